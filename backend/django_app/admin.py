@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User, UserProfile, Stock, UserHoldings, StockHolding, ZodiacSignMatching, DailyHoroscope
+from .models import User, UserProfile, Stock, UserHoldings, StockHolding, ZodiacSignMatching, DailyHoroscope, PortfolioValuation, StockOrder, PriceAlert, AlertNotification, TaxLot, DailyBar, RelatedStocks, BacktestJob, BasketIndex, CosmicVibeSnapshot, SyncTombstone, ChangeLogEntry
 
 
 class UserProfileInline(admin.StackedInline):
@@ -38,7 +38,7 @@ class StockAdmin(admin.ModelAdmin):
 
 @admin.register(UserHoldings)
 class UserHoldingsAdmin(admin.ModelAdmin):
-    list_display = ('user', 'balance', 'created_at', 'updated_at')
+    list_display = ('user', 'balance', 'lot_method', 'realized_gain_loss', 'created_at', 'updated_at')
     search_fields = ('user__email', 'user__username')
     readonly_fields = ('created_at', 'updated_at')
 
@@ -90,4 +90,96 @@ class DailyHoroscopeAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(PortfolioValuation)
+class PortfolioValuationAdmin(admin.ModelAdmin):
+    list_display = ('user', 'zodiac_sign', 'total_value', 'gain_loss_percent', 'alignment_score', 'cosmic_vibe_index', 'updated_at')
+    list_filter = ('zodiac_sign', 'element')
+    search_fields = ('user__email', 'user__username')
+    readonly_fields = ('updated_at',)
+
+
+@admin.register(StockOrder)
+class StockOrderAdmin(admin.ModelAdmin):
+    list_display = ('user', 'ticker', 'side', 'order_type', 'trigger_price', 'quantity', 'status', 'created_at')
+    list_filter = ('status', 'side', 'order_type')
+    search_fields = ('user__email', 'ticker')
+    readonly_fields = ('created_at', 'updated_at', 'filled_at')
+
+
+@admin.register(PriceAlert)
+class PriceAlertAdmin(admin.ModelAdmin):
+    list_display = ('user', 'ticker', 'alert_type', 'threshold', 'is_active', 'triggered_price', 'triggered_at')
+    list_filter = ('is_active', 'alert_type')
+    search_fields = ('user__email', 'ticker')
+    readonly_fields = ('created_at', 'triggered_at')
+
+
+@admin.register(AlertNotification)
+class AlertNotificationAdmin(admin.ModelAdmin):
+    list_display = ('user', 'message', 'is_read', 'created_at')
+    list_filter = ('is_read',)
+    search_fields = ('user__email', 'message')
+    readonly_fields = ('created_at',)
+
+
+@admin.register(TaxLot)
+class TaxLotAdmin(admin.ModelAdmin):
+    list_display = ('user', 'ticker', 'quantity', 'remaining_quantity', 'cost_per_share', 'realized_gain_loss', 'acquired_at')
+    list_filter = ('ticker',)
+    search_fields = ('user__email', 'ticker')
+    readonly_fields = ('created_at', 'updated_at', 'closed_at')
+
+
+@admin.register(DailyBar)
+class DailyBarAdmin(admin.ModelAdmin):
+    list_display = ('ticker', 'date', 'open', 'high', 'low', 'close', 'volume')
+    list_filter = ('date',)
+    search_fields = ('ticker',)
+
+
+@admin.register(RelatedStocks)
+class RelatedStocksAdmin(admin.ModelAdmin):
+    list_display = ('ticker', 'observations', 'as_of', 'updated_at')
+    search_fields = ('ticker',)
+    readonly_fields = ('updated_at',)
+
+
+@admin.register(CosmicVibeSnapshot)
+class CosmicVibeSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('user', 'cosmic_vibe_index', 'alignment_score', 'elements_held', 'recorded_at')
+    search_fields = ('user__email',)
+    date_hierarchy = 'recorded_at'
+
+
+@admin.register(BasketIndex)
+class BasketIndexAdmin(admin.ModelAdmin):
+    list_display = ('name', 'basket_type', 'weighting', 'constituents', 'updated_at')
+    list_filter = ('basket_type', 'weighting')
+    readonly_fields = ('updated_at',)
+    exclude = ('dates', 'values')
+
+
+@admin.register(BacktestJob)
+class BacktestJobAdmin(admin.ModelAdmin):
+    list_display = ('user', 'status', 'created_at', 'completed_at')
+    list_filter = ('status',)
+    search_fields = ('user__email',)
+    readonly_fields = ('created_at', 'completed_at')
+
+
+@admin.register(SyncTombstone)
+class SyncTombstoneAdmin(admin.ModelAdmin):
+    list_display = ('model', 'ticker', 'user', 'deleted_at')
+    list_filter = ('model',)
+    search_fields = ('ticker', 'user__email')
+    readonly_fields = ('deleted_at',)
+
+
+@admin.register(ChangeLogEntry)
+class ChangeLogEntryAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'object_id', 'created_at')
+    list_filter = ('kind',)
+    readonly_fields = ('created_at',)
+
+
 admin.site.register(User, CustomUserAdmin)
\ No newline at end of file
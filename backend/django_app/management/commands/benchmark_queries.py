@@ -0,0 +1,66 @@
+"""
+Management command to report the query counts and plans of the per-user endpoints
+Usage: python manage.py benchmark_queries --email user@example.com [--no-explain]
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from django_app.models import StockHolding, UserStockPreference, ZodiacSignMatching
+
+# Endpoints measured, all read-only
+ENDPOINTS = [
+    '/api/holdings/',
+    '/api/portfolio/',
+    '/api/portfolio/?holdings=false',
+    '/api/watchlist/',
+    '/api/dislike-list/',
+    '/api/zodiac/matched-stocks/',
+]
+
+
+class Command(BaseCommand):
+    help = 'Count the queries of the holdings, portfolio and preference endpoints and EXPLAIN their main queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--email', required=True, help='User whose data the endpoints are run against')
+        parser.add_argument('--no-explain', action='store_true', help='Only report query counts')
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(email=options['email'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'No user with email {options["email"]}')
+
+        client = APIClient()
+        client.force_authenticate(user)
+
+        # Bypass the response cache so every request does its full work
+        self.stdout.write(f'Queries per request for {user.email} (response cache bypassed):')
+        with override_settings(
+            ALLOWED_HOSTS=['*'],
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+        ):
+            for url in ENDPOINTS:
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(url)
+                self.stdout.write(f'  {url:<32} {response.status_code}  {len(queries.captured_queries):3d} queries')
+
+        if options['no_explain']:
+            return
+
+        sign = getattr(getattr(user, 'profile', None), 'zodiac_sign', None)
+        plans = {
+            'Positions joined to stocks (portfolio summary)': StockHolding.objects.filter(
+                user_holdings__user=user, stock__isnull=False
+            ).values('ticker', 'quantity', 'stock__current_price', 'stock__zodiac_sign'),
+            'Watchlist, newest first': UserStockPreference.objects.filter(
+                user=user, preference_type='watchlist'
+            ),
+            'Sign matches of the user': ZodiacSignMatching.objects.filter(user_sign=sign),
+        }
+        for title, queryset in plans.items():
+            self.stdout.write(f'\n{title}:')
+            self.stdout.write(queryset.explain())
@@ -0,0 +1,157 @@
+"""
+Management command to benchmark response serialization: DRF serializers + JSONRenderer against
+the lightweight serializers + FastJSONRenderer (orjson), and the history layouts and encodings
+Usage: python manage.py benchmark_serialization [--stocks 100] [--positions 50] [--bars 390] [--repeat 5]
+"""
+import json
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from django_app.models import Stock
+from django_app.renderers import FastJSONRenderer, MessagePackRenderer
+from django_app.serializers import PortfolioSummarySerializer, StockSerializer
+from django_app.utils.columnar import ohlcv_columns, ohlcv_rows
+from django_app.utils.fast_serializers import STOCK_FIELDS, serialize_portfolio_summary, serialize_stocks
+
+SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+
+
+def legacy_history(hist):
+    """Row-by-row history formatting, as StockHistoryView built it before"""
+    history_data = []
+    for timestamp, row in hist.iterrows():
+        history_data.append({
+            'timestamp': timestamp.isoformat(),
+            'open': float(row['Open']),
+            'high': float(row['High']),
+            'low': float(row['Low']),
+            'close': float(row['Close']),
+            'volume': int(row['Volume'])
+        })
+    return JSONRenderer().render({'ticker': 'AAA', 'timeframe': '1D', 'data': history_data})
+
+
+def fast_history(hist):
+    """Column-wise history formatting, as StockHistoryView builds it now"""
+    history_data = ohlcv_rows(hist)
+    return FastJSONRenderer().render({'ticker': 'AAA', 'timeframe': '1D', 'data': history_data})
+
+
+def columnar_history(hist, renderer):
+    """Parallel-array history (?layout=columns), in JSON or MessagePack"""
+    return renderer.render({'ticker': 'AAA', 'timeframe': '1D', 'layout': 'columns', 'data': ohlcv_columns(hist)})
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the CPU time per request of DRF serialization against the fast serializers and renderer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stocks', type=int, default=100, help='Stocks in the stock list')
+        parser.add_argument('--positions', type=int, default=50, help='Positions in the portfolio summary')
+        parser.add_argument('--bars', type=int, default=390, help='Bars in the stock history')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per implementation (best is reported)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic data')
+
+    def time_best(self, func, repeat, *args):
+        best, result = None, None
+        for _ in range(repeat):
+            started = time.process_time()
+            result = func(*args)
+            elapsed = time.process_time() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def compare(self, name, repeat, legacy, fast, legacy_args, fast_args):
+        legacy_time, legacy_body = self.time_best(legacy, repeat, *legacy_args)
+        fast_time, fast_body = self.time_best(fast, repeat, *fast_args)
+        same = json.loads(legacy_body) == json.loads(fast_body)
+        self.stdout.write(
+            f'{name:<18} drf {legacy_time * 1000:8.2f} ms   fast {fast_time * 1000:8.2f} ms   '
+            f'saved {(legacy_time - fast_time) * 1000:8.2f} ms ({legacy_time / fast_time:5.1f}x)   '
+            f'{len(fast_body):8d} bytes   {"identical" if same else "DIFFERENT"}'
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        repeat = options['repeat']
+        now = timezone.now()
+
+        stocks = [
+            Stock(
+                id=i + 1, ticker=f'T{i:04d}', company_name=f'Company {i}',
+                current_price=Decimal(rng.randint(100, 500_000)).scaleb(-2),
+                previous_close=Decimal(rng.randint(100, 500_000)).scaleb(-2),
+                market_state='REGULAR', last_updated=now, description='Lorem ipsum dolor sit amet. ' * 20,
+                date_founded=now - timedelta(days=rng.randint(1000, 40000)), zodiac_sign=rng.choice(SIGNS),
+            )
+            for i in range(options['stocks'])
+        ]
+        rows = [{name: getattr(stock, name) for name, _ in STOCK_FIELDS} for stock in stocks]
+
+        holdings = [
+            {
+                'ticker': f'T{i:04d}', 'company_name': f'Company {i}',
+                'quantity': Decimal(rng.randint(1, 5_000_000)).scaleb(-4),
+                'purchase_price': Decimal(rng.randint(100, 500_000)).scaleb(-2), 'purchase_date': now,
+                'current_price': Decimal(rng.randint(100, 500_000)).scaleb(-2),
+                'current_value': Decimal(rng.randint(100, 50_000_000)).scaleb(-2),
+                'cost_basis': Decimal(rng.randint(100, 50_000_000)).scaleb(-2),
+                'gain_loss': Decimal(rng.randint(-5_000_000, 5_000_000)).scaleb(-2),
+                'gain_loss_percent': Decimal(rng.randint(-10_000, 10_000)).scaleb(-2),
+                'alignment_score': 85, 'match_type': 'positive', 'zodiac_sign': 'Leo', 'element': 'Fire',
+            }
+            for i in range(options['positions'])
+        ]
+        summary = {
+            'cash_balance': Decimal('12345.67'), 'stocks_value': Decimal('98765.43'),
+            'total_portfolio_value': Decimal('111111.10'), 'total_cost_basis': Decimal('90000.00'),
+            'total_gain_loss': Decimal('8765.43'), 'total_gain_loss_percent': Decimal('9.74'),
+            'realized_gain_loss': Decimal('0.00'), 'overall_alignment_score': 72, 'cosmic_vibe_index': 80,
+            'element_distribution': {'Fire': Decimal('40.0'), 'Earth': Decimal('20.0'), 'Air': Decimal('30.0'), 'Water': Decimal('10.0')},
+            'alignment_breakdown': {'same_sign': 1, 'positive': 2, 'neutral': 3, 'negative': 4},
+            'position_count': len(holdings), 'holdings': holdings,
+        }
+
+        closes = 100 * np.exp(np.cumsum(np.random.default_rng(options['seed']).normal(0, 0.002, options['bars'])))
+        hist = pd.DataFrame(
+            {'Open': closes, 'High': closes * 1.001, 'Low': closes * 0.999, 'Close': closes, 'Volume': np.full(options['bars'], 1000)},
+            index=pd.date_range('2026-10-16 13:30', periods=options['bars'], freq='min', tz='UTC'),
+        )
+
+        renderer = FastJSONRenderer()
+        self.stdout.write(f'CPU time per request, best of {repeat}')
+        self.compare(
+            f'stocks ({len(stocks)})', repeat,
+            lambda: JSONRenderer().render(StockSerializer(stocks, many=True).data),
+            lambda: renderer.render(serialize_stocks(rows)), (), (),
+        )
+        self.compare(
+            f'portfolio ({len(holdings)})', repeat,
+            lambda: JSONRenderer().render(PortfolioSummarySerializer(summary).data),
+            lambda: renderer.render(serialize_portfolio_summary(summary)), (), (),
+        )
+        self.compare(f'history ({options["bars"]})', repeat, legacy_history, fast_history, (hist,), (hist,))
+
+        # History layouts and encodings, against the legacy rows
+        legacy_time, legacy_body = self.time_best(legacy_history, repeat, hist)
+        encodings = [
+            ('rows json', fast_history, (hist,)),
+            ('columns json', columnar_history, (hist, renderer)),
+            ('columns msgpack', columnar_history, (hist, MessagePackRenderer())),
+        ]
+        for name, func, func_args in encodings:
+            elapsed, body = self.time_best(func, repeat, *func_args)
+            self.stdout.write(
+                f'{name:<18} {elapsed * 1000:8.2f} ms ({legacy_time / elapsed:5.1f}x)   '
+                f'{len(body):8d} bytes ({len(legacy_body) / len(body):5.1f}x smaller)'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Benchmark complete'))
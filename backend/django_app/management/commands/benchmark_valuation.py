@@ -0,0 +1,126 @@
+"""
+Management command to benchmark the fixed-point valuation core against the Decimal implementation
+Usage: python manage.py benchmark_valuation [--positions 500] [--timestamps 390] [--repeat 5] [--seed 0]
+"""
+import random
+import time
+from decimal import Decimal
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from django_app.utils.fixed_point import CENTS, QUANTITY_SCALE, float_to_fixed, position_values, to_fixed, value_portfolio
+
+
+def legacy_summary(quantities, prices, costs, scores):
+    """Per-position Decimal valuation, as PortfolioSummaryView computed it before fixed point"""
+    stocks_value = Decimal('0')
+    cost_basis = Decimal('0')
+    weighted_alignment = 0
+    values = []
+    for quantity, price, cost, score in zip(quantities, prices, costs, scores):
+        value = Decimal(str(price)) * Decimal(str(quantity))
+        gain_loss = value - Decimal(str(cost))
+        gain_loss_percent = (gain_loss / Decimal(str(cost)) * 100) if cost > 0 else Decimal('0')
+        stocks_value += value
+        cost_basis += Decimal(str(cost))
+        weighted_alignment += score * float(value)
+        values.append((value, gain_loss, gain_loss_percent))
+    total_gain_loss = stocks_value - cost_basis
+    return {
+        'values': [value.quantize(Decimal('0.01')) for value, _, _ in values],
+        'stocks_value': stocks_value,
+        'gain_loss_total': total_gain_loss,
+        'alignment_score': int(weighted_alignment / float(stocks_value)) if stocks_value > 0 else 50,
+    }
+
+
+def fixed_summary(quantities, prices, costs, scores):
+    """The same summary through utils.fixed_point"""
+    return value_portfolio(
+        to_fixed(quantities, QUANTITY_SCALE),
+        to_fixed(prices, CENTS),
+        to_fixed(costs, CENTS),
+        scores,
+    )
+
+
+def legacy_history(quantities, closes):
+    """Timestamp x position Decimal loop, as PortfolioHistoryView computed it before fixed point"""
+    totals = []
+    for row in closes:
+        stocks_value = Decimal('0')
+        for quantity, close in zip(quantities, row):
+            stocks_value += Decimal(str(close)) * Decimal(str(quantity))
+        totals.append(float(stocks_value))
+    return totals
+
+
+def fixed_history(quantities, closes):
+    """The same history through utils.fixed_point"""
+    values = position_values(to_fixed(quantities, QUANTITY_SCALE), float_to_fixed(closes, CENTS))
+    return values.sum(axis=1) / CENTS
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the fixed-point portfolio valuation against the per-position Decimal implementation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--positions', type=int, default=500, help='Positions per synthetic portfolio')
+        parser.add_argument('--timestamps', type=int, default=390, help='History points (e.g. 390 five-minute bars)')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per implementation (best is reported)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic portfolio')
+
+    def time_best(self, func, repeat, *args):
+        best, result = None, None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func(*args)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def report(self, name, legacy_time, fixed_time, max_difference):
+        self.stdout.write(
+            f'{name:<10} decimal {legacy_time * 1000:9.2f} ms   fixed {fixed_time * 1000:9.2f} ms   '
+            f'speedup {legacy_time / fixed_time:7.1f}x   max difference {max_difference} cents'
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        positions, repeat = options['positions'], options['repeat']
+
+        # Synthetic portfolio with the models' precision (4 dp quantities, 2 dp money)
+        quantities = [Decimal(rng.randint(1, 5_000_000)).scaleb(-4) for _ in range(positions)]
+        prices = [Decimal(rng.randint(100, 500_000)).scaleb(-2) for _ in range(positions)]
+        costs = [(quantity * price * Decimal(str(rng.uniform(0.5, 1.5)))).quantize(Decimal('0.01'))
+                 for quantity, price in zip(quantities, prices)]
+        scores = [rng.choice([100, 85, 65, 40]) for _ in range(positions)]
+        closes = np.round(
+            np.array([float(price) for price in prices])
+            * np.exp(np.cumsum(np.random.default_rng(options['seed']).normal(0, 0.002, (options['timestamps'], positions)), axis=0)),
+            2,
+        )
+
+        self.stdout.write(f'{positions} positions, {options["timestamps"]} history points, best of {repeat}')
+
+        legacy_time, legacy = self.time_best(legacy_summary, repeat, quantities, prices, costs, scores)
+        fixed_time, fixed = self.time_best(fixed_summary, repeat, quantities, prices, costs, scores)
+        difference = max(
+            (abs(int(value * CENTS) - int(cents)) for value, cents in zip(legacy['values'], fixed['values'])),
+            default=0,
+        )
+        self.report('summary', legacy_time, fixed_time, difference)
+        if legacy['alignment_score'] != fixed['alignment_score']:
+            self.stdout.write(self.style.WARNING(
+                f'Alignment differs: decimal {legacy["alignment_score"]}, fixed {fixed["alignment_score"]}'
+            ))
+
+        legacy_time, legacy = self.time_best(legacy_history, repeat, quantities, closes.tolist())
+        fixed_time, fixed = self.time_best(fixed_history, repeat, quantities, closes)
+        # Fixed point rounds each position to cents before summing, so totals can drift from the
+        # unrounded Decimal sum by up to half a cent per position
+        difference = int(np.abs(np.round(np.array(legacy) * CENTS) - np.round(fixed * CENTS)).max())
+        self.report('history', legacy_time, fixed_time, difference)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark complete'))
@@ -0,0 +1,35 @@
+"""
+Management command to update the zodiac sign and element basket indices from cached daily bars
+Usage: python manage.py build_basket_indices [--rebuild] [--refresh-shares]
+"""
+from django.core.management.base import BaseCommand
+from django_app.utils.basket_indices import update_basket_indices
+from django_app.utils.market_data import sync_shares_outstanding
+
+
+class Command(BaseCommand):
+    help = 'Append the latest daily bars to the sign and element basket indices (normally run nightly after sync_daily_bars)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recompute every index from the full bar history instead of appending',
+        )
+        parser.add_argument(
+            '--refresh-shares',
+            action='store_true',
+            help='Re-fetch shares outstanding for every stock (used for cap weighting)',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Syncing shares outstanding...')
+        if options['refresh_shares']:
+            updated = sync_shares_outstanding(refresh=True, limit=None)
+        else:
+            updated = sync_shares_outstanding()
+        self.stdout.write(f'Updated shares outstanding for {updated} stocks')
+
+        self.stdout.write('Updating basket indices...')
+        written = update_basket_indices(rebuild=options['rebuild'])
+        self.stdout.write(self.style.SUCCESS(f'Successfully wrote {written} basket index series'))
@@ -0,0 +1,15 @@
+"""
+Management command to rebuild the related stocks index from cached daily bars
+Usage: python manage.py build_related_stocks
+"""
+from django.core.management.base import BaseCommand
+from django_app.utils.related_stocks import build_related_stocks
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the top-k correlated stocks of every ticker (normally run nightly after sync_daily_bars)'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Building related stocks...')
+        indexed = build_related_stocks()
+        self.stdout.write(self.style.SUCCESS(f'Successfully indexed {indexed} tickers'))
@@ -5,6 +5,7 @@ Uses yfinance to get the last known close price
 from django.core.management.base import BaseCommand
 from django_app.models import Stock
 from django_app.utils.yfinance_module import get_ticker_price
+from django_app.utils.response_cache import bump_price_epoch
 
 
 class Command(BaseCommand):
@@ -61,6 +62,8 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.ERROR(f' FAILED: {str(e)}'))
         
         self.stdout.write('\n' + '=' * 60)
+        # Cached discovery and portfolio responses are built from this data
+        bump_price_epoch()
         self.stdout.write(self.style.SUCCESS(
             f'Complete! Success: {success_count}, Errors: {error_count}'
         ))
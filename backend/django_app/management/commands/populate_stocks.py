@@ -8,6 +8,7 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 import pytz
 from django_app.models import Stock
+from django_app.utils.response_cache import bump_price_epoch
 
 
 class Command(BaseCommand):
@@ -67,6 +68,8 @@ class Command(BaseCommand):
                 updated_count += 1
                 self.stdout.write(f'[*] Updated {ticker}')
         
+        # Cached discovery and portfolio responses are built from this data
+        bump_price_epoch()
         self.stdout.write(self.style.SUCCESS(
             f'\nComplete! Created: {created_count}, Updated: {updated_count}'
         ))
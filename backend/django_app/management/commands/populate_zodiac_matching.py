@@ -6,6 +6,7 @@ import os
 from django.core.management.base import BaseCommand
 from django.conf import settings
 from django_app.models import ZodiacSignMatching
+from django_app.utils.response_cache import bump_price_epoch
 
 
 class Command(BaseCommand):
@@ -64,6 +65,8 @@ class Command(BaseCommand):
                 )
                 created_count += 1
         
+        # Cached discovery and portfolio responses are built from this data
+        bump_price_epoch()
         self.stdout.write(self.style.SUCCESS(
             f'Successfully created {created_count} zodiac sign matching records'
         ))
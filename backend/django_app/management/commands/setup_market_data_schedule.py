@@ -0,0 +1,49 @@
+"""
+Management command to set up the nightly daily bar sync
+Usage: python manage.py setup_market_data_schedule
+"""
+from datetime import time, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django_q.models import Schedule
+from django_q.tasks import async_task
+
+from django_app.models import DailyBar
+
+# After the US close (4:00 PM ET) in UTC, whatever the daylight saving offset
+SYNC_TIME_UTC = time(hour=22, minute=0)
+
+
+class Command(BaseCommand):
+    help = 'Set up Django-Q2 scheduled task for the nightly daily bar sync'
+
+    def handle(self, *args, **options):
+        schedule_name = 'sync_daily_bars'
+        
+        if Schedule.objects.filter(name=schedule_name).exists():
+            self.stdout.write(self.style.WARNING(f'Schedule "{schedule_name}" already exists. Deleting and recreating...'))
+            Schedule.objects.filter(name=schedule_name).delete()
+        
+        now = timezone.now()
+        next_run = now.replace(hour=SYNC_TIME_UTC.hour, minute=SYNC_TIME_UTC.minute, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        
+        schedule = Schedule.objects.create(
+            name=schedule_name,
+            func='django_app.tasks.sync_daily_bars',
+            schedule_type=Schedule.DAILY,
+            next_run=next_run,
+            repeats=-1,  # Repeat indefinitely
+            kwargs="{'q_options': {'timeout': 600}}",
+        )
+        
+        self.stdout.write(self.style.SUCCESS(f'Successfully created schedule: "{schedule_name}"'))
+        self.stdout.write(f'  Function: {schedule.func}')
+        self.stdout.write(f'  Next run: {schedule.next_run}')
+        
+        # First setup: backfill the history now instead of waiting for tonight
+        if not DailyBar.objects.exists():
+            async_task('django_app.tasks.sync_daily_bars', q_options={'timeout': 600})
+            self.stdout.write(self.style.SUCCESS('  Queued initial backfill (runs via qcluster)'))
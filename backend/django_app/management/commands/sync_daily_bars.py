@@ -0,0 +1,26 @@
+"""
+Management command to fill the daily bar cache used by portfolio analytics
+Usage: python manage.py sync_daily_bars [--tickers AAPL MSFT ...]
+"""
+from django.core.management.base import BaseCommand
+from django_app.utils.market_data import sync_daily_bars
+
+
+class Command(BaseCommand):
+    help = 'Fetch missing daily bars for every stock and the benchmark (or the given tickers)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tickers',
+            nargs='+',
+            help='Only sync these tickers',
+        )
+
+    def handle(self, *args, **options):
+        tickers = options.get('tickers')
+        if tickers:
+            tickers = [ticker.upper() for ticker in tickers]
+        
+        self.stdout.write('Syncing daily bars...')
+        written = sync_daily_bars(tickers)
+        self.stdout.write(self.style.SUCCESS(f'Successfully wrote {written} daily bars'))
@@ -0,0 +1,79 @@
+"""
+Middleware for the ZEN Trading API
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+
+from django_app.utils.compression import ENCODINGS, choose_encoding, compress, compress_stream
+
+COMPRESSED_BODY_TIMEOUT = 10 * 60
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli or gzip, whichever the client accepts (brotli first)
+
+    - Only COMPRESSION_CONTENT_TYPES are compressed, and only bodies of at least
+      COMPRESSION_MIN_SIZE bytes; responses that already have a Content-Encoding (the
+      pre-compressed stock list) pass through untouched
+    - Bodies that carry an ETag (the conditional and cached read endpoints) repeat until
+      their data changes, so each is compressed once and the result cached by its digest
+    - Streaming responses are compressed chunk by chunk and flushed after every chunk
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = settings.COMPRESSION_MIN_SIZE
+        self.content_types = tuple(settings.COMPRESSION_CONTENT_TYPES)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.is_compressible(response):
+            return response
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        coding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), ENCODINGS)
+        if coding == 'identity':
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(response.streaming_content, coding)
+            del response['Content-Length']
+        else:
+            body = self.compressed_body(response.content, coding, cached=response.has_header('ETag'))
+            if len(body) >= len(response.content):
+                return response
+            response.content = body
+            response['Content-Length'] = str(len(body))
+
+        # The compressed body is not byte-for-byte the one a strong validator describes
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = f'W/{etag}'
+        response['Content-Encoding'] = coding
+        return response
+
+    def is_compressible(self, response):
+        if response.has_header('Content-Encoding'):
+            return False
+        if response.streaming and response.is_async:
+            return False
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return False
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        return content_type in self.content_types
+
+    def compressed_body(self, body, coding, cached=False):
+        if not cached:
+            return compress(body, coding)
+        cache_key = f'compressed:{coding}:{hashlib.blake2b(body, digest_size=16).hexdigest()}'
+        compressed = cache.get(cache_key)
+        if compressed is None:
+            compressed = compress(body, coding)
+            cache.set(cache_key, compressed, COMPRESSED_BODY_TIMEOUT)
+        return compressed
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app', '0008_dailyhoroscope'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioValuation',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='portfolio_valuation', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('zodiac_sign', models.CharField(blank=True, max_length=50, null=True)),
+                ('element', models.CharField(blank=True, max_length=50, null=True)),
+                ('cash_balance', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('stocks_value', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('total_value', models.DecimalField(db_index=True, decimal_places=2, default=0, max_digits=12)),
+                ('cost_basis', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('gain_loss', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('gain_loss_percent', models.DecimalField(db_index=True, decimal_places=2, default=0, max_digits=12)),
+                ('alignment_score', models.IntegerField(db_index=True, default=50)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Portfolio Valuation',
+                'verbose_name_plural': 'Portfolio Valuations',
+                'indexes': [models.Index(fields=['zodiac_sign', 'total_value'], name='django_app__zodiac__1bb8a5_idx'), models.Index(fields=['element', 'total_value'], name='django_app__element_452c1b_idx')],
+            },
+        ),
+    ]
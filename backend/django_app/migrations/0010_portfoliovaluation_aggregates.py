@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app', '0009_portfoliovaluation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='portfoliovaluation',
+            name='air_value',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='portfoliovaluation',
+            name='alignment_weighted_value',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=16),
+        ),
+        migrations.AddField(
+            model_name='portfoliovaluation',
+            name='earth_value',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='portfoliovaluation',
+            name='fire_value',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='portfoliovaluation',
+            name='negative_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='portfoliovaluation',
+            name='neutral_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='portfoliovaluation',
+            name='position_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='portfoliovaluation',
+            name='positive_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='portfoliovaluation',
+            name='same_sign_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='portfoliovaluation',
+            name='water_value',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app', '0010_portfoliovaluation_aggregates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockOrder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticker', models.CharField(max_length=10)),
+                ('side', models.CharField(choices=[('buy', 'Buy'), ('sell', 'Sell')], max_length=10)),
+                ('order_type', models.CharField(choices=[('limit', 'Limit'), ('stop', 'Stop')], max_length=10)),
+                ('trigger_price', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('quantity', models.DecimalField(decimal_places=4, max_digits=12)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('filled', 'Filled'), ('cancelled', 'Cancelled'), ('rejected', 'Rejected')], default='open', max_length=20)),
+                ('status_detail', models.CharField(blank=True, max_length=255)),
+                ('fill_price', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('filled_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_orders', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Stock Order',
+                'verbose_name_plural': 'Stock Orders',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'id'], name='django_app__status_dfa812_idx'), models.Index(fields=['user', 'status'], name='django_app__user_id_5b51e5_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app', '0011_stockorder'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticker', models.CharField(max_length=10)),
+                ('alert_type', models.CharField(choices=[('above', 'Price Above'), ('below', 'Price Below'), ('percent_change', 'Percent Change')], max_length=20)),
+                ('threshold', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('is_active', models.BooleanField(default=True)),
+                ('triggered_price', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('triggered_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='price_alerts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Price Alert',
+                'verbose_name_plural': 'Price Alerts',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AlertNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('message', models.CharField(max_length=255)),
+                ('is_read', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alert_notifications', to=settings.AUTH_USER_MODEL)),
+                ('alert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='django_app.pricealert')),
+            ],
+            options={
+                'verbose_name': 'Alert Notification',
+                'verbose_name_plural': 'Alert Notifications',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='pricealert',
+            index=models.Index(fields=['is_active', 'id'], name='django_app__is_acti_997055_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alertnotification',
+            index=models.Index(fields=['user', 'is_read'], name='django_app__user_id_d6059c_idx'),
+        ),
+    ]
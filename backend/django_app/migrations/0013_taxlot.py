@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:03
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def create_opening_lots(apps, schema_editor):
+    """
+    Give every existing position a single lot at its average cost
+    """
+    StockHolding = apps.get_model('django_app', 'StockHolding')
+    TaxLot = apps.get_model('django_app', 'TaxLot')
+
+    lots = []
+    for position in StockHolding.objects.select_related('user_holdings').iterator():
+        if position.quantity <= 0:
+            continue
+        lots.append(TaxLot(
+            user_id=position.user_holdings.user_id,
+            ticker=position.ticker,
+            quantity=position.quantity,
+            remaining_quantity=position.quantity,
+            cost_per_share=(position.total_value / position.quantity).quantize(Decimal('0.0001')),
+            remaining_cost=position.total_value,
+            acquired_at=position.purchase_date or position.created_at or timezone.now(),
+        ))
+    TaxLot.objects.bulk_create(lots, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app', '0012_pricealert_alertnotification'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='portfoliovaluation',
+            name='realized_gain_loss',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='userholdings',
+            name='lot_method',
+            field=models.CharField(choices=[('fifo', 'First In, First Out'), ('lifo', 'Last In, First Out'), ('highest_cost', 'Highest Cost First')], default='fifo', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='userholdings',
+            name='realized_gain_loss',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.CreateModel(
+            name='TaxLot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticker', models.CharField(max_length=10)),
+                ('quantity', models.DecimalField(decimal_places=4, max_digits=12)),
+                ('remaining_quantity', models.DecimalField(decimal_places=4, max_digits=12)),
+                ('cost_per_share', models.DecimalField(decimal_places=4, max_digits=12)),
+                ('remaining_cost', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('realized_gain_loss', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('acquired_at', models.DateTimeField()),
+                ('closed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tax_lots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Tax Lot',
+                'verbose_name_plural': 'Tax Lots',
+                'ordering': ['acquired_at', 'id'],
+                'indexes': [models.Index(condition=models.Q(('remaining_quantity__gt', 0)), fields=['user', 'ticker', 'id'], name='taxlot_open_by_age'), models.Index(condition=models.Q(('remaining_quantity__gt', 0)), fields=['user', 'ticker', '-cost_per_share', 'id'], name='taxlot_open_by_cost')],
+            },
+        ),
+        migrations.RunPython(create_opening_lots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app', '0013_taxlot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyBar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticker', models.CharField(max_length=10)),
+                ('date', models.DateField(db_index=True)),
+                ('open', models.FloatField(blank=True, null=True)),
+                ('high', models.FloatField(blank=True, null=True)),
+                ('low', models.FloatField(blank=True, null=True)),
+                ('close', models.FloatField()),
+                ('volume', models.BigIntegerField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Daily Bar',
+                'verbose_name_plural': 'Daily Bars',
+                'ordering': ['ticker', 'date'],
+                'unique_together': {('ticker', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app', '0014_dailybar'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedStocks',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticker', models.CharField(max_length=10, unique=True)),
+                ('related', models.JSONField(default=list)),
+                ('observations', models.PositiveIntegerField(default=0)),
+                ('as_of', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Related Stocks',
+                'verbose_name_plural': 'Related Stocks',
+            },
+        ),
+    ]
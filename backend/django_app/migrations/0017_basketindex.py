@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app', '0016_backtestjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stock',
+            name='shares_outstanding',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='BasketIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('basket_type', models.CharField(choices=[('sign', 'Zodiac Sign'), ('element', 'Element')], max_length=10)),
+                ('name', models.CharField(max_length=50)),
+                ('weighting', models.CharField(choices=[('equal', 'Equal Weighted'), ('cap', 'Market Cap Weighted')], max_length=10)),
+                ('dates', models.JSONField(default=list)),
+                ('values', models.JSONField(default=list)),
+                ('constituents', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Basket Index',
+                'verbose_name_plural': 'Basket Indices',
+                'ordering': ['basket_type', 'name', 'weighting'],
+                'unique_together': {('basket_type', 'name', 'weighting')},
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:23
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def record_initial_vibe(apps, schema_editor):
+    """
+    Store every valuation's cosmic vibe index and start each user's history with it
+    """
+    PortfolioValuation = apps.get_model('django_app', 'PortfolioValuation')
+    CosmicVibeSnapshot = apps.get_model('django_app', 'CosmicVibeSnapshot')
+
+    snapshots = []
+    for valuation in PortfolioValuation.objects.iterator():
+        elements_held = sum(
+            1 for value in (valuation.fire_value, valuation.earth_value, valuation.air_value, valuation.water_value)
+            if value > 0
+        )
+        # Alignment plus 3 points per element held (at most 15), capped at 100
+        valuation.cosmic_vibe_index = min(valuation.alignment_score + min(elements_held * 3, 15), 100)
+        valuation.save(update_fields=['cosmic_vibe_index'])
+        snapshots.append(CosmicVibeSnapshot(
+            user_id=valuation.user_id,
+            cosmic_vibe_index=valuation.cosmic_vibe_index,
+            alignment_score=valuation.alignment_score,
+            elements_held=elements_held,
+            recorded_at=valuation.updated_at,
+        ))
+    CosmicVibeSnapshot.objects.bulk_create(snapshots, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app', '0017_basketindex'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='portfoliovaluation',
+            name='cosmic_vibe_index',
+            field=models.IntegerField(default=50),
+        ),
+        migrations.CreateModel(
+            name='CosmicVibeSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cosmic_vibe_index', models.IntegerField()),
+                ('alignment_score', models.IntegerField()),
+                ('elements_held', models.PositiveSmallIntegerField(default=0)),
+                ('recorded_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cosmic_vibe_snapshots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Cosmic Vibe Snapshot',
+                'verbose_name_plural': 'Cosmic Vibe Snapshots',
+                'indexes': [models.Index(fields=['user', 'recorded_at'], name='django_app__user_id_d22bd6_idx')],
+            },
+        ),
+        migrations.RunPython(record_initial_vibe, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_versions(apps, schema_editor):
+    """
+    Create the price epoch row and a data version for every existing user
+    """
+    User = apps.get_model('django_app', 'User')
+    UserDataVersion = apps.get_model('django_app', 'UserDataVersion')
+    PriceEpoch = apps.get_model('django_app', 'PriceEpoch')
+
+    PriceEpoch.objects.get_or_create(pk=1)
+    UserDataVersion.objects.bulk_create(
+        [UserDataVersion(user_id=user_id) for user_id in User.objects.values_list('pk', flat=True)],
+        batch_size=1000,
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app', '0018_cosmicvibesnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceEpoch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('epoch', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Price Epoch',
+                'verbose_name_plural': 'Price Epochs',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserDataVersion',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='data_version', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'User Data Version',
+                'verbose_name_plural': 'User Data Versions',
+            },
+        ),
+        migrations.RunPython(create_versions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_stocks(apps, schema_editor):
+    """
+    Point every position and preference at the stock with its ticker
+    Rows whose ticker is not a known stock keep a null stock.
+    """
+    Stock = apps.get_model('django_app', 'Stock')
+    stock_id = models.Subquery(Stock.objects.filter(ticker=models.OuterRef('ticker')).values('pk')[:1])
+    for model_name in ('StockHolding', 'UserStockPreference'):
+        apps.get_model('django_app', model_name).objects.update(stock_id=stock_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app', '0019_userdataversion_priceepoch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stockholding',
+            name='stock',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='positions', to='django_app.stock'),
+        ),
+        migrations.AddField(
+            model_name='userstockpreference',
+            name='stock',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='preferences', to='django_app.stock'),
+        ),
+        migrations.AlterField(
+            model_name='stockholding',
+            name='ticker',
+            field=models.CharField(db_index=True, max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='userstockpreference',
+            name='ticker',
+            field=models.CharField(db_index=True, max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='userstockpreference',
+            index=models.Index(fields=['user', 'preference_type', '-created_at'], name='preference_by_type'),
+        ),
+        migrations.RunPython(link_stocks, migrations.RunPython.noop),
+    ]
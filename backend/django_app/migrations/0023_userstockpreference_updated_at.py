@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:17
+
+from django.db import migrations, models
+
+
+def backfill_updated_at(apps, schema_editor):
+    """
+    Start existing preferences at their creation time rather than at the migration
+    """
+    UserStockPreference = apps.get_model('django_app', 'UserStockPreference')
+    UserStockPreference.objects.update(updated_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app', '0022_sync_tombstones'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userstockpreference',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='userstockpreference',
+            index=models.Index(fields=['user', 'updated_at'], name='preference_by_update'),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app', '0025_change_log_orders'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='changelogentry',
+            name='kind',
+            field=models.CharField(choices=[('portfolio', 'Portfolio'), ('order', 'Order'), ('alert', 'Alert')], max_length=20),
+        ),
+    ]
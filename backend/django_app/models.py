@@ -1,6 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
-from django.db.models.signals import post_save
+from django.utils import timezone
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 
@@ -13,11 +14,12 @@ class Stock(models.Model):
     current_price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     previous_close = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     market_state = models.CharField(max_length=20, null=True, blank=True)
-    last_updated = models.DateTimeField(auto_now=True)
+    last_updated = models.DateTimeField(auto_now=True, db_index=True)  # Saved only when the quote changes
     # Additional metadata from stocks.json
     description = models.TextField(blank=True)
     date_founded = models.DateTimeField(null=True, blank=True)
     zodiac_sign = models.CharField(max_length=50, null=True, blank=True)
+    shares_outstanding = models.BigIntegerField(null=True, blank=True)  # For cap-weighted basket indices
     
     def __str__(self):
         return f"{self.ticker} - {self.company_name}"
@@ -87,8 +89,16 @@ class UserHoldings(models.Model):
     """
     Track user's current balance and overall portfolio
     """
+    LOT_METHODS = [
+        ('fifo', 'First In, First Out'),
+        ('lifo', 'Last In, First Out'),
+        ('highest_cost', 'Highest Cost First'),
+    ]
+    
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='holdings')
     balance = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    lot_method = models.CharField(max_length=20, choices=LOT_METHODS, default='fifo')  # Default tax-lot policy for sells
+    realized_gain_loss = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # Running total over all sells
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -105,7 +115,8 @@ class StockHolding(models.Model):
     Individual stock positions within a user's holdings
     """
     user_holdings = models.ForeignKey(UserHoldings, on_delete=models.CASCADE, related_name='positions')
-    ticker = models.CharField(max_length=10)
+    stock = models.ForeignKey(Stock, on_delete=models.SET_NULL, null=True, blank=True, related_name='positions')
+    ticker = models.CharField(max_length=10, db_index=True)  # Denormalized from stock, kept for compatibility
     quantity = models.DecimalField(max_digits=12, decimal_places=4)  # Supports fractional shares
     total_value = models.DecimalField(max_digits=12, decimal_places=2)  # Total cost basis (purchase value)
     purchase_price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)  # Average price per share
@@ -120,15 +131,70 @@ class StockHolding(models.Model):
         verbose_name = "Stock Holding"
         verbose_name_plural = "Stock Holdings"
         unique_together = ['user_holdings', 'ticker']
+        indexes = [
+            # Positions changed since a sync token
+            models.Index(fields=['user_holdings', 'updated_at'], name='position_by_update'),
+        ]
+
+
+class TaxLot(models.Model):
+    """
+    Shares acquired by a single buy
+    Sells consume open lots under the user's lot method; the remaining lots of a ticker
+    always add up to the StockHolding's quantity and cost basis.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tax_lots')
+    ticker = models.CharField(max_length=10)
+    quantity = models.DecimalField(max_digits=12, decimal_places=4)  # Shares bought
+    remaining_quantity = models.DecimalField(max_digits=12, decimal_places=4)  # Shares not sold yet
+    cost_per_share = models.DecimalField(max_digits=12, decimal_places=4)
+    remaining_cost = models.DecimalField(max_digits=12, decimal_places=2)  # Cost basis of the remaining shares
+    realized_gain_loss = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # From shares sold out of this lot
+    acquired_at = models.DateTimeField()
+    closed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.ticker}: {self.remaining_quantity}/{self.quantity} @ ${self.cost_per_share}"
+    
+    class Meta:
+        verbose_name = "Tax Lot"
+        verbose_name_plural = "Tax Lots"
+        ordering = ['acquired_at', 'id']
+        indexes = [
+            # Open lots in acquisition order (FIFO forwards, LIFO backwards) and by cost
+            models.Index(
+                fields=['user', 'ticker', 'id'],
+                condition=models.Q(remaining_quantity__gt=0),
+                name='taxlot_open_by_age',
+            ),
+            models.Index(
+                fields=['user', 'ticker', '-cost_per_share', 'id'],
+                condition=models.Q(remaining_quantity__gt=0),
+                name='taxlot_open_by_cost',
+            ),
+        ]
+
+
+@receiver(post_save, sender=Stock)
+def link_stock_references(sender, instance, created, **kwargs):
+    """
+    Point positions and preferences recorded before their stock existed at the new Stock
+    """
+    if created:
+        StockHolding.objects.filter(ticker=instance.ticker, stock__isnull=True).update(stock=instance)
+        UserStockPreference.objects.filter(ticker=instance.ticker, stock__isnull=True).update(stock=instance)
 
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     """
-    Automatically create a UserProfile when a new User is created
+    Automatically create a UserProfile and response cache version when a new User is created
     """
     if created:
         UserProfile.objects.create(user=instance)
+        UserDataVersion.objects.create(user=instance)
 
 
 @receiver(post_save, sender=User)
@@ -140,6 +206,82 @@ def save_user_profile(sender, instance, **kwargs):
         instance.profile.save()
 
 
+class DailyBar(models.Model):
+    """
+    Cached daily OHLCV bar for a ticker (split/dividend adjusted)
+    Filled by the nightly market data sync; prices are floats so they load straight into NumPy
+    """
+    ticker = models.CharField(max_length=10)
+    date = models.DateField(db_index=True)
+    open = models.FloatField(null=True, blank=True)
+    high = models.FloatField(null=True, blank=True)
+    low = models.FloatField(null=True, blank=True)
+    close = models.FloatField()
+    volume = models.BigIntegerField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"{self.ticker} {self.date}: {self.close}"
+    
+    class Meta:
+        verbose_name = "Daily Bar"
+        verbose_name_plural = "Daily Bars"
+        ordering = ['ticker', 'date']
+        unique_together = ['ticker', 'date']
+
+
+class RelatedStocks(models.Model):
+    """
+    Top-k most correlated stocks for a ticker, rebuilt nightly from daily returns
+    related is ordered by correlation, highest first
+    """
+    ticker = models.CharField(max_length=10, unique=True)
+    related = models.JSONField(default=list)  # [{ticker, company_name, zodiac_sign, correlation}]
+    observations = models.PositiveIntegerField(default=0)  # Daily returns in the correlation window
+    as_of = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.ticker} - {len(self.related)} related stocks ({self.as_of})"
+    
+    class Meta:
+        verbose_name = "Related Stocks"
+        verbose_name_plural = "Related Stocks"
+
+
+class BasketIndex(models.Model):
+    """
+    Daily index level of a zodiac sign or element basket of stocks, stored as one compact
+    series per basket and weighting. dates and values are parallel lists (ISO dates, level
+    starting at 100); the nightly build appends the newest bars to them.
+    """
+    BASKET_TYPES = [
+        ('sign', 'Zodiac Sign'),
+        ('element', 'Element'),
+    ]
+    
+    WEIGHTINGS = [
+        ('equal', 'Equal Weighted'),
+        ('cap', 'Market Cap Weighted'),
+    ]
+    
+    basket_type = models.CharField(max_length=10, choices=BASKET_TYPES)
+    name = models.CharField(max_length=50)  # Zodiac sign or element
+    weighting = models.CharField(max_length=10, choices=WEIGHTINGS)
+    dates = models.JSONField(default=list)
+    values = models.JSONField(default=list)
+    constituents = models.PositiveIntegerField(default=0)  # Stocks in the basket at the last update
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.name} {self.weighting}-weighted index ({len(self.values)} days)"
+    
+    class Meta:
+        verbose_name = "Basket Index"
+        verbose_name_plural = "Basket Indices"
+        unique_together = ['basket_type', 'name', 'weighting']
+        ordering = ['basket_type', 'name', 'weighting']
+
+
 class ZodiacSignMatching(models.Model):
     """
     Model to store zodiac sign compatibility data for stock matching
@@ -175,9 +317,11 @@ class UserStockPreference(models.Model):
     ]
     
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='stock_preferences')
-    ticker = models.CharField(max_length=10)
+    stock = models.ForeignKey(Stock, on_delete=models.SET_NULL, null=True, blank=True, related_name='preferences')
+    ticker = models.CharField(max_length=10, db_index=True)  # Denormalized from stock, kept for compatibility
     preference_type = models.CharField(max_length=20, choices=PREFERENCE_TYPES)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.user.email} - {self.ticker} ({self.preference_type})"
@@ -187,6 +331,12 @@ class UserStockPreference(models.Model):
         verbose_name_plural = "User Stock Preferences"
         unique_together = ['user', 'ticker']
         ordering = ['-created_at']
+        indexes = [
+            # Watchlist / dislike list of a user, newest first
+            models.Index(fields=['user', 'preference_type', '-created_at'], name='preference_by_type'),
+            # Preferences changed since a delta sync token
+            models.Index(fields=['user', 'updated_at'], name='preference_by_update'),
+        ]
 
 
 class DailyHoroscope(models.Model):
@@ -232,6 +382,206 @@ class DailyHoroscope(models.Model):
         ordering = ['-date', 'zodiac_sign']
 
 
+class CosmicVibeSnapshot(models.Model):
+    """
+    Point in a user's cosmic vibe index history
+    A snapshot is appended only when the index changes (by a trade or by price moves
+    shifting the position weights), so the value at any time is the latest snapshot before it
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='cosmic_vibe_snapshots')
+    cosmic_vibe_index = models.IntegerField()
+    alignment_score = models.IntegerField()
+    elements_held = models.PositiveSmallIntegerField(default=0)
+    recorded_at = models.DateTimeField(default=timezone.now)
+    
+    def __str__(self):
+        return f"{self.user.email} - Cosmic vibe {self.cosmic_vibe_index} at {self.recorded_at}"
+    
+    class Meta:
+        verbose_name = "Cosmic Vibe Snapshot"
+        verbose_name_plural = "Cosmic Vibe Snapshots"
+        indexes = [
+            models.Index(fields=['user', 'recorded_at']),
+        ]
+
+
+class PortfolioValuation(models.Model):
+    """
+    Latest valuation and aggregates of a user's whole portfolio
+    Updated incrementally inside every trade, recomputed for every user at once by the
+    valuation engine after each price batch, and used to rank the leaderboard
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='portfolio_valuation')
+    zodiac_sign = models.CharField(max_length=50, null=True, blank=True)
+    element = models.CharField(max_length=50, null=True, blank=True)
+    cash_balance = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    stocks_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    total_value = models.DecimalField(max_digits=12, decimal_places=2, default=0, db_index=True)
+    cost_basis = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    gain_loss = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    gain_loss_percent = models.DecimalField(max_digits=12, decimal_places=2, default=0, db_index=True)
+    realized_gain_loss = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    alignment_score = models.IntegerField(default=50, db_index=True)
+    cosmic_vibe_index = models.IntegerField(default=50)
+    # Materialized aggregates so the portfolio summary headline is a single row read
+    fire_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    earth_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    air_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    water_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    alignment_weighted_value = models.DecimalField(max_digits=16, decimal_places=2, default=0)  # Sum of value x alignment score
+    position_count = models.PositiveIntegerField(default=0)
+    same_sign_count = models.PositiveIntegerField(default=0)
+    positive_count = models.PositiveIntegerField(default=0)
+    neutral_count = models.PositiveIntegerField(default=0)
+    negative_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.email} - Valuation (${self.total_value})"
+
+    class Meta:
+        verbose_name = "Portfolio Valuation"
+        verbose_name_plural = "Portfolio Valuations"
+        indexes = [
+            models.Index(fields=['zodiac_sign', 'total_value']),
+            models.Index(fields=['element', 'total_value']),
+        ]
+
+
+class StockOrder(models.Model):
+    """
+    Resting limit or stop order, executed at market once the price crosses its trigger
+    Buy limit / sell stop fire at or below the trigger; sell limit / buy stop fire at or above it
+    """
+    SIDES = [
+        ('buy', 'Buy'),
+        ('sell', 'Sell'),
+    ]
+    
+    ORDER_TYPES = [
+        ('limit', 'Limit'),
+        ('stop', 'Stop'),
+    ]
+    
+    STATUSES = [
+        ('open', 'Open'),
+        ('filled', 'Filled'),
+        ('cancelled', 'Cancelled'),
+        ('rejected', 'Rejected'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='stock_orders')
+    ticker = models.CharField(max_length=10)
+    side = models.CharField(max_length=10, choices=SIDES)
+    order_type = models.CharField(max_length=10, choices=ORDER_TYPES)
+    trigger_price = models.DecimalField(max_digits=12, decimal_places=2)
+    quantity = models.DecimalField(max_digits=12, decimal_places=4)  # Supports fractional shares
+    status = models.CharField(max_length=20, choices=STATUSES, default='open')
+    status_detail = models.CharField(max_length=255, blank=True)  # Reason for a rejection
+    fill_price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    filled_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.side} {self.order_type} {self.quantity} {self.ticker} @ ${self.trigger_price} ({self.status})"
+    
+    class Meta:
+        verbose_name = "Stock Order"
+        verbose_name_plural = "Stock Orders"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'id']),
+            models.Index(fields=['user', 'status']),
+        ]
+
+
+class PriceAlert(models.Model):
+    """
+    One-shot price alert for a stock
+    above/below compare the price with threshold; percent_change fires when the price has
+    moved at least threshold percent (either direction) from previous_close
+    """
+    ALERT_TYPES = [
+        ('above', 'Price Above'),
+        ('below', 'Price Below'),
+        ('percent_change', 'Percent Change'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='price_alerts')
+    ticker = models.CharField(max_length=10)
+    alert_type = models.CharField(max_length=20, choices=ALERT_TYPES)
+    threshold = models.DecimalField(max_digits=12, decimal_places=2)  # Price, or percent for percent_change
+    is_active = models.BooleanField(default=True)
+    triggered_price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    triggered_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.ticker} {self.alert_type} {self.threshold}"
+    
+    class Meta:
+        verbose_name = "Price Alert"
+        verbose_name_plural = "Price Alerts"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_active', 'id']),
+        ]
+
+
+class AlertNotification(models.Model):
+    """
+    Notification delivered to a user when one of their price alerts fires
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='alert_notifications')
+    alert = models.ForeignKey(PriceAlert, on_delete=models.CASCADE, related_name='notifications')
+    message = models.CharField(max_length=255)
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.message}"
+    
+    class Meta:
+        verbose_name = "Alert Notification"
+        verbose_name_plural = "Alert Notifications"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'is_read']),
+        ]
+
+
+class BacktestJob(models.Model):
+    """
+    Queued "what if I had bought this basket" simulation and its result
+    """
+    STATUSES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='backtest_jobs')
+    status = models.CharField(max_length=20, choices=STATUSES, default='queued')
+    params = models.JSONField()  # tickers, weights, rebalance, horizon, initial_value
+    result = models.JSONField(null=True, blank=True)
+    error = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"{self.user.email} - Backtest {self.pk} ({self.status})"
+    
+    class Meta:
+        verbose_name = "Backtest Job"
+        verbose_name_plural = "Backtest Jobs"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+        ]
+
+
 # Utility function to get element from zodiac sign
 def get_element_from_zodiac(zodiac_sign):
     """
@@ -251,4 +601,172 @@ def get_element_from_zodiac(zodiac_sign):
         'Scorpio': 'Water',
         'Pisces': 'Water',
     }
-    return ZODIAC_ELEMENTS.get(zodiac_sign, 'Unknown')
\ No newline at end of file
+    return ZODIAC_ELEMENTS.get(zodiac_sign, 'Unknown')
+
+
+class UserDataVersion(models.Model):
+    """
+    Version of a user's cached API responses (see utils/response_cache.py)
+    Bumped in the same transaction as every trade and preference change, and written
+    nowhere else, so a response cached under a version can never outlive its data
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='data_version')
+    version = models.PositiveBigIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.user.email} - Data version {self.version}"
+    
+    class Meta:
+        verbose_name = "User Data Version"
+        verbose_name_plural = "User Data Versions"
+
+
+class PriceEpoch(models.Model):
+    """
+    Global counter bumped once per price update batch (a single row)
+    Cached responses that include prices are keyed on it as well as the user's data version
+    """
+    epoch = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Price epoch {self.epoch}"
+    
+    class Meta:
+        verbose_name = "Price Epoch"
+        verbose_name_plural = "Price Epochs"
+
+
+class MarketSnapshot(models.Model):
+    """
+    Latest market aggregates: top movers and per-sign and per-element averages (a single row)
+    Maintained incrementally by each price update batch (see utils/market_aggregates.py),
+    so endpoints return it with a single row read
+    """
+    data = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Market snapshot at {self.updated_at}"
+    
+    class Meta:
+        verbose_name = "Market Snapshot"
+        verbose_name_plural = "Market Snapshots"
+
+
+class SyncTombstone(models.Model):
+    """
+    Deleted stock, position or preference, reported by the delta-sync endpoint (see utils/delta_sync.py)
+    Written by post_delete signals and pruned nightly; older sync tokens get a full resync
+    """
+    MODELS = [
+        ('stock', 'Stock'),
+        ('position', 'Position'),
+        ('preference', 'Preference'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='sync_tombstones')  # None for stocks
+    model = models.CharField(max_length=20, choices=MODELS)
+    ticker = models.CharField(max_length=10)
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    def __str__(self):
+        return f"{self.model} {self.ticker} deleted at {self.deleted_at}"
+    
+    class Meta:
+        verbose_name = "Sync Tombstone"
+        verbose_name_plural = "Sync Tombstones"
+        indexes = [
+            models.Index(fields=['user', 'deleted_at']),
+        ]
+
+
+def deleted_with_account(origin):
+    """
+    Whether a delete cascades from a user or their holdings (nothing left to sync)
+    """
+    model = origin.model if isinstance(origin, models.QuerySet) else type(origin)
+    return model in (User, UserHoldings)
+
+
+@receiver(post_delete, sender=Stock)
+def record_stock_tombstone(sender, instance, **kwargs):
+    """
+    Record a deleted stock for delta sync
+    """
+    SyncTombstone.objects.create(model='stock', ticker=instance.ticker)
+
+
+@receiver(post_delete, sender=StockHolding)
+def record_position_tombstone(sender, instance, origin=None, **kwargs):
+    """
+    Record a closed position for delta sync
+    """
+    if not deleted_with_account(origin):
+        SyncTombstone.objects.create(user_id=instance.user_holdings.user_id, model='position', ticker=instance.ticker)
+
+
+@receiver(post_delete, sender=UserStockPreference)
+def record_preference_tombstone(sender, instance, origin=None, **kwargs):
+    """
+    Record a removed watchlist or dislike list entry for delta sync
+    """
+    if not deleted_with_account(origin):
+        SyncTombstone.objects.create(user_id=instance.user_id, model='preference', ticker=instance.ticker)
+
+
+class ChangeLogEntry(models.Model):
+    """
+    Change the in-memory engines must apply (see utils/change_log.py)
+    Written in the same transaction as the change itself and pruned nightly; object_id is
+    the id of the changed user (portfolio), order or alert
+    """
+    KINDS = [
+        ('portfolio', 'Portfolio'),
+        ('order', 'Order'),
+        ('alert', 'Alert'),
+    ]
+    
+    kind = models.CharField(max_length=20, choices=KINDS)
+    object_id = models.PositiveBigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    def __str__(self):
+        return f"{self.kind} {self.object_id} changed at {self.created_at}"
+    
+    class Meta:
+        verbose_name = "Change Log Entry"
+        verbose_name_plural = "Change Log Entries"
+        indexes = [
+            models.Index(fields=['kind', 'created_at'], name='change_by_kind'),
+        ]
+
+
+@receiver(post_save, sender=UserHoldings)
+@receiver(post_save, sender=UserProfile)
+def record_portfolio_change(sender, instance, **kwargs):
+    """
+    Record a changed balance, position set or zodiac sign for the valuation engine
+    (every trade saves the user's UserHoldings)
+    """
+    ChangeLogEntry.objects.create(kind='portfolio', object_id=instance.user_id)
+
+
+@receiver(post_save, sender=StockOrder)
+@receiver(post_delete, sender=StockOrder)
+def record_order_change(sender, instance, **kwargs):
+    """
+    Record a placed, filled, rejected or deleted order for the order book
+    (queryset updates, like cancelling, record their own entries)
+    """
+    ChangeLogEntry.objects.create(kind='order', object_id=instance.pk)
+
+
+@receiver(post_save, sender=PriceAlert)
+@receiver(post_delete, sender=PriceAlert)
+def record_alert_change(sender, instance, **kwargs):
+    """
+    Record a created or deleted alert for the alert index
+    (alerts the index fires are deactivated by a queryset update and need no entry)
+    """
+    ChangeLogEntry.objects.create(kind='alert', object_id=instance.pk)
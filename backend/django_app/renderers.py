@@ -0,0 +1,74 @@
+"""
+Fast JSON renderer and parser for the ZEN Trading API
+orjson encodes and decodes in native code and handles datetime, date, UUID and NumPy arrays and
+scalars itself; whatever it does not know (Decimal, timedelta, lazy strings, querysets, ...) is
+passed to DRF's encoder, so responses match JSONRenderer's.
+
+MessagePackRenderer adds a binary format (Accept: application/msgpack) for the columnar history
+endpoints.
+"""
+import msgpack
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BaseRenderer, BrowsableAPIRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_encoder = JSONEncoder()
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson (indented output, e.g. ?indent=, still uses the stdlib)
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS)
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser backed by orjson (UTF-8 bodies; other charsets use the stdlib)
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+def _msgpack_default(obj):
+    # NumPy arrays pack as lists of native numbers, the rest as DRF's JSON encoder converts it
+    if hasattr(obj, 'dtype') and hasattr(obj, 'tolist'):
+        return obj.tolist()
+    return _encoder.default(obj)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack renderer (binary; Accept: application/msgpack or ?format=msgpack)
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_msgpack_default, use_bin_type=True)
+
+
+# Renderers of the history endpoints: the API defaults, plus MessagePack
+HISTORY_RENDERER_CLASSES = [FastJSONRenderer, BrowsableAPIRenderer, MessagePackRenderer]
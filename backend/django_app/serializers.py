@@ -1,12 +1,18 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
-from .models import Stock, UserProfile, UserHoldings, StockHolding, ZodiacSignMatching, UserStockPreference, DailyHoroscope
+from django.db import transaction
+from decimal import Decimal
+from .models import Stock, UserProfile, UserHoldings, StockHolding, ZodiacSignMatching, UserStockPreference, DailyHoroscope, PortfolioValuation, StockOrder, PriceAlert, AlertNotification, TaxLot, RelatedStocks, BacktestJob, BasketIndex
+from .utils.basket_indices import get_change_percent, slice_series
+from .utils.response_cache import bump_data_version
+from .utils.pagination import SparseFieldsMixin
+from .utils.watchlist import stock_compatibility
 
 User = get_user_model()
 
 
-class StockSerializer(serializers.ModelSerializer):
+class StockSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for Stock model - real-time market data
     """
@@ -27,6 +33,16 @@ class StockSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'last_updated']
 
 
+class StockQuoteSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a stock's quote only (delta sync, without the descriptive fields)
+    """
+    class Meta:
+        model = Stock
+        fields = ['id', 'ticker', 'current_price', 'previous_close', 'market_state', 'last_updated']
+        read_only_fields = fields
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
     """
     Serializer for UserProfile model
@@ -47,7 +63,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for User model - used for retrieving user data
     """
@@ -167,21 +183,24 @@ class OnboardingSerializer(serializers.Serializer):
         """
         Save validated onboarding data to the user's profile and create holdings
         """
-        profile, created = UserProfile.objects.get_or_create(user=user)
-        
-        profile.date_of_birth = self.validated_data['date_of_birth']
-        profile.zodiac_sign = self.validated_data['zodiac_sign']
-        profile.zodiac_symbol = self.validated_data.get('zodiac_symbol', '')
-        profile.zodiac_element = self.validated_data.get('zodiac_element', '')
-        profile.investing_style = self.validated_data['investing_style']
-        profile.starting_balance = self.validated_data['starting_balance']
-        profile.onboarding_completed = True
-        profile.save()
-        
-        # Create or update UserHoldings with the starting balance
-        holdings, created = UserHoldings.objects.get_or_create(user=user)
-        holdings.balance = self.validated_data['starting_balance']
-        holdings.save()
+        with transaction.atomic():
+            profile, created = UserProfile.objects.get_or_create(user=user)
+            
+            profile.date_of_birth = self.validated_data['date_of_birth']
+            profile.zodiac_sign = self.validated_data['zodiac_sign']
+            profile.zodiac_symbol = self.validated_data.get('zodiac_symbol', '')
+            profile.zodiac_element = self.validated_data.get('zodiac_element', '')
+            profile.investing_style = self.validated_data['investing_style']
+            profile.starting_balance = self.validated_data['starting_balance']
+            profile.onboarding_completed = True
+            profile.save()
+            
+            # Create or update UserHoldings with the starting balance
+            holdings, created = UserHoldings.objects.get_or_create(user=user)
+            holdings.balance = self.validated_data['starting_balance']
+            holdings.save()
+            
+            bump_data_version(user)
         
         return profile
 
@@ -204,11 +223,11 @@ class UserHoldingsSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = UserHoldings
-        fields = ['id', 'balance', 'positions', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        fields = ['id', 'balance', 'lot_method', 'realized_gain_loss', 'positions', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'realized_gain_loss', 'created_at', 'updated_at']
 
 
-class ZodiacSignMatchingSerializer(serializers.ModelSerializer):
+class ZodiacSignMatchingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for zodiac sign matching compatibility
     """
@@ -244,7 +263,7 @@ class MatchedStockSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'last_updated']
 
 
-class UserStockPreferenceSerializer(serializers.ModelSerializer):
+class UserStockPreferenceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for user stock preferences (watchlist and dislike list)
     """
@@ -254,6 +273,29 @@ class UserStockPreferenceSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
+class WatchlistEntrySerializer(UserStockPreferenceSerializer):
+    """
+    Serializer for watchlist entries with their stock's quote and zodiac compatibility embedded
+    Expects a queryset from utils.watchlist.with_quotes; pass the user's sign as context['user_sign'].
+    """
+    quote = serializers.SerializerMethodField()
+
+    class Meta(UserStockPreferenceSerializer.Meta):
+        fields = UserStockPreferenceSerializer.Meta.fields + ['quote']
+
+    def get_quote(self, preference):
+        stock = preference.stock
+        if stock is None:
+            return None
+        quote = StockQuoteSerializer(stock).data
+        quote['company_name'] = stock.company_name
+        quote['zodiac_sign'] = stock.zodiac_sign
+        user_sign = self.context.get('user_sign')
+        if user_sign:
+            quote.update(stock_compatibility(user_sign, stock.zodiac_sign, preference.stock_match_type))
+        return quote
+
+
 class PortfolioHoldingSerializer(serializers.Serializer):
     """
     Serializer for portfolio holdings with alignment information
@@ -284,13 +326,70 @@ class PortfolioSummarySerializer(serializers.Serializer):
     total_cost_basis = serializers.DecimalField(max_digits=12, decimal_places=2)
     total_gain_loss = serializers.DecimalField(max_digits=12, decimal_places=2)
     total_gain_loss_percent = serializers.DecimalField(max_digits=12, decimal_places=2)
+    realized_gain_loss = serializers.DecimalField(max_digits=12, decimal_places=2, required=False)
     overall_alignment_score = serializers.IntegerField()
     cosmic_vibe_index = serializers.IntegerField()
     element_distribution = serializers.DictField()
     alignment_breakdown = serializers.DictField()
+    position_count = serializers.IntegerField(required=False)
     holdings = PortfolioHoldingSerializer(many=True)
 
 
+class PositionRiskSerializer(serializers.Serializer):
+    """
+    Serializer for the risk metrics of a single position
+    """
+    ticker = serializers.CharField()
+    weight = serializers.FloatField()
+    volatility = serializers.FloatField()
+    beta = serializers.FloatField(allow_null=True)
+    risk_contribution = serializers.FloatField()
+    risk_contribution_percent = serializers.FloatField()
+
+
+class PortfolioRiskSerializer(serializers.Serializer):
+    """
+    Serializer for portfolio risk analytics
+    Ratios and returns are fractions (0.12 = 12%), annualized where applicable
+    """
+    period = serializers.CharField()
+    as_of = serializers.DateField()
+    start_date = serializers.DateField(allow_null=True)
+    benchmark = serializers.CharField()
+    risk_free_rate = serializers.FloatField()
+    observations = serializers.IntegerField()
+    annual_return = serializers.FloatField(allow_null=True)
+    volatility = serializers.FloatField(allow_null=True)
+    beta = serializers.FloatField(allow_null=True)
+    max_drawdown = serializers.FloatField(allow_null=True)
+    sharpe_ratio = serializers.FloatField(allow_null=True)
+    sortino_ratio = serializers.FloatField(allow_null=True)
+    positions = PositionRiskSerializer(many=True)
+    missing_tickers = serializers.ListField(child=serializers.CharField())
+
+
+class PortfolioProjectionSerializer(serializers.Serializer):
+    """
+    Serializer for a Monte Carlo portfolio projection
+    bands maps each percentile (p5 ... p95) to projected values aligned with days/dates
+    """
+    horizon = serializers.CharField()
+    paths = serializers.IntegerField()
+    as_of = serializers.DateField()
+    history_start = serializers.DateField()
+    observations = serializers.IntegerField()
+    starting_value = serializers.FloatField()
+    percentiles = serializers.ListField(child=serializers.IntegerField())
+    days = serializers.ListField(child=serializers.IntegerField())
+    dates = serializers.ListField(child=serializers.CharField())
+    bands = serializers.DictField(child=serializers.ListField(child=serializers.FloatField()))
+    expected_value = serializers.FloatField()
+    median_value = serializers.FloatField()
+    value_at_risk_95 = serializers.FloatField()
+    probability_of_loss = serializers.FloatField()
+    missing_tickers = serializers.ListField(child=serializers.CharField())
+
+
 class DailyHoroscopeSerializer(serializers.ModelSerializer):
     """
     Serializer for daily horoscope
@@ -298,4 +397,264 @@ class DailyHoroscopeSerializer(serializers.ModelSerializer):
     class Meta:
         model = DailyHoroscope
         fields = ['id', 'zodiac_sign', 'investing_style', 'date', 'horoscope_text', 'created_at']
-        read_only_fields = ['id', 'created_at']
\ No newline at end of file
+        read_only_fields = ['id', 'created_at']
+
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    """
+    Serializer for a ranked leaderboard entry
+    """
+    username = serializers.CharField(source='user.username', read_only=True)
+    rank = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        model = PortfolioValuation
+        fields = [
+            'rank',
+            'username',
+            'zodiac_sign',
+            'element',
+            'total_value',
+            'gain_loss',
+            'gain_loss_percent',
+            'alignment_score',
+            'cosmic_vibe_index',
+            'updated_at'
+        ]
+        read_only_fields = fields
+
+
+class StockOrderSerializer(serializers.ModelSerializer):
+    """
+    Serializer for resting limit and stop orders
+    """
+    class Meta:
+        model = StockOrder
+        fields = [
+            'id',
+            'ticker',
+            'side',
+            'order_type',
+            'trigger_price',
+            'quantity',
+            'status',
+            'status_detail',
+            'fill_price',
+            'filled_at',
+            'created_at',
+            'updated_at'
+        ]
+        read_only_fields = ['id', 'status', 'status_detail', 'fill_price', 'filled_at', 'created_at', 'updated_at']
+    
+    def validate_ticker(self, value):
+        """Validate that the ticker exists"""
+        value = value.upper().strip()
+        if not Stock.objects.filter(ticker=value).exists():
+            raise serializers.ValidationError(f"Stock with ticker {value} does not exist")
+        return value
+    
+    def validate_quantity(self, value):
+        """Validate that quantity is positive"""
+        if value <= 0:
+            raise serializers.ValidationError("Quantity must be greater than 0")
+        return value
+    
+    def validate_trigger_price(self, value):
+        """Validate that trigger price is positive"""
+        if value <= 0:
+            raise serializers.ValidationError("Trigger price must be greater than 0")
+        return value
+
+
+class PriceAlertSerializer(serializers.ModelSerializer):
+    """
+    Serializer for price alerts
+    """
+    class Meta:
+        model = PriceAlert
+        fields = [
+            'id',
+            'ticker',
+            'alert_type',
+            'threshold',
+            'is_active',
+            'triggered_price',
+            'triggered_at',
+            'created_at'
+        ]
+        read_only_fields = ['id', 'is_active', 'triggered_price', 'triggered_at', 'created_at']
+    
+    def validate_ticker(self, value):
+        """Validate that the ticker exists"""
+        value = value.upper().strip()
+        if not Stock.objects.filter(ticker=value).exists():
+            raise serializers.ValidationError(f"Stock with ticker {value} does not exist")
+        return value
+    
+    def validate_threshold(self, value):
+        """Validate that threshold is positive"""
+        if value <= 0:
+            raise serializers.ValidationError("Threshold must be greater than 0")
+        return value
+
+
+class AlertNotificationSerializer(serializers.ModelSerializer):
+    """
+    Serializer for notifications created by fired price alerts
+    """
+    ticker = serializers.CharField(source='alert.ticker', read_only=True)
+    
+    class Meta:
+        model = AlertNotification
+        fields = ['id', 'alert', 'ticker', 'message', 'is_read', 'created_at']
+        read_only_fields = fields
+
+
+class TaxLotSerializer(serializers.ModelSerializer):
+    """
+    Serializer for tax lots
+    Unrealized gain/loss uses the prices passed in the 'prices' context ({ticker: price})
+    """
+    unrealized_gain_loss = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = TaxLot
+        fields = [
+            'id',
+            'ticker',
+            'quantity',
+            'remaining_quantity',
+            'cost_per_share',
+            'remaining_cost',
+            'realized_gain_loss',
+            'unrealized_gain_loss',
+            'acquired_at',
+            'closed_at'
+        ]
+        read_only_fields = fields
+    
+    def get_unrealized_gain_loss(self, obj):
+        """Get the gain/loss on the lot's remaining shares at the current price"""
+        price = self.context.get('prices', {}).get(obj.ticker)
+        if price is None or obj.remaining_quantity <= 0:
+            return None
+        return str((obj.remaining_quantity * price - obj.remaining_cost).quantize(Decimal('0.01')))
+
+
+class RelatedStocksSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a stock's most correlated stocks
+    """
+    class Meta:
+        model = RelatedStocks
+        fields = ['ticker', 'related', 'observations', 'as_of', 'updated_at']
+        read_only_fields = fields
+
+
+class BasketIndexSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a zodiac sign or element basket index summary
+    """
+    as_of = serializers.SerializerMethodField()
+    level = serializers.SerializerMethodField()
+    day_change_percent = serializers.SerializerMethodField()
+    year_change_percent = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = BasketIndex
+        fields = [
+            'basket_type', 'name', 'weighting', 'constituents', 'as_of', 'level',
+            'day_change_percent', 'year_change_percent', 'updated_at'
+        ]
+        read_only_fields = fields
+    
+    def get_as_of(self, obj):
+        """Get the date of the latest index level"""
+        return obj.dates[-1] if obj.dates else None
+    
+    def get_level(self, obj):
+        """Get the latest index level"""
+        return obj.values[-1] if obj.values else None
+    
+    def get_day_change_percent(self, obj):
+        """Get the change since the previous trading day"""
+        return get_change_percent(obj, 1)
+    
+    def get_year_change_percent(self, obj):
+        """Get the change over the last year"""
+        return get_change_percent(obj, 365)
+
+
+class BasketIndexSeriesSerializer(BasketIndexSerializer):
+    """
+    Serializer for a basket index summary plus its series over a chart period
+    dates and values are parallel lists; pass the period in the serializer context
+    """
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['period'] = self.context['period']
+        data['dates'], data['values'] = slice_series(instance, self.context['period'])
+        return data
+
+
+class BacktestRequestSerializer(serializers.Serializer):
+    """
+    Serializer for validating a backtest request
+    Either tickers (with optional weights, equal-weighted by default) or use_holdings
+    """
+    REBALANCE_CHOICES = ['none', 'monthly', 'quarterly', 'yearly']
+    HORIZON_CHOICES = ['1Y', '3Y', '5Y', '10Y']
+    
+    tickers = serializers.ListField(child=serializers.CharField(max_length=10), required=False, max_length=100)
+    weights = serializers.ListField(child=serializers.FloatField(min_value=0), required=False)
+    use_holdings = serializers.BooleanField(default=False)
+    rebalance = serializers.ChoiceField(choices=REBALANCE_CHOICES, default='none')
+    horizon = serializers.ChoiceField(choices=HORIZON_CHOICES, default='1Y')
+    initial_value = serializers.DecimalField(max_digits=12, decimal_places=2, default=10000, min_value=1)
+    
+    def validate(self, data):
+        """Validate the basket unless the user's holdings are used"""
+        if data['use_holdings']:
+            return data
+        
+        tickers = [ticker.upper().strip() for ticker in data.get('tickers') or []]
+        if not tickers:
+            raise serializers.ValidationError({'tickers': 'Provide tickers or set use_holdings'})
+        if len(set(tickers)) != len(tickers):
+            raise serializers.ValidationError({'tickers': 'Tickers must be unique'})
+        
+        known = set(Stock.objects.filter(ticker__in=tickers).values_list('ticker', flat=True))
+        unknown = [ticker for ticker in tickers if ticker not in known]
+        if unknown:
+            raise serializers.ValidationError({'tickers': f'Unknown tickers: {", ".join(unknown)}'})
+        
+        weights = data.get('weights')
+        if weights is None:
+            weights = [1.0] * len(tickers)
+        elif len(weights) != len(tickers):
+            raise serializers.ValidationError({'weights': 'Provide one weight per ticker'})
+        elif sum(weights) <= 0:
+            raise serializers.ValidationError({'weights': 'Weights must add up to more than 0'})
+        
+        data['tickers'] = tickers
+        data['weights'] = weights
+        return data
+
+
+class BacktestJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer for backtest jobs (without the result series)
+    """
+    class Meta:
+        model = BacktestJob
+        fields = ['id', 'status', 'params', 'error', 'created_at', 'completed_at']
+        read_only_fields = fields
+
+
+class BacktestJobDetailSerializer(BacktestJobSerializer):
+    """
+    Serializer for a backtest job including its result
+    """
+    class Meta(BacktestJobSerializer.Meta):
+        fields = BacktestJobSerializer.Meta.fields + ['result']
+        read_only_fields = fields
@@ -63,6 +63,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "django_app.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -160,6 +161,16 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
+    # orjson-backed JSON
+    "DEFAULT_RENDERER_CLASSES": (
+        "django_app.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "django_app.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 
 SIMPLE_JWT = {
@@ -235,4 +246,25 @@ Q_CLUSTER = {
     'bulk': 10,
     'orm': 'default',  # Use Django ORM as broker (no Redis needed)
     'catch_up': False,  # Don't execute missed schedules
+    'daemonize_workers': False,  # Let tasks hand heavy analytics to the compute process pool
 }
+
+# Analytics
+# Processes in the shared pool that runs heavy NumPy computations off the request threads
+COMPUTE_POOL_WORKERS = int(os.getenv("COMPUTE_POOL_WORKERS", "2"))
+# Annual risk-free rate used for Sharpe/Sortino ratios
+RISK_FREE_RATE = float(os.getenv("RISK_FREE_RATE", "0.04"))
+
+# Response compression (django_app.middleware.CompressionMiddleware)
+# Smallest body worth compressing, in bytes
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# Content types that are compressed (MessagePack is already compact binary)
+COMPRESSION_CONTENT_TYPES = [
+    "application/json",
+    "application/x-ndjson",
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/javascript",
+    "application/javascript",
+]
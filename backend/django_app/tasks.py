@@ -145,26 +145,248 @@ def update_stock_prices():
     stocks = Stock.objects.all()
     updated_count = 0
     error_count = 0
+    changed_prices = {}  # ticker -> new price, for tickers whose price moved
     
     for stock in stocks:
         try:
             # Fetch current price data from yfinance
             price_data = get_ticker_price(stock.ticker)
             
-            # Update stock model with new data
-            stock.current_price = price_data.get('current_price')
-            stock.previous_close = price_data.get('previous_close')
-            stock.market_state = price_data.get('market_state')
-            stock.save()
+            new_price = price_data.get('current_price')
+            if new_price is not None and (
+                stock.current_price is None or abs(float(stock.current_price) - float(new_price)) >= 0.005
+            ):
+                changed_prices[stock.ticker] = float(new_price)
             
-            updated_count += 1
-            logger.debug(f"Updated {stock.ticker}: ${stock.current_price}")
+            # Update stock model with new data, only when the quote moved so last_updated
+            # (which delta sync and ETags read) means "quote changed"
+            if quote_changed(stock, price_data):
+                stock.current_price = price_data.get('current_price')
+                stock.previous_close = price_data.get('previous_close')
+                stock.market_state = price_data.get('market_state')
+                stock.save()
+                updated_count += 1
+                logger.debug(f"Updated {stock.ticker}: ${stock.current_price}")
             
         except Exception as e:
             error_count += 1
             logger.error(f"Error updating {stock.ticker}: {str(e)}")
     
     logger.info(f"Price update complete. Updated: {updated_count}, Errors: {error_count}")
+    
+    # Top movers and per-sign/element averages, updated incrementally from this batch
+    publish_market_aggregates(stocks)
+    
+    # Fill resting orders first so the valuations below include the fills
+    execute_triggered_orders(changed_prices)
+    evaluate_price_alerts(changed_prices)
+    
+    # Priced responses only go stale when a quote actually changed
+    if updated_count > 0:
+        refresh_portfolio_valuations()
+        invalidate_price_responses()
+
+
+def quote_changed(stock, price_data):
+    """
+    Whether a fetched quote differs from the stock's saved one (prices to the cent)
+    """
+    for field in ('current_price', 'previous_close'):
+        old, new = getattr(stock, field), price_data.get(field)
+        if (old is None) != (new is None):
+            return True
+        if new is not None and abs(float(old) - float(new)) >= 0.005:
+            return True
+    return price_data.get('market_state') != stock.market_state
+
+
+def publish_market_aggregates(stocks):
+    """
+    Apply the batch to the live market aggregates and publish the snapshot endpoints read.
+    Stocks that failed to update keep their last saved prices.
+    """
+    from django_app.utils.market_aggregates import update_market_aggregates
+    
+    try:
+        update_market_aggregates(
+            (stock.ticker, stock.current_price, stock.previous_close, stock.zodiac_sign) for stock in stocks
+        )
+    except Exception as e:
+        logger.error(f"Error updating market aggregates: {str(e)}")
+
+
+def execute_triggered_orders(changed_prices):
+    """
+    Execute resting limit and stop orders triggered by the latest price batch.
+    Also picks up orders placed since the last batch and checks them against current prices.
+    """
+    from django_app.utils.order_engine import execute_triggered_orders as run_orders
+    
+    try:
+        run_orders(changed_prices)
+    except Exception as e:
+        logger.error(f"Error executing triggered orders: {str(e)}")
+
+
+def evaluate_price_alerts(changed_prices):
+    """
+    Fire price alerts crossed by the latest price batch.
+    Notifications are queued as a separate task so delivery never slows the price update.
+    """
+    from django_q.tasks import async_task
+    from django_app.utils.alert_engine import evaluate_price_alerts as run_alerts
+    
+    try:
+        fired_ids = run_alerts(changed_prices)
+        if fired_ids:
+            async_task('django_app.tasks.deliver_alert_notifications', fired_ids)
+    except Exception as e:
+        logger.error(f"Error evaluating price alerts: {str(e)}")
+
+
+def deliver_alert_notifications(alert_ids):
+    """
+    Create the in-app notifications for a batch of fired price alerts.
+    """
+    from django_app.utils.alert_engine import create_alert_notifications
+    
+    try:
+        created = create_alert_notifications(alert_ids)
+        logger.info(f"Delivered {created} alert notification(s)")
+    except Exception as e:
+        logger.error(f"Error delivering alert notifications: {str(e)}")
+
+
+def refresh_portfolio_valuations():
+    """
+    Revalue every user's portfolio against the latest prices.
+    Runs after each price update batch so the leaderboard stays current.
+    """
+    from django_app.utils.valuation_engine import refresh_portfolio_valuations as run_valuation
+    
+    try:
+        run_valuation()
+    except Exception as e:
+        logger.error(f"Error refreshing portfolio valuations: {str(e)}")
+
+
+def invalidate_price_responses():
+    """
+    Bump the price epoch once the whole batch (prices, fills, valuations) is written,
+    so cached responses that include prices are rebuilt on their next request
+    """
+    from django_app.utils.response_cache import bump_price_epoch
+    
+    try:
+        bump_price_epoch()
+    except Exception as e:
+        logger.error(f"Error bumping price epoch: {str(e)}")
+
+
+def sync_daily_bars():
+    """
+    Append the latest daily bars for every stock and the benchmark to the bar cache.
+    Runs nightly after the US close; analytics read their history from the cache.
+    """
+    from django_app.utils.market_data import sync_daily_bars as run_sync
+    
+    prune_sync_tombstones()
+    prune_change_log()
+    
+    try:
+        run_sync()
+    except Exception as e:
+        logger.error(f"Error syncing daily bars: {str(e)}")
+        return
+    
+    build_related_stocks()
+    update_basket_indices()
+
+
+def prune_sync_tombstones():
+    """
+    Delete the delta-sync tombstones older than any token still served incrementally.
+    Runs with the nightly bar sync.
+    """
+    from django.utils import timezone
+    from django_app.models import SyncTombstone
+    from django_app.utils.delta_sync import SYNC_RETENTION
+    
+    try:
+        deleted_count, _ = SyncTombstone.objects.filter(deleted_at__lt=timezone.now() - SYNC_RETENTION).delete()
+        if deleted_count > 0:
+            logger.info(f"Deleted {deleted_count} sync tombstone(s)")
+    except Exception as e:
+        logger.error(f"Error pruning sync tombstones: {str(e)}")
+
+
+def prune_change_log():
+    """
+    Delete the change log entries every in-memory engine has read long ago.
+    Runs with the nightly bar sync.
+    """
+    from django.utils import timezone
+    from django_app.models import ChangeLogEntry
+    from django_app.utils.change_log import CHANGE_LOG_RETENTION
+    
+    try:
+        deleted_count, _ = ChangeLogEntry.objects.filter(created_at__lt=timezone.now() - CHANGE_LOG_RETENTION).delete()
+        if deleted_count > 0:
+            logger.info(f"Deleted {deleted_count} change log entries")
+    except Exception as e:
+        logger.error(f"Error pruning the change log: {str(e)}")
+
+
+def build_related_stocks():
+    """
+    Rebuild the top-k correlated stocks of every ticker from the freshly synced bars.
+    """
+    from django_app.utils.related_stocks import build_related_stocks as run_build
+    
+    try:
+        run_build()
+    except Exception as e:
+        logger.error(f"Error building related stocks: {str(e)}")
+
+
+def update_basket_indices():
+    """
+    Fill in missing share counts, then append the freshly synced bars to the zodiac sign
+    and element basket indices.
+    """
+    from django_app.utils.market_data import sync_shares_outstanding
+    from django_app.utils.basket_indices import update_basket_indices as run_update
+    
+    try:
+        sync_shares_outstanding()
+        run_update()
+    except Exception as e:
+        logger.error(f"Error updating basket indices: {str(e)}")
+
+
+def compute_portfolio_risk(user_id, period):
+    """
+    Compute a large portfolio's risk analytics into the cache the risk endpoint reads.
+    """
+    from django.contrib.auth import get_user_model
+    from django_app.utils.risk_analytics import get_portfolio_risk
+    
+    try:
+        get_portfolio_risk(get_user_model().objects.get(pk=user_id), period, queue=False)
+    except Exception as e:
+        logger.error(f"Error computing risk analytics for user {user_id}: {str(e)}")
+
+
+def run_backtest_job(job_id):
+    """
+    Run a queued portfolio backtest and store the result on its job.
+    """
+    from django_app.utils.backtester import run_backtest_job as run_job
+    
+    try:
+        run_job(job_id)
+    except Exception as e:
+        logger.error(f"Error running backtest job {job_id}: {str(e)}")
 
 
 def generate_single_horoscope(zodiac_sign, investing_style):
@@ -0,0 +1,1480 @@
+"""
+Tests for ZEN Trading analytics
+Run with: uv run manage.py test django_app
+"""
+import gzip
+import io
+import json
+import zlib
+from datetime import date, timedelta
+from decimal import Decimal
+from importlib import import_module
+from unittest import mock
+
+import brotli
+import msgpack
+import numpy as np
+import pandas as pd
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Sum
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from django_app.models import ChangeLogEntry, CosmicVibeSnapshot, DailyBar, DailyHoroscope, PortfolioValuation, PriceAlert, RelatedStocks, Stock, StockHolding, StockOrder, SyncTombstone, TaxLot, UserHoldings, UserStockPreference, ZodiacSignMatching
+from django_app.renderers import FastJSONParser, FastJSONRenderer, MessagePackRenderer
+from django_app.serializers import PortfolioSummarySerializer, StockSerializer
+from django_app.tasks import compute_portfolio_risk, update_stock_prices
+from django_app.utils import market_data
+from django_app.utils.alert_engine import AlertIndex, evaluate_price_alerts
+from django_app.utils.backtester import compute_backtest
+from django_app.utils.columnar import ohlcv_columns
+from django_app.utils.basket_indices import extend_series
+from django_app.utils.delta_sync import make_token
+from django_app.utils.fast_serializers import STOCK_FIELDS, serialize_portfolio_summary, serialize_stocks
+from django_app.utils.fixed_point import CENTS, QUANTITY_SCALE, position_values, round_div, to_decimal, to_fixed, value_portfolio
+from django_app.utils.market_aggregates import MarketAggregator
+from django_app.utils.order_engine import OrderBook, execute_triggered_orders
+from django_app.utils.quant import basket_returns, bootstrap_paths, compute_risk_metrics, rebalance_starts, run_backtest, simulate_positions, standardize_returns, top_k_correlations
+from django_app.utils.related_stocks import build_related_stocks
+from django_app.utils.response_cache import bump_price_epoch
+from django_app.utils.compression import choose_encoding, compress_stream
+from django_app.utils.stock_snapshot import clear_stock_list_snapshot, get_price_epoch
+from django_app.utils.trading import execute_trade
+from django_app.utils.valuation_engine import (
+    ELEMENTS,
+    PERSIST_FIELDS,
+    PortfolioValuationEngine,
+    get_cosmic_vibe_history,
+    get_cosmic_vibe_index,
+)
+
+User = get_user_model()
+
+# Two assets over five trading days straddling a month end
+FIXTURE_DATES = np.array(
+    ['2024-01-29', '2024-01-30', '2024-01-31', '2024-02-01', '2024-02-02'], dtype='datetime64[D]'
+)
+FIXTURE_CLOSES = np.array([
+    [10.0, 20.0],
+    [11.0, 20.0],
+    [12.0, 18.0],
+    [12.0, 30.0],
+    [15.0, 30.0],
+])
+
+
+class BacktestKernelTests(SimpleTestCase):
+    """
+    Deterministic checks of the vectorized backtest kernel against hand-computed values
+    """
+
+    def test_rebalance_starts(self):
+        self.assertEqual(rebalance_starts(FIXTURE_DATES, 'none').tolist(), [0])
+        self.assertEqual(rebalance_starts(FIXTURE_DATES, 'monthly').tolist(), [0, 3])
+        self.assertEqual(rebalance_starts(FIXTURE_DATES, 'yearly').tolist(), [0])
+
+    def test_buy_and_hold(self):
+        values = simulate_positions(FIXTURE_CLOSES, np.array([0.5, 0.5]), np.array([0]), 100.0)
+        # 5 shares of A and 2.5 shares of B bought on day one, never traded
+        np.testing.assert_allclose(values.sum(axis=1), [100.0, 105.0, 105.0, 135.0, 150.0])
+
+    def test_monthly_rebalance(self):
+        starts = rebalance_starts(FIXTURE_DATES, 'monthly')
+        values = simulate_positions(FIXTURE_CLOSES, np.array([0.5, 0.5]), starts, 100.0)
+        # Equity is 135 at the Feb 1 close and is split 67.5/67.5: 5.625 shares of A, 2.25 of B
+        np.testing.assert_allclose(values[3], [67.5, 67.5])
+        np.testing.assert_allclose(values.sum(axis=1), [100.0, 105.0, 105.0, 135.0, 151.875])
+
+    def test_rebalance_changes_the_path(self):
+        weights = np.array([0.8, 0.2])
+        hold = simulate_positions(FIXTURE_CLOSES, weights, np.array([0]), 100.0).sum(axis=1)
+        monthly = simulate_positions(
+            FIXTURE_CLOSES, weights, rebalance_starts(FIXTURE_DATES, 'monthly'), 100.0
+        ).sum(axis=1)
+        # Identical until the rebalance, then the reset weights diverge
+        np.testing.assert_allclose(hold[:4], monthly[:4])
+        np.testing.assert_allclose(hold[-1], 8 * 15 + 1 * 30)
+        np.testing.assert_allclose(monthly[-1], 126 * (0.8 * 15 / 12 + 0.2))
+
+    def test_summary_and_cosmic_vibe(self):
+        result = run_backtest(
+            FIXTURE_CLOSES,
+            np.array([0.5, 0.5]),
+            np.array([0]),
+            alignment_scores=np.array([100.0, 40.0]),
+            element_index=np.array([0, 1]),
+            n_elements=4,
+            benchmark_closes=np.array([50.0, 50.0, 55.0, 55.0, 60.0]),
+            initial_value=100.0,
+        )
+        self.assertEqual(result['equity'], [100.0, 105.0, 105.0, 135.0, 150.0])
+        self.assertAlmostEqual(result['total_return'], 0.5)
+        self.assertAlmostEqual(result['max_drawdown'], 0.0)
+        self.assertAlmostEqual(result['benchmark_total_return'], 0.2)
+        # Day one: (50 x 100 + 50 x 40) / 100 = 70 alignment, two elements held = +6
+        self.assertEqual(result['cosmic_vibe_index'][0], 76)
+        self.assertEqual(len(result['cosmic_vibe_index']), len(FIXTURE_CLOSES))
+
+
+class BootstrapPathsTests(SimpleTestCase):
+    """
+    Checks of the Monte Carlo bootstrap kernel
+    """
+
+    def test_constant_returns_compound_exactly(self):
+        returns = np.tile([0.01, -0.01], (30, 1))
+        growth = bootstrap_paths(returns, np.array([0.5, 0.5]), 10, 4, seed=7, step=5)
+        self.assertEqual(growth.shape, (4, 2))
+        expected = 0.5 * 1.01 ** np.array([5, 10]) + 0.5 * 0.99 ** np.array([5, 10])
+        np.testing.assert_allclose(growth, np.tile(expected, (4, 1)))
+
+    def test_seeded_and_chunk_independent(self):
+        returns = np.random.default_rng(0).normal(0, 0.01, (100, 3))
+        weights = np.array([0.2, 0.3, 0.5])
+        first = bootstrap_paths(returns, weights, 21, 50, seed=1, step=7)
+        # Tiny chunks draw the same days, one chunk at a time
+        chunked = bootstrap_paths(returns, weights, 21, 50, seed=1, step=7, max_cells=21 * 3 * 4)
+        np.testing.assert_allclose(first, chunked)
+        self.assertFalse(np.allclose(first, bootstrap_paths(returns, weights, 21, 50, seed=2, step=7)))
+
+
+class BasketIndexTests(SimpleTestCase):
+    """
+    Checks of the sign/element basket index series
+    """
+
+    def test_equal_and_cap_weighted_returns(self):
+        closes = np.array([[10.0, np.nan], [11.0, 20.0], [11.0, 30.0]])
+        # Day one only A trades; day two A is flat and B gains 50%
+        np.testing.assert_allclose(basket_returns(closes), [0.1, 0.25])
+        # Caps on day one: 3 x 11 = 33 and 1 x 20 = 20
+        np.testing.assert_allclose(basket_returns(closes, np.array([3.0, 1.0])), [0.1, 10.0 / 53])
+
+    def test_appending_matches_a_full_build(self):
+        full_dates, full_values = extend_series([], [], FIXTURE_DATES, FIXTURE_CLOSES)
+        dates, values = extend_series([], [], FIXTURE_DATES[:3], FIXTURE_CLOSES[:3])
+        dates, values = extend_series(dates, values, FIXTURE_DATES[2:], FIXTURE_CLOSES[2:])
+
+        self.assertEqual(dates, full_dates)
+        self.assertEqual(full_dates[0], '2024-01-29')
+        np.testing.assert_allclose(values, full_values, atol=1e-4)
+        self.assertEqual(full_values[:2], [100.0, 105.0])
+
+
+class FixedPointTests(SimpleTestCase):
+    """
+    Checks of the integer cents valuation core
+    """
+
+    def test_division_rounds_half_to_even(self):
+        quotients = round_div(np.array([5, 15, 25, 26, -5, -15]), 10)
+        self.assertEqual(quotients.tolist(), [0, 2, 2, 3, 0, -2])
+
+    def test_position_values_match_decimal_quantize(self):
+        quantities = [Decimal('2.5000'), Decimal('0.3333'), Decimal('1.0005')]
+        prices = [Decimal('100.50'), Decimal('10.05'), Decimal('0.50')]
+        values = position_values(to_fixed(quantities, QUANTITY_SCALE), to_fixed(prices, CENTS))
+        expected = [(quantity * price).quantize(Decimal('0.01')) for quantity, price in zip(quantities, prices)]
+        self.assertEqual([to_decimal(value) for value in values], expected)
+
+    def test_large_products_do_not_overflow(self):
+        values = position_values(np.array([10 ** 12], dtype=np.int64), np.array([10 ** 9], dtype=np.int64))
+        self.assertEqual(int(values[0]), 10 ** 17)
+
+    def test_portfolio_totals_add_up(self):
+        valuation = value_portfolio([150_000, 25_000], [10_000, 10_050], [120_000, 30_000], [100, 40])
+        self.assertEqual(valuation['values'].tolist(), [150_000, 25_125])
+        self.assertEqual(valuation['stocks_value'], 175_125)
+        self.assertEqual(valuation['gain_loss_total'], sum(valuation['gain_loss'].tolist()))
+        self.assertEqual(valuation['gain_loss_percent'].tolist(), [2500, -1625])
+        self.assertEqual(valuation['alignment_score'], 91)
+        self.assertIsNone(value_portfolio([], [], [], [])['alignment_score'])
+
+
+class MarketAggregatesTests(SimpleTestCase):
+    """
+    Checks of the incrementally maintained market aggregates
+    """
+
+    def test_incremental_batches_match_a_fresh_build(self):
+        first = [
+            ('AAA', 110, 100, 'Leo'),
+            ('BBB', 95, 100, 'Aries'),
+            ('CCC', 100, 100, 'Taurus'),
+            ('DDD', 120, 100, None),
+        ]
+        second = [
+            ('AAA', 90, 100, 'Leo'),
+            ('BBB', 95, 100, 'Aries'),
+            ('CCC', 103.5, 100, 'Taurus'),
+            ('EEE', 50, 40, 'Virgo'),
+        ]
+        aggregator = MarketAggregator()
+        aggregator.apply_batch(first)
+        self.assertEqual(aggregator.apply_batch(second), 4)
+
+        fresh = MarketAggregator()
+        fresh.apply_batch(second)
+        self.assertEqual(aggregator.totals, fresh.totals)
+
+        snapshot = aggregator.snapshot()
+        self.assertEqual([mover['ticker'] for mover in snapshot['top_gainers']], ['EEE', 'CCC'])
+        self.assertEqual(snapshot['top_losers'][0], {
+            'ticker': 'AAA', 'zodiac_sign': 'Leo', 'current_price': 90.0, 'change_percent': -10.0,
+        })
+        self.assertEqual(snapshot['signs']['Aries']['average_change_percent'], -5.0)
+        self.assertEqual(snapshot['elements']['Fire'], {
+            'average_change_percent': -7.5, 'advancers': 0, 'decliners': 2, 'stocks': 2,
+        })
+        self.assertEqual(snapshot['market']['stocks'], 4)
+
+
+class BacktestTests(TestCase):
+    """
+    Backtests over fixture bars stored in the daily bar cache
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='backtest@example.com', username='backtest', password='pw12345!X')
+        cls.user.profile.zodiac_sign = 'Leo'
+        cls.user.profile.save()
+
+        for ticker, sign in (('AAA', 'Leo'), ('BBB', 'Taurus')):
+            Stock.objects.create(ticker=ticker, company_name=ticker, zodiac_sign=sign, current_price=Decimal('10'))
+
+        first_day = date(2024, 1, 29)
+        DailyBar.objects.bulk_create([
+            DailyBar(ticker=ticker, date=first_day + timedelta(days=row), close=float(FIXTURE_CLOSES[row, col]))
+            for row in range(len(FIXTURE_CLOSES))
+            for col, ticker in enumerate(['AAA', 'BBB'])
+        ])
+
+    def test_compute_backtest_is_deterministic(self):
+        params = {
+            'tickers': ['AAA', 'BBB'],
+            'weights': [1, 1],
+            'rebalance': 'monthly',
+            'horizon': '1Y',
+            'initial_value': '100',
+        }
+        first = compute_backtest(self.user, params)
+        second = compute_backtest(self.user, params)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first['equity'], [100.0, 105.0, 105.0, 135.0, 151.88])
+        self.assertEqual(first['dates'][0], '2024-01-29')
+        self.assertEqual(first['rebalances'], 1)
+        self.assertIsNone(first['benchmark'])
+
+
+class ResponseCacheTests(TestCase):
+    """
+    Invalidation of cached per-user responses
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='cache@example.com', username='cache', password='pw12345!X')
+        cls.user.profile.zodiac_sign = 'Leo'
+        cls.user.profile.save()
+        UserHoldings.objects.create(user=cls.user, balance=Decimal('10000'))
+        Stock.objects.create(ticker='AAA', company_name='AAA', zodiac_sign='Leo', current_price=Decimal('10'))
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def buy(self, quantity):
+        response = self.client.post(
+            '/api/holdings/', {'ticker': 'AAA', 'quantity': quantity, 'total_value': quantity * 10, 'action': 'buy'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_trade_invalidates_holdings_and_summary(self):
+        self.buy(1)
+        self.assertEqual(self.client.get('/api/portfolio/').data['stocks_value'], '10.00')
+        self.assertEqual(len(self.client.get('/api/holdings/').data['positions']), 1)
+
+        self.buy(2)
+        self.assertEqual(self.client.get('/api/portfolio/').data['stocks_value'], '30.00')
+        self.assertEqual(self.client.get('/api/holdings/').data['positions'][0]['quantity'], '3.0000')
+
+    def test_price_epoch_invalidates_priced_responses_only(self):
+        self.buy(1)
+        self.client.get('/api/portfolio/')
+        self.client.get('/api/holdings/')
+        Stock.objects.filter(ticker='AAA').update(current_price=Decimal('20'))
+
+        # Prices written mid-batch are not visible until the batch bumps the epoch
+        self.assertEqual(self.client.get('/api/portfolio/').data['stocks_value'], '10.00')
+        bump_price_epoch()
+        self.assertEqual(self.client.get('/api/portfolio/').data['stocks_value'], '20.00')
+        with self.assertNumQueries(1):
+            self.client.get('/api/holdings/')
+
+    def test_price_batch_bumps_epoch_only_for_changed_quotes(self):
+        stock = Stock.objects.get(ticker='AAA')
+        quote = {'current_price': 10.0, 'previous_close': None, 'market_state': stock.market_state}
+        with mock.patch('django_app.tasks.is_market_open', return_value=True), \
+                mock.patch('django_app.tasks.get_ticker_price', return_value=quote):
+            update_stock_prices()
+            self.assertEqual(get_price_epoch()[0], 0)
+            quote['current_price'] = 10.5
+            update_stock_prices()
+            self.assertEqual(get_price_epoch()[0], 1)
+
+    def test_preference_change_invalidates_watchlist(self):
+        self.assertEqual(self.client.get('/api/watchlist/').data['watchlist'], [])
+        self.client.post('/api/watchlist/', {'ticker': 'AAA'}, format='json')
+        self.assertEqual([row['ticker'] for row in self.client.get('/api/watchlist/').data['watchlist']], ['AAA'])
+
+
+class StockLinkTests(TestCase):
+    """
+    Foreign keys from positions and preferences to stocks
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='link@example.com', username='link', password='pw12345!X')
+        self.user.profile.zodiac_sign = 'Leo'
+        self.user.profile.save()
+        UserHoldings.objects.create(user=self.user, balance=Decimal('10000'))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_position_is_linked_once_its_stock_exists(self):
+        self.client.post('/api/holdings/', {'ticker': 'NEW', 'quantity': 2, 'total_value': 20, 'action': 'buy'}, format='json')
+        self.assertIsNone(StockHolding.objects.get(ticker='NEW').stock)
+        self.assertEqual(self.client.get('/api/portfolio/').data['position_count'], 0)
+
+        stock = Stock.objects.create(ticker='NEW', company_name='New', zodiac_sign='Leo', current_price=Decimal('15'))
+        bump_price_epoch()
+        self.assertEqual(StockHolding.objects.get(ticker='NEW').stock, stock)
+        self.assertEqual(self.client.get('/api/portfolio/').data['stocks_value'], '30.00')
+
+
+class StockListSnapshotTests(TestCase):
+    """
+    Stock list pre-rendered once per price epoch
+    """
+
+    def setUp(self):
+        clear_stock_list_snapshot()
+        Stock.objects.create(ticker='AAA', company_name='AAA', zodiac_sign='Leo', current_price=Decimal('10'))
+
+    def test_body_is_reused_until_the_price_epoch_changes(self):
+        self.assertEqual(json.loads(self.client.get('/api/stocks/').content)[0]['current_price'], '10.00')
+        Stock.objects.filter(ticker='AAA').update(current_price=Decimal('20'))
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/stocks/')
+        self.assertEqual(json.loads(response.content)[0]['current_price'], '10.00')
+
+        bump_price_epoch()
+        self.assertEqual(json.loads(self.client.get('/api/stocks/').content)[0]['current_price'], '20.00')
+
+    def test_gzip_variant_matches_the_json_body(self):
+        plain = self.client.get('/api/stocks/')
+        compressed = self.client.get('/api/stocks/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+
+    def test_choose_encoding(self):
+        self.assertEqual(choose_encoding('gzip, br', {'identity', 'gzip', 'br'}), 'br')
+        self.assertEqual(choose_encoding('gzip, br', {'identity', 'gzip'}), 'gzip')
+        self.assertEqual(choose_encoding('br;q=0, gzip;q=0.5', {'identity', 'gzip', 'br'}), 'gzip')
+        self.assertEqual(choose_encoding('', {'identity', 'gzip', 'br'}), 'identity')
+        self.assertEqual(choose_encoding('*', {'identity', 'gzip'}), 'gzip')
+
+
+class ConditionalGetTests(TestCase):
+    """
+    ETags from version stamps and 304 answers to unchanged polls
+    """
+
+    def setUp(self):
+        cache.clear()
+        clear_stock_list_snapshot()
+        self.user = User.objects.create_user(email='etag@example.com', username='etag', password='pw12345!X')
+        self.user.profile.zodiac_sign = 'Leo'
+        self.user.profile.save()
+        UserHoldings.objects.create(user=self.user, balance=Decimal('10000'))
+        Stock.objects.create(ticker='AAA', company_name='AAA', zodiac_sign='Leo', current_price=Decimal('10'))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertRevalidates(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        return etag
+
+    def test_unchanged_polls_are_not_modified(self):
+        for url in ['/api/stocks/', '/api/stocks/AAA/', '/api/watchlist/', '/api/portfolio/', '/api/zodiac/matching-rules/']:
+            with self.subTest(url=url):
+                self.assertRevalidates(url)
+
+    def test_anonymous_stock_detail_revalidates(self):
+        self.client.force_authenticate(None)
+        self.assertRevalidates('/api/stocks/AAA/')
+
+    def test_etag_follows_the_version_stamps(self):
+        watchlist = self.assertRevalidates('/api/watchlist/')
+        portfolio = self.assertRevalidates('/api/portfolio/')
+        stocks = self.assertRevalidates('/api/stocks/')
+
+        self.client.post('/api/watchlist/', {'ticker': 'AAA'}, format='json')
+        self.assertEqual(self.client.get('/api/watchlist/', HTTP_IF_NONE_MATCH=watchlist).status_code, 200)
+
+        bump_price_epoch()
+        self.assertEqual(self.client.get('/api/stocks/', HTTP_IF_NONE_MATCH=stocks).status_code, 200)
+        self.assertEqual(self.client.get('/api/portfolio/', HTTP_IF_NONE_MATCH=portfolio).status_code, 200)
+
+    def test_matching_rules_etag_follows_in_place_edits(self):
+        ZodiacSignMatching.objects.create(user_sign='Leo', stock_sign='Aries', match_type='positive', element='Fire')
+        etag = self.assertRevalidates('/api/zodiac/matching-rules/')
+        ZodiacSignMatching.objects.update(match_type='negative')
+        response = self.client.get('/api/zodiac/matching-rules/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_etags_differ_per_user_and_query(self):
+        etag = self.client.get('/api/portfolio/')['ETag']
+        self.assertNotEqual(self.client.get('/api/portfolio/?holdings=false')['ETag'], etag)
+
+        etag = self.client.get('/api/watchlist/')['ETag']
+        other = User.objects.create_user(email='etag2@example.com', username='etag2', password='pw12345!X')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get('/api/watchlist/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_if_modified_since(self):
+        response = self.client.get('/api/stocks/AAA/')
+        last_modified = response['Last-Modified']
+        self.assertEqual(self.client.get('/api/stocks/AAA/', HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+
+class DeltaSyncTests(TestCase):
+    """
+    Changes since a sync token, with tombstones for deletions
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='sync@example.com', username='sync', password='pw12345!X')
+        self.user.profile.zodiac_sign = 'Leo'
+        self.user.profile.investing_style = 'balanced'
+        self.user.profile.save()
+        UserHoldings.objects.create(user=self.user, balance=Decimal('10000'))
+        for ticker in ['AAA', 'BBB']:
+            Stock.objects.create(ticker=ticker, company_name=ticker, zodiac_sign='Leo', current_price=Decimal('10'))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def sync(self, token=None):
+        response = self.client.get('/api/sync/', {'token': token} if token else {})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_full_sync_then_only_changes(self):
+        full = self.sync()
+        self.assertTrue(full['reset'])
+        self.assertEqual([stock['ticker'] for stock in full['stocks']], ['AAA', 'BBB'])
+        self.assertEqual(full['holdings']['balance'], '10000.00')
+
+        # Only rows changed after the token are sent (the overlap is skipped for the test)
+        token = make_token(timezone.now())
+        stock = Stock.objects.get(ticker='BBB')
+        stock.current_price = Decimal('11')
+        stock.save()
+        self.client.post('/api/holdings/', {'ticker': 'AAA', 'quantity': 1, 'total_value': 10, 'action': 'buy'}, format='json')
+
+        delta = self.sync(token)
+        self.assertFalse(delta['reset'])
+        self.assertEqual([stock['ticker'] for stock in delta['stocks']], ['BBB'])
+        self.assertEqual([position['ticker'] for position in delta['positions']], ['AAA'])
+        self.assertEqual(delta['holdings']['balance'], '9990.00')
+        self.assertEqual(delta['preferences'], [])
+
+    def test_list_moves_and_lot_method_are_changes(self):
+        self.client.post('/api/dislike-list/', {'ticker': 'AAA'}, format='json')
+        self.client.post('/api/dislike-list/', {'ticker': 'BBB'}, format='json')
+        token = make_token(timezone.now())
+
+        self.client.post('/api/watchlist/', {'ticker': 'AAA'}, format='json')
+        self.client.post('/api/watchlist/', {'tickers': ['BBB']}, format='json')
+        self.client.patch('/api/holdings/', {'lot_method': 'lifo'}, format='json')
+
+        delta = self.sync(token)
+        self.assertEqual(
+            sorted((row['ticker'], row['preference_type']) for row in delta['preferences']),
+            [('AAA', 'watchlist'), ('BBB', 'watchlist')],
+        )
+        self.assertEqual(delta['holdings']['lot_method'], 'lifo')
+
+    def test_deletions_are_reported_as_tombstones(self):
+        self.client.post('/api/holdings/', {'ticker': 'AAA', 'quantity': 1, 'total_value': 10, 'action': 'buy'}, format='json')
+        self.client.post('/api/watchlist/', {'ticker': 'BBB'}, format='json')
+        token = make_token(timezone.now())
+
+        self.client.post('/api/holdings/', {'ticker': 'AAA', 'quantity': 1, 'total_value': 10, 'action': 'sell'}, format='json')
+        self.client.delete('/api/watchlist/', {'ticker': 'BBB'}, format='json')
+        Stock.objects.filter(ticker='BBB').delete()
+
+        delta = self.sync(token)
+        self.assertEqual(delta['deleted_positions'], ['AAA'])
+        self.assertEqual(delta['deleted_preferences'], ['BBB'])
+        self.assertEqual(delta['deleted_stocks'], ['BBB'])
+
+    def test_account_deletion_leaves_no_tombstones(self):
+        self.client.post('/api/holdings/', {'ticker': 'AAA', 'quantity': 1, 'total_value': 10, 'action': 'buy'}, format='json')
+        self.user.delete()
+        self.assertFalse(SyncTombstone.objects.exists())
+
+    def test_horoscope_is_sent_when_created_or_profile_changes(self):
+        token = make_token(timezone.now())
+        self.assertIsNone(self.sync(token)['horoscope'])
+        DailyHoroscope.objects.create(zodiac_sign='Leo', investing_style='balanced', date=date.today(), horoscope_text='Stars')
+        self.assertEqual(self.sync(token)['horoscope']['horoscope_text'], 'Stars')
+        self.assertIsNone(self.sync(make_token(timezone.now()))['horoscope'])
+
+    def test_invalid_token(self):
+        self.assertEqual(self.client.get('/api/sync/', {'token': 'yesterday'}).status_code, 400)
+
+
+class SparseListTests(TestCase):
+    """
+    fields= and opt-in keyset pagination on list endpoints
+    """
+
+    def setUp(self):
+        cache.clear()
+        clear_stock_list_snapshot()
+        for ticker in ['CCC', 'AAA', 'BBB']:
+            Stock.objects.create(ticker=ticker, company_name=ticker, zodiac_sign='Leo', current_price=Decimal('10'), description='Long text')
+
+    def test_fields_are_pushed_down_to_the_query(self):
+        with self.assertNumQueries(1) as queries:
+            response = self.client.get('/api/stocks/', {'fields': 'ticker,current_price'})
+        self.assertEqual(response.json(), [
+            {'ticker': 'AAA', 'current_price': '10.00'},
+            {'ticker': 'BBB', 'current_price': '10.00'},
+            {'ticker': 'CCC', 'current_price': '10.00'},
+        ])
+        self.assertNotIn('description', queries.captured_queries[0]['sql'])
+        self.assertEqual(self.client.get('/api/stocks/', {'fields': 'ticker,nope'}).status_code, 400)
+
+    def test_keyset_pages_cover_the_list_once(self):
+        tickers = []
+        url, params = '/api/stocks/', {'page_size': 2, 'fields': 'ticker'}
+        while url:
+            page = self.client.get(url, params).json()
+            tickers += [stock['ticker'] for stock in page['results']]
+            url, params = page['next'], None
+        self.assertEqual(tickers, ['AAA', 'BBB', 'CCC'])
+
+    def test_watchlist_pages_keep_their_key(self):
+        user = User.objects.create_user(email='pages@example.com', username='pages', password='pw12345!X')
+        client = APIClient()
+        client.force_authenticate(user)
+        for ticker in ['AAA', 'BBB', 'CCC']:
+            client.post('/api/watchlist/', {'ticker': ticker}, format='json')
+
+        page = client.get('/api/watchlist/', {'page_size': 2, 'fields': 'ticker'}).data
+        self.assertEqual(page['watchlist'], [{'ticker': 'CCC'}, {'ticker': 'BBB'}])
+        self.assertEqual(client.get(page['next']).data['watchlist'], [{'ticker': 'AAA'}])
+        self.assertEqual(len(client.get('/api/watchlist/').data['watchlist']), 3)
+        self.assertEqual(client.get('/api/watchlist/', {'cursor': 'bad'}).status_code, 400)
+
+
+class FastSerializationTests(TestCase):
+    """
+    orjson renderer and parser, and the hand-written serializers, match DRF's output
+    """
+
+    def test_renderer_matches_drf(self):
+        data = {
+            'price': Decimal('12.34'),
+            'when': timezone.now(),
+            'day': date(2026, 1, 2),
+            'values': np.array([1.5, 2.5]),
+            'count': np.int64(3),
+            'nested': [{'text': 'Lé'}],
+        }
+        fast = FastJSONRenderer().render(data)
+        self.assertEqual(json.loads(fast), json.loads(JSONRenderer().render(data)))
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(fast)), json.loads(fast))
+
+    def test_serializers_match_drf(self):
+        Stock.objects.create(ticker='AAA', company_name='AAA', zodiac_sign='Leo', current_price=Decimal('10.5'), description='Text')
+        Stock.objects.create(ticker='BBB', company_name='BBB', date_founded=timezone.now())
+        self.assertEqual(
+            serialize_stocks(Stock.objects.values(*(name for name, _ in STOCK_FIELDS))),
+            StockSerializer(Stock.objects.all(), many=True).data,
+        )
+
+        holding = {
+            'ticker': 'AAA', 'company_name': 'AAA', 'quantity': Decimal('1.5'), 'purchase_price': 0,
+            'purchase_date': timezone.now(), 'current_price': Decimal('10.5'), 'current_value': Decimal('15.75'),
+            'cost_basis': Decimal('15.00'), 'gain_loss': Decimal('0.75'), 'gain_loss_percent': Decimal('5.00'),
+            'alignment_score': 100, 'match_type': 'same_sign', 'zodiac_sign': 'Leo', 'element': 'Fire',
+        }
+        summary = {
+            'cash_balance': Decimal('100'), 'stocks_value': Decimal('15.75'), 'total_portfolio_value': Decimal('115.75'),
+            'total_cost_basis': Decimal('15'), 'total_gain_loss': Decimal('0.75'), 'total_gain_loss_percent': Decimal('5'),
+            'overall_alignment_score': 100, 'cosmic_vibe_index': 90,
+            'element_distribution': {'Fire': Decimal('100.0')}, 'alignment_breakdown': {'same_sign': 1},
+            'holdings': [holding],
+        }
+        self.assertEqual(
+            json.loads(JSONRenderer().render(serialize_portfolio_summary(summary))),
+            json.loads(JSONRenderer().render(PortfolioSummarySerializer(summary).data)),
+        )
+
+
+class ColumnarHistoryTests(TestCase):
+    """
+    History as parallel arrays, in JSON or MessagePack
+    """
+
+    def setUp(self):
+        cache.clear()
+        for ticker in ('AAA', 'BBB', 'NONE'):
+            Stock.objects.create(ticker=ticker, company_name=ticker, zodiac_sign='Leo', current_price=Decimal('10'))
+        closes = np.array([100.0, 101.5, 99.25])
+        self.hist = pd.DataFrame(
+            {'Open': closes, 'High': closes + 1, 'Low': closes - 1, 'Close': closes, 'Volume': [10, 20, 30]},
+            index=pd.date_range('2026-10-16 13:30', periods=3, freq='min', tz='UTC'),
+        )
+        self.client = APIClient()
+
+    def get_history(self, *args, **kwargs):
+        with mock.patch('yfinance.Ticker') as ticker:
+            ticker.return_value.history.return_value = self.hist
+            return self.client.get('/api/stocks/AAA/history/', *args, **kwargs)
+
+    def test_columns_match_rows(self):
+        columns = ohlcv_columns(self.hist)
+        self.assertEqual(columns['timestamp'].tolist(), [int(ts.timestamp()) for ts in self.hist.index])
+        self.assertEqual(columns['close'].tolist(), self.hist['Close'].tolist())
+        self.assertEqual(columns['volume'].dtype, np.int64)
+
+        rows = self.get_history({'timeframe': '1D'}).json()['data']
+        data = self.get_history({'timeframe': '1D', 'layout': 'columns'}).json()['data']
+        self.assertEqual(data['close'], [row['close'] for row in rows])
+        self.assertEqual(data['volume'], [row['volume'] for row in rows])
+        self.assertEqual(self.get_history({'layout': 'diagonal'}).status_code, 400)
+
+    def test_msgpack_defaults_to_columns(self):
+        response = self.get_history({'timeframe': '1D'}, HTTP_ACCEPT=MessagePackRenderer.media_type)
+        self.assertEqual(response['Content-Type'], MessagePackRenderer.media_type)
+        payload = msgpack.unpackb(response.content)
+        self.assertEqual(payload['layout'], 'columns')
+        self.assertEqual(payload['data']['high'], (self.hist['Close'] + 1).tolist())
+
+
+class CompressionMiddlewareTests(TestCase):
+    """
+    API responses compressed by content type and size, brotli preferred
+    """
+
+    def setUp(self):
+        cache.clear()
+        Stock.objects.bulk_create([
+            Stock(ticker=f'T{i:03d}', company_name=f'Company {i}', current_price=Decimal(50 + i), description='Text ' * 20)
+            for i in range(50)
+        ])
+        self.url = '/api/stocks/?fields=ticker,company_name,description'
+
+    def test_gzip_round_trip(self):
+        plain = self.client.get(self.url)
+        compressed = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+        self.assertEqual(int(compressed['Content-Length']), len(compressed.content))
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+
+    def test_brotli_preferred(self):
+        plain = self.client.get(self.url)
+        compressed = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        self.assertEqual(compressed['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(compressed.content), plain.content)
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get('/api/stocks/T001/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_stream_chunks_decode_as_they_arrive(self):
+        lines = [json.dumps({'line': i}).encode() + b'\n' for i in range(3)]
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        chunks = list(compress_stream(iter(lines), 'gzip'))
+        for line, chunk in zip(lines, chunks):
+            self.assertEqual(decoder.decompress(chunk), line)
+        self.assertEqual(gzip.decompress(b''.join(chunks)), b''.join(lines))
+
+
+class HistoryStreamTests(TestCase):
+    """
+    Multi-ticker history streamed as NDJSON, one line per ticker
+    """
+
+    def setUp(self):
+        cache.clear()
+        for ticker in ('AAA', 'BBB', 'NONE'):
+            Stock.objects.create(ticker=ticker, company_name=ticker, zodiac_sign='Leo', current_price=Decimal('10'))
+        closes = np.array([100.0, 101.5, 99.25])
+        self.hist = pd.DataFrame(
+            {'Open': closes, 'High': closes + 1, 'Low': closes - 1, 'Close': closes, 'Volume': [10, 20, 30]},
+            index=pd.date_range('2026-10-16 13:30', periods=3, freq='min', tz='UTC'),
+        )
+
+    def stream(self, query):
+        with mock.patch('django_app.utils.history_stream.get_history') as get_history:
+            get_history.side_effect = lambda tickers, period, interval: {
+                ticker: self.hist for ticker in tickers if ticker != 'NONE'
+            }
+            response = self.client.get('/api/stocks/history/stream/', query)
+            lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        return response, lines, get_history
+
+    def test_lines_match_stock_history(self):
+        response, lines, _ = self.stream({'tickers': 'aaa,BBB,aaa,NONE', 'timeframe': '1D'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(sorted(line['ticker'] for line in lines), ['AAA', 'BBB', 'NONE'])
+        by_ticker = {line['ticker']: line for line in lines}
+        self.assertEqual(by_ticker['NONE']['error'], 'No data available')
+
+        with mock.patch('yfinance.Ticker') as ticker:
+            ticker.return_value.history.return_value = self.hist
+            single = self.client.get('/api/stocks/AAA/history/', {'timeframe': '1D'}).json()
+        self.assertEqual({key: by_ticker['AAA'][key] for key in single}, single)
+
+    def test_cached_series_are_not_downloaded_again(self):
+        self.stream({'tickers': 'AAA', 'layout': 'columns'})
+        _, lines, get_history = self.stream({'tickers': 'AAA,BBB', 'layout': 'columns'})
+        self.assertEqual([line['ticker'] for line in lines], ['AAA', 'BBB'])
+        self.assertEqual(lines[0]['data']['close'], self.hist['Close'].tolist())
+        get_history.assert_called_once_with(['BBB'], '1mo', '1d')
+
+    def test_unlisted_tickers_are_not_downloaded(self):
+        _, lines, get_history = self.stream({'tickers': 'AAA,ZZZ'})
+        self.assertEqual([line['ticker'] for line in lines], ['ZZZ', 'AAA'])
+        self.assertEqual(lines[0]['error'], 'Stock not found')
+        get_history.assert_called_once_with(['AAA'], '1mo', '1d')
+
+        _, lines, get_history = self.stream({'tickers': 'ZZZ'})
+        self.assertEqual(lines[0]['error'], 'Stock not found')
+        get_history.assert_not_called()
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.client.get('/api/stocks/history/stream/').status_code, 400)
+        self.assertEqual(self.client.get('/api/stocks/history/stream/', {'tickers': 'AAA', 'timeframe': '2Y'}).status_code, 400)
+
+
+class DashboardTests(TestCase):
+    """
+    Page-load sections in one response, with per-section errors
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='dash@example.com', username='dash', password='pw12345!X')
+        self.user.profile.zodiac_sign = 'Leo'
+        self.user.profile.save()
+        holdings = UserHoldings.objects.create(user=self.user, balance=Decimal('10000'))
+        Stock.objects.create(ticker='AAA', company_name='AAA', zodiac_sign='Leo', current_price=Decimal('10'))
+        StockHolding.objects.create(
+            user_holdings=holdings, ticker='AAA', quantity=Decimal('2'), purchase_price=Decimal('9'), total_value=Decimal('18')
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_sections_match_their_endpoints(self):
+        with mock.patch('django_app.utils.yfinance_module.is_market_open', return_value=False), \
+                mock.patch('django_app.utils.yfinance_module.get_next_market_open', return_value='2026-10-19 09:30:00 EDT'):
+            document = self.client.get('/api/dashboard/', {'sections': 'portfolio,holdings,watchlist,horoscope,market'}).json()
+
+        for name, url in [('portfolio', '/api/portfolio/'), ('holdings', '/api/holdings/'), ('watchlist', '/api/watchlist/')]:
+            self.assertEqual(document['sections'][name], self.client.get(url).json())
+        self.assertEqual(document['sections']['market']['next_event'], 'open')
+
+        # No investing style yet: the horoscope fails alone
+        self.assertEqual(document['errors']['horoscope']['status'], 400)
+        self.assertEqual(document['errors']['horoscope']['error'], 'Profile incomplete')
+        self.assertNotIn('horoscope', document['sections'])
+
+    def test_sections_ignore_conditional_headers(self):
+        portfolio = self.client.get('/api/portfolio/')
+        document = self.client.get(
+            '/api/dashboard/', {'sections': 'portfolio,holdings'},
+            HTTP_IF_NONE_MATCH=portfolio['ETag'],
+        ).json()
+        self.assertEqual(document['errors'], {})
+        self.assertEqual(document['sections']['portfolio'], portfolio.json())
+
+    def test_unknown_section(self):
+        response = self.client.get('/api/dashboard/', {'sections': 'portfolio,weather'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'Invalid sections')
+
+
+class WatchlistQuotesTests(TestCase):
+    """
+    Watchlist with embedded quotes, and bulk add / remove
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='watch@example.com', username='watch', password='pw12345!X')
+        self.user.profile.zodiac_sign = 'Leo'
+        self.user.profile.save()
+        UserHoldings.objects.create(user=self.user, balance=Decimal('10000'))
+        ZodiacSignMatching.objects.create(user_sign='Leo', stock_sign='Aries', match_type='positive')
+        for ticker, sign in [('AAA', 'Leo'), ('BBB', 'Aries'), ('CCC', 'Taurus'), ('DDD', 'Virgo')]:
+            Stock.objects.create(ticker=ticker, company_name=ticker, zodiac_sign=sign, current_price=Decimal('10'))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_add_and_remove(self):
+        UserStockPreference.objects.create(user=self.user, ticker='DDD', preference_type='dislike')
+        response = self.client.post('/api/watchlist/', {'tickers': ['aaa', 'BBB', 'DDD', 'ZZZ', 'AAA']}, format='json')
+        self.assertEqual(response.json()['added'], ['AAA', 'BBB'])
+        self.assertEqual(response.json()['updated'], ['DDD'])
+        self.assertEqual(response.json()['not_found'], ['ZZZ'])
+        self.assertEqual(len(self.client.get('/api/watchlist/').json()['watchlist']), 3)
+
+        response = self.client.delete('/api/watchlist/', {'tickers': ['AAA', 'CCC']}, format='json')
+        self.assertEqual((response.json()['removed'], response.json()['not_found']), (['AAA'], ['CCC']))
+        self.assertEqual(self.client.post('/api/watchlist/', {'tickers': 'AAA'}, format='json').status_code, 400)
+
+    def test_bulk_add_racing_another_request(self):
+        # Another request inserts BBB (as a dislike) after the existing rows were read
+        bulk_create = UserStockPreference.objects.bulk_create
+
+        def racing_bulk_create(objs, **kwargs):
+            UserStockPreference.objects.create(user=self.user, ticker='BBB', preference_type='dislike')
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch.object(UserStockPreference.objects, 'bulk_create', side_effect=racing_bulk_create):
+            response = self.client.post('/api/watchlist/', {'tickers': ['AAA', 'BBB']}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['added'], response.json()['updated']), (['AAA'], ['BBB']))
+        preferences = UserStockPreference.objects.filter(user=self.user).order_by('ticker')
+        self.assertEqual(list(preferences.values_list('ticker', 'preference_type', 'stock__ticker')), [
+            ('AAA', 'watchlist', 'AAA'), ('BBB', 'watchlist', 'BBB'),
+        ])
+
+    def test_quotes_match_stock_detail_in_one_query(self):
+        self.client.post('/api/watchlist/', {'tickers': ['AAA', 'BBB', 'CCC']}, format='json')
+        cache.clear()
+        with self.assertNumQueries(3):  # versions (ETag), versions (cache), joined watchlist
+            rows = self.client.get('/api/watchlist/', {'include': 'quotes'}).json()['watchlist']
+        for row in rows:
+            detail = self.client.get(f'/api/stocks/{row["ticker"]}/').json()
+            self.assertEqual(row['quote'], {key: detail[key] for key in row['quote']})
+        self.assertEqual([row['quote']['compatibility_score'] for row in rows], [2, 3, 4])
+
+    def test_quotes_follow_prices(self):
+        self.client.post('/api/watchlist/', {'tickers': ['AAA']}, format='json')
+        self.assertEqual(self.client.get('/api/watchlist/', {'include': 'quotes'}).json()['watchlist'][0]['quote']['current_price'], '10.00')
+        Stock.objects.filter(ticker='AAA').update(current_price=Decimal('12'))
+        bump_price_epoch()
+        self.assertEqual(self.client.get('/api/watchlist/', {'include': 'quotes'}).json()['watchlist'][0]['quote']['current_price'], '12.00')
+
+
+class LeaderboardTests(TestCase):
+    """
+    Leaderboard ranks, ties broken by user id
+    """
+
+    def setUp(self):
+        self.users = []
+        for i, total in enumerate(['500', '300', '300', '300']):
+            user = User.objects.create_user(email=f'rank{i}@example.com', username=f'rank{i}', password='pw12345!X')
+            PortfolioValuation.objects.update_or_create(user=user, defaults={'total_value': Decimal(total)})
+            self.users.append(user)
+
+    def test_my_rank_matches_my_row(self):
+        for user in self.users:
+            client = APIClient()
+            client.force_authenticate(user)
+            data = client.get('/api/leaderboard/').json()
+            row = next(entry for entry in data['entries'] if entry['rank'] == data['me']['rank'])
+            self.assertEqual(row, data['me'])
+        self.assertEqual(data['me']['rank'], 4)
+
+
+
+class MaterializedValuationTests(TestCase):
+    """
+    Per-trade updates of the materialized portfolio aggregates against a bulk recalculation
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='value@example.com', username='value', password='pw12345!X')
+        self.user.profile.zodiac_sign = 'Leo'
+        self.user.profile.save()
+        UserHoldings.objects.create(user=self.user, balance=Decimal('10000'))
+        ZodiacSignMatching.objects.create(user_sign='Leo', stock_sign='Taurus', match_type='negative')
+        Stock.objects.create(ticker='AAA', company_name='AAA', zodiac_sign='Leo', current_price=Decimal('10'))
+        Stock.objects.create(ticker='BBB', company_name='BBB', zodiac_sign='Taurus', current_price=Decimal('20'))
+        self.revalue()
+
+    def revalue(self):
+        engine = PortfolioValuationEngine()
+        engine.full_load()
+        engine.persist(engine.revalue())
+
+    def aggregates(self):
+        return PortfolioValuation.objects.filter(user=self.user).values(*[
+            field for field in PERSIST_FIELDS if field != 'updated_at'
+        ]).get()
+
+    def test_trades_match_bulk_recalculation(self):
+        execute_trade(self.user, 'AAA', 'buy', Decimal('10'), Decimal('100'))
+        execute_trade(self.user, 'BBB', 'buy', Decimal('5'), Decimal('90'))
+        execute_trade(self.user, 'AAA', 'sell', Decimal('4'), Decimal('50'))
+        execute_trade(self.user, 'BBB', 'sell', Decimal('5'), Decimal('100'))
+        incremental = self.aggregates()
+
+        PortfolioValuation.objects.filter(user=self.user).delete()
+        self.revalue()
+        self.assertEqual(incremental, self.aggregates())
+        self.assertEqual(incremental['stocks_value'], Decimal('60.00'))
+        self.assertEqual(incremental['realized_gain_loss'], Decimal('20.00'))
+        self.assertEqual((incremental['position_count'], incremental['same_sign_count'], incremental['negative_count']), (1, 1, 0))
+
+    def test_headline_summary_matches_full_summary(self):
+        execute_trade(self.user, 'AAA', 'buy', Decimal('3'), Decimal('27'))
+        execute_trade(self.user, 'BBB', 'buy', Decimal('2'), Decimal('44'))
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        full = client.get('/api/portfolio/').json()
+        headline = client.get('/api/portfolio/', {'holdings': 'false'}).json()
+        self.assertEqual(headline['holdings'], [])
+        self.assertEqual(
+            {key: value for key, value in headline.items() if key != 'holdings'},
+            {key: value for key, value in full.items() if key != 'holdings'},
+        )
+
+
+class ValuationEngineSyncTests(TestCase):
+    """
+    Engine reloads driven by the change log, and persists that never overwrite a newer trade
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='engine@example.com', username='engine', password='pw12345!X')
+        self.user.profile.zodiac_sign = 'Leo'
+        self.user.profile.save()
+        UserHoldings.objects.create(user=self.user, balance=Decimal('10000'))
+        Stock.objects.create(ticker='AAA', company_name='AAA', zodiac_sign='Leo', current_price=Decimal('10'))
+        self.engine = PortfolioValuationEngine()
+        self.engine.sync()
+        self.engine.persist(self.engine.revalue())
+
+    def aggregates(self):
+        return PortfolioValuation.objects.filter(user=self.user).values(*[
+            field for field in PERSIST_FIELDS if field != 'updated_at'
+        ]).get()
+
+    def bulk_aggregates(self):
+        PortfolioValuation.objects.filter(user=self.user).delete()
+        engine = PortfolioValuationEngine()
+        engine.full_load()
+        engine.persist(engine.revalue())
+        return self.aggregates()
+
+    def test_trade_committed_after_a_poll_is_reloaded(self):
+        self.engine.sync()
+        execute_trade(self.user, 'AAA', 'buy', Decimal('10'), Decimal('100'))
+        # Its entry was written before that poll but committed after it
+        ChangeLogEntry.objects.filter(id__gt=max(self.engine.changes.seen)).update(
+            created_at=self.engine.changes.read_at - timedelta(seconds=30)
+        )
+        self.engine.sync()
+        self.engine.persist(self.engine.revalue())
+        after_tick = self.aggregates()
+        self.assertEqual(after_tick['position_count'], 1)
+        self.assertEqual(after_tick, self.bulk_aggregates())
+
+    def test_persist_skips_users_traded_since_their_load(self):
+        execute_trade(self.user, 'AAA', 'buy', Decimal('5'), Decimal('50'))
+        self.engine.sync()
+        self.engine.persist(self.engine.revalue())
+
+        # A trade the engine has not seen, then a price tick that moves its stale numbers
+        with mock.patch.object(self.engine.changes, 'poll', return_value=set()):
+            execute_trade(self.user, 'AAA', 'buy', Decimal('10'), Decimal('100'))
+            traded = self.aggregates()
+            Stock.objects.filter(ticker='AAA').update(current_price=Decimal('12'))
+            self.engine.sync()
+            self.assertEqual(self.engine.persist(self.engine.revalue()), 0)
+            self.assertEqual(self.aggregates(), traded)
+
+            # Skipped users are reloaded at the next sync even without a change log entry
+            self.engine.sync()
+        self.engine.persist(self.engine.revalue())
+        self.assertEqual(self.aggregates()['stocks_value'], Decimal('180.00'))
+        self.assertEqual(self.aggregates(), self.bulk_aggregates())
+
+
+class OrderEngineTests(TestCase):
+    """
+    Resting orders booked from the change log whenever they commit, and kept when a fill fails
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='orders@example.com', username='orders', password='pw12345!X')
+        UserHoldings.objects.create(user=self.user, balance=Decimal('10000'))
+        Stock.objects.create(ticker='AAA', company_name='AAA', zodiac_sign='Leo', current_price=Decimal('10'))
+        self.book = OrderBook()
+        patcher = mock.patch('django_app.utils.order_engine._order_book', self.book)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def place(self, **kwargs):
+        return StockOrder.objects.create(
+            user=self.user, ticker='AAA', side='buy', order_type='limit', trigger_price=Decimal('8'),
+            quantity=Decimal('1'), **kwargs
+        )
+
+    def test_sync_reads_only_changed_orders(self):
+        first = self.place()
+        self.assertEqual(self.book.sync(), {'AAA'})
+        # The first poll re-reads the window before the load; the order is not booked twice
+        self.assertEqual(self.book.sync(), set())
+        with self.assertNumQueries(1):  # change log window
+            self.assertEqual(self.book.sync(), set())
+
+        later = self.place()
+        # An order whose entry was written before that sync but committed after it
+        earlier = self.place()
+        ChangeLogEntry.objects.filter(kind='order', object_id=earlier.pk).update(
+            created_at=self.book.changes.read_at - timedelta(seconds=30)
+        )
+        self.assertEqual(self.book.sync(), {'AAA'})
+        self.assertEqual(set(self.book.orders), {first.pk, earlier.pk, later.pk})
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.delete(f'/api/orders/{later.pk}/').status_code, 200)
+        self.assertEqual(self.book.sync(), set())
+        self.assertEqual(set(self.book.orders), {first.pk, earlier.pk})
+        self.assertEqual(len(self.book), 3)  # the cancelled entry goes when it would fire
+
+    def test_failed_fill_keeps_order_resting(self):
+        order = self.place()
+        with mock.patch('django_app.utils.order_engine.fill_order', side_effect=RuntimeError('database is locked')), \
+                self.assertLogs('django_app.utils.order_engine', 'ERROR'):
+            self.assertEqual(execute_triggered_orders({'AAA': 7.5}), {})
+        self.assertEqual(len(self.book), 1)
+
+        self.assertEqual(execute_triggered_orders({'AAA': 7.5}), {'filled': 1})
+        order.refresh_from_db()
+        self.assertEqual((order.status, order.fill_price), ('filled', Decimal('7.50')))
+        self.assertEqual(len(self.book), 0)
+
+
+class AlertEngineTests(TestCase):
+    """
+    Active alerts indexed from the change log whenever they commit
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='alerts@example.com', username='alerts', password='pw12345!X')
+        Stock.objects.create(
+            ticker='AAA', company_name='AAA', zodiac_sign='Leo', current_price=Decimal('10'), previous_close=Decimal('10')
+        )
+        self.index = AlertIndex()
+        patcher = mock.patch('django_app.utils.alert_engine._alert_index', self.index)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_alert(self, **kwargs):
+        return PriceAlert.objects.create(user=self.user, ticker='AAA', alert_type='above', threshold=Decimal('12'), **kwargs)
+
+    def test_sync_reads_only_changed_alerts(self):
+        first = self.create_alert()
+        self.assertEqual(self.index.sync(), {'AAA'})
+        self.assertEqual(self.index.sync(), set())
+        with self.assertNumQueries(1):  # change log window
+            self.assertEqual(self.index.sync(), set())
+
+        # An alert whose entry was written before the last sync but committed after it
+        earlier = self.create_alert()
+        ChangeLogEntry.objects.filter(kind='alert', object_id=earlier.pk).update(
+            created_at=self.index.changes.read_at - timedelta(seconds=30)
+        )
+        deleted = self.create_alert()
+        self.assertEqual(self.index.sync(), {'AAA'})
+        self.assertEqual(set(self.index.alerts), {first.pk, earlier.pk, deleted.pk})
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.delete(f'/api/alerts/{deleted.pk}/').status_code, 200)
+        self.assertEqual(self.index.sync(), set())
+        self.assertEqual(set(self.index.alerts), {first.pk, earlier.pk})
+
+        self.assertEqual(sorted(evaluate_price_alerts({'AAA': 12.5})), [first.pk, earlier.pk])
+        self.assertFalse(PriceAlert.objects.filter(is_active=True).exists())
+        self.assertEqual(self.index.alerts, {})
+
+    def test_alerts_that_fail_to_deactivate_fire_again(self):
+        alert = self.create_alert()
+        with mock.patch.object(PriceAlert.objects, 'filter', side_effect=[
+            PriceAlert.objects.filter(is_active=True), RuntimeError('database is locked'),
+        ]), self.assertLogs('django_app.utils.alert_engine', 'ERROR'):
+            self.assertEqual(evaluate_price_alerts({'AAA': 12.5}), [])
+        self.assertEqual(evaluate_price_alerts({'AAA': 12.5}), [alert.pk])
+
+
+class TaxLotTests(TestCase):
+    """
+    Lot consumption per lot method, realized gain/loss, and positions older than lot tracking
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='lots@example.com', username='lots', password='pw12345!X')
+        self.user.profile.zodiac_sign = 'Leo'
+        self.user.profile.save()
+        self.holdings = UserHoldings.objects.create(user=self.user, balance=Decimal('10000'))
+        Stock.objects.create(ticker='AAA', company_name='AAA', zodiac_sign='Leo', current_price=Decimal('25'))
+
+    def buy_lots(self):
+        for total in ('100', '300', '200'):  # 10 shares each at 10, 30 and 20
+            execute_trade(self.user, 'AAA', 'buy', Decimal('10'), Decimal(total))
+
+    def open_lots(self):
+        return list(TaxLot.objects.filter(user=self.user, remaining_quantity__gt=0).order_by('id').values_list(
+            'cost_per_share', 'remaining_quantity', 'remaining_cost'
+        ))
+
+    def position(self):
+        return StockHolding.objects.filter(user_holdings=self.holdings).values_list('quantity', 'total_value').get()
+
+    def test_multi_lot_sell_per_method(self):
+        expected = {
+            'fifo': (Decimal('125.00'), [(Decimal('30'), Decimal('5'), Decimal('150.00')), (Decimal('20'), Decimal('10'), Decimal('200.00'))]),
+            'lifo': (Decimal('25.00'), [(Decimal('10'), Decimal('10'), Decimal('100.00')), (Decimal('30'), Decimal('5'), Decimal('150.00'))]),
+            'highest_cost': (Decimal('-25.00'), [(Decimal('10'), Decimal('10'), Decimal('100.00')), (Decimal('20'), Decimal('5'), Decimal('100.00'))]),
+        }
+        for method, (realized, lots) in expected.items():
+            with self.subTest(method=method):
+                TaxLot.objects.all().delete()
+                StockHolding.objects.all().delete()
+                UserHoldings.objects.filter(pk=self.holdings.pk).update(balance=Decimal('10000'), realized_gain_loss=0)
+                self.buy_lots()
+
+                holdings, _ = execute_trade(self.user, 'AAA', 'sell', Decimal('15'), Decimal('375'), lot_method=method)
+                self.assertEqual(holdings.realized_gain_loss, realized)
+                self.assertEqual(self.open_lots(), lots)
+                # The remaining lots always add up to the position
+                self.assertEqual(self.position(), (Decimal('15'), sum(cost for _, _, cost in lots)))
+                self.assertEqual(
+                    TaxLot.objects.filter(user=self.user).aggregate(total=Sum('realized_gain_loss'))['total'], realized
+                )
+
+    def test_partial_sell_uses_holdings_lot_method(self):
+        self.buy_lots()
+        UserHoldings.objects.filter(pk=self.holdings.pk).update(lot_method='highest_cost')
+        holdings, _ = execute_trade(self.user, 'AAA', 'sell', Decimal('4'), Decimal('100'))
+        self.assertEqual(holdings.realized_gain_loss, Decimal('-20.00'))
+        self.assertEqual(self.open_lots()[1], (Decimal('30'), Decimal('6'), Decimal('180.00')))
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get('/api/portfolio/').json()['realized_gain_loss'], '-20.00')
+
+    def test_sell_of_shares_bought_before_lot_tracking(self):
+        StockHolding.objects.create(
+            user_holdings=self.holdings, ticker='AAA', quantity=Decimal('10'), purchase_price=Decimal('12'), total_value=Decimal('120')
+        )
+        # Not covered by any lot: released at the average cost
+        with self.assertLogs('django_app.utils.tax_lots', 'WARNING'):
+            holdings, _ = execute_trade(self.user, 'AAA', 'sell', Decimal('4'), Decimal('60'))
+        self.assertEqual(holdings.realized_gain_loss, Decimal('12.00'))
+        self.assertEqual(self.position(), (Decimal('6'), Decimal('72.00')))
+
+        # The migration gives the position an opening lot, consumed first under FIFO
+        import_module('django_app.migrations.0013_taxlot').create_opening_lots(django_apps, None)
+        execute_trade(self.user, 'AAA', 'buy', Decimal('10'), Decimal('200'))
+        holdings, _ = execute_trade(self.user, 'AAA', 'sell', Decimal('10'), Decimal('250'))
+        # 12 earlier, plus 250 of proceeds against the 72 opening lot and 4 new shares at 20
+        self.assertEqual(holdings.realized_gain_loss, Decimal('110.00'))
+        self.assertEqual(self.open_lots(), [(Decimal('20'), Decimal('6'), Decimal('120.00'))])
+        self.assertEqual(self.position(), (Decimal('6'), Decimal('120.00')))
+
+
+class RiskMetricsKernelTests(SimpleTestCase):
+    """
+    Risk metrics of the two-asset fixture against hand-computed values
+    """
+
+    def metrics(self, closes=FIXTURE_CLOSES, benchmark=None):
+        benchmark = FIXTURE_CLOSES[:, 0] if benchmark is None else benchmark
+        return compute_risk_metrics(closes, benchmark, np.array([150.0, 150.0]), 0.0)
+
+    def test_portfolio_metrics(self):
+        metrics = self.metrics()
+        # Daily returns at 50/50 weights: 0.05, -1/220, 1/3, 0.125
+        returns = np.array([0.05, -1 / 220, 1 / 3, 0.125])
+        self.assertEqual(metrics['observations'], 4)
+        self.assertAlmostEqual(metrics['volatility'], returns.std(ddof=1) * np.sqrt(252))
+        self.assertAlmostEqual(metrics['max_drawdown'], -1 / 220)
+        self.assertAlmostEqual(metrics['sharpe_ratio'], returns.mean() / returns.std(ddof=1) * np.sqrt(252))
+        self.assertAlmostEqual(metrics['sortino_ratio'], returns.mean() / np.sqrt((1 / 220) ** 2 / 4) * np.sqrt(252))
+        self.assertEqual(metrics['weights'], [0.5, 0.5])
+
+    def test_beta_and_risk_contribution(self):
+        metrics = self.metrics()
+        # The benchmark is asset A itself
+        self.assertAlmostEqual(metrics['asset_beta'][0], 1.0)
+        # Euler contributions add up to the portfolio volatility
+        self.assertAlmostEqual(sum(metrics['risk_contribution']), metrics['volatility'])
+        self.assertAlmostEqual(sum(metrics['risk_contribution_percent']), 100.0)
+
+    def test_window_starts_at_first_complete_row(self):
+        padded = np.vstack([[np.nan, 19.0], FIXTURE_CLOSES])
+        metrics = self.metrics(padded, np.concatenate([[9.0], FIXTURE_CLOSES[:, 0]]))
+        self.assertEqual(metrics['start_offset'], 1)
+        self.assertAlmostEqual(metrics['volatility'], self.metrics()['volatility'])
+        self.assertIsNone(self.metrics(FIXTURE_CLOSES[:2], FIXTURE_CLOSES[:2, 0]))
+
+
+class PortfolioRiskTests(TestCase):
+    """
+    Risk analytics of a user's holdings from the daily bar cache
+    """
+
+    def setUp(self):
+        cache.clear()
+        market_data._series_cache.clear()
+        self.user = User.objects.create_user(email='risk@example.com', username='risk', password='pw12345!X')
+        self.user.profile.zodiac_sign = 'Leo'
+        self.user.profile.save()
+        holdings = UserHoldings.objects.create(user=self.user, balance=Decimal('10000'))
+        first_day = date(2024, 1, 29)
+        for col, ticker in enumerate(['AAA', 'BBB']):
+            stock = Stock.objects.create(
+                ticker=ticker, company_name=ticker, zodiac_sign='Leo', current_price=Decimal(str(FIXTURE_CLOSES[-1, col]))
+            )
+            StockHolding.objects.create(
+                user_holdings=holdings, stock=stock, ticker=ticker, quantity=Decimal(str(150 / FIXTURE_CLOSES[-1, col])),
+                purchase_price=Decimal('10'), total_value=Decimal('100')
+            )
+        StockHolding.objects.create(
+            user_holdings=holdings, ticker='CCC', quantity=Decimal('1'), purchase_price=Decimal('10'), total_value=Decimal('10')
+        )
+        DailyBar.objects.bulk_create([
+            DailyBar(ticker=ticker, date=first_day + timedelta(days=row), close=float(FIXTURE_CLOSES[row, col]))
+            for row in range(len(FIXTURE_CLOSES))
+            for col, ticker in [(0, 'AAA'), (1, 'BBB'), (0, 'SPY')]
+        ])
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_risk_matches_kernel(self):
+        data = self.client.get('/api/portfolio/risk/').json()
+        expected = compute_risk_metrics(FIXTURE_CLOSES, FIXTURE_CLOSES[:, 0], np.array([150.0, 150.0]), settings.RISK_FREE_RATE)
+        for key in ('volatility', 'beta', 'max_drawdown', 'sharpe_ratio', 'sortino_ratio'):
+            self.assertAlmostEqual(data[key], expected[key])
+        self.assertEqual((data['start_date'], data['as_of']), ('2024-01-29', '2024-02-02'))
+        self.assertEqual([position['ticker'] for position in data['positions']], ['AAA', 'BBB'])
+        self.assertEqual(data['missing_tickers'], ['CCC'])
+
+    def test_trade_invalidates_cached_risk(self):
+        self.assertEqual([p['weight'] for p in self.client.get('/api/portfolio/risk/').json()['positions']], [0.5, 0.5])
+        execute_trade(self.user, 'AAA', 'buy', Decimal('10'), Decimal('150'))
+        weights = [p['weight'] for p in self.client.get('/api/portfolio/risk/').json()['positions']]
+        self.assertAlmostEqual(weights[0], 2 / 3)
+
+    def test_large_portfolios_are_computed_in_the_background(self):
+        expected = self.client.get('/api/portfolio/risk/').json()
+        cache.clear()
+        with mock.patch('django_app.utils.risk_analytics.POOL_MIN_CELLS', 1), \
+                mock.patch('django_app.utils.risk_analytics.async_task') as async_task, \
+                mock.patch('django_app.utils.risk_analytics.run_in_pool', side_effect=lambda func, *args: func(*args)):
+            for _ in range(2):
+                response = self.client.get('/api/portfolio/risk/')
+                self.assertEqual(response.status_code, 202)
+                self.assertEqual(response['Retry-After'], '2')
+            async_task.assert_called_once_with('django_app.tasks.compute_portfolio_risk', self.user.pk, '1Y')
+
+            compute_portfolio_risk(self.user.pk, '1Y')
+            response = self.client.get('/api/portfolio/risk/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), expected)
+
+    def test_no_bars(self):
+        DailyBar.objects.all().delete()
+        response = self.client.get('/api/portfolio/risk/')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.get('/api/portfolio/risk/', {'period': '2Y'}).status_code, 400)
+
+
+class CorrelationKernelTests(SimpleTestCase):
+    """
+    Blockwise top-k correlations against numpy's full correlation matrix
+    """
+
+    def test_top_k_matches_corrcoef(self):
+        returns = np.random.default_rng(7).normal(0, 0.01, size=(120, 7))
+        returns[:, 3] += returns[:, 0]  # make a few pairs clearly correlated
+        returns[:, 5] -= returns[:, 1]
+        standardized, usable = standardize_returns(returns, 60)
+        self.assertTrue(usable.all())
+
+        indices, correlations = top_k_correlations(standardized, 3, block_size=3)
+        expected = np.corrcoef(returns, rowvar=False)
+        np.fill_diagonal(expected, -np.inf)
+        np.testing.assert_array_equal(indices, np.argsort(-expected, axis=1)[:, :3])
+        np.testing.assert_allclose(correlations, -np.sort(-expected, axis=1)[:, :3], atol=1e-5)
+
+    def test_short_and_flat_columns_are_unusable(self):
+        returns = np.random.default_rng(7).normal(0, 0.01, size=(100, 3))
+        returns[:50, 1] = np.nan
+        returns[:, 2] = 0.0
+        _, usable = standardize_returns(returns, 60)
+        self.assertEqual(usable.tolist(), [True, False, False])
+
+
+class RelatedStocksTests(TestCase):
+    """
+    Nightly related stocks build and its endpoint
+    """
+
+    def setUp(self):
+        market_data._series_cache.clear()
+        rng = np.random.default_rng(11)
+        returns = rng.normal(0, 0.01, size=(90, 4))
+        returns[:, 1] += returns[:, 0]
+        closes = 100 * np.cumprod(1 + np.vstack([np.zeros((1, 4)), returns]), axis=0)
+        self.returns = returns
+        first_day = date(2024, 1, 1)
+        tickers = ['AAA', 'BBB', 'CCC', 'DDD']
+        for ticker in tickers + ['NEW']:
+            Stock.objects.create(ticker=ticker, company_name=f'{ticker} Inc', zodiac_sign='Leo', current_price=Decimal('10'))
+        DailyBar.objects.bulk_create([
+            DailyBar(ticker=ticker, date=first_day + timedelta(days=row), close=float(closes[row, col]))
+            for row in range(len(closes))
+            for col, ticker in enumerate(tickers)
+        ] + [
+            # Too little history to be correlated
+            DailyBar(ticker='NEW', date=first_day + timedelta(days=row), close=10.0 + row) for row in range(85, 91)
+        ])
+        RelatedStocks.objects.create(ticker='GONE', related=[], observations=100, as_of=first_day)
+
+    def test_build_matches_corrcoef(self):
+        self.assertEqual(build_related_stocks(k=2), 4)
+        self.assertEqual(
+            sorted(RelatedStocks.objects.values_list('ticker', flat=True)), ['AAA', 'BBB', 'CCC', 'DDD']
+        )
+
+        data = APIClient().get('/api/stocks/aaa/related/').json()
+        expected = np.corrcoef(self.returns, rowvar=False)[0]
+        self.assertEqual(
+            [row['ticker'] for row in data['related']], [['BBB', 'CCC', 'DDD'][i] for i in np.argsort(-expected[1:])[:2]]
+        )
+        self.assertAlmostEqual(data['related'][0]['correlation'], expected[1], places=4)
+        self.assertEqual(data['related'][0]['company_name'], 'BBB Inc')
+        self.assertEqual(data['observations'], 90)
+
+        self.assertEqual(len(APIClient().get('/api/stocks/AAA/related/', {'limit': 1}).json()['related']), 1)
+        self.assertEqual(APIClient().get('/api/stocks/NEW/related/').status_code, 404)
+
+
+class CosmicVibeHistoryTests(TestCase):
+    """
+    Cosmic vibe snapshots, the index in effect at chart timestamps, and the 0018 backfill
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='vibe@example.com', username='vibe', password='pw12345!X')
+        self.user.profile.zodiac_sign = 'Leo'
+        self.user.profile.save()
+        UserHoldings.objects.create(user=self.user, balance=Decimal('10000'))
+        ZodiacSignMatching.objects.create(user_sign='Leo', stock_sign='Taurus', match_type='negative')
+        Stock.objects.create(ticker='AAA', company_name='AAA', zodiac_sign='Leo', current_price=Decimal('10'))
+        Stock.objects.create(ticker='BBB', company_name='BBB', zodiac_sign='Taurus', current_price=Decimal('10'))
+
+    def snapshots(self):
+        return list(CosmicVibeSnapshot.objects.filter(user=self.user).order_by('id').values_list(
+            'cosmic_vibe_index', 'alignment_score', 'elements_held'
+        ))
+
+    def test_snapshots_follow_index_changes(self):
+        engine = PortfolioValuationEngine()
+        engine.full_load()
+        engine.persist(engine.revalue())
+        self.assertEqual(self.snapshots(), [(50, 50, 0)])
+
+        execute_trade(self.user, 'AAA', 'buy', Decimal('10'), Decimal('100'))
+        execute_trade(self.user, 'AAA', 'buy', Decimal('10'), Decimal('100'))  # same index: no snapshot
+        execute_trade(self.user, 'BBB', 'buy', Decimal('20'), Decimal('200'))
+        self.assertEqual(self.snapshots(), [(50, 50, 0), (100, 100, 1), (76, 70, 2)])
+
+        # A price move that shifts the weights is recorded by the next revaluation
+        Stock.objects.filter(ticker='BBB').update(current_price=Decimal('30'))
+        engine.sync()
+        engine.persist(engine.revalue())
+        self.assertEqual(self.snapshots()[-1], (61, 55, 2))
+        engine.persist(engine.revalue())
+        self.assertEqual(len(self.snapshots()), 4)
+
+    def test_history_reads_index_in_effect(self):
+        now = timezone.now()
+        CosmicVibeSnapshot.objects.bulk_create([
+            CosmicVibeSnapshot(user=self.user, cosmic_vibe_index=60, alignment_score=60, recorded_at=now - timedelta(hours=3)),
+            CosmicVibeSnapshot(user=self.user, cosmic_vibe_index=80, alignment_score=80, recorded_at=now - timedelta(hours=1)),
+        ])
+        timestamps = [now - timedelta(hours=hours) for hours in (4, 3, 2, 1, 0)]
+        # Times before the first snapshot get the first recorded index
+        self.assertEqual(get_cosmic_vibe_history(self.user, timestamps), [60, 60, 60, 80, 80])
+        self.assertEqual(get_cosmic_vibe_history(self.user, timestamps[3:]), [80, 80])
+        self.assertEqual(get_cosmic_vibe_history(self.user, []), [])
+
+        CosmicVibeSnapshot.objects.all().delete()
+        self.assertEqual(get_cosmic_vibe_history(self.user, timestamps[:2]), [50, 50])
+        PortfolioValuation.objects.create(user=self.user, cosmic_vibe_index=73)
+        self.assertEqual(get_cosmic_vibe_history(self.user, timestamps[:2]), [73, 73])
+
+    def test_backfill_matches_valuation_engine(self):
+        cases = [
+            (100, ['10', '10', '10', '10']),
+            (90, ['5', '0', '0', '0']),
+            (85, ['0', '1', '0', '1']),
+            (65, ['0', '0', '0', '0']),
+            (40, ['1', '1', '1', '0']),
+        ]
+        for i, (alignment, values) in enumerate(cases):
+            user = self.user if i == 0 else User.objects.create_user(
+                email=f'vibe{i}@example.com', username=f'vibe{i}', password='pw12345!X'
+            )
+            PortfolioValuation.objects.create(
+                user=user, alignment_score=alignment, cosmic_vibe_index=0,
+                **{f'{element.lower()}_value': Decimal(value) for element, value in zip(ELEMENTS, values)}
+            )
+
+        import_module('django_app.migrations.0018_cosmicvibesnapshot').record_initial_vibe(django_apps, None)
+        for valuation in PortfolioValuation.objects.all():
+            element_values = [getattr(valuation, f'{element.lower()}_value') for element in ELEMENTS]
+            expected = get_cosmic_vibe_index(valuation.alignment_score, element_values)
+            self.assertEqual(valuation.cosmic_vibe_index, expected)
+            snapshot = CosmicVibeSnapshot.objects.get(user_id=valuation.user_id)
+            self.assertEqual((snapshot.cosmic_vibe_index, snapshot.recorded_at), (expected, valuation.updated_at))
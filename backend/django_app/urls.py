@@ -32,9 +32,15 @@ api_urlpatterns = [
     
     # Stock endpoints (real-time market data)
     path('stocks/', views.StockListView.as_view(), name='stock-list'),
+    path('stocks/history/stream/', views.StockHistoryStreamView.as_view(), name='stock-history-stream'),
     path('stocks/<str:ticker>/history/', views.StockHistoryView.as_view(), name='stock-history'),
+    path('stocks/<str:ticker>/related/', views.RelatedStocksView.as_view(), name='stock-related'),
     path('stocks/<str:ticker>/', views.StockDetailView.as_view(), name='stock-detail'),
     
+    # Zodiac sign and element basket indices
+    path('baskets/', views.BasketIndexListView.as_view(), name='basket-index-list'),
+    path('baskets/<str:name>/', views.BasketIndexDetailView.as_view(), name='basket-index-detail'),
+    
     # Class-based views
     path('users/', views.UserListCreateView.as_view(), name='user-list-create'),
     path('users/<int:pk>/', views.UserDetailView.as_view(), name='user-detail'),
@@ -50,8 +56,18 @@ api_urlpatterns = [
     # Onboarding endpoint
     path('onboarding/', views.OnboardingView.as_view(), name='onboarding'),
     
-    # Holdings endpoint
+    # Holdings endpoints
     path('holdings/', views.UserHoldingsView.as_view(), name='user-holdings'),
+    path('holdings/lots/', views.TaxLotListView.as_view(), name='tax-lot-list'),
+    
+    # Limit and stop orders
+    path('orders/', views.StockOrderListView.as_view(), name='stock-order-list'),
+    path('orders/<int:pk>/', views.StockOrderDetailView.as_view(), name='stock-order-detail'),
+    
+    # Price alerts and their notifications
+    path('alerts/', views.PriceAlertListView.as_view(), name='price-alert-list'),
+    path('alerts/notifications/', views.AlertNotificationListView.as_view(), name='alert-notification-list'),
+    path('alerts/<int:pk>/', views.PriceAlertDetailView.as_view(), name='price-alert-detail'),
     
     # Portfolio summary endpoint
     path('portfolio/', views.PortfolioSummaryView.as_view(), name='portfolio-summary'),
@@ -59,6 +75,19 @@ api_urlpatterns = [
     # Portfolio history endpoint
     path('portfolio/history/', views.PortfolioHistoryView.as_view(), name='portfolio-history'),
     
+    # Portfolio risk analytics endpoint
+    path('portfolio/risk/', views.PortfolioRiskView.as_view(), name='portfolio-risk'),
+    
+    # Portfolio Monte Carlo projection endpoint
+    path('portfolio/projection/', views.PortfolioProjectionView.as_view(), name='portfolio-projection'),
+    
+    # Portfolio backtests (queued jobs)
+    path('backtests/', views.BacktestListView.as_view(), name='backtest-list'),
+    path('backtests/<int:pk>/', views.BacktestDetailView.as_view(), name='backtest-detail'),
+    
+    # Leaderboard endpoint (global, per sign and per element)
+    path('leaderboard/', views.LeaderboardView.as_view(), name='leaderboard'),
+    
     # Zodiac sign matching endpoints
     path('zodiac/matched-stocks/', views.ZodiacMatchedStocksView.as_view(), name='zodiac-matched-stocks'),
     path('zodiac/matching-rules/', views.ZodiacSignMatchingListView.as_view(), name='zodiac-matching-rules'),
@@ -67,11 +96,20 @@ api_urlpatterns = [
     path('watchlist/', views.UserWatchlistView.as_view(), name='user-watchlist'),
     path('dislike-list/', views.UserDislikeListView.as_view(), name='user-dislike-list'),
     
+    # Delta sync: quotes, holdings, preferences and horoscope changed since a token
+    path('sync/', views.SyncView.as_view(), name='sync'),
+    
     # Horoscope endpoint
     path('horoscope/', views.DailyHoroscopeView.as_view(), name='daily-horoscope'),
     
     # Market status (public endpoint)
     path('market/status/', views.market_status, name='market-status'),
+    
+    # Live market aggregates: top movers, per-sign and per-element averages (public endpoint)
+    path('market/movers/', views.MarketMoversView.as_view(), name='market-movers'),
+    
+    # Dashboard: several page-load endpoints in one request
+    path('dashboard/', views.DashboardView.as_view(), name='dashboard'),
 ]
 
 urlpatterns = [
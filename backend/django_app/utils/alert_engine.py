@@ -0,0 +1,215 @@
+"""
+Price alert engine for ZEN Trading
+Indexes active alerts per ticker in sorted threshold books (see trigger_book.py) and
+evaluates them against each price update batch at O(log n + fired) per changed ticker.
+Created and deleted alerts reach the index through the change log (see change_log.py).
+
+Fired alerts are deactivated in bulk during the tick; building and storing the user
+notifications is handed to the Django-Q2 queue so a burst of alerts never turns into
+per-user work on the price update path.
+"""
+import logging
+
+from django.utils import timezone
+
+from django_app.models import PriceAlert, AlertNotification, Stock
+from django_app.utils.change_log import ChangeLogReader
+from django_app.utils.trigger_book import TriggerBook, FIRES_AT_OR_BELOW, FIRES_AT_OR_ABOVE
+
+logger = logging.getLogger(__name__)
+
+# Changed alerts loaded per query during a sync
+SYNC_BATCH_SIZE = 500
+
+
+class AlertIndex:
+    """
+    In-memory index of active alerts
+
+    Price alerts are keyed on their price threshold, percent_change alerts on their
+    percent threshold (evaluated against the absolute move from previous_close).
+    The first sync indexes every active alert; later syncs load only the alerts named in
+    the change log since, so a sync costs O(changed alerts) whenever their transactions
+    commit. Deleted alerts are forgotten, and their book entries dropped lazily when they
+    would have fired.
+    """
+
+    def __init__(self):
+        self.price_book = TriggerBook()
+        self.percent_book = TriggerBook()
+        # alert id -> (ticker, alert type, threshold) of every indexed active alert
+        self.alerts = {}
+        self.changes = ChangeLogReader('alert')
+
+    def add(self, alert_id, ticker, alert_type, threshold):
+        """Insert an alert into the book for its type"""
+        self.alerts[alert_id] = (ticker, alert_type, threshold)
+        self._book(alert_id, ticker, alert_type, threshold)
+
+    def restore(self, alert_ids):
+        """Put popped alerts back into their books (they could not be deactivated)"""
+        for alert_id in alert_ids:
+            if alert_id in self.alerts:
+                self._book(alert_id, *self.alerts[alert_id])
+
+    def forget(self, alert_ids):
+        """Drop fired alerts once they are deactivated"""
+        for alert_id in alert_ids:
+            self.alerts.pop(alert_id, None)
+
+    def _book(self, alert_id, ticker, alert_type, threshold):
+        if alert_type == 'percent_change':
+            self.percent_book.add(ticker, FIRES_AT_OR_ABOVE, abs(threshold), alert_id)
+        elif alert_type == 'above':
+            self.price_book.add(ticker, FIRES_AT_OR_ABOVE, threshold, alert_id)
+        else:
+            self.price_book.add(ticker, FIRES_AT_OR_BELOW, threshold, alert_id)
+
+    def sync(self):
+        """
+        Index the alerts created and forget the alerts deleted since the last sync
+
+        Returns:
+            set: Tickers that received new alerts
+        """
+        if self.changes.read_at is None:
+            # First sync: index every active alert
+            self.changes.reset()
+            changed = []
+            batches = [PriceAlert.objects.filter(is_active=True)]
+        else:
+            changed = sorted(self.changes.poll())
+            batches = [
+                PriceAlert.objects.filter(id__in=changed[i:i + SYNC_BATCH_SIZE], is_active=True)
+                for i in range(0, len(changed), SYNC_BATCH_SIZE)
+            ]
+
+        active_ids = set()
+        new_tickers = set()
+        for batch in batches:
+            for alert_id, ticker, alert_type, threshold in batch.values_list('id', 'ticker', 'alert_type', 'threshold'):
+                active_ids.add(alert_id)
+                if alert_id not in self.alerts:
+                    self.add(alert_id, ticker, alert_type, threshold)
+                    new_tickers.add(ticker)
+
+        # Deleted alerts are forgotten; their book entries go lazily
+        self.forget(alert_id for alert_id in changed if alert_id not in active_ids)
+        return new_tickers
+
+    def pop_fired(self, ticker, price, previous_close):
+        """
+        Remove and return the ids of every alert on a ticker fired at a price
+
+        Args:
+            ticker (str): Ticker symbol
+            price (float): Latest price
+            previous_close (float): Previous close, or None if unknown
+
+        Returns:
+            list: Fired alert ids
+        """
+        fired = self.price_book.pop_triggered(ticker, price)
+        if previous_close:
+            move_percent = abs(price / previous_close - 1) * 100
+            fired.extend(self.percent_book.pop_triggered(ticker, move_percent))
+        return fired
+
+
+_alert_index = None
+
+
+def get_alert_index():
+    """
+    Get the process-wide alert index, loading every active alert on first use
+    """
+    global _alert_index
+    if _alert_index is None:
+        _alert_index = AlertIndex()
+    return _alert_index
+
+
+def evaluate_price_alerts(changed_prices):
+    """
+    Fire every alert crossed by a price update batch
+
+    Args:
+        changed_prices (dict): {ticker: new price} for tickers whose price moved
+
+    Returns:
+        list: Ids of the alerts that fired (to hand to deliver_alert_notifications)
+    """
+    index = get_alert_index()
+    new_tickers = index.sync()
+    tickers = set(changed_prices) | new_tickers
+    if not tickers:
+        return []
+
+    # Freshly created alerts are checked against the current price right away
+    quotes = {
+        ticker: (current_price, previous_close)
+        for ticker, current_price, previous_close in Stock.objects.filter(ticker__in=tickers).values_list(
+            'ticker', 'current_price', 'previous_close'
+        )
+    }
+
+    now = timezone.now()
+    fired_ids = []
+    for ticker in tickers:
+        current_price, previous_close = quotes.get(ticker, (None, None))
+        price = changed_prices.get(ticker, current_price)
+        if price is None:
+            continue
+        price = float(price)
+
+        fired = index.pop_fired(ticker, price, float(previous_close) if previous_close else None)
+        if not fired:
+            continue
+
+        # Deactivate in bulk; alerts deleted since they were indexed simply don't match
+        try:
+            active = list(PriceAlert.objects.filter(id__in=fired, is_active=True).values_list('id', flat=True))
+            if active:
+                PriceAlert.objects.filter(id__in=active).update(
+                    is_active=False, triggered_price=round(price, 2), triggered_at=now
+                )
+        except Exception as e:
+            logger.error(f"Error deactivating alerts for {ticker}: {str(e)}")
+            # Still active: they fire again on a later batch
+            index.restore(fired)
+            continue
+        index.forget(fired)
+        fired_ids.extend(active)
+
+    if fired_ids:
+        logger.info(f"{len(fired_ids)} price alert(s) fired")
+    return fired_ids
+
+
+def build_alert_message(alert):
+    """
+    Get the notification text for a fired alert
+    """
+    if alert.alert_type == 'percent_change':
+        return f'{alert.ticker} moved {alert.threshold}% from its previous close (now ${alert.triggered_price})'
+    direction = 'above' if alert.alert_type == 'above' else 'below'
+    return f'{alert.ticker} is {direction} ${alert.threshold} (now ${alert.triggered_price})'
+
+
+def create_alert_notifications(alert_ids):
+    """
+    Create the user notifications for fired alerts in bulk
+
+    Args:
+        alert_ids (list): Ids of fired alerts
+
+    Returns:
+        int: Number of notifications created
+    """
+    alerts = PriceAlert.objects.filter(id__in=alert_ids, is_active=False)
+    notifications = [
+        AlertNotification(user_id=alert.user_id, alert=alert, message=build_alert_message(alert))
+        for alert in alerts
+    ]
+    AlertNotification.objects.bulk_create(notifications, batch_size=1000)
+    return len(notifications)
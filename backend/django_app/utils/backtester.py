@@ -0,0 +1,181 @@
+"""
+Portfolio backtester for ZEN Trading
+Simulates "what if I had bought this basket N years ago" over the daily bar cache, with
+optional periodic rebalancing, and tracks the basket's cosmic vibe index along the way.
+
+Backtests run as jobs: the API queues a BacktestJob, a Django-Q2 task computes it (handing
+large simulations to the compute process pool) and the result is polled from the job.
+"""
+import logging
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from django_app.models import BacktestJob, Stock, StockHolding, ZodiacSignMatching, get_element_from_zodiac
+from django_app.utils.compute_pool import run_in_pool
+from django_app.utils.market_data import (
+    BENCHMARK_TICKER,
+    get_close_matrix,
+    get_history_start,
+    get_latest_bar_date,
+)
+from django_app.utils.quant import first_complete_row, rebalance_starts, run_backtest
+from django_app.utils.valuation_engine import ELEMENTS, get_alignment_score
+
+logger = logging.getLogger(__name__)
+
+# Lookback in years per horizon
+BACKTEST_HORIZONS = {'1Y': 1, '3Y': 3, '5Y': 5, '10Y': 10}
+
+REBALANCE_POLICIES = ['none', 'monthly', 'quarterly', 'yearly']
+
+# Simulations with at least this many cells (days x assets) run in the process pool
+POOL_MIN_CELLS = 50_000
+
+
+class BacktestError(Exception):
+    """
+    Raised when a backtest cannot be run (unknown tickers, no history, ...)
+    """
+
+
+def get_holdings_basket(user):
+    """
+    Get the user's current positions as a basket weighted by market value
+
+    Returns:
+        tuple: (tickers, weights)
+
+    Raises:
+        BacktestError: If the user holds no priced positions
+    """
+    rows = list(
+        StockHolding.objects.filter(user_holdings__user=user).values_list('ticker', 'quantity', 'stock__current_price')
+    )
+    positions = {ticker: quantity for ticker, quantity, _ in rows}
+    prices = {ticker: price for ticker, _, price in rows if price is not None and price > 0}
+    tickers = sorted(prices)
+    if not tickers:
+        raise BacktestError('You have no priced positions to backtest.')
+    values = [float(positions[ticker] * prices[ticker]) for ticker in tickers]
+    total = sum(values)
+    return tickers, [value / total for value in values]
+
+
+def compute_backtest(user, params):
+    """
+    Run a backtest for a user
+
+    Args:
+        user (User): Owner (their zodiac sign drives the cosmic vibe index)
+        params (dict): tickers, weights, rebalance, horizon, initial_value
+
+    Returns:
+        dict: Simulation result with dates, equity and cosmic vibe series and summary stats
+
+    Raises:
+        BacktestError: If the basket has no usable history
+    """
+    latest = get_latest_bar_date()
+    if latest is None:
+        raise BacktestError('Daily price history has not been synced yet.')
+
+    tickers = params['tickers']
+    weights = np.asarray(params['weights'], dtype=np.float64)
+    weights = weights / weights.sum()
+
+    start = get_history_start(latest, BACKTEST_HORIZONS[params['horizon']])
+    dates, closes = get_close_matrix(tickers + [BENCHMARK_TICKER], start=start)
+    asset_closes, benchmark_closes = closes[:, :-1], closes[:, -1]
+
+    missing = [ticker for ticker, ok in zip(tickers, np.isfinite(asset_closes).any(axis=0)) if not ok]
+    if missing:
+        raise BacktestError(f'No price history for: {", ".join(missing)}')
+
+    # The simulation starts once every ticker in the basket has a price
+    first = first_complete_row(asset_closes)
+    dates, asset_closes, benchmark_closes = dates[first:], asset_closes[first:], benchmark_closes[first:]
+    if len(dates) < 2:
+        raise BacktestError('Not enough overlapping price history for this basket.')
+    if not np.isfinite(benchmark_closes).all():
+        benchmark_closes = None
+
+    # Alignment score and element of every ticker for the user's sign
+    user_sign = user.profile.zodiac_sign
+    stock_signs = dict(Stock.objects.filter(ticker__in=tickers).values_list('ticker', 'zodiac_sign'))
+    matching_table = {
+        (user_sign, stock_sign): match_type
+        for stock_sign, match_type in ZodiacSignMatching.objects.filter(user_sign=user_sign).values_list(
+            'stock_sign', 'match_type'
+        )
+    }
+    alignment_scores = np.array(
+        [get_alignment_score(user_sign, stock_signs.get(ticker), matching_table) for ticker in tickers],
+        dtype=np.float64,
+    )
+    element_index = np.array(
+        [
+            ELEMENTS.index(element) if element in ELEMENTS else len(ELEMENTS)
+            for element in (get_element_from_zodiac(stock_signs.get(ticker)) for ticker in tickers)
+        ],
+        dtype=np.int64,
+    )
+
+    args = (
+        asset_closes,
+        weights,
+        rebalance_starts(dates, params['rebalance']),
+        alignment_scores,
+        element_index,
+        len(ELEMENTS),
+        benchmark_closes,
+        float(params['initial_value']),
+        settings.RISK_FREE_RATE,
+    )
+    if asset_closes.size >= POOL_MIN_CELLS:
+        result = run_in_pool(run_backtest, *args)
+    else:
+        result = run_backtest(*args)
+
+    result.update({
+        'tickers': tickers,
+        'weights': weights.tolist(),
+        'rebalance': params['rebalance'],
+        'horizon': params['horizon'],
+        'benchmark': BENCHMARK_TICKER if benchmark_closes is not None else None,
+        'start_date': str(dates[0]),
+        'end_date': str(dates[-1]),
+        'dates': dates.astype(str).tolist(),
+    })
+    return result
+
+
+def run_backtest_job(job_id):
+    """
+    Execute a queued backtest job and store its result on the job
+
+    Args:
+        job_id (int): BacktestJob id
+
+    Returns:
+        str: Final job status
+    """
+    job = BacktestJob.objects.select_related('user__profile').get(pk=job_id)
+    job.status = 'running'
+    job.save(update_fields=['status'])
+
+    try:
+        job.result = compute_backtest(job.user, job.params)
+        job.status = 'completed'
+    except BacktestError as e:
+        job.status = 'failed'
+        job.error = str(e)[:255]
+    except Exception as e:
+        logger.error(f"Error running backtest job {job_id}: {str(e)}")
+        job.status = 'failed'
+        job.error = 'Backtest failed unexpectedly'
+
+    job.completed_at = timezone.now()
+    job.save(update_fields=['status', 'result', 'error', 'completed_at'])
+    return job.status
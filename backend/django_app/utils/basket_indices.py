@@ -0,0 +1,178 @@
+"""
+Zodiac sign and element basket indices for ZEN Trading
+Equal- and cap-weighted index levels of every sign's and element's stocks, computed from
+the daily bar cache and stored as one compact series per basket (see BasketIndex).
+
+The nightly build is incremental: each series is chained from its last stored level over
+only the bars that arrived since, so history is never recomputed. Pass rebuild=True to
+recompute every series from the full bar history (e.g. after restating bars).
+"""
+import bisect
+import logging
+
+import numpy as np
+
+from django_app.models import BasketIndex, Stock, get_element_from_zodiac
+from django_app.utils.market_data import get_close_matrix, get_latest_bar_date
+from django_app.utils.quant import basket_returns
+
+logger = logging.getLogger(__name__)
+
+# Level of every index on its first day
+BASE_LEVEL = 100.0
+
+# Calendar days of history returned per chart period (None = full history)
+INDEX_PERIODS = {'1M': 30, '3M': 91, '6M': 182, '1Y': 365, '5Y': 1826, 'ALL': None}
+
+WEIGHTINGS = [weighting for weighting, _ in BasketIndex.WEIGHTINGS]
+
+
+def get_baskets():
+    """
+    Group the stock universe into sign and element baskets
+
+    Returns:
+        dict: {(basket_type, name): [tickers]}
+    """
+    baskets = {}
+    for ticker, zodiac_sign in Stock.objects.filter(zodiac_sign__isnull=False).values_list('ticker', 'zodiac_sign'):
+        element = get_element_from_zodiac(zodiac_sign)
+        if element == 'Unknown':
+            continue
+        baskets.setdefault(('sign', zodiac_sign), []).append(ticker)
+        baskets.setdefault(('element', element), []).append(ticker)
+    return baskets
+
+
+def extend_series(dates, values, calendar, closes, shares=None):
+    """
+    Append the index levels of the calendar days after a series' last date
+
+    Args:
+        dates (list): Stored ISO dates (empty for a new series)
+        values (list): Stored levels, parallel to dates
+        calendar (numpy.ndarray): Trading days as datetime64[D], covering the last stored date
+        closes (numpy.ndarray): Calendar x constituents closes
+        shares (numpy.ndarray): Shares outstanding per constituent; None for equal weights
+
+    Returns:
+        tuple: (dates, values) including the appended days
+    """
+    if values:
+        first = int(np.searchsorted(calendar, np.datetime64(dates[-1]), side='right')) - 1
+        if first < 0:
+            return dates, values
+        level = values[-1]
+    else:
+        has_close = np.isfinite(closes).any(axis=1)
+        if not has_close.any():
+            return dates, values
+        first = int(np.argmax(has_close))
+        dates, values, level = [str(calendar[first])], [BASE_LEVEL], BASE_LEVEL
+
+    returns = np.nan_to_num(basket_returns(closes[first:], shares))
+    if not len(returns):
+        return dates, values
+    levels = level * np.cumprod(1.0 + returns)
+    return (
+        dates + [str(day) for day in calendar[first + 1:]],
+        values + np.round(levels, 4).tolist(),
+    )
+
+
+def update_basket_indices(rebuild=False):
+    """
+    Append the latest bars to every sign and element index
+
+    Args:
+        rebuild (bool): Recompute every series from the full bar history
+
+    Returns:
+        int: Number of series written
+    """
+    latest = get_latest_bar_date()
+    if latest is None:
+        logger.info("No daily bars cached yet, skipping basket index update")
+        return 0
+
+    baskets = get_baskets()
+    shares = dict(
+        Stock.objects.filter(shares_outstanding__gt=0).values_list('ticker', 'shares_outstanding')
+    )
+    existing = {} if rebuild else {
+        (index.basket_type, index.name, index.weighting): index
+        for index in BasketIndex.objects.all()
+    }
+
+    # Load the universe once, from the oldest last date among the series (full history if any is new)
+    keys = [(basket_type, name, weighting) for basket_type, name in baskets for weighting in WEIGHTINGS]
+    if all(key in existing and existing[key].dates for key in keys):
+        start = min(existing[key].dates[-1] for key in keys)
+    else:
+        start = None
+    tickers = sorted({ticker for members in baskets.values() for ticker in members})
+    calendar, closes = get_close_matrix(tickers, start=start, use_cache=False)
+    columns = {ticker: i for i, ticker in enumerate(tickers)}
+
+    rows = []
+    for (basket_type, name), members in sorted(baskets.items()):
+        for weighting in WEIGHTINGS:
+            if weighting == 'cap':
+                weighted = [ticker for ticker in members if ticker in shares]
+                if not weighted:
+                    continue
+                member_shares = np.array([shares[ticker] for ticker in weighted], dtype=np.float64)
+            else:
+                weighted, member_shares = members, None
+
+            index = existing.get((basket_type, name, weighting)) or BasketIndex(
+                basket_type=basket_type, name=name, weighting=weighting
+            )
+            index.dates, index.values = extend_series(
+                index.dates, index.values, calendar, closes[:, [columns[ticker] for ticker in weighted]],
+                member_shares,
+            )
+            index.constituents = len(weighted)
+            if index.values:
+                rows.append(index)
+
+    BasketIndex.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['basket_type', 'name', 'weighting'],
+        update_fields=['dates', 'values', 'constituents', 'updated_at'],
+    )
+    logger.info(f"Basket indices updated: {len(rows)} series through {latest}")
+    return len(rows)
+
+
+def slice_series(index, period):
+    """
+    Get the part of a basket index series inside a chart period
+
+    Args:
+        index (BasketIndex): Stored series
+        period (str): One of INDEX_PERIODS
+
+    Returns:
+        tuple: (dates, values)
+    """
+    days = INDEX_PERIODS[period]
+    if days is None or not index.dates:
+        return index.dates, index.values
+    start = str(np.datetime64(index.dates[-1]) - np.timedelta64(days, 'D'))
+    first = bisect.bisect_left(index.dates, start)
+    return index.dates[first:], index.values[first:]
+
+
+def get_change_percent(index, days):
+    """
+    Get the index's percent change over the last N calendar days (None if too little history)
+    """
+    if len(index.values) < 2:
+        return None
+    start = str(np.datetime64(index.dates[-1]) - np.timedelta64(days, 'D'))
+    first = bisect.bisect_right(index.dates, start) - 1
+    if first < 0:
+        return None
+    return round((index.values[-1] / index.values[first] - 1) * 100, 2)
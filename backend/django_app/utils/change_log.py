@@ -0,0 +1,66 @@
+"""
+Change log reader for the in-memory engines of ZEN Trading
+Writes the engines must apply record a ChangeLogEntry in the same transaction, so an engine
+catches up by reading the entries written since its last poll instead of rescanning the tables
+it mirrors.
+
+An entry's created_at is taken when it is inserted, not when its transaction commits, so a
+plain "created_at > last poll" watermark would skip an entry that commits late. Readers
+instead re-read the last CHANGE_LOG_LAG of entries on every poll and skip the ids they have
+already applied: a poll costs O(entries in that window), and any transaction shorter than the
+lag is picked up.
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+from django_app.models import ChangeLogEntry
+
+# How long after it was written an entry is still read (longer than any write transaction)
+CHANGE_LOG_LAG = timedelta(minutes=5)
+
+# How long entries are kept before the nightly prune
+CHANGE_LOG_RETENTION = timedelta(days=1)
+
+
+class ChangeLogReader:
+    """
+    Reads the changed object ids of one kind of ChangeLogEntry, each entry once
+    """
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.read_at = None
+        # entry id -> created_at of the entries read within the lag window
+        self.seen = {}
+
+    def reset(self):
+        """
+        Start reading from now; call right before loading the state the entries describe
+        """
+        self.read_at = timezone.now()
+        self.seen = {}
+
+    def poll(self):
+        """
+        Get the ids of the objects changed since the last poll
+
+        Returns:
+            set: Changed object ids
+        """
+        now = timezone.now()
+        entries = ChangeLogEntry.objects.filter(
+            kind=self.kind, created_at__gt=self.read_at - CHANGE_LOG_LAG
+        ).values_list('id', 'object_id', 'created_at')
+
+        changed = set()
+        for entry_id, object_id, created_at in entries:
+            if entry_id not in self.seen:
+                self.seen[entry_id] = created_at
+                changed.add(object_id)
+
+        # Entries older than the next poll's window are never read again
+        cutoff = now - CHANGE_LOG_LAG
+        self.seen = {entry_id: created_at for entry_id, created_at in self.seen.items() if created_at > cutoff}
+        self.read_at = now
+        return changed
@@ -0,0 +1,84 @@
+"""
+Row and columnar history payloads for ZEN Trading
+History endpoints return one dict per bar by default, or parallel arrays (one per field):
+
+    {"layout": "columns", "data": {"timestamp": [...], "open": [...], ..., "volume": [...]}}
+
+Arrays come straight from the DataFrame's NumPy buffers without iterating rows, and timestamps
+are Unix seconds (int64), so neither keys nor ISO strings are repeated per bar. The JSON
+renderer writes the arrays natively (orjson); the MessagePack renderer packs them in binary.
+"""
+import numpy as np
+
+LAYOUTS = ('rows', 'columns')
+
+
+class LayoutError(Exception):
+    """
+    Raised for an unknown layout query parameter
+    """
+
+
+def get_layout(request):
+    """
+    Get the requested history layout: ?layout=rows|columns, columns by default for binary formats
+
+    Raises:
+        LayoutError: If the layout is not one of LAYOUTS
+    """
+    default = 'columns' if getattr(request.accepted_renderer, 'render_style', 'text') == 'binary' else 'rows'
+    layout = request.query_params.get('layout', default).lower()
+    if layout not in LAYOUTS:
+        raise LayoutError(f'Layout must be one of: {", ".join(LAYOUTS)}')
+    return layout
+
+
+def epoch_seconds(index):
+    """
+    Unix seconds of a DatetimeIndex (naive indexes are taken as UTC)
+    as_unit keeps this independent of the index resolution (ns, us, ...)
+    """
+    return index.as_unit('s').asi8
+
+
+def ohlcv_columns(hist):
+    """
+    Columns of a yfinance history DataFrame (Open, High, Low, Close, Volume)
+
+    Returns:
+        dict: timestamp (Unix seconds), open, high, low, close and volume arrays
+    """
+    return {
+        'timestamp': epoch_seconds(hist.index),
+        'open': hist['Open'].to_numpy(dtype=np.float64),
+        'high': hist['High'].to_numpy(dtype=np.float64),
+        'low': hist['Low'].to_numpy(dtype=np.float64),
+        'close': hist['Close'].to_numpy(dtype=np.float64),
+        'volume': hist['Volume'].fillna(0).to_numpy(dtype=np.int64),
+    }
+
+
+def ohlcv_rows(hist):
+    """
+    Rows of a yfinance history DataFrame, one dict per bar with an ISO 8601 timestamp
+    Built column-wise: tolist() yields plain floats and ints without iterating the DataFrame.
+    """
+    return [
+        {
+            'timestamp': timestamp.isoformat(),
+            'open': open_,
+            'high': high,
+            'low': low,
+            'close': close,
+            'volume': volume
+        }
+        for timestamp, open_, high, low, close, volume in zip(
+            hist.index,
+            hist['Open'].astype(float).tolist(),
+            hist['High'].astype(float).tolist(),
+            hist['Low'].astype(float).tolist(),
+            hist['Close'].astype(float).tolist(),
+            hist['Volume'].fillna(0).astype('int64').tolist(),
+        )
+    ]
+
@@ -0,0 +1,81 @@
+"""
+Content coding helpers for ZEN Trading responses
+Brotli is preferred when the client accepts it, gzip otherwise. Used by the pre-rendered stock
+list and by CompressionMiddleware.
+"""
+import gzip
+import zlib
+
+import brotli
+
+# Content codings in order of preference
+ENCODINGS = ('br', 'gzip')
+
+# Levels for responses compressed per request: most of the size reduction of the maximum
+# levels at a fraction of their CPU time
+BROTLI_QUALITY = 5
+GZIP_LEVEL = 6
+
+
+def choose_encoding(accept_encoding, available):
+    """
+    Pick the content coding to send for an Accept-Encoding header
+
+    Args:
+        accept_encoding (str): Accept-Encoding request header
+        available (iterable): Content codings that have a body
+
+    Returns:
+        str: 'br', 'gzip' or 'identity'
+    """
+    accepted = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = quality
+
+    best, best_quality = 'identity', 0.0
+    for coding in ENCODINGS:
+        quality = accepted.get(coding, accepted.get('*', 0.0))
+        if coding in available and quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body, coding):
+    """
+    Compress a body with the 'br' or 'gzip' content coding
+    """
+    if coding == 'br':
+        return brotli.compress(body, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_stream(chunks, coding):
+    """
+    Compress an iterable of byte chunks, flushing after each chunk so a client can decode
+    every chunk as soon as it arrives (e.g. one NDJSON line at a time)
+    """
+    if coding == 'br':
+        compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+
+    # wbits 16 + MAX_WBITS writes the gzip header and trailer
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
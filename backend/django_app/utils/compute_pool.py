@@ -0,0 +1,85 @@
+"""
+Shared process pool for CPU-heavy analytics
+Keeps long NumPy computations off the request threads and out of the GIL. Functions
+sent to the pool must be importable without Django (see quant.py).
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_compute_pool():
+    """
+    Get the process-wide compute pool, starting it on first use
+
+    Workers are spawned rather than forked so they never inherit database connections
+    or locks held by the web server's threads.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.COMPUTE_POOL_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _pool
+
+
+def run_in_pool(func, *args, timeout=None):
+    """
+    Run a function in the compute pool and wait for its result
+
+    Falls back to running in the calling process if the pool is broken (e.g. a worker
+    was killed), so a pool failure never fails the request.
+
+    Args:
+        func (callable): Module-level function importable without Django
+        *args: Picklable arguments
+        timeout (float): Seconds to wait for the result (default: no limit)
+
+    Returns:
+        The function's return value
+    """
+    global _pool
+    try:
+        return get_compute_pool().submit(func, *args).result(timeout=timeout)
+    except BrokenProcessPool:
+        logger.error("Compute pool is broken, restarting it and running inline")
+        with _pool_lock:
+            _pool = None
+        return func(*args)
+
+
+def map_in_pool(func, arg_tuples, timeout=None):
+    """
+    Run a function over several argument tuples in parallel in the compute pool
+
+    Falls back to running every call in the calling process if the pool is broken.
+
+    Args:
+        func (callable): Module-level function importable without Django
+        arg_tuples (list): Picklable argument tuples, one per call
+        timeout (float): Seconds to wait for all results (default: no limit)
+
+    Returns:
+        list: Return values in the order of arg_tuples
+    """
+    global _pool
+    try:
+        pool = get_compute_pool()
+        futures = [pool.submit(func, *args) for args in arg_tuples]
+        return [future.result(timeout=timeout) for future in futures]
+    except BrokenProcessPool:
+        logger.error("Compute pool is broken, restarting it and running inline")
+        with _pool_lock:
+            _pool = None
+        return [func(*args) for args in arg_tuples]
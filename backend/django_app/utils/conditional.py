@@ -0,0 +1,184 @@
+"""
+Conditional GET for ZEN Trading
+Read endpoints tag their responses with a weak ETag built from cheap version stamps (the price
+epoch, a user's data version, a stock's last update, today's horoscope, ...) and answer a
+matching If-None-Match, or an If-Modified-Since no older than their Last-Modified, with
+304 Not Modified before the view body runs, so an unchanged poll skips both the queries and the
+serialization of the full response.
+
+Like the response cache, stamps are read before the view runs, so a response can never be
+tagged with a version newer than the data it was built from.
+"""
+import hashlib
+from datetime import date
+from functools import wraps
+
+from django.db.models import CharField, OuterRef, Subquery, Value
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+
+from django_app.models import DailyHoroscope, MarketSnapshot, PriceEpoch, Stock, UserProfile, ZodiacSignMatching
+from django_app.utils.response_cache import get_cache_versions
+
+
+def make_etag(*stamps):
+    """
+    Build a weak ETag from version stamps
+    """
+    digest = hashlib.md5(':'.join(str(stamp) for stamp in stamps).encode(), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"'
+
+
+def is_not_modified(request, etag, last_modified=None):
+    """
+    Check a GET's validators against the current ETag and Last-Modified
+    If-None-Match takes precedence; If-Modified-Since is only used without it.
+    """
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        tags = {tag.removeprefix('W/') for tag in parse_etags(if_none_match)}
+        return '*' in tags or etag.removeprefix('W/') in tags
+
+    if last_modified is not None:
+        since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        return since is not None and int(last_modified.timestamp()) <= since
+    return False
+
+
+def set_validators(request, response, etag, last_modified=None):
+    """
+    Add ETag, Last-Modified and Cache-Control (revalidate on every use) to a response
+    """
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    if request.user.is_authenticated:
+        patch_cache_control(response, no_cache=True, private=True)
+    else:
+        patch_cache_control(response, no_cache=True)
+    return response
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    Build the 304 response for a matching conditional GET
+    """
+    return set_validators(request, HttpResponseNotModified(), etag, last_modified)
+
+
+def conditional_response(name, validators, params=()):
+    """
+    Answer conditional GETs of an APIView method from version stamps
+
+    Args:
+        name (str): ETag namespace of the endpoint
+        validators (callable): validators(request, *args, **kwargs) returning
+                               (stamps tuple, last_modified datetime or None), or None to run
+                               the view without validators (e.g. nothing to compare yet)
+        params (tuple): Query parameters the response depends on
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            found = validators(request, *args, **kwargs)
+            if found is None:
+                return view_method(self, request, *args, **kwargs)
+
+            stamps, last_modified = found
+            etag = make_etag(
+                name,
+                request.user.pk,
+                request.accepted_renderer.format,
+                *args,
+                *sorted(kwargs.items()),
+                *stamps,
+                *(request.GET.get(param, '') for param in params),
+            )
+            if is_not_modified(request, etag, last_modified):
+                return not_modified(request, etag, last_modified)
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                set_validators(request, response, etag, last_modified)
+            return response
+        return wrapper
+    return decorator
+
+
+def price_epoch_validators(request, *args, **kwargs):
+    """
+    Validators of responses that only change with a price batch
+    """
+    epoch, updated_at = PriceEpoch.objects.filter(pk=1).values_list('epoch', 'updated_at').first() or (0, None)
+    return (epoch,), updated_at
+
+
+def stock_validators(request, ticker):
+    """
+    Validators of a stock's detail: its last update and the user's sign it is matched against
+    """
+    if request.user.is_authenticated:
+        user_sign = Subquery(UserProfile.objects.filter(user=request.user.pk).values('zodiac_sign')[:1])
+    else:
+        user_sign = Value(None, output_field=CharField())
+    row = Stock.objects.filter(ticker=ticker.upper()).annotate(user_sign=user_sign).values_list(
+        'last_updated', 'user_sign'
+    ).first()
+    if row is None:
+        return None
+    last_updated, user_sign = row
+    return (last_updated.timestamp(), user_sign), last_updated
+
+
+def matching_rules_validators(request, *args, **kwargs):
+    """
+    Validators of the zodiac matching rules: a digest of the whole table (at most 144 rows),
+    so rules edited in place change the ETag as well as rules reloaded wholesale
+    """
+    rules = ZodiacSignMatching.objects.order_by('id').values_list(
+        'id', 'user_sign', 'stock_sign', 'match_type', 'element'
+    )
+    digest = hashlib.md5(repr(list(rules)).encode(), usedforsecurity=False).hexdigest()
+    return (digest,), None
+
+
+def horoscope_validators(request):
+    """
+    Validators of today's horoscope: the user's sign and style, the horoscope and the market snapshot
+    Returns None until today's horoscope exists, so the view can generate it.
+    """
+    today = date.today()
+    horoscope = DailyHoroscope.objects.filter(
+        zodiac_sign=OuterRef('zodiac_sign'), investing_style=OuterRef('investing_style'), date=today
+    )
+    row = UserProfile.objects.filter(user=request.user.pk).annotate(
+        horoscope_id=Subquery(horoscope.values('id')[:1]),
+        market_updated=Subquery(MarketSnapshot.objects.filter(pk=1).values('updated_at')[:1]),
+    ).values_list('zodiac_sign', 'investing_style', 'horoscope_id', 'market_updated').first()
+    if row is None or row[2] is None:
+        return None
+    zodiac_sign, investing_style, horoscope_id, market_updated = row
+    market_stamp = market_updated.timestamp() if market_updated else None
+    return (today.isoformat(), zodiac_sign, investing_style, horoscope_id, market_stamp), None
+
+
+def user_data_validators(request, *args, **kwargs):
+    """
+    Validators of responses built from the user's holdings or preferences only
+    """
+    versions = get_cache_versions(request.user)
+    if versions is None:
+        return None
+    return (versions[0],), None
+
+
+def user_prices_validators(request, *args, **kwargs):
+    """
+    Validators of responses built from the user's data and current prices
+    """
+    versions = get_cache_versions(request.user)
+    if versions is None:
+        return None
+    return versions, None
@@ -0,0 +1,145 @@
+"""
+Composite dashboard responses for ZEN Trading
+GET /api/dashboard/ runs the GET handlers of several endpoints (portfolio, history, holdings,
+horoscope, watchlist, market status) inside one request:
+
+- authentication, the user's profile and their holdings are loaded once and shared by every
+  section (the handlers read holdings through load_holdings)
+- sections that wait on the network (yfinance) run on worker threads while the database
+  sections run on the request thread
+- a failing section is reported under "errors" and never fails the others
+- the client's conditional headers are dropped first: they describe the dashboard, and a
+  section must always produce a body, never a 304 of its own endpoint
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+from rest_framework.response import Response
+
+from django_app.models import UserHoldings
+
+logger = logging.getLogger(__name__)
+
+# Worker threads for the network-bound sections of one dashboard request
+DASHBOARD_WORKERS = 4
+
+# Request headers that would let a section answer 304 Not Modified (or 412)
+CONDITIONAL_HEADERS = ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE', 'HTTP_IF_MATCH', 'HTTP_IF_UNMODIFIED_SINCE')
+
+
+class DashboardError(Exception):
+    """
+    Raised for an unknown section name
+    """
+
+
+def load_holdings(request):
+    """
+    Get the authenticated user's UserHoldings, loaded once per request
+
+    Raises:
+        UserHoldings.DoesNotExist: If the user has no holdings yet
+    """
+    holdings = getattr(request, '_user_holdings', None)
+    if holdings is None:
+        holdings = UserHoldings.objects.get(user=request.user)
+        request._user_holdings = holdings
+    return holdings
+
+
+def parse_sections(value, available):
+    """
+    Parse a comma-separated sections list (default: every available section, in order)
+
+    Raises:
+        DashboardError: If a section does not exist
+    """
+    if not value:
+        return list(available)
+    sections = list(dict.fromkeys(name.strip().lower() for name in value.split(',') if name.strip()))
+    unknown = [name for name in sections if name not in available]
+    if unknown:
+        raise DashboardError(f'Unknown sections: {", ".join(unknown)}. Available: {", ".join(available)}')
+    return sections
+
+
+def run_section(view_class, request):
+    """
+    Run an APIView's GET handler on an already authenticated request
+
+    Returns:
+        tuple: (status code, response data)
+    """
+    view = view_class()
+    view.request = request
+    view.args, view.kwargs = (), {}
+    view.format_kwarg = None
+    view.headers = {}
+    try:
+        response = view.get(request)
+    except Exception as e:
+        logger.exception("Dashboard section %s failed", view_class.__name__)
+        return 500, {'error': 'Section failed', 'detail': str(e)}
+    if not isinstance(response, Response):
+        return response.status_code, {'error': 'Section failed', 'detail': 'Unexpected response'}
+    return response.status_code, response.data
+
+
+def _run_section_in_thread(view_class, request):
+    try:
+        return run_section(view_class, request)
+    finally:
+        # Worker threads open their own database connections; don't leak them
+        connections.close_all()
+
+
+def build_dashboard(request, sections, handlers, threaded=()):
+    """
+    Run the requested sections and collect them into one document
+
+    Args:
+        request: Authenticated DRF request shared by every section
+        sections (list): Section names, in response order
+        handlers (dict): APIView class by section name
+        threaded (iterable): Sections to run on worker threads (network-bound ones)
+
+    Returns:
+        dict: {'sections': {name: data}, 'errors': {name: {'status', 'error', 'detail'}}}
+    """
+    for header in CONDITIONAL_HEADERS:
+        request.META.pop(header, None)
+
+    # Load what the sections share before any thread starts
+    request.user.profile
+    try:
+        load_holdings(request)
+    except UserHoldings.DoesNotExist:
+        pass
+
+    results = {}
+    background = [name for name in sections if name in threaded]
+    executor = ThreadPoolExecutor(max_workers=min(DASHBOARD_WORKERS, len(background))) if background else None
+    try:
+        futures = {name: executor.submit(_run_section_in_thread, handlers[name], request) for name in background}
+        for name in sections:
+            if name not in futures:
+                results[name] = run_section(handlers[name], request)
+        for name, future in futures.items():
+            results[name] = future.result()
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    document = {'sections': {}, 'errors': {}}
+    for name in sections:
+        status_code, data = results[name]
+        if status_code < 400:
+            document['sections'][name] = data
+        else:
+            document['errors'][name] = {
+                'status': status_code,
+                'error': data.get('error', 'Section failed') if isinstance(data, dict) else 'Section failed',
+                'detail': data.get('detail', '') if isinstance(data, dict) else str(data),
+            }
+    return document
@@ -0,0 +1,122 @@
+"""
+Delta sync for ZEN Trading
+Returns what changed since a sync token, so a polling client downloads bytes proportional to
+the changes instead of refetching whole collections:
+
+- stocks whose quote changed (Stock.last_updated, saved only when the quote moves)
+- the user's balance, positions and watchlist/dislike entries (updated_at / created_at)
+- today's horoscope, when it or the user's sign and style changed
+- tombstones of deleted stocks, positions and preferences (SyncTombstone)
+
+A token is the server time of the previous sync minus SYNC_OVERLAP, so rows written by
+transactions still in flight at that moment are sent again rather than missed; clients
+apply deletions first, then upsert by ticker. Tokens older than SYNC_RETENTION (tombstones are
+pruned after it) and requests without a token get a full sync flagged with reset.
+"""
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.utils import timezone
+
+from django_app.models import DailyHoroscope, Stock, StockHolding, SyncTombstone, UserHoldings, UserProfile, UserStockPreference
+from django_app.serializers import DailyHoroscopeSerializer, StockHoldingSerializer, StockQuoteSerializer, UserStockPreferenceSerializer
+
+# Rows written this long before a sync are sent again by the next one
+SYNC_OVERLAP = timedelta(seconds=5)
+
+# Tombstones are kept this long; older tokens get a full sync
+SYNC_RETENTION = timedelta(days=7)
+
+
+class SyncTokenError(Exception):
+    """
+    Raised when a sync token cannot be parsed
+    """
+
+
+def make_token(moment):
+    """
+    Encode a moment as a sync token (microseconds since the epoch)
+    """
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def parse_token(token):
+    """
+    Decode a sync token
+
+    Raises:
+        SyncTokenError: If the token is not one issued by make_token
+    """
+    try:
+        micros = int(token)
+        return datetime.fromtimestamp(micros / 1_000_000, tz=dt_timezone.utc)
+    except (TypeError, ValueError, OverflowError, OSError):
+        raise SyncTokenError('Sync token must be a value returned by a previous sync')
+
+
+def get_changes(user, token=None):
+    """
+    Get what changed for a user since a sync token
+
+    Args:
+        user: Authenticated user
+        token (str): Token returned by the previous sync, or None for a full sync
+
+    Returns:
+        dict: token, reset, stocks, holdings, positions, preferences, horoscope and the
+              deleted tickers of stocks, positions and preferences
+    """
+    now = timezone.now()
+    since = parse_token(token) if token else None
+    reset = since is None or since < now - SYNC_RETENTION
+
+    def changed(queryset, field):
+        return queryset if reset else queryset.filter(**{f'{field}__gte': since})
+
+    def deleted(model, owner):
+        if reset:
+            return []
+        return list(
+            SyncTombstone.objects.filter(user=owner, model=model, deleted_at__gte=since)
+            .values_list('ticker', flat=True).distinct()
+        )
+
+    holdings = changed(UserHoldings.objects.filter(user=user), 'updated_at').first()
+    positions = changed(StockHolding.objects.filter(user_holdings__user=user), 'updated_at')
+    preferences = changed(UserStockPreference.objects.filter(user=user), 'updated_at')
+
+    return {
+        'token': make_token(now - SYNC_OVERLAP),
+        'reset': reset,
+        'stocks': StockQuoteSerializer(changed(Stock.objects.all(), 'last_updated'), many=True).data,
+        'deleted_stocks': deleted('stock', None),
+        'holdings': {
+            'balance': str(holdings.balance),
+            'lot_method': holdings.lot_method,
+            'realized_gain_loss': str(holdings.realized_gain_loss),
+            'updated_at': holdings.updated_at,
+        } if holdings else None,
+        'positions': StockHoldingSerializer(positions, many=True).data,
+        'deleted_positions': deleted('position', user),
+        'preferences': UserStockPreferenceSerializer(preferences, many=True).data,
+        'deleted_preferences': deleted('preference', user),
+        'horoscope': get_changed_horoscope(user, None if reset else since),
+    }
+
+
+def get_changed_horoscope(user, since):
+    """
+    Get today's horoscope for the user if it, or the sign and style it is picked by, changed since a moment
+    """
+    profile = UserProfile.objects.filter(user=user).values('zodiac_sign', 'investing_style', 'updated_at').first()
+    if profile is None or not profile['zodiac_sign'] or not profile['investing_style']:
+        return None
+
+    horoscope = DailyHoroscope.objects.filter(
+        zodiac_sign=profile['zodiac_sign'], investing_style=profile['investing_style'], date=date.today()
+    ).first()
+    if horoscope is None:
+        return None
+    if since is not None and horoscope.created_at < since and profile['updated_at'] < since:
+        return None
+    return DailyHoroscopeSerializer(horoscope).data
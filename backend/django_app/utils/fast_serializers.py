@@ -0,0 +1,130 @@
+"""
+Lightweight serializers for the hot read paths of ZEN Trading
+Output is identical to the DRF serializers they stand in for (StockSerializer,
+PortfolioSummarySerializer), but each row is built by one dict comprehension over a fixed
+field spec instead of DRF's per-field get_attribute / to_representation dispatch.
+"""
+from decimal import Decimal
+from functools import partial
+
+from django.conf import settings
+from django.utils import timezone
+
+# Quantum of each number of decimal places
+_QUANTUM = {places: Decimal(1).scaleb(-places) for places in range(5)}
+
+
+def format_decimal(value, places=2):
+    """
+    Format a number like DRF's DecimalField (string rounded half-even to fixed places)
+    """
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value).strip())
+    return f'{value.quantize(_QUANTUM[places]):f}'
+
+
+def format_datetime(value, tz=None):
+    """
+    Format a datetime like DRF's DateTimeField (ISO 8601 in the current time zone, UTC as Z)
+    """
+    if isinstance(value, str):
+        return value
+    if settings.USE_TZ:
+        tz = tz or timezone.get_current_timezone()
+        value = value.astimezone(tz) if timezone.is_aware(value) else timezone.make_aware(value, tz)
+    value = value.isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+def bind_time_zone(fields):
+    """
+    Field spec whose datetimes use the current time zone looked up once, not once per value
+    """
+    tz = timezone.get_current_timezone()
+    return tuple(
+        (name, partial(format_datetime, tz=tz) if formatter is format_datetime else formatter)
+        for name, formatter in fields
+    )
+
+
+def money(value):
+    return format_decimal(value, 2)
+
+
+def quantity(value):
+    return format_decimal(value, 4)
+
+
+def serialize(data, fields):
+    """
+    Serialize a dict over a (name, formatter) field spec; None stays None, missing keys are left out
+    """
+    return {
+        name: None if data[name] is None else formatter(data[name])
+        for name, formatter in fields
+        if name in data
+    }
+
+
+STOCK_FIELDS = (
+    ('id', int),
+    ('ticker', str),
+    ('company_name', str),
+    ('current_price', money),
+    ('previous_close', money),
+    ('market_state', str),
+    ('last_updated', format_datetime),
+    ('description', str),
+    ('date_founded', format_datetime),
+    ('zodiac_sign', str),
+)
+
+PORTFOLIO_HOLDING_FIELDS = (
+    ('ticker', str),
+    ('company_name', str),
+    ('quantity', quantity),
+    ('purchase_price', money),
+    ('purchase_date', format_datetime),
+    ('current_price', money),
+    ('current_value', money),
+    ('cost_basis', money),
+    ('gain_loss', money),
+    ('gain_loss_percent', money),
+    ('alignment_score', int),
+    ('match_type', str),
+    ('zodiac_sign', str),
+    ('element', str),
+)
+
+PORTFOLIO_SUMMARY_FIELDS = (
+    ('cash_balance', money),
+    ('stocks_value', money),
+    ('total_portfolio_value', money),
+    ('total_cost_basis', money),
+    ('total_gain_loss', money),
+    ('total_gain_loss_percent', money),
+    ('realized_gain_loss', money),
+    ('overall_alignment_score', int),
+    ('cosmic_vibe_index', int),
+    ('element_distribution', lambda value: {str(key): item for key, item in value.items()}),
+    ('alignment_breakdown', lambda value: {str(key): item for key, item in value.items()}),
+    ('position_count', int),
+)
+
+
+def serialize_stocks(stocks):
+    """
+    Serialize stocks (rows of Stock.objects.values()) as StockSerializer does
+    """
+    fields = bind_time_zone(STOCK_FIELDS)
+    return [serialize(stock, fields) for stock in stocks]
+
+
+def serialize_portfolio_summary(summary):
+    """
+    Serialize a portfolio summary dict as PortfolioSummarySerializer does
+    """
+    data = serialize(summary, PORTFOLIO_SUMMARY_FIELDS)
+    fields = bind_time_zone(PORTFOLIO_HOLDING_FIELDS)
+    data['holdings'] = [serialize(holding, fields) for holding in summary['holdings']]
+    return data
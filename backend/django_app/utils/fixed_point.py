@@ -0,0 +1,168 @@
+"""
+Fixed-point valuation core for ZEN Trading
+Money is held as integer cents and share quantities as integer ten-thousandths, matching
+the models' decimal_places, so whole portfolios are valued with int64 array arithmetic
+and converted to Decimal only for serialization.
+
+Rounding rules (the same as Decimal.quantize under the default context):
+- every division rounds half to even
+- a position's value is rounded to cents once; totals and gains are exact sums and
+  differences of those cents, so the rows of a summary always add up to its totals
+
+This module must not import Django, so it can be used from the compute pool.
+"""
+from decimal import Decimal
+
+import numpy as np
+
+CENTS = 100
+QUANTITY_SCALE = 10_000
+
+# int64 products must stay below this; larger inputs fall back to Python integers
+_INT64_LIMIT = 2 ** 63 - 1
+
+
+def to_fixed(values, scale):
+    """
+    Convert Decimals (or None) to scaled integers
+
+    Args:
+        values (iterable): Decimal values as read from DecimalFields; None counts as 0
+        scale (int): CENTS or QUANTITY_SCALE
+
+    Returns:
+        numpy.ndarray: int64 array
+    """
+    return np.array(
+        [int((value * scale).to_integral_value()) if value is not None else 0 for value in values],
+        dtype=np.int64,
+    )
+
+
+def float_to_fixed(values, scale):
+    """
+    Convert floats (e.g. market data closes) to scaled integers, NaN counting as 0
+
+    Returns:
+        numpy.ndarray: int64 array of the same shape
+    """
+    scaled = np.rint(np.asarray(values, dtype=np.float64) * scale)
+    return np.nan_to_num(scaled, nan=0.0).astype(np.int64)
+
+
+def round_div(numerator, denominator):
+    """
+    Integer division rounded half to even
+
+    Args:
+        numerator (numpy.ndarray | int): Integers
+        denominator (numpy.ndarray | int): Positive integers
+
+    Returns:
+        Quotients, same type as the inputs
+    """
+    quotient = numerator // denominator
+    twice = (numerator - quotient * denominator) * 2
+    return quotient + ((twice > denominator) | ((twice == denominator) & (quotient % 2 == 1)))
+
+
+def _checked_product(left, right):
+    """Elementwise product, switching to Python integers if it could overflow int64"""
+    if len(left) and int(np.abs(left).max()) * int(np.abs(right).max()) > _INT64_LIMIT:
+        return left.astype(object) * right.astype(object)
+    return left * right
+
+
+def position_values(quantities, prices):
+    """
+    Market value of positions in cents
+
+    Args:
+        quantities (numpy.ndarray): Shares in ten-thousandths
+        prices (numpy.ndarray): Prices in cents (broadcastable against quantities)
+
+    Returns:
+        numpy.ndarray: Values in cents
+    """
+    quantities, prices = np.broadcast_arrays(quantities, prices)
+    return round_div(_checked_product(quantities.ravel(), prices.ravel()), QUANTITY_SCALE).reshape(
+        quantities.shape
+    )
+
+
+def percent_change(change, base):
+    """
+    Percent change in hundredths of a percent (0 where base is not positive)
+
+    Args:
+        change (numpy.ndarray): Change in cents
+        base (numpy.ndarray): Base amount in cents
+
+    Returns:
+        numpy.ndarray: e.g. 1234 for 12.34%
+    """
+    change = np.atleast_1d(change)
+    base = np.atleast_1d(base)
+    positive = base > 0
+    scaled = _checked_product(change, np.full(change.shape, 100 * CENTS, dtype=np.int64))
+    return np.where(positive, round_div(scaled, np.where(positive, base, 1)), 0)
+
+
+def share_of_total(parts, total, places=1):
+    """
+    Each part's percentage of a total, rounded to a number of decimal places
+
+    Returns:
+        list: Decimal percentages (all 0 if total is not positive)
+    """
+    if total <= 0:
+        return [Decimal(0) for _ in parts]
+    scale = 100 * 10 ** places
+    return [to_decimal(value, places) for value in round_div(np.array(list(parts), dtype=object) * scale, total)]
+
+
+def to_decimal(value, places=2):
+    """
+    Convert a scaled integer back to a Decimal with the given decimal places
+    """
+    return Decimal(int(value)).scaleb(-places)
+
+
+def value_portfolio(quantities, prices, costs, scores):
+    """
+    Value a portfolio's positions
+
+    Args:
+        quantities (array-like): Shares per position, in ten-thousandths
+        prices (array-like): Current price per position, in cents
+        costs (array-like): Cost basis per position, in cents
+        scores (array-like): Alignment score per position
+
+    Returns:
+        dict: Per-position arrays (value, gain_loss in cents, gain_loss_percent in
+              hundredths of a percent) and totals (stocks_value, cost_basis, gain_loss,
+              gain_loss_percent, alignment_score as the value-weighted score, truncated)
+    """
+    quantities, prices, costs, scores = (
+        np.asarray(array, dtype=np.int64) for array in (quantities, prices, costs, scores)
+    )
+    values = position_values(quantities, prices)
+    gains = values - costs
+    stocks_value = int(values.sum())
+    cost_basis = int(costs.sum())
+    total_gain = stocks_value - cost_basis
+    if stocks_value > 0:
+        alignment_score = int(_checked_product(values, scores).sum()) // stocks_value
+    else:
+        alignment_score = None
+
+    return {
+        'values': values,
+        'gain_loss': gains,
+        'gain_loss_percent': percent_change(gains, costs),
+        'stocks_value': stocks_value,
+        'cost_basis': cost_basis,
+        'gain_loss_total': total_gain,
+        'gain_loss_percent_total': int(percent_change(total_gain, cost_basis)[0]),
+        'alignment_score': alignment_score,
+    }
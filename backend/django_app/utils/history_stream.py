@@ -0,0 +1,134 @@
+"""
+Multi-ticker history as a stream of newline-delimited JSON for ZEN Trading
+One line per ticker, written as soon as that ticker's series is ready:
+
+    {"ticker": "AAPL", "timeframe": "1M", "data": [...]}
+    {"ticker": "XYZ", "error": "No data available", "detail": "..."}
+
+Only tickers of listed stocks are downloaded (and cached); the rest get a "Stock not found"
+line. Rendered lines are cached per price epoch, so series already served since the last price
+batch go out first, straight from the cache. The rest are downloaded in small batches
+(one yf.download request each) that run concurrently, and every batch is streamed as it
+completes, so the first series never waits for the slowest ticker.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.cache import cache
+
+from django_app.models import Stock
+from django_app.renderers import FastJSONRenderer
+from django_app.utils.columnar import ohlcv_columns, ohlcv_rows
+from django_app.utils.stock_snapshot import get_price_epoch
+from django_app.utils.yfinance_module import get_history
+
+logger = logging.getLogger(__name__)
+
+# Most tickers one request may stream
+MAX_STREAM_TICKERS = 50
+
+# Tickers per yfinance download, and downloads in flight at once
+STREAM_BATCH_SIZE = 5
+STREAM_DOWNLOAD_WORKERS = 4
+
+HISTORY_LINE_TIMEOUT = 60 * 60
+
+_renderer = FastJSONRenderer()
+
+
+class HistoryStreamError(Exception):
+    """
+    Raised for a missing or too long tickers list
+    """
+
+
+def parse_tickers(value):
+    """
+    Parse a comma-separated tickers list (upper-cased, duplicates dropped, order kept)
+
+    Raises:
+        HistoryStreamError: If the list is empty or longer than MAX_STREAM_TICKERS
+    """
+    tickers = list(dict.fromkeys(
+        ticker.strip().upper() for ticker in (value or '').split(',') if ticker.strip()
+    ))
+    if not tickers:
+        raise HistoryStreamError('Provide tickers as a comma-separated list, e.g. tickers=AAPL,MSFT')
+    if len(tickers) > MAX_STREAM_TICKERS:
+        raise HistoryStreamError(f'At most {MAX_STREAM_TICKERS} tickers can be requested at once')
+    return tickers
+
+
+def render_line(data):
+    return _renderer.render(data) + b'\n'
+
+
+def render_series(ticker, timeframe, layout, hist):
+    """
+    Render one ticker's NDJSON line, shaped like a StockHistoryView response
+    """
+    if layout == 'columns':
+        return render_line({'ticker': ticker, 'timeframe': timeframe, 'layout': layout, 'data': ohlcv_columns(hist)})
+    return render_line({'ticker': ticker, 'timeframe': timeframe, 'data': ohlcv_rows(hist)})
+
+
+def render_error(ticker, error, detail):
+    return render_line({'ticker': ticker, 'error': error, 'detail': detail})
+
+
+def stream_history(tickers, timeframe, period, interval, layout='rows'):
+    """
+    Yield one NDJSON line per ticker: unknown tickers first, then cached series, then
+    downloads as they complete
+
+    Args:
+        tickers (list): Ticker symbols (see parse_tickers)
+        timeframe (str): Timeframe name echoed in each line (e.g. '1M')
+        period (str): yfinance period of the timeframe
+        interval (str): yfinance interval of the timeframe
+        layout (str): 'rows' or 'columns'
+    """
+    listed = set(Stock.objects.filter(ticker__in=tickers).values_list('ticker', flat=True))
+    for ticker in tickers:
+        if ticker not in listed:
+            yield render_error(ticker, 'Stock not found', f'Stock with ticker {ticker} does not exist')
+    tickers = [ticker for ticker in tickers if ticker in listed]
+    if not tickers:
+        return
+
+    epoch, _ = get_price_epoch()
+    keys = {ticker: f'history:{ticker}:{timeframe}:{layout}:{epoch}' for ticker in tickers}
+    cached = cache.get_many(keys.values())
+    for ticker in tickers:
+        if keys[ticker] in cached:
+            yield cached[keys[ticker]]
+
+    missing = [ticker for ticker in tickers if keys[ticker] not in cached]
+    if not missing:
+        return
+
+    batches = [missing[i:i + STREAM_BATCH_SIZE] for i in range(0, len(missing), STREAM_BATCH_SIZE)]
+    # A client that disconnects closes the generator: downloads not yet started are dropped
+    executor = ThreadPoolExecutor(max_workers=min(STREAM_DOWNLOAD_WORKERS, len(batches)))
+    try:
+        futures = {executor.submit(get_history, batch, period, interval): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                history = future.result()
+            except Exception as e:
+                logger.warning("History download failed for %s: %s", ', '.join(batch), e)
+                for ticker in batch:
+                    yield render_error(ticker, 'Failed to retrieve stock history', str(e))
+                continue
+
+            for ticker in batch:
+                hist = history.get(ticker)
+                if hist is None:
+                    yield render_error(ticker, 'No data available', f'No historical data found for ticker {ticker}')
+                    continue
+                line = render_series(ticker, timeframe, layout, hist)
+                cache.set(keys[ticker], line, HISTORY_LINE_TIMEOUT)
+                yield line
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
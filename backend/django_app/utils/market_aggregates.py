@@ -0,0 +1,208 @@
+"""
+Live market aggregates for ZEN Trading
+Today's top gainers and losers by percent change vs previous close, and the average change,
+advancers and decliners of the whole market and of every zodiac sign and element.
+
+The aggregator keeps each stock's last change and running sums per group in memory, so a
+price batch only re-applies the stocks whose numbers moved, and the top movers come from
+bounded heaps (O(n log k)) instead of sorting the universe. Changes are held in integer
+hundredths of a percent so the running sums never drift. Each batch publishes the result to
+the MarketSnapshot row, which any endpoint can return with a single read.
+"""
+import heapq
+import logging
+from decimal import Decimal
+
+from django.utils import timezone
+
+from django_app.models import MarketSnapshot, Stock, get_element_from_zodiac
+from django_app.utils.fixed_point import CENTS, round_div
+
+logger = logging.getLogger(__name__)
+
+# Gainers and losers published in the snapshot
+TOP_MOVERS = 10
+
+
+def get_change(price, previous_close):
+    """
+    Get a stock's percent change vs previous close
+
+    Returns:
+        int: Change in hundredths of a percent (e.g. 1234 for 12.34%), None without both prices
+    """
+    if price is None or previous_close is None:
+        return None
+    price = int((Decimal(str(price)) * CENTS).to_integral_value())
+    previous_close = int((Decimal(str(previous_close)) * CENTS).to_integral_value())
+    if previous_close <= 0:
+        return None
+    return int(round_div((price - previous_close) * 100 * CENTS, previous_close))
+
+
+class MarketAggregator:
+    """
+    Running market aggregates, updated from full price batches
+    """
+
+    def __init__(self):
+        self.inputs = {}  # ticker -> (current_price, previous_close, zodiac_sign) last applied
+        self.stocks = {}  # ticker -> (change, zodiac_sign, current_price)
+        self.totals = {}  # (group_type, name) -> [change sum, stocks, advancers, decliners]
+
+    def _groups(self, zodiac_sign):
+        groups = [('market', 'all')]
+        element = get_element_from_zodiac(zodiac_sign) if zodiac_sign else 'Unknown'
+        if element != 'Unknown':
+            groups += [('sign', zodiac_sign), ('element', element)]
+        return groups
+
+    def _apply(self, change, zodiac_sign, direction):
+        for key in self._groups(zodiac_sign):
+            totals = self.totals.setdefault(key, [0, 0, 0, 0])
+            totals[0] += direction * change
+            totals[1] += direction
+            totals[2] += direction * (change > 0)
+            totals[3] += direction * (change < 0)
+            if not totals[1]:
+                del self.totals[key]
+
+    def apply_batch(self, stocks):
+        """
+        Bring the aggregates up to date with a price batch
+
+        Args:
+            stocks (iterable): (ticker, current_price, previous_close, zodiac_sign) of every
+                               stock; stocks missing from the batch are dropped
+
+        Returns:
+            int: Number of stocks whose entry changed
+        """
+        seen = set()
+        changed = 0
+        for ticker, price, previous_close, zodiac_sign in stocks:
+            seen.add(ticker)
+            inputs = (price, previous_close, zodiac_sign)
+            if self.inputs.get(ticker) == inputs:
+                continue
+            self.inputs[ticker] = inputs
+
+            change = get_change(price, previous_close)
+            entry = (change, zodiac_sign, float(price)) if change is not None else None
+            previous = self.stocks.get(ticker)
+            if entry == previous:
+                continue
+
+            changed += 1
+            if previous is not None:
+                self._apply(previous[0], previous[1], -1)
+                del self.stocks[ticker]
+            if entry is not None:
+                self.stocks[ticker] = entry
+                self._apply(change, zodiac_sign, 1)
+
+        for ticker in set(self.inputs) - seen:
+            del self.inputs[ticker]
+            if ticker in self.stocks:
+                change, zodiac_sign, _ = self.stocks.pop(ticker)
+                self._apply(change, zodiac_sign, -1)
+                changed += 1
+        return changed
+
+    def _group_summary(self, key):
+        change_sum, count, advancers, decliners = self.totals.get(key, [0, 0, 0, 0])
+        return {
+            'average_change_percent': round(change_sum / count / 100, 2) if count else None,
+            'advancers': advancers,
+            'decliners': decliners,
+            'stocks': count,
+        }
+
+    def _group_summaries(self, group_type):
+        return {name: self._group_summary((kind, name)) for kind, name in sorted(self.totals) if kind == group_type}
+
+    def _movers(self, select, condition):
+        movers = select(
+            TOP_MOVERS,
+            ((change, ticker) for ticker, (change, _, _) in self.stocks.items() if condition(change)),
+        )
+        return [
+            {
+                'ticker': ticker,
+                'zodiac_sign': self.stocks[ticker][1],
+                'current_price': self.stocks[ticker][2],
+                'change_percent': change / 100,
+            }
+            for change, ticker in movers
+        ]
+
+    def snapshot(self):
+        """
+        Build the published snapshot
+
+        Returns:
+            dict: as_of, market totals, top_gainers, top_losers, signs and elements
+        """
+        return {
+            'as_of': timezone.now().isoformat(),
+            'market': self._group_summary(('market', 'all')),
+            'top_gainers': self._movers(heapq.nlargest, lambda change: change > 0),
+            'top_losers': self._movers(heapq.nsmallest, lambda change: change < 0),
+            'signs': self._group_summaries('sign'),
+            'elements': self._group_summaries('element'),
+        }
+
+
+_aggregator = None
+
+
+def update_market_aggregates(stocks):
+    """
+    Apply a price batch to the process-wide aggregator and publish the snapshot
+
+    Args:
+        stocks (iterable): (ticker, current_price, previous_close, zodiac_sign) of every stock
+
+    Returns:
+        dict: The published snapshot
+    """
+    global _aggregator
+    if _aggregator is None:
+        _aggregator = MarketAggregator()
+    changed = _aggregator.apply_batch(stocks)
+    snapshot = _aggregator.snapshot()
+    MarketSnapshot.objects.update_or_create(pk=1, defaults={'data': snapshot})
+    logger.info(f"Market aggregates updated: {changed} of {len(_aggregator.stocks)} stocks changed")
+    return snapshot
+
+
+def get_market_snapshot():
+    """
+    Get the latest published market snapshot
+    Built from the Stock table if no price batch has published one yet.
+    """
+    data = MarketSnapshot.objects.filter(pk=1).values_list('data', flat=True).first()
+    if data is not None:
+        return data
+
+    aggregator = MarketAggregator()
+    aggregator.apply_batch(Stock.objects.values_list('ticker', 'current_price', 'previous_close', 'zodiac_sign'))
+    data = aggregator.snapshot()
+    MarketSnapshot.objects.get_or_create(pk=1, defaults={'data': data})
+    return data
+
+
+def get_sign_market(zodiac_sign):
+    """
+    Get how a zodiac sign and its element are trading today, from the latest snapshot
+
+    Returns:
+        dict: as_of, sign and element (each with name and its aggregates, if any)
+    """
+    snapshot = get_market_snapshot()
+    element = get_element_from_zodiac(zodiac_sign)
+    return {
+        'as_of': snapshot['as_of'],
+        'sign': {'name': zodiac_sign, **snapshot['signs'].get(zodiac_sign, {})},
+        'element': {'name': element, **snapshot['elements'].get(element, {})},
+    }
@@ -0,0 +1,247 @@
+"""
+Daily bar cache for ZEN Trading analytics
+Keeps adjusted daily bars for every stock (plus the benchmark) in the DailyBar table and
+serves them to the analytics code as aligned NumPy close matrices.
+
+Each web/worker process keeps the close series it has loaded in memory until the nightly
+sync adds a newer trading day, so analytics requests after the first one never go back
+to the bar table.
+"""
+import logging
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import Max
+
+from django_app.models import DailyBar, Stock
+from django_app.utils.yfinance_module import get_daily_bars, get_shares_outstanding
+
+logger = logging.getLogger(__name__)
+
+# Market benchmark for beta and relative metrics
+BENCHMARK_TICKER = 'SPY'
+
+# Bars fetched for a ticker with no history yet
+INITIAL_HISTORY_PERIOD = '10y'
+
+# Tickers per yfinance download request
+DOWNLOAD_BATCH_SIZE = 100
+
+# Share counts fetched per sync (one request per ticker, so large universes fill in over a few nights)
+SHARES_SYNC_LIMIT = 200
+
+
+def sync_daily_bars(tickers=None):
+    """
+    Fetch the daily bars missing from the cache
+
+    Tickers that already have bars are fetched from their last stored date (which is
+    re-fetched, since it may have been stored mid-session); new tickers get the full
+    INITIAL_HISTORY_PERIOD.
+
+    Args:
+        tickers (list): Tickers to sync (default: every Stock plus the benchmark)
+
+    Returns:
+        int: Number of bars written
+    """
+    if tickers is None:
+        tickers = list(Stock.objects.values_list('ticker', flat=True)) + [BENCHMARK_TICKER]
+
+    last_dates = dict(
+        DailyBar.objects.filter(ticker__in=tickers).values('ticker').annotate(
+            last_date=Max('date')
+        ).values_list('ticker', 'last_date')
+    )
+
+    # Group tickers by start date so each group is one download
+    groups = {}
+    for ticker in tickers:
+        groups.setdefault(last_dates.get(ticker), []).append(ticker)
+
+    written = 0
+    for start, group in groups.items():
+        for i in range(0, len(group), DOWNLOAD_BATCH_SIZE):
+            batch = group[i:i + DOWNLOAD_BATCH_SIZE]
+            try:
+                if start is None:
+                    bars = get_daily_bars(batch, period=INITIAL_HISTORY_PERIOD)
+                else:
+                    bars = get_daily_bars(batch, start=start)
+            except Exception as e:
+                logger.error(f"Error downloading daily bars for {len(batch)} ticker(s): {str(e)}")
+                continue
+
+            rows = [
+                DailyBar(
+                    ticker=ticker,
+                    date=timestamp.date(),
+                    open=_to_float(row['Open']),
+                    high=_to_float(row['High']),
+                    low=_to_float(row['Low']),
+                    close=float(row['Close']),
+                    volume=int(row['Volume']) if row['Volume'] == row['Volume'] else None,
+                )
+                for ticker, frame in bars.items()
+                for timestamp, row in frame.iterrows()
+            ]
+            DailyBar.objects.bulk_create(
+                rows,
+                batch_size=2000,
+                update_conflicts=True,
+                unique_fields=['ticker', 'date'],
+                update_fields=['open', 'high', 'low', 'close', 'volume'],
+            )
+            written += len(rows)
+
+    logger.info(f"Daily bar sync complete: {written} bars for {len(tickers)} tickers")
+    return written
+
+
+def sync_shares_outstanding(refresh=False, limit=SHARES_SYNC_LIMIT):
+    """
+    Fetch shares outstanding for stocks that don't have them yet
+
+    Stocks yfinance has no share count for are stored as 0 so they aren't retried every
+    night; failed requests leave the field empty for the next sync.
+
+    Args:
+        refresh (bool): Re-fetch every stock, not only the missing ones
+        limit (int): Maximum stocks to fetch (None for no limit)
+
+    Returns:
+        int: Number of stocks updated
+    """
+    stocks = Stock.objects.order_by('ticker')
+    if not refresh:
+        stocks = stocks.filter(shares_outstanding__isnull=True)
+    if limit is not None:
+        stocks = stocks[:limit]
+
+    updated = []
+    for stock in stocks.only('id', 'ticker'):
+        try:
+            stock.shares_outstanding = get_shares_outstanding(stock.ticker) or 0
+        except Exception as e:
+            logger.warning(f"Error fetching shares outstanding for {stock.ticker}: {str(e)}")
+            continue
+        updated.append(stock)
+
+    Stock.objects.bulk_update(updated, ['shares_outstanding'], batch_size=500)
+    return len(updated)
+
+
+def _to_float(value):
+    """Convert a pandas cell to float, mapping NaN to None"""
+    value = float(value)
+    return None if value != value else value
+
+
+# Per-process series cache: ticker -> (dates as datetime64[D], closes)
+_series_cache = {}
+_cache_through = None
+
+
+def get_latest_bar_date():
+    """
+    Get the most recent date in the bar cache, dropping this process's cached series when it moved
+
+    Returns:
+        date: Latest bar date, or None if no bars are stored
+    """
+    global _cache_through
+    latest = DailyBar.objects.aggregate(latest=Max('date'))['latest']
+    if latest != _cache_through:
+        _series_cache.clear()
+        _cache_through = latest
+    return latest
+
+
+def _query_series(tickers, start=None):
+    """
+    Load close series from the bar table with a single query
+
+    Returns:
+        dict: {ticker: (dates as datetime64[D], closes)} for the tickers that have bars
+    """
+    query = DailyBar.objects.filter(ticker__in=tickers)
+    if start is not None:
+        query = query.filter(date__gte=start)
+    rows = list(query.order_by('ticker', 'date').values_list('ticker', 'date', 'close'))
+    if not rows:
+        return {}
+
+    row_tickers = np.array([row[0] for row in rows])
+    dates = np.array([row[1] for row in rows], dtype='datetime64[D]')
+    closes = np.array([row[2] for row in rows], dtype=np.float64)
+
+    # Rows are sorted by ticker, so each ticker is one contiguous slice
+    boundaries = np.flatnonzero(row_tickers[1:] != row_tickers[:-1]) + 1
+    starts = np.concatenate([[0], boundaries])
+    ends = np.concatenate([boundaries, [len(rows)]])
+    return {
+        str(row_tickers[first]): (dates[first:last], closes[first:last])
+        for first, last in zip(starts.tolist(), ends.tolist())
+    }
+
+
+def _load_series(tickers):
+    """Load the full close series of the tickers not cached yet"""
+    missing = [ticker for ticker in tickers if ticker not in _series_cache]
+    if not missing:
+        return
+    empty = (np.empty(0, dtype='datetime64[D]'), np.empty(0, dtype=np.float64))
+    loaded = _query_series(missing)
+    for ticker in missing:
+        _series_cache[ticker] = loaded.get(ticker, empty)
+
+
+def get_close_matrix(tickers, start=None, use_cache=True):
+    """
+    Get aligned daily closes for a set of tickers
+
+    The calendar is the union of the tickers' trading days since start. Gaps are
+    forward-filled; days before a ticker's first bar are NaN.
+
+    Args:
+        tickers (list): Ticker symbols (columns, in order)
+        start (date): First calendar day (default: full history)
+        use_cache (bool): Go through the per-process series cache. Batch jobs over the
+                          whole universe pass False to load only the window.
+
+    Returns:
+        tuple: (dates as numpy datetime64[D] array, closes as a len(dates) x len(tickers) array)
+    """
+    empty = (np.empty(0, dtype='datetime64[D]'), np.empty(0, dtype=np.float64))
+    if use_cache:
+        get_latest_bar_date()
+        _load_series(tickers)
+        series = [_series_cache[ticker] for ticker in tickers]
+    else:
+        loaded = _query_series(tickers, start=start)
+        series = [loaded.get(ticker, empty) for ticker in tickers]
+
+    all_dates = [dates for dates, _ in series if len(dates)]
+    if not all_dates:
+        return np.empty(0, dtype='datetime64[D]'), np.empty((0, len(tickers)), dtype=np.float64)
+
+    calendar = np.unique(np.concatenate(all_dates))
+    if start is not None:
+        calendar = calendar[calendar >= np.datetime64(start, 'D')]
+
+    closes = np.full((len(calendar), len(tickers)), np.nan, dtype=np.float64)
+    for col, (dates, values) in enumerate(series):
+        if not len(dates):
+            continue
+        # Index of the last bar on or before each calendar day (forward fill)
+        idx = np.searchsorted(dates, calendar, side='right') - 1
+        valid = idx >= 0
+        closes[valid, col] = values[idx[valid]]
+    return calendar, closes
+
+
+def get_history_start(latest, years):
+    """
+    Get the first calendar day of a lookback window ending at latest
+    """
+    return latest - timedelta(days=round(365.25 * years))
@@ -0,0 +1,181 @@
+"""
+Limit and stop order engine for ZEN Trading
+Keeps resting orders in per-ticker price-sorted books (see trigger_book.py) and executes
+the triggered ones after each price update batch, at O(log n + triggered) per ticker.
+Placed and closed orders reach the books through the change log (see change_log.py).
+"""
+import logging
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from django_app.models import StockOrder, Stock
+from django_app.utils.change_log import ChangeLogReader
+from django_app.utils.trading import execute_trade, TradeError
+from django_app.utils.trigger_book import TriggerBook, FIRES_AT_OR_BELOW, FIRES_AT_OR_ABOVE
+
+logger = logging.getLogger(__name__)
+
+# Changed orders loaded per query during a sync
+SYNC_BATCH_SIZE = 500
+
+
+def get_trigger_direction(side, order_type):
+    """
+    Get whether an order fires when the price is at/below or at/above its trigger
+    Buy limit and sell stop fire at or below; sell limit and buy stop at or above
+    """
+    if (side, order_type) in (('buy', 'limit'), ('sell', 'stop')):
+        return FIRES_AT_OR_BELOW
+    return FIRES_AT_OR_ABOVE
+
+
+class OrderBook(TriggerBook):
+    """
+    In-memory books of open orders, two per ticker
+
+    The first sync books every open order; later syncs load only the orders named in the
+    change log since, so a sync costs O(changed orders) whenever their transactions commit.
+    Orders that closed are forgotten, and their book entries dropped lazily when they would
+    have fired.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # order id -> (ticker, direction, trigger price) of every booked open order
+        self.orders = {}
+        self.changes = ChangeLogReader('order')
+
+    def book(self, order_id, ticker, direction, trigger_price):
+        """Insert an open order into the book for its ticker and direction"""
+        self.orders[order_id] = (ticker, direction, trigger_price)
+        self.add(ticker, direction, trigger_price, order_id)
+
+    def restore(self, order_id):
+        """Put a popped order back into its book (its fill failed and it is still open)"""
+        if order_id in self.orders:
+            self.add(*self.orders[order_id], order_id)
+
+    def sync(self):
+        """
+        Book the orders placed and forget the orders closed since the last sync
+
+        Returns:
+            set: Tickers that received new orders
+        """
+        if self.changes.read_at is None:
+            # First sync: book every open order
+            self.changes.reset()
+            changed = []
+            batches = [StockOrder.objects.filter(status='open')]
+        else:
+            changed = sorted(self.changes.poll())
+            batches = [
+                StockOrder.objects.filter(id__in=changed[i:i + SYNC_BATCH_SIZE], status='open')
+                for i in range(0, len(changed), SYNC_BATCH_SIZE)
+            ]
+
+        open_ids = set()
+        new_tickers = set()
+        for batch in batches:
+            for order_id, ticker, side, order_type, trigger_price in batch.values_list(
+                'id', 'ticker', 'side', 'order_type', 'trigger_price'
+            ):
+                open_ids.add(order_id)
+                if order_id not in self.orders:
+                    self.book(order_id, ticker, get_trigger_direction(side, order_type), trigger_price)
+                    new_tickers.add(ticker)
+
+        # Filled, rejected, cancelled and deleted orders are forgotten; their book entries go lazily
+        for order_id in changed:
+            if order_id not in open_ids:
+                self.orders.pop(order_id, None)
+        return new_tickers
+
+
+def fill_order(order_id, price):
+    """
+    Execute a triggered order at market through the normal holdings path
+
+    Args:
+        order_id (int): StockOrder id
+        price (float): Price the order triggered at
+
+    Returns:
+        str: Resulting status, or None if the order was no longer open
+    """
+    with transaction.atomic():
+        order = StockOrder.objects.select_for_update().select_related('user').filter(
+            pk=order_id, status='open'
+        ).first()
+        if order is None:
+            # Cancelled (or already handled) since it was booked
+            return None
+
+        fill_price = Decimal(str(price)).quantize(Decimal('0.01'))
+        total_value = (order.quantity * fill_price).quantize(Decimal('0.01'))
+        try:
+            execute_trade(order.user, order.ticker, order.side, order.quantity, total_value)
+        except TradeError as e:
+            order.status = 'rejected'
+            order.status_detail = e.detail[:255]
+            order.save(update_fields=['status', 'status_detail', 'updated_at'])
+            return order.status
+
+        order.status = 'filled'
+        order.fill_price = fill_price
+        order.filled_at = timezone.now()
+        order.save(update_fields=['status', 'fill_price', 'filled_at', 'updated_at'])
+        return order.status
+
+
+_order_book = None
+
+
+def get_order_book():
+    """
+    Get the process-wide order book, loading every open order on first use
+    """
+    global _order_book
+    if _order_book is None:
+        _order_book = OrderBook()
+    return _order_book
+
+
+def execute_triggered_orders(changed_prices):
+    """
+    Fill every resting order triggered by a price update batch
+
+    Args:
+        changed_prices (dict): {ticker: new price} for tickers whose price moved
+
+    Returns:
+        dict: Number of orders per resulting status
+    """
+    book = get_order_book()
+    prices = dict(changed_prices)
+
+    # Freshly placed orders are checked against the current price right away
+    new_tickers = book.sync() - set(prices)
+    if new_tickers:
+        for ticker, current_price in Stock.objects.filter(ticker__in=new_tickers).values_list('ticker', 'current_price'):
+            if current_price is not None:
+                prices[ticker] = float(current_price)
+
+    results = {}
+    for ticker, price in prices.items():
+        for order_id in book.pop_triggered(ticker, float(price)):
+            try:
+                outcome = fill_order(order_id, price)
+            except Exception as e:
+                logger.error(f"Error filling order {order_id} for {ticker}: {str(e)}")
+                # The fill rolled back and the order is still open: keep it resting
+                book.restore(order_id)
+                continue
+            if outcome:
+                results[outcome] = results.get(outcome, 0) + 1
+
+    if results:
+        logger.info(f"Resting orders processed: {results}")
+    return results
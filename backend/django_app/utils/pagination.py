@@ -0,0 +1,164 @@
+"""
+Sparse fieldsets and keyset pagination for ZEN Trading list endpoints
+
+- fields=ticker,current_price picks the serializer fields returned, and the queryset only
+  loads their columns (.only()), so dropping description never reads it from the database
+- cursor= / page_size= switch on keyset (cursor) pagination: each page is an indexed range
+  scan from the last row seen, so page 10,000 costs the same as page 1
+
+Pagination is opt-in: a list requested without cursor or page_size keeps its unpaginated
+shape, so existing clients are unaffected.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.serializers import BaseSerializer
+
+# Query parameters a paginated, sparse list depends on (for response cache keys and ETags)
+LIST_PARAMS = ('fields', 'cursor', 'page_size')
+
+
+class ListQueryError(Exception):
+    """
+    Raised for an unknown field in fields= or an invalid cursor
+    """
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin: fields=[...] keeps only the named fields
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Opt-in cursor pagination over a view's keyset_ordering (unique, indexed columns)
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = 'id'
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = ordering
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'keyset_ordering', self.ordering)
+        return (ordering,) if isinstance(ordering, str) else tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_links(self):
+        return {'next': self.get_next_link(), 'previous': self.get_previous_link()}
+
+
+def parse_fields(request, serializer_class):
+    """
+    Parse fields= against the fields of a serializer
+
+    Returns:
+        list: Requested field names, or None for all fields
+
+    Raises:
+        ListQueryError: If a requested field does not exist
+    """
+    value = request.query_params.get('fields')
+    if not value:
+        return None
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = sorted(set(fields) - set(serializer_class().fields))
+    if unknown:
+        raise ListQueryError(f'Unknown fields: {", ".join(unknown)}')
+    return fields
+
+
+def restrict_columns(queryset, serializer_class, fields, ordering=()):
+    """
+    Load only the columns the requested serializer fields read (plus the ordering columns)
+    Nested serializers are joined with select_related; fields that are not plain columns
+    (methods, dotted sources) leave the queryset unrestricted.
+    """
+    if fields is None:
+        return queryset
+
+    serializer = serializer_class()
+    model = queryset.model
+    columns = {name.lstrip('-') for name in ((ordering,) if isinstance(ordering, str) else ordering)}
+    related = []
+    for name in fields:
+        field = serializer.fields[name]
+        if isinstance(field, BaseSerializer):
+            related.append(field.source)
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return queryset
+        if not model_field.concrete:
+            return queryset
+        columns.add(field.source)
+
+    # Joins of nested serializers that were not requested are dropped along with their columns
+    queryset = queryset.select_related(None).only(*columns, *(
+        f'{name}__{child.name}' for name in related
+        for child in model._meta.get_field(name).related_model._meta.concrete_fields
+    ))
+    return queryset.select_related(*related) if related else queryset
+
+
+def paginate_list(request, queryset, serializer_class, ordering, view=None, context=None):
+    """
+    Apply fields= and opt-in keyset pagination to a list an APIView builds itself
+    context is passed on to the serializer.
+
+    Returns:
+        tuple: (serialized rows, {'next', 'previous'} links or None when unpaginated)
+
+    Raises:
+        ListQueryError: For an unknown field or an invalid cursor
+    """
+    fields = parse_fields(request, serializer_class)
+    queryset = restrict_columns(queryset, serializer_class, fields, ordering)
+    paginator = KeysetPagination(ordering)
+    try:
+        page = paginator.paginate_queryset(queryset, request, view)
+    except NotFound as e:
+        raise ListQueryError(str(e.detail))
+    rows = serializer_class(queryset if page is None else page, many=True, fields=fields, context=context or {}).data
+    return rows, None if page is None else paginator.get_links()
+
+
+class SparseListMixin:
+    """
+    Generic list views: fields= and opt-in keyset pagination ordered by keyset_ordering
+    """
+    pagination_class = KeysetPagination
+    keyset_ordering = 'id'
+
+    def get_sparse_fields(self):
+        if not hasattr(self, '_sparse_fields'):
+            try:
+                self._sparse_fields = parse_fields(self.request, self.get_serializer_class())
+            except ListQueryError as e:
+                raise ValidationError({'error': 'Invalid fields', 'detail': str(e)})
+        return self._sparse_fields
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return restrict_columns(queryset, self.get_serializer_class(), self.get_sparse_fields(), self.keyset_ordering)
+
+    def get_serializer(self, *args, **kwargs):
+        if self.request.method == 'GET':
+            kwargs.setdefault('fields', self.get_sparse_fields())
+        return super().get_serializer(*args, **kwargs)
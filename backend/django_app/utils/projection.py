@@ -0,0 +1,189 @@
+"""
+Monte Carlo portfolio projection for ZEN Trading
+Projects the user's current holdings forward by bootstrapping whole trading days from the
+daily bar cache (see quant.bootstrap_paths) and reports percentile bands of future value.
+
+Paths are split into one seeded batch per compute pool worker. The seeds derive from the
+holdings version and the latest bar date, so a projection is reproducible and can be
+cached until the user trades or the nightly sync adds a day. The cache stores growth
+bands; they are scaled by the positions' current market value on every request.
+"""
+import logging
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from django_app.models import StockHolding
+from django_app.utils.compute_pool import map_in_pool
+from django_app.utils.market_data import get_close_matrix, get_history_start, get_latest_bar_date
+from django_app.utils.quant import bootstrap_paths, first_complete_row, simple_returns
+from django_app.utils.risk_analytics import RiskAnalyticsError, get_holdings_version
+
+logger = logging.getLogger(__name__)
+
+# Trading days simulated per horizon
+PROJECTION_HORIZONS = {'3M': 63, '6M': 126, '1Y': 252, '2Y': 504}
+
+DEFAULT_PATHS = 10_000
+MIN_PATHS = 1_000
+MAX_PATHS = 50_000
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+# Years of history the bootstrap samples from, and the fewest days it accepts
+HISTORY_YEARS = 3
+MIN_OBSERVATIONS = 60
+
+# Bands are reported every CHECKPOINT_DAYS trading days (divides every horizon)
+CHECKPOINT_DAYS = 7
+
+# Simulations with at least this many cells (paths x days x assets) run in the process pool
+POOL_MIN_CELLS = 20_000_000
+
+PROJECTION_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class ProjectionError(Exception):
+    """
+    Raised when a projection cannot be computed for a user
+    """
+
+
+def get_position_values(user):
+    """
+    Get the current market value of each priced position
+
+    Returns:
+        tuple: ({ticker: value}, tickers without a price)
+    """
+    rows = list(
+        StockHolding.objects.filter(user_holdings__user=user).values_list('ticker', 'quantity', 'stock__current_price')
+    )
+    positions = {ticker: quantity for ticker, quantity, _ in rows}
+    prices = {ticker: price for ticker, _, price in rows if price is not None and price > 0}
+    values = {ticker: float(positions[ticker] * price) for ticker, price in prices.items()}
+    return values, sorted(set(positions) - set(prices))
+
+
+def simulate_growth_bands(tickers, values, latest, horizon, paths, seed):
+    """
+    Simulate the growth percentile bands of a basket
+
+    Args:
+        tickers (list): Tickers in the basket
+        values (numpy.ndarray): Current market value per ticker
+        latest (date): Latest cached bar date
+        horizon (int): Trading days to simulate
+        paths (int): Number of paths
+        seed (numpy.random.SeedSequence): Root seed
+
+    Returns:
+        dict: Band growth factors per checkpoint, terminal growth stats and the tickers
+              that were dropped for lack of history
+    """
+    start = get_history_start(latest, HISTORY_YEARS)
+    _, closes = get_close_matrix(tickers, start=start)
+
+    has_history = np.isfinite(closes).any(axis=0)
+    missing = [ticker for ticker, ok in zip(tickers, has_history) if not ok]
+    closes = closes[:, has_history]
+    values = values[has_history]
+    if not len(values):
+        raise ProjectionError('None of your positions have price history yet.')
+
+    closes = closes[first_complete_row(closes):]
+    returns = simple_returns(closes)
+    if len(returns) < MIN_OBSERVATIONS:
+        raise ProjectionError('Not enough shared price history to project your positions.')
+
+    weights = values / values.sum()
+    checkpoints = np.arange(CHECKPOINT_DAYS, horizon + 1, CHECKPOINT_DAYS)
+
+    # One batch per worker; the split is fixed so results don't depend on where batches run
+    batches = max(1, settings.COMPUTE_POOL_WORKERS)
+    sizes = [len(part) for part in np.array_split(np.arange(paths), batches)]
+    arg_tuples = [
+        (returns, weights, horizon, size, child, CHECKPOINT_DAYS)
+        for size, child in zip(sizes, seed.spawn(batches))
+    ]
+    if paths * horizon * returns.shape[1] >= POOL_MIN_CELLS and batches > 1:
+        growth = np.vstack(map_in_pool(bootstrap_paths, arg_tuples))
+    else:
+        growth = np.vstack([bootstrap_paths(*args) for args in arg_tuples])
+
+    terminal = growth[:, -1]
+    return {
+        'history_start': start,
+        'observations': int(len(returns)),
+        'checkpoints': checkpoints.tolist(),
+        'bands': np.percentile(growth, PERCENTILES, axis=0),
+        'mean': float(terminal.mean()),
+        'probability_of_loss': float((terminal < 1.0).mean()),
+        'missing_tickers': missing,
+    }
+
+
+def get_portfolio_projection(user, horizon='1Y', paths=DEFAULT_PATHS):
+    """
+    Get the Monte Carlo projection of a user's current holdings
+
+    Args:
+        user (User): Portfolio owner
+        horizon (str): Projection horizon, one of PROJECTION_HORIZONS
+        paths (int): Number of simulated paths
+
+    Returns:
+        dict: Starting value, percentile bands of future value per checkpoint date and
+              terminal-value statistics
+
+    Raises:
+        ProjectionError: If the user has no priced positions with enough history
+    """
+    latest = get_latest_bar_date()
+    if latest is None:
+        raise ProjectionError('Daily price history has not been synced yet.')
+    try:
+        version = get_holdings_version(user)
+    except RiskAnalyticsError as e:
+        raise ProjectionError(str(e))
+
+    position_values, unpriced = get_position_values(user)
+    if not position_values:
+        raise ProjectionError('You have no priced positions to project.')
+    tickers = sorted(position_values)
+    values = np.array([position_values[ticker] for ticker in tickers])
+
+    cache_key = f'portfolio_projection:{user.pk}:{version}:{latest.isoformat()}:{horizon}:{paths}'
+    simulation = cache.get(cache_key)
+    if simulation is None:
+        seed = np.random.SeedSequence([user.pk, version, latest.toordinal()])
+        simulation = simulate_growth_bands(
+            tickers, values, latest, PROJECTION_HORIZONS[horizon], paths, seed
+        )
+        cache.set(cache_key, simulation, PROJECTION_CACHE_TIMEOUT)
+
+    # Scale the cached growth by the current value of the positions that were simulated
+    starting_value = float(sum(
+        value for ticker, value in position_values.items() if ticker not in simulation['missing_tickers']
+    ))
+    bands = np.round(simulation['bands'] * starting_value, 2)
+    dates = np.busday_offset(np.datetime64(latest, 'D'), simulation['checkpoints'], roll='forward')
+
+    return {
+        'horizon': horizon,
+        'paths': paths,
+        'as_of': latest,
+        'history_start': simulation['history_start'],
+        'observations': simulation['observations'],
+        'starting_value': round(starting_value, 2),
+        'percentiles': PERCENTILES,
+        'days': simulation['checkpoints'],
+        'dates': [str(day) for day in dates],
+        'bands': {f'p{percentile}': band.tolist() for percentile, band in zip(PERCENTILES, bands)},
+        'expected_value': round(simulation['mean'] * starting_value, 2),
+        'median_value': float(bands[PERCENTILES.index(50), -1]),
+        'value_at_risk_95': round(starting_value - float(bands[PERCENTILES.index(5), -1]), 2),
+        'probability_of_loss': simulation['probability_of_loss'],
+        'missing_tickers': sorted(unpriced + simulation['missing_tickers']),
+    }
@@ -0,0 +1,378 @@
+"""
+Vectorized quantitative kernels for ZEN Trading analytics
+Pure NumPy functions over close/return matrices (rows are days, columns are assets).
+
+This module must not import Django: the kernels are sent to the compute process pool,
+whose workers import it without setting Django up.
+"""
+import numpy as np
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def simple_returns(closes):
+    """
+    Get daily simple returns from a close matrix
+
+    Args:
+        closes (numpy.ndarray): Days x assets closes (or a 1-D series)
+
+    Returns:
+        numpy.ndarray: One row fewer than closes; NaN where either close is missing
+    """
+    return closes[1:] / closes[:-1] - 1.0
+
+
+def drawdowns(equity):
+    """
+    Get the drawdown from the running peak at each point of an equity curve
+
+    Args:
+        equity (numpy.ndarray): Equity curve (1-D), or days x curves
+
+    Returns:
+        numpy.ndarray: Drawdowns (<= 0), same shape as equity
+    """
+    peaks = np.maximum.accumulate(equity, axis=0)
+    return equity / peaks - 1.0
+
+
+def first_complete_row(matrix):
+    """
+    Get the index of the first row with no NaN (len(matrix) if there is none)
+    """
+    complete = np.flatnonzero(np.all(np.isfinite(matrix), axis=1))
+    return int(complete[0]) if len(complete) else len(matrix)
+
+
+def standardize_returns(returns, min_observations):
+    """
+    Z-score each return column over the window, for correlations as matrix products
+
+    Missing returns become 0 after standardizing, so they don't contribute to any
+    correlation (a pairwise-complete approximation that needs no per-pair work).
+
+    Args:
+        returns (numpy.ndarray): Days x assets returns (NaN where missing)
+        min_observations (int): Columns with fewer valid returns are flagged unusable
+
+    Returns:
+        tuple: (standardized days x assets float32 matrix scaled by 1/sqrt(days),
+                boolean mask of usable columns)
+    """
+    valid = np.isfinite(returns)
+    counts = valid.sum(axis=0)
+    filled = np.where(valid, returns, 0.0)
+    means = filled.sum(axis=0) / np.maximum(counts, 1)
+    centered = np.where(valid, returns - means, 0.0)
+    stds = np.sqrt((centered ** 2).sum(axis=0) / np.maximum(counts, 1))
+    usable = (counts >= min_observations) & (stds > 0)
+    scaled = np.divide(centered, stds, out=np.zeros_like(centered), where=usable)
+    return (scaled / np.sqrt(len(returns))).astype(np.float32), usable
+
+
+def top_k_correlations(standardized, k, block_size=512):
+    """
+    Top-k most correlated columns for every column, computed blockwise
+
+    The full N x N matrix is never held at once: each block of rows is one
+    (block x days) @ (days x N) product followed by an O(N) partial sort per row,
+    so memory stays at block_size x N.
+
+    Args:
+        standardized (numpy.ndarray): Output of standardize_returns (days x N)
+        k (int): Neighbours per column
+        block_size (int): Columns correlated per matrix product
+
+    Returns:
+        tuple: (N x k neighbour indices, N x k correlations), highest correlation first
+    """
+    n = standardized.shape[1]
+    k = min(k, n - 1)
+    indices = np.empty((n, k), dtype=np.int64)
+    correlations = np.empty((n, k), dtype=np.float32)
+    transposed = np.ascontiguousarray(standardized.T)
+
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        block = transposed[start:end] @ standardized
+        # Exclude each column's correlation with itself
+        block[np.arange(end - start), np.arange(start, end)] = -np.inf
+        top = np.argpartition(block, -k, axis=1)[:, -k:]
+        top_values = np.take_along_axis(block, top, axis=1)
+        order = np.argsort(-top_values, axis=1)
+        indices[start:end] = np.take_along_axis(top, order, axis=1)
+        correlations[start:end] = np.take_along_axis(top_values, order, axis=1)
+    return indices, correlations
+
+
+def compute_risk_metrics(closes, benchmark_closes, values, risk_free_rate=0.0):
+    """
+    Risk metrics of a fixed-weight portfolio over a close history
+
+    Weights come from the current position values and are held constant over the window.
+    The window starts at the first day on which every asset and the benchmark have a close.
+
+    Args:
+        closes (numpy.ndarray): Days x assets closes
+        benchmark_closes (numpy.ndarray): Benchmark closes on the same days
+        values (numpy.ndarray): Current market value per asset
+        risk_free_rate (float): Annual risk-free rate, as a fraction
+
+    Returns:
+        dict: Portfolio metrics and per-asset lists (weight, volatility, beta, risk
+              contribution); None if fewer than two aligned days are available
+    """
+    combined = np.column_stack([closes, benchmark_closes])
+    start = first_complete_row(combined)
+    combined = combined[start:]
+    if len(combined) < 3 or values.sum() <= 0:
+        return None
+
+    returns = simple_returns(combined)
+    asset_returns = returns[:, :-1]
+    benchmark_returns = returns[:, -1]
+    weights = values / values.sum()
+    portfolio_returns = asset_returns @ weights
+
+    annualizer = np.sqrt(TRADING_DAYS_PER_YEAR)
+    daily_rf = risk_free_rate / TRADING_DAYS_PER_YEAR
+
+    # Covariance of assets, portfolio and benchmark in one pass
+    covariance = np.cov(np.column_stack([asset_returns, portfolio_returns, benchmark_returns]), rowvar=False)
+    asset_cov = covariance[:-2, :-2]
+    benchmark_var = covariance[-1, -1]
+    portfolio_var = covariance[-2, -2]
+    portfolio_vol = np.sqrt(portfolio_var)
+
+    betas = covariance[:-1, -1] / benchmark_var if benchmark_var > 0 else np.full(len(weights) + 1, np.nan)
+
+    # Euler decomposition: contributions sum to the portfolio volatility
+    marginal = asset_cov @ weights / portfolio_vol if portfolio_vol > 0 else np.zeros_like(weights)
+    contributions = weights * marginal
+
+    excess = portfolio_returns - daily_rf
+    mean_excess = excess.mean()
+    downside_dev = np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2))
+
+    equity = np.concatenate([[1.0], np.cumprod(1.0 + portfolio_returns)])
+    years = len(portfolio_returns) / TRADING_DAYS_PER_YEAR
+
+    return {
+        'observations': int(len(portfolio_returns)),
+        'start_offset': int(start),
+        'annual_return': float(equity[-1] ** (1.0 / years) - 1.0) if years > 0 else 0.0,
+        'volatility': float(portfolio_vol * annualizer),
+        'beta': _finite(betas[-1]),
+        'max_drawdown': float(drawdowns(equity).min()),
+        'sharpe_ratio': _finite(mean_excess / portfolio_vol * annualizer) if portfolio_vol > 0 else None,
+        'sortino_ratio': _finite(mean_excess / downside_dev * annualizer) if downside_dev > 0 else None,
+        'weights': weights.tolist(),
+        'asset_volatility': (np.sqrt(np.diag(asset_cov)) * annualizer).tolist(),
+        'asset_beta': [_finite(beta) for beta in betas[:-1]],
+        'risk_contribution': (contributions * annualizer).tolist(),
+        'risk_contribution_percent': (
+            (contributions / portfolio_vol * 100).tolist() if portfolio_vol > 0 else [0.0] * len(weights)
+        ),
+    }
+
+
+def rebalance_starts(dates, policy):
+    """
+    Get the row indices at which a rebalanced portfolio resets to its target weights
+
+    Args:
+        dates (numpy.ndarray): Trading days as datetime64[D]
+        policy (str): 'none' (buy and hold), 'monthly', 'quarterly' or 'yearly'
+
+    Returns:
+        numpy.ndarray: Sorted start indices, always beginning with 0
+    """
+    if policy == 'none' or len(dates) == 0:
+        return np.zeros(1, dtype=np.int64)
+    months = dates.astype('datetime64[M]').astype(np.int64)
+    if policy == 'monthly':
+        periods = months
+    elif policy == 'quarterly':
+        periods = months // 3
+    elif policy == 'yearly':
+        periods = months // 12
+    else:
+        raise ValueError(f'Unknown rebalance policy: {policy}')
+    return np.concatenate([[0], np.flatnonzero(periods[1:] != periods[:-1]) + 1])
+
+
+def simulate_positions(closes, weights, starts, initial_value=1.0):
+    """
+    Value of each position of a periodically rebalanced portfolio on every day
+
+    Within a segment the shares are fixed, so values follow prices; at each segment start
+    (at that day's close) the equity is redistributed by weight. Segment equities chain
+    through a cumulative product of per-segment growth factors, so no day is looped over.
+
+    Args:
+        closes (numpy.ndarray): Days x assets closes, no NaN
+        weights (numpy.ndarray): Target weights (sum to 1)
+        starts (numpy.ndarray): Rebalance rows from rebalance_starts
+        initial_value (float): Equity on the first day
+
+    Returns:
+        numpy.ndarray: Days x assets position values
+    """
+    segment = np.searchsorted(starts, np.arange(len(closes)), side='right') - 1
+    start_prices = closes[starts]
+
+    # Growth of each segment from its start to the next segment's start
+    ends = np.append(starts[1:], len(closes) - 1)
+    growth = (closes[ends] / start_prices) @ weights
+    start_equity = initial_value * np.concatenate([[1.0], np.cumprod(growth[:-1])])
+
+    return start_equity[segment, None] * weights * (closes / start_prices[segment])
+
+
+def cosmic_vibe_index(alignment_scores, elements_held):
+    """
+    Cosmic vibe index from alignment and element diversity
+
+    Alignment plus 3 points per element held (at most 15), capped at 100.
+
+    Args:
+        alignment_scores (numpy.ndarray): Value-weighted alignment scores
+        elements_held (numpy.ndarray): Number of elements with any position value
+
+    Returns:
+        numpy.ndarray: Integer index values
+    """
+    alignment_scores = np.asarray(alignment_scores, dtype=np.int64)
+    diversity_bonus = np.minimum(np.asarray(elements_held, dtype=np.int64) * 3, 15)
+    return np.minimum(alignment_scores + diversity_bonus, 100)
+
+
+def run_backtest(closes, weights, starts, alignment_scores, element_index, n_elements,
+                 benchmark_closes=None, initial_value=10000.0, risk_free_rate=0.0):
+    """
+    Simulate a basket over a close history
+
+    Args:
+        closes (numpy.ndarray): Days x assets closes, no NaN
+        weights (numpy.ndarray): Target weights (sum to 1)
+        starts (numpy.ndarray): Rebalance rows from rebalance_starts
+        alignment_scores (numpy.ndarray): Alignment score per asset
+        element_index (numpy.ndarray): Element bucket per asset (n_elements = unknown)
+        n_elements (int): Number of known elements
+        benchmark_closes (numpy.ndarray): Benchmark closes on the same days (optional)
+        initial_value (float): Starting equity
+        risk_free_rate (float): Annual risk-free rate for the Sharpe ratio
+
+    Returns:
+        dict: equity, benchmark_equity and cosmic_vibe_index series plus summary stats
+    """
+    values = simulate_positions(closes, weights, starts, initial_value)
+    equity = values.sum(axis=1)
+
+    # Daily value-weighted alignment and number of elements held
+    alignment = (values @ alignment_scores) / equity
+    element_values = np.zeros((len(values), n_elements + 1))
+    np.add.at(element_values.T, element_index, values.T)
+    elements_held = (element_values[:, :n_elements] > 0).sum(axis=1)
+    vibe = cosmic_vibe_index(alignment, elements_held)
+
+    returns = simple_returns(equity)
+    years = len(returns) / TRADING_DAYS_PER_YEAR
+    volatility = returns.std(ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR) if len(returns) > 1 else 0.0
+    excess = returns.mean() * TRADING_DAYS_PER_YEAR - risk_free_rate if len(returns) else 0.0
+
+    result = {
+        'equity': np.round(equity, 2).tolist(),
+        'cosmic_vibe_index': vibe.tolist(),
+        'benchmark_equity': None,
+        'final_value': float(equity[-1]),
+        'total_return': float(equity[-1] / equity[0] - 1.0),
+        'annual_return': float((equity[-1] / equity[0]) ** (1.0 / years) - 1.0) if years > 0 else 0.0,
+        'volatility': float(volatility),
+        'max_drawdown': float(drawdowns(equity).min()),
+        'sharpe_ratio': _finite(excess / volatility) if volatility > 0 else None,
+        'rebalances': int(len(starts) - 1),
+        'average_cosmic_vibe_index': float(vibe.mean()),
+    }
+    if benchmark_closes is not None:
+        benchmark_equity = initial_value * benchmark_closes / benchmark_closes[0]
+        result['benchmark_equity'] = np.round(benchmark_equity, 2).tolist()
+        result['benchmark_total_return'] = float(benchmark_equity[-1] / initial_value - 1.0)
+    return result
+
+
+def bootstrap_paths(returns, weights, horizon, n_paths, seed, step, max_cells=4_000_000):
+    """
+    Simulate portfolio growth paths by bootstrapping historical trading days
+
+    Each path draws `horizon` whole days (rows) of asset returns with replacement, so the
+    cross-asset correlation of every day is preserved. Paths are built as one
+    paths x horizon x assets array per chunk, with chunks sized to stay under max_cells
+    elements. Growth is compounded per block of `step` days first, so the cumulative
+    product only runs over the checkpoints. Positions are bought at the start and held.
+
+    Args:
+        returns (numpy.ndarray): Days x assets historical simple returns, no NaN
+        weights (numpy.ndarray): Current weights (sum to 1)
+        horizon (int): Trading days to simulate, a multiple of step
+        n_paths (int): Number of paths
+        seed (numpy.random.SeedSequence | int): Random seed, for reproducible results
+        step (int): Trading days between recorded checkpoints
+        max_cells (int): Upper bound on the elements of one chunk's return array
+
+    Returns:
+        numpy.ndarray: n_paths x (horizon / step) growth of 1.0 invested, at days
+                       step, 2 * step, ..., horizon
+    """
+    if horizon % step:
+        raise ValueError('horizon must be a multiple of step')
+    rng = np.random.default_rng(seed)
+    n_days, n_assets = returns.shape
+    n_checkpoints = horizon // step
+    chunk_size = max(1, max_cells // (horizon * n_assets))
+    day_growth = 1.0 + returns
+    growth = np.empty((n_paths, n_checkpoints))
+
+    for start in range(0, n_paths, chunk_size):
+        end = min(start + chunk_size, n_paths)
+        sampled = day_growth[rng.integers(0, n_days, size=(end - start, horizon))]
+        blocks = sampled.reshape(end - start, n_checkpoints, step, n_assets).prod(axis=2)
+        np.cumprod(blocks, axis=1, out=blocks)
+        growth[start:end] = blocks @ weights
+    return growth
+
+
+def basket_returns(closes, shares=None):
+    """
+    Daily returns of a basket of stocks
+
+    Equal weighting averages the constituents' returns (rebalanced daily). Cap weighting
+    weights each return by the constituent's previous-day market cap, shares x close,
+    which makes it the return of the basket's total market value. Constituents without a
+    close on both days are left out of that day.
+
+    Args:
+        closes (numpy.ndarray): Days x constituents closes (NaN before a stock's first bar)
+        shares (numpy.ndarray): Shares outstanding per constituent; None for equal weights
+
+    Returns:
+        numpy.ndarray: One row fewer than closes; NaN on days no constituent trades
+    """
+    returns = simple_returns(closes)
+    valid = np.isfinite(returns)
+    if shares is None:
+        weights = valid.astype(np.float64)
+    else:
+        weights = np.where(valid, closes[:-1] * shares, 0.0)
+    total_weight = weights.sum(axis=1)
+    weighted = np.where(valid, returns, 0.0) * weights
+    return np.divide(
+        weighted.sum(axis=1), total_weight, out=np.full(len(returns), np.nan), where=total_weight > 0
+    )
+
+
+def _finite(value):
+    """Convert to float, mapping NaN/inf to None"""
+    value = float(value)
+    return value if np.isfinite(value) else None
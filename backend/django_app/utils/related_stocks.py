@@ -0,0 +1,98 @@
+"""
+Related stocks index for ZEN Trading
+Nightly job that correlates the daily returns of the whole stock universe and stores the
+top-k most correlated stocks per ticker, so "stocks that move with this one" is a single
+indexed read at request time.
+"""
+import logging
+import time
+
+import numpy as np
+
+from django_app.models import RelatedStocks, Stock
+from django_app.utils.market_data import get_close_matrix, get_history_start, get_latest_bar_date
+from django_app.utils.quant import simple_returns, standardize_returns, top_k_correlations
+
+logger = logging.getLogger(__name__)
+
+# Neighbours stored per ticker
+RELATED_STOCKS_K = 10
+
+# Correlation window
+CORRELATION_YEARS = 1
+
+# Tickers need at least this many daily returns in the window to be correlated
+MIN_OBSERVATIONS = 60
+
+# Columns correlated per matrix product (bounds memory to block x universe)
+CORRELATION_BLOCK_SIZE = 512
+
+
+def build_related_stocks(k=RELATED_STOCKS_K):
+    """
+    Rebuild the related stocks of every ticker from cached daily bars
+
+    Args:
+        k (int): Neighbours per ticker
+
+    Returns:
+        int: Number of tickers indexed
+    """
+    latest = get_latest_bar_date()
+    if latest is None:
+        logger.info("No daily bars cached yet, skipping related stocks build")
+        return 0
+
+    started = time.perf_counter()
+    stocks = {
+        ticker: (company_name, zodiac_sign)
+        for ticker, company_name, zodiac_sign in Stock.objects.values_list('ticker', 'company_name', 'zodiac_sign')
+    }
+    tickers = sorted(stocks)
+    _, closes = get_close_matrix(
+        tickers, start=get_history_start(latest, CORRELATION_YEARS), use_cache=False
+    )
+    if len(closes) < 2:
+        return 0
+
+    returns = simple_returns(closes)
+    standardized, usable = standardize_returns(returns, MIN_OBSERVATIONS)
+    usable_tickers = [ticker for ticker, ok in zip(tickers, usable) if ok]
+    if len(usable_tickers) < 2:
+        return 0
+
+    standardized = standardized[:, usable]
+    neighbours, correlations = top_k_correlations(standardized, k, block_size=CORRELATION_BLOCK_SIZE)
+    observations = np.isfinite(returns[:, usable]).sum(axis=0)
+
+    rows = [
+        RelatedStocks(
+            ticker=ticker,
+            related=[
+                {
+                    'ticker': usable_tickers[j],
+                    'company_name': stocks[usable_tickers[j]][0],
+                    'zodiac_sign': stocks[usable_tickers[j]][1],
+                    'correlation': round(float(correlation), 4),
+                }
+                for j, correlation in zip(neighbours[i].tolist(), correlations[i].tolist())
+            ],
+            observations=int(observations[i]),
+            as_of=latest,
+        )
+        for i, ticker in enumerate(usable_tickers)
+    ]
+    RelatedStocks.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['ticker'],
+        update_fields=['related', 'observations', 'as_of', 'updated_at'],
+    )
+    # Tickers that dropped out of the universe or lost their history
+    RelatedStocks.objects.exclude(ticker__in=usable_tickers).delete()
+
+    logger.info(
+        f"Related stocks built for {len(usable_tickers)} tickers in {time.perf_counter() - started:.1f}s"
+    )
+    return len(usable_tickers)
@@ -0,0 +1,88 @@
+"""
+Per-user response cache for ZEN Trading
+Serialized payloads of the per-user read endpoints (holdings, portfolio summary, watchlist,
+dislike list, discovery) are cached under the user's data version and, for responses that
+include prices, the global price epoch:
+
+- the data version is bumped in the same transaction as every trade and preference change
+- the price epoch is bumped once at the end of every update_stock_prices batch
+
+Both are read before the view runs, so a payload can never be stored under a version newer
+than the data it was built from; stale entries are simply never read again. The timeout only
+bounds memory, it plays no part in invalidation.
+"""
+from functools import wraps
+
+from django.core.cache import cache
+from django.db.models import F, Subquery
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from django_app.models import PriceEpoch, UserDataVersion
+
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+
+def bump_data_version(user):
+    """
+    Invalidate every cached response of a user
+    Call inside the transaction that changes the user's holdings or preferences.
+    """
+    UserDataVersion.objects.filter(user=user).update(version=F('version') + 1)
+
+
+def bump_price_epoch():
+    """
+    Invalidate every cached response that includes prices
+    """
+    if not PriceEpoch.objects.filter(pk=1).update(epoch=F('epoch') + 1, updated_at=timezone.now()):
+        PriceEpoch.objects.get_or_create(pk=1, defaults={'epoch': 1})
+
+
+def get_cache_versions(user):
+    """
+    Get a user's data version and the current price epoch in one query
+
+    Returns:
+        tuple: (data_version, price_epoch), or None if the user has no version row
+    """
+    versions = UserDataVersion.objects.filter(user=user).annotate(
+        price_epoch=Subquery(PriceEpoch.objects.filter(pk=1).values('epoch')[:1])
+    ).values_list('version', 'price_epoch').first()
+    if versions is None:
+        return None
+    data_version, price_epoch = versions
+    return data_version, price_epoch or 0
+
+
+def cache_response(name, params=(), prices=True):
+    """
+    Cache the successful responses of an APIView GET method per user
+
+    Args:
+        name (str): Cache namespace of the endpoint
+        params (tuple): Query parameters the response depends on
+        prices (bool): Whether the response includes prices (keys it on the price epoch)
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            versions = get_cache_versions(request.user)
+            if versions is None:
+                return view_method(self, request, *args, **kwargs)
+
+            data_version, price_epoch = versions
+            query = ':'.join(request.GET.get(param, '') for param in params)
+            cache_key = f'response:{name}:{request.user.pk}:{data_version}:{price_epoch if prices else "-"}:{query}'
+
+            data = cache.get(cache_key)
+            if data is not None:
+                return Response(data, status=status.HTTP_200_OK)
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(cache_key, response.data, RESPONSE_CACHE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
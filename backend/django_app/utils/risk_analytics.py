@@ -0,0 +1,158 @@
+"""
+Portfolio risk analytics for ZEN Trading
+Volatility, beta, drawdown, Sharpe/Sortino and per-position risk contribution computed
+from the daily bar cache (see market_data.py) with the kernels in quant.py.
+
+Results are cached per (user, holdings version, latest bar date, period): they can only
+change when the user trades or the nightly sync adds a trading day. Portfolios too large to
+compute on the request thread are queued to a Django-Q2 task (which hands them to the
+compute process pool) and the request is answered 202; the task fills the cache the next
+request reads.
+"""
+import logging
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django_q.tasks import async_task
+
+from django_app.models import UserHoldings, StockHolding
+from django_app.utils.compute_pool import run_in_pool
+from django_app.utils.market_data import (
+    BENCHMARK_TICKER,
+    get_close_matrix,
+    get_history_start,
+    get_latest_bar_date,
+)
+from django_app.utils.quant import compute_risk_metrics
+
+logger = logging.getLogger(__name__)
+
+# Lookback window in years per period
+RISK_PERIODS = {'1Y': 1, '3Y': 3, '5Y': 5}
+
+# Matrices with at least this many cells (days x assets) are queued and computed in the process pool
+POOL_MIN_CELLS = 50_000
+
+RISK_CACHE_TIMEOUT = 60 * 60 * 24
+
+# How long a queued computation blocks queueing the same one again
+RISK_PENDING_TIMEOUT = 60
+
+# Seconds a client is told to wait before requesting a queued result again
+RISK_RETRY_AFTER = 2
+
+
+class RiskAnalyticsError(Exception):
+    """
+    Raised when risk analytics cannot be computed for a user
+    """
+
+
+def get_holdings_version(user):
+    """
+    Get a token that changes whenever the user's holdings change
+    Every trade saves the UserHoldings row, so its updated_at is enough.
+    """
+    updated_at = UserHoldings.objects.filter(user=user).values_list('updated_at', flat=True).first()
+    if updated_at is None:
+        raise RiskAnalyticsError('User holdings have not been created yet. Complete onboarding first.')
+    return int(updated_at.timestamp() * 1_000_000)
+
+
+def get_portfolio_risk(user, period='1Y', queue=True):
+    """
+    Get the risk analytics of a user's current holdings
+
+    Args:
+        user (User): Portfolio owner
+        period (str): Lookback window, one of RISK_PERIODS
+        queue (bool): Queue large computations instead of running them (False in the task)
+
+    Returns:
+        dict: Portfolio metrics plus a 'positions' list with per-position metrics, or None
+              if the computation was queued (request again shortly)
+
+    Raises:
+        RiskAnalyticsError: If the user has no holdings row or no bars are cached yet
+    """
+    latest = get_latest_bar_date()
+    if latest is None:
+        raise RiskAnalyticsError('Daily price history has not been synced yet.')
+
+    cache_key = f'portfolio_risk:{user.pk}:{get_holdings_version(user)}:{latest.isoformat()}:{period}'
+    result = cache.get(cache_key)
+    if result is not None:
+        return result
+
+    rows = list(
+        StockHolding.objects.filter(user_holdings__user=user).values_list('ticker', 'quantity', 'stock__current_price')
+    )
+    positions = {ticker: quantity for ticker, quantity, _ in rows}
+    prices = {ticker: price for ticker, _, price in rows if price is not None}
+
+    result = {
+        'period': period,
+        'as_of': latest,
+        'benchmark': BENCHMARK_TICKER,
+        'risk_free_rate': settings.RISK_FREE_RATE,
+        'observations': 0,
+        'start_date': None,
+        'annual_return': None,
+        'volatility': None,
+        'beta': None,
+        'max_drawdown': None,
+        'sharpe_ratio': None,
+        'sortino_ratio': None,
+        'positions': [],
+        'missing_tickers': sorted(set(positions) - set(prices)),
+    }
+
+    tickers = sorted(prices)
+    if tickers:
+        start = get_history_start(latest, RISK_PERIODS[period])
+        dates, closes = get_close_matrix(tickers + [BENCHMARK_TICKER], start=start)
+
+        # Positions without any bar in the window can't be analysed
+        has_history = np.isfinite(closes[:, :-1]).any(axis=0)
+        result['missing_tickers'] += [ticker for ticker, ok in zip(tickers, has_history) if not ok]
+        result['missing_tickers'].sort()
+        tickers = [ticker for ticker, ok in zip(tickers, has_history) if ok]
+        asset_closes = closes[:, :-1][:, has_history]
+        values = np.array([float(positions[t] * prices[t]) for t in tickers], dtype=np.float64)
+
+        args = (asset_closes, closes[:, -1], values, settings.RISK_FREE_RATE)
+        if tickers and asset_closes.size >= POOL_MIN_CELLS:
+            if queue:
+                # Queued once until it completes or the marker expires
+                if cache.add(f'{cache_key}:pending', True, RISK_PENDING_TIMEOUT):
+                    async_task('django_app.tasks.compute_portfolio_risk', user.pk, period)
+                return None
+            metrics = run_in_pool(compute_risk_metrics, *args)
+        elif tickers:
+            metrics = compute_risk_metrics(*args)
+        else:
+            metrics = None
+
+        if metrics is not None:
+            result.update({
+                key: metrics[key]
+                for key in ('observations', 'annual_return', 'volatility', 'beta', 'max_drawdown',
+                            'sharpe_ratio', 'sortino_ratio')
+            })
+            result['start_date'] = dates[metrics['start_offset']].item()
+            result['positions'] = [
+                {
+                    'ticker': ticker,
+                    'weight': metrics['weights'][i],
+                    'volatility': metrics['asset_volatility'][i],
+                    'beta': metrics['asset_beta'][i],
+                    'risk_contribution': metrics['risk_contribution'][i],
+                    'risk_contribution_percent': metrics['risk_contribution_percent'][i],
+                }
+                for i, ticker in enumerate(tickers)
+            ]
+
+    cache.set(cache_key, result, RISK_CACHE_TIMEOUT)
+    cache.delete(f'{cache_key}:pending')
+    return result
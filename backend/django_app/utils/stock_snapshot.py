@@ -0,0 +1,77 @@
+"""
+Pre-rendered stock list for ZEN Trading
+GET /api/stocks/ is public, unpaginated and only changes with a price batch, so every worker
+renders it once per price epoch and keeps the JSON bytes, plus gzip and brotli variants, in
+memory. A request then costs the epoch read, a dictionary
+lookup and a copy of the chosen body.
+
+The epoch is bumped at the end of every update_stock_prices batch and by the commands that
+load stocks, so a worker picks up new prices on its first request after the bump.
+"""
+import gzip
+import threading
+
+import brotli
+
+from django_app.models import PriceEpoch, Stock
+from django_app.renderers import FastJSONRenderer
+from django_app.utils.fast_serializers import STOCK_FIELDS, serialize_stocks
+
+_snapshot = None  # (epoch, {'identity': bytes, 'gzip': bytes, 'br': bytes})
+_lock = threading.Lock()
+
+
+def get_price_epoch():
+    """
+    Get the current price epoch and when it was bumped
+
+    Returns:
+        tuple: (epoch, updated_at), (0, None) before the first price batch
+    """
+    return PriceEpoch.objects.filter(pk=1).values_list('epoch', 'updated_at').first() or (0, None)
+
+
+def render_stock_list():
+    """
+    Render the stock list and its compressed variants
+
+    Returns:
+        dict: Body bytes by content coding ('identity', 'gzip' and 'br')
+    """
+    stocks = Stock.objects.values(*(name for name, _ in STOCK_FIELDS))
+    body = FastJSONRenderer().render(serialize_stocks(stocks))
+    return {
+        'identity': body,
+        'gzip': gzip.compress(body, compresslevel=9, mtime=0),
+        'br': brotli.compress(body, mode=brotli.MODE_TEXT),
+    }
+
+
+def get_stock_list_snapshot():
+    """
+    Get the rendered stock list of the current price epoch, rendering it on first use
+
+    Returns:
+        tuple: (epoch, updated_at, body bytes by content coding)
+    """
+    global _snapshot
+    epoch, updated_at = get_price_epoch()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot[0] == epoch:
+        return epoch, updated_at, snapshot[1]
+
+    # Only one thread per worker renders a new epoch, the others wait for its result
+    with _lock:
+        if _snapshot is None or _snapshot[0] != epoch:
+            _snapshot = (epoch, render_stock_list())
+        return epoch, updated_at, _snapshot[1]
+
+
+def clear_stock_list_snapshot():
+    """
+    Drop this worker's rendered stock list (e.g. between tests)
+    """
+    global _snapshot
+    with _lock:
+        _snapshot = None
+
@@ -0,0 +1,125 @@
+"""
+Tax-lot accounting for ZEN Trading
+Every buy opens a lot; sells consume open lots under a FIFO, LIFO or highest-cost policy
+
+Open lots are read through partial indexes ordered by each policy (see TaxLot.Meta), a
+batch at a time, so a sell costs an index seek plus the lots it actually touches rather
+than a scan of the user's lot history.
+"""
+import logging
+from decimal import Decimal
+
+from django.utils import timezone
+
+from django_app.models import TaxLot, UserHoldings
+
+logger = logging.getLogger(__name__)
+
+LOT_METHODS = [method for method, _ in UserHoldings.LOT_METHODS]
+
+# Consumption order of open lots per policy
+LOT_ORDERING = {
+    'fifo': ('id',),
+    'lifo': ('-id',),
+    'highest_cost': ('-cost_per_share', 'id'),
+}
+
+# Lots fetched per query while consuming a sell
+LOT_BATCH_SIZE = 20
+
+
+def open_lot(user, ticker, quantity, total_value, acquired_at=None):
+    """
+    Record the lot created by a buy
+
+    Args:
+        user (User): Buying user
+        ticker (str): Ticker symbol
+        quantity (Decimal): Shares bought
+        total_value (Decimal): Total cost of the buy
+        acquired_at (datetime): Acquisition time (defaults to now)
+
+    Returns:
+        TaxLot: The new lot
+    """
+    return TaxLot.objects.create(
+        user=user,
+        ticker=ticker,
+        quantity=quantity,
+        remaining_quantity=quantity,
+        cost_per_share=(total_value / quantity).quantize(Decimal('0.0001')),
+        remaining_cost=total_value,
+        acquired_at=acquired_at or timezone.now(),
+    )
+
+
+def consume_lots(user, ticker, quantity, proceeds, method='fifo'):
+    """
+    Sell shares out of a user's open lots
+
+    Each lot gives up its cost basis pro rata to the shares taken from it (all of it when
+    the lot is emptied, so no rounding is left behind) and is credited its share of the
+    proceeds as realized gain/loss. Must be called inside the trade's transaction, with
+    the user's holdings row locked.
+
+    Args:
+        user (User): Selling user
+        ticker (str): Ticker symbol
+        quantity (Decimal): Shares sold
+        proceeds (Decimal): Total value received for the sale
+        method (str): 'fifo', 'lifo' or 'highest_cost'
+
+    Returns:
+        tuple: (cost basis released, shares not covered by any lot)
+    """
+    if method not in LOT_ORDERING:
+        raise ValueError(f'Unknown lot method: {method}')
+
+    open_lots = TaxLot.objects.filter(
+        user=user, ticker=ticker, remaining_quantity__gt=0
+    ).order_by(*LOT_ORDERING[method])
+
+    now = timezone.now()
+    to_sell = quantity
+    released_cost = Decimal('0')
+    unallocated_proceeds = proceeds
+
+    while to_sell > 0:
+        # Emptied lots drop out of the partial index, so each batch starts at the next open lot
+        batch = list(open_lots[:LOT_BATCH_SIZE])
+        if not batch:
+            break
+
+        for lot in batch:
+            take = min(lot.remaining_quantity, to_sell)
+            if take == lot.remaining_quantity:
+                cost = lot.remaining_cost
+                lot.closed_at = now
+            else:
+                cost = (lot.remaining_cost * take / lot.remaining_quantity).quantize(Decimal('0.01'))
+            if take == to_sell:
+                # Last lot of the sale gets the remainder so the split adds up exactly
+                lot_proceeds = unallocated_proceeds
+            else:
+                lot_proceeds = (proceeds * take / quantity).quantize(Decimal('0.01'))
+            unallocated_proceeds -= lot_proceeds
+
+            lot.remaining_quantity -= take
+            lot.remaining_cost -= cost
+            lot.realized_gain_loss += lot_proceeds - cost
+            lot.updated_at = now
+
+            released_cost += cost
+            to_sell -= take
+            if to_sell <= 0:
+                batch = batch[:batch.index(lot) + 1]
+                break
+
+        TaxLot.objects.bulk_update(
+            batch, ['remaining_quantity', 'remaining_cost', 'realized_gain_loss', 'closed_at', 'updated_at']
+        )
+
+    if to_sell > 0:
+        logger.warning(f"{to_sell} shares of {ticker} sold by user {user.pk} were not covered by tax lots")
+
+    return released_cost, to_sell
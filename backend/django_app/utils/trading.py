@@ -0,0 +1,183 @@
+"""
+Trade execution for ZEN Trading
+Shared by the holdings endpoint and any background process that places trades
+"""
+import logging
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from django_app.models import Stock, UserHoldings, StockHolding, UserStockPreference
+from django_app.utils.tax_lots import open_lot, consume_lots, LOT_METHODS
+from django_app.utils.valuation_engine import apply_position_change
+from django_app.utils.response_cache import bump_data_version
+
+logger = logging.getLogger(__name__)
+
+
+class TradeError(Exception):
+    """
+    Raised when a trade cannot be executed
+    Carries the same error/detail pair the API returns to the client
+    """
+
+    def __init__(self, error, detail, status_code=400):
+        super().__init__(detail)
+        self.error = error
+        self.detail = detail
+        self.status_code = status_code
+
+
+def execute_trade(user, ticker, action, quantity, total_value, lot_method=None):
+    """
+    Buy or sell shares of a stock for a user in a single transaction
+
+    The holdings row is locked for the duration of the trade, and the user's materialized
+    portfolio aggregates and response cache version are updated in the same transaction. Buys open a tax lot; sells
+    consume lots and release their cost basis, realizing the difference with the proceeds.
+
+    Args:
+        user (User): User placing the trade
+        ticker (str): Upper-cased ticker symbol
+        action (str): 'buy' or 'sell'
+        quantity (Decimal): Number of shares (> 0)
+        total_value (Decimal): Total value of the trade (>= 0)
+        lot_method (str): Lot policy for a sell (defaults to the user's lot_method)
+
+    Returns:
+        tuple: (UserHoldings, message)
+
+    Raises:
+        TradeError: If the trade is invalid (insufficient balance, unknown position, ...)
+    """
+    if action not in ('buy', 'sell'):
+        raise TradeError('Invalid action', 'Action must be either "buy" or "sell"')
+    if lot_method is not None and lot_method not in LOT_METHODS:
+        raise TradeError('Invalid lot method', f'lot_method must be one of: {", ".join(LOT_METHODS)}')
+
+    with transaction.atomic():
+        holdings, _ = UserHoldings.objects.get_or_create(user=user)
+        holdings = UserHoldings.objects.select_for_update().get(pk=holdings.pk)
+        bump_data_version(user)
+
+        if action == 'buy':
+            # Check if user has enough balance
+            if holdings.balance < total_value:
+                raise TradeError(
+                    'Insufficient balance',
+                    f'Your balance (${holdings.balance}) is insufficient to complete this purchase (${total_value})'
+                )
+
+            # Calculate purchase price per share
+            purchase_price_per_share = total_value / quantity
+
+            # Update or create stock holding
+            stock = Stock.objects.filter(ticker=ticker).values('pk', 'current_price', 'zodiac_sign').first()
+            stock_holding, created = StockHolding.objects.get_or_create(
+                user_holdings=holdings,
+                ticker=ticker,
+                defaults={
+                    'stock_id': stock['pk'] if stock else None,
+                    'quantity': quantity,
+                    'total_value': total_value,
+                    'purchase_price': purchase_price_per_share,
+                    'purchase_date': timezone.now()
+                }
+            )
+
+            if not created:
+                # Update existing position with weighted average purchase price
+                new_cost_basis = stock_holding.total_value + total_value
+                new_quantity = stock_holding.quantity + quantity
+
+                stock_holding.purchase_price = new_cost_basis / new_quantity
+                stock_holding.quantity = new_quantity
+                stock_holding.total_value = new_cost_basis
+                stock_holding.purchase_date = timezone.now()  # Update to most recent purchase
+                stock_holding.save()
+
+            open_lot(user, ticker, quantity, total_value)
+            
+            # Deduct from balance
+            holdings.balance -= total_value
+            holdings.save()
+
+            apply_position_change(
+                user, ticker,
+                quantity_delta=quantity,
+                cost_delta=total_value,
+                cash_delta=-total_value,
+                opened=created,
+                stock=stock
+            )
+
+            return holdings, f'Successfully purchased {quantity} shares of {ticker}'
+
+        # Sell
+        try:
+            stock_holding = StockHolding.objects.select_for_update().get(
+                user_holdings=holdings,
+                ticker=ticker
+            )
+        except StockHolding.DoesNotExist:
+            raise TradeError('Position not found', f'You do not own any shares of {ticker}', status_code=404)
+
+        # Check if user has enough shares
+        if stock_holding.quantity < quantity:
+            raise TradeError('Insufficient shares', f'You only own {stock_holding.quantity} shares of {ticker}')
+
+        old_cost_basis = stock_holding.total_value
+
+        # Release the cost basis of the consumed lots
+        released_cost, uncovered = consume_lots(
+            user, ticker, quantity, total_value, method=lot_method or holdings.lot_method
+        )
+        closed = stock_holding.quantity - quantity <= Decimal('0')
+        if closed:
+            # Closing the position releases whatever cost basis is left
+            released_cost = old_cost_basis
+        elif uncovered > 0:
+            # Shares bought before lot tracking existed are released at the average cost
+            released_cost += min(
+                (uncovered * (stock_holding.purchase_price or Decimal('0'))).quantize(Decimal('0.01')),
+                old_cost_basis - released_cost
+            )
+        realized_gain_loss = total_value - released_cost
+
+        # Update position
+        stock_holding.quantity -= quantity
+        stock_holding.total_value -= released_cost
+
+        if closed:
+            # Remove position if fully sold
+            stock_holding.delete()
+            logger.debug(f"Position deleted for {ticker}")
+
+            # Remove from watchlist so it can appear in discovery again
+            deleted_count, _ = UserStockPreference.objects.filter(
+                user=user,
+                ticker=ticker,
+                preference_type='watchlist'
+            ).delete()
+            logger.debug(f"Removed {ticker} from watchlist for user {user.email}: {deleted_count} entries deleted")
+        else:
+            stock_holding.purchase_price = stock_holding.total_value / stock_holding.quantity
+            stock_holding.save()
+            logger.debug(f"Position updated for {ticker}, remaining quantity: {stock_holding.quantity}")
+
+        # Add to balance
+        holdings.balance += total_value
+        holdings.realized_gain_loss += realized_gain_loss
+        holdings.save()
+
+        apply_position_change(
+            user, ticker,
+            quantity_delta=-quantity,
+            cost_delta=-released_cost,
+            cash_delta=total_value,
+            realized_delta=realized_gain_loss,
+            closed=closed
+        )
+
+        return holdings, f'Successfully sold {quantity} shares of {ticker}'
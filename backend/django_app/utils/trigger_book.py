@@ -0,0 +1,63 @@
+"""
+Sorted threshold index shared by the order and alert engines
+
+Each book stores (key, item_id) pairs sorted ascending, with keys chosen so that an item
+fires exactly when key >= threshold. The fired items are then always a suffix located with
+one binary search and removed with one slice deletion, so evaluating a book against a new
+value costs O(log n + fired) however many items are resting in it.
+"""
+from bisect import bisect_left, insort
+
+# Items that fire when the value falls to their threshold, and when it rises to it
+FIRES_AT_OR_BELOW = 'at_or_below'
+FIRES_AT_OR_ABOVE = 'at_or_above'
+
+
+class TriggerBook:
+    """
+    One-shot threshold items grouped per ticker
+
+    Items are removed when they fire; cancelled items are expected to be dropped lazily by
+    the caller when they come back out of pop_triggered.
+    """
+
+    def __init__(self):
+        # ticker -> direction -> sorted list of (key, item_id)
+        self.books = {}
+
+    def add(self, ticker, direction, threshold, item_id):
+        """
+        Insert an item that fires when the ticker's value crosses threshold in direction
+        """
+        threshold = float(threshold)
+        # At or below: fires when threshold >= value. At or above: fires when -threshold >= -value.
+        key = threshold if direction == FIRES_AT_OR_BELOW else -threshold
+        books = self.books.setdefault(ticker, {FIRES_AT_OR_BELOW: [], FIRES_AT_OR_ABOVE: []})
+        insort(books[direction], (key, item_id))
+
+    def pop_triggered(self, ticker, value):
+        """
+        Remove and return the ids of every item on a ticker that fires at a value
+
+        Args:
+            ticker (str): Ticker symbol
+            value (float): Latest value (price, percent move, ...)
+
+        Returns:
+            list: Fired item ids in ascending id order
+        """
+        books = self.books.get(ticker)
+        if not books:
+            return []
+
+        fired = []
+        for direction, threshold in ((FIRES_AT_OR_BELOW, value), (FIRES_AT_OR_ABOVE, -value)):
+            entries = books[direction]
+            start = bisect_left(entries, (threshold,))
+            if start < len(entries):
+                fired.extend(item_id for _, item_id in entries[start:])
+                del entries[start:]
+        return sorted(fired)
+
+    def __len__(self):
+        return sum(len(entries) for books in self.books.values() for entries in books.values())
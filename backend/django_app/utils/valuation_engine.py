@@ -0,0 +1,732 @@
+"""
+Vectorized valuation engine for ZEN Trading
+Values every user's portfolio at once after each price batch
+
+All positions are held in a user x ticker sparse matrix and all current prices in a
+single vector, so one price tick is a handful of sparse matrix-vector products instead
+of a per-user loop. Only users whose numbers actually moved are written back to
+PortfolioValuation, which keeps the leaderboard up to date incrementally, and only users
+whose cosmic vibe index moved get a CosmicVibeSnapshot appended to their history.
+
+Trades update a user's PortfolioValuation row in place, so the engine never writes a row
+from positions older than the user's data version (see persist).
+"""
+import bisect
+import logging
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+from scipy import sparse
+
+from django_app.models import (
+    Stock,
+    StockHolding,
+    UserHoldings,
+    UserProfile,
+    ZodiacSignMatching,
+    PortfolioValuation,
+    CosmicVibeSnapshot,
+    UserDataVersion,
+    get_element_from_zodiac,
+)
+from django_app.utils.change_log import ChangeLogReader
+from django_app.utils.quant import cosmic_vibe_index
+
+logger = logging.getLogger(__name__)
+
+# Alignment score per match type (same scale as the portfolio summary)
+ALIGNMENT_SCORES = {
+    'same_sign': 100,
+    'positive': 85,
+    'neutral': 65,
+    'negative': 40,
+}
+
+# Alignment reported for portfolios without any stock value
+EMPTY_PORTFOLIO_ALIGNMENT = 50
+
+ELEMENTS = ['Fire', 'Earth', 'Air', 'Water']
+MATCH_TYPES = ['same_sign', 'positive', 'neutral', 'negative']
+
+PERSIST_FIELDS = [
+    'zodiac_sign',
+    'element',
+    'cash_balance',
+    'stocks_value',
+    'total_value',
+    'cost_basis',
+    'gain_loss',
+    'gain_loss_percent',
+    'realized_gain_loss',
+    'alignment_score',
+    'cosmic_vibe_index',
+    'fire_value',
+    'earth_value',
+    'air_value',
+    'water_value',
+    'alignment_weighted_value',
+    'position_count',
+    'same_sign_count',
+    'positive_count',
+    'neutral_count',
+    'negative_count',
+    'updated_at',
+]
+
+
+def get_match_type(user_sign, stock_sign, matching_table):
+    """
+    Get the match type of a stock sign for a user sign
+
+    Args:
+        user_sign (str): User's zodiac sign
+        stock_sign (str): Stock's zodiac sign
+        matching_table (dict): {(user_sign, stock_sign): match_type}
+
+    Returns:
+        str: same_sign, positive, neutral or negative (neutral when unknown)
+    """
+    if stock_sign and stock_sign == user_sign:
+        return 'same_sign'
+    match_type = matching_table.get((user_sign, stock_sign), 'neutral')
+    return match_type if match_type in ALIGNMENT_SCORES else 'neutral'
+
+
+def get_alignment_score(user_sign, stock_sign, matching_table):
+    """
+    Get the alignment score of a stock sign for a user sign
+
+    Returns:
+        int: Alignment score (40-100)
+    """
+    return ALIGNMENT_SCORES[get_match_type(user_sign, stock_sign, matching_table)]
+
+
+def get_cosmic_vibe_index(alignment_score, element_values):
+    """
+    Get the cosmic vibe index of a portfolio (see quant.cosmic_vibe_index)
+
+    Args:
+        alignment_score (int): Value-weighted alignment score
+        element_values (iterable): Position value held per element
+
+    Returns:
+        int: Cosmic vibe index (0-100)
+    """
+    elements_held = sum(1 for value in element_values if value > 0)
+    return int(cosmic_vibe_index(alignment_score, elements_held))
+
+
+def record_cosmic_vibe(user_id, vibe_index, alignment_score, elements_held):
+    """
+    Append a point to a user's cosmic vibe history
+    """
+    return CosmicVibeSnapshot.objects.create(
+        user_id=user_id,
+        cosmic_vibe_index=vibe_index,
+        alignment_score=alignment_score,
+        elements_held=elements_held,
+    )
+
+
+def _to_money(value):
+    """Round a float to a 2-decimal Decimal for a DecimalField"""
+    return Decimal(f"{value:.2f}")
+
+
+class PortfolioValuationEngine:
+    """
+    Holds every position in memory and revalues all portfolios per price tick
+
+    Positions are kept as COO triplets (user row, ticker column, value) and compiled
+    into CSR matrices. When trades happen only the rows of the affected users are
+    reloaded (read from the change log), so staying in sync costs O(changed users) queries
+    plus an O(nnz) rebuild.
+    """
+
+    def __init__(self):
+        self.user_ids = np.empty(0, dtype=np.int64)
+        self.user_index = {}
+        self.tickers = []
+        self.ticker_index = {}
+        self.stock_signs = {}
+        self.user_signs = []
+        self.user_elements = []
+        self.cash = np.empty(0, dtype=np.float64)
+        self.realized = np.empty(0, dtype=np.float64)
+        self._user_id_list = []
+        self._cash_list = []
+        self._realized_list = []
+
+        # COO triplets for every known position
+        self._rows = np.empty(0, dtype=np.int64)
+        self._cols = np.empty(0, dtype=np.int64)
+        self._quantities = np.empty(0, dtype=np.float64)
+        self._costs = np.empty(0, dtype=np.float64)
+
+        # Compiled matrices
+        self.quantities = None  # users x tickers share counts
+        self.aligned_quantities = None  # share counts weighted by alignment score
+        self.cost_basis = np.empty(0, dtype=np.float64)  # per user
+        self.position_counts = np.empty(0, dtype=np.int64)  # per user
+        self.match_counts = np.empty((0, len(MATCH_TYPES)), dtype=np.int64)  # per user and match type
+        self._entry_rows = np.empty(0, dtype=np.int64)
+        self._entry_elements = np.empty(0, dtype=np.int64)
+
+        self.changes = ChangeLogReader('portfolio')
+        self.matching_table = {}
+        # Data version each user's positions were loaded at, and users to reload at the next sync
+        self.data_versions = {}
+        self._stale_users = set()
+
+        # Last persisted (total value, cost basis, alignment, vibe) per row, NaN when it must be written
+        self._last_written = np.empty((0, 4), dtype=np.float64)
+        # Last recorded cosmic vibe index per row (kept across reloads, NaN when unknown)
+        self._last_vibe = np.empty(0, dtype=np.float64)
+
+    # Loading
+
+    def _load_tickers(self):
+        """Make sure every Stock has a column in the price vector"""
+        for ticker, zodiac_sign in Stock.objects.values_list('ticker', 'zodiac_sign'):
+            if ticker not in self.ticker_index:
+                self.ticker_index[ticker] = len(self.tickers)
+                self.tickers.append(ticker)
+            self.stock_signs[ticker] = zodiac_sign
+
+    def _user_row(self, user_id):
+        """Get (or allocate) the matrix row for a user"""
+        row = self.user_index.get(user_id)
+        if row is None:
+            row = len(self.user_index)
+            self.user_index[user_id] = row
+            self._user_id_list.append(user_id)
+            self._cash_list.append(0.0)
+            self._realized_list.append(0.0)
+            self.user_signs.append(None)
+            self.user_elements.append('Unknown')
+        return row
+
+    def _load_users(self, user_ids=None):
+        """
+        (Re)load cash, realized P&L, zodiac sign and positions for the given users (all users if None)
+        """
+        version_query = UserDataVersion.objects.all()
+        holdings_query = UserHoldings.objects.all()
+        profile_query = UserProfile.objects.all()
+        position_query = StockHolding.objects.all()
+        if user_ids is not None:
+            version_query = version_query.filter(user_id__in=user_ids)
+            holdings_query = holdings_query.filter(user_id__in=user_ids)
+            profile_query = profile_query.filter(user_id__in=user_ids)
+            position_query = position_query.filter(user_holdings__user_id__in=user_ids)
+
+        # Read before the positions: a trade committing in between makes the version look
+        # older than the data (one extra reload), never newer
+        self.data_versions.update(version_query.values_list('user_id', 'version'))
+
+        for user_id, balance, realized in holdings_query.values_list('user_id', 'balance', 'realized_gain_loss'):
+            row = self._user_row(user_id)
+            self._cash_list[row] = float(balance)
+            self._realized_list[row] = float(realized)
+
+        for user_id, zodiac_sign in profile_query.values_list('user_id', 'zodiac_sign'):
+            if user_id in self.user_index:
+                row = self.user_index[user_id]
+                self.user_signs[row] = zodiac_sign
+                self.user_elements[row] = get_element_from_zodiac(zodiac_sign)
+
+        rows, cols, quantities, costs = [], [], [], []
+        for user_id, ticker, quantity, total_value in position_query.values_list(
+            'user_holdings__user_id', 'ticker', 'quantity', 'total_value'
+        ):
+            # Positions in tickers we have no Stock row for are skipped, same as the summary view
+            col = self.ticker_index.get(ticker)
+            if col is None:
+                continue
+            rows.append(self._user_row(user_id))
+            cols.append(col)
+            quantities.append(float(quantity))
+            costs.append(float(total_value))
+
+        if user_ids is not None:
+            # Drop the stale positions of the reloaded users before appending the fresh ones
+            reloaded_rows = np.asarray(
+                [self.user_index[uid] for uid in user_ids if uid in self.user_index], dtype=np.int64
+            )
+            self._last_written[reloaded_rows[reloaded_rows < len(self._last_written)]] = np.nan
+            # Trades record their own vibe snapshot, so pick up the index they left behind
+            for user_id, vibe_index in PortfolioValuation.objects.filter(user_id__in=user_ids).values_list(
+                'user_id', 'cosmic_vibe_index'
+            ):
+                row = self.user_index.get(user_id)
+                if row is not None and row < len(self._last_vibe):
+                    self._last_vibe[row] = vibe_index
+            keep = ~np.isin(self._rows, reloaded_rows)
+            self._rows = self._rows[keep]
+            self._cols = self._cols[keep]
+            self._quantities = self._quantities[keep]
+            self._costs = self._costs[keep]
+
+        self._rows = np.concatenate([self._rows, np.asarray(rows, dtype=np.int64)])
+        self._cols = np.concatenate([self._cols, np.asarray(cols, dtype=np.int64)])
+        self._quantities = np.concatenate([self._quantities, np.asarray(quantities, dtype=np.float64)])
+        self._costs = np.concatenate([self._costs, np.asarray(costs, dtype=np.float64)])
+
+    def _compile(self):
+        """Build the CSR matrices from the COO triplets"""
+        shape = (len(self.user_index), len(self.tickers))
+        self.user_ids = np.asarray(self._user_id_list, dtype=np.int64)
+        self.cash = np.asarray(self._cash_list, dtype=np.float64)
+        self.realized = np.asarray(self._realized_list, dtype=np.float64)
+        missing = shape[0] - len(self._last_written)
+        if missing > 0:
+            self._last_written = np.vstack([self._last_written, np.full((missing, 4), np.nan)])
+            self._last_vibe = np.concatenate([self._last_vibe, np.full(missing, np.nan)])
+
+        # Match type of every position, looked up from a (user sign, stock sign) table
+        signs = sorted({sign for sign in self.user_signs if sign} | {sign for sign in self.stock_signs.values() if sign})
+        sign_index = {sign: i for i, sign in enumerate(signs)}
+        unknown = len(signs)
+        match_table = np.array(
+            [
+                [
+                    MATCH_TYPES.index(get_match_type(user_sign, stock_sign, self.matching_table))
+                    for stock_sign in signs + [None]
+                ]
+                for user_sign in signs + [None]
+            ],
+            dtype=np.int64,
+        ).reshape(len(signs) + 1, len(signs) + 1)
+        user_sign_idx = np.array([sign_index.get(sign, unknown) for sign in self.user_signs], dtype=np.int64)
+        stock_sign_idx = np.array(
+            [sign_index.get(self.stock_signs.get(ticker), unknown) for ticker in self.tickers], dtype=np.int64
+        )
+        match_idx = match_table[user_sign_idx[self._rows], stock_sign_idx[self._cols]]
+        scores = np.array([ALIGNMENT_SCORES[match_type] for match_type in MATCH_TYPES], dtype=np.float64)[match_idx]
+
+        self.quantities = sparse.csr_matrix((self._quantities, (self._rows, self._cols)), shape=shape)
+        self.aligned_quantities = sparse.csr_matrix(
+            (self._quantities * scores, (self._rows, self._cols)), shape=shape
+        )
+        self.cost_basis = np.bincount(self._rows, weights=self._costs, minlength=shape[0])
+        self.position_counts = np.bincount(self._rows, minlength=shape[0])
+        self.match_counts = np.bincount(
+            self._rows * len(MATCH_TYPES) + match_idx, minlength=shape[0] * len(MATCH_TYPES)
+        ).reshape(shape[0], len(MATCH_TYPES))
+
+        # Element bucket of every stored entry, for the per-element value split
+        element_idx = np.array(
+            [
+                ELEMENTS.index(element) if element in ELEMENTS else len(ELEMENTS)
+                for element in (get_element_from_zodiac(self.stock_signs.get(ticker)) for ticker in self.tickers)
+            ],
+            dtype=np.int64,
+        )
+        self._entry_rows = np.repeat(np.arange(shape[0]), np.diff(self.quantities.indptr))
+        self._entry_elements = element_idx[self.quantities.indices]
+
+    def full_load(self):
+        """Load every user and position from scratch"""
+        self.__init__()
+        self.matching_table = {
+            (user_sign, stock_sign): match_type
+            for user_sign, stock_sign, match_type in ZodiacSignMatching.objects.values_list(
+                'user_sign', 'stock_sign', 'match_type'
+            )
+        }
+        self.changes.reset()
+        self._load_tickers()
+        self._load_users()
+        self._compile()
+        for user_id, total, cost, alignment, vibe_index in PortfolioValuation.objects.values_list(
+            'user_id', 'total_value', 'cost_basis', 'alignment_score', 'cosmic_vibe_index'
+        ):
+            row = self.user_index.get(user_id)
+            if row is not None:
+                self._last_written[row] = (float(total), float(cost), alignment, vibe_index)
+                self._last_vibe[row] = vibe_index
+        logger.info(
+            f"Valuation engine loaded {len(self.user_index)} users, "
+            f"{len(self._rows)} positions across {len(self.tickers)} tickers"
+        )
+
+    def sync(self):
+        """
+        Bring the in-memory positions up to date with trades and profile changes
+
+        Every save of a user's UserHoldings (each trade) or UserProfile writes a change log
+        entry, so the users read from the log, plus those persist found newer in the
+        database, are exactly the ones to reload.
+        """
+        if self.changes.read_at is None or UserHoldings.objects.count() < len(self.user_index):
+            # First run, or users were deleted: start over
+            self.full_load()
+            return
+
+        changed_users = self.changes.poll() | self._stale_users
+        self._stale_users = set()
+        new_tickers = Stock.objects.exclude(ticker__in=self.tickers).exists()
+        if new_tickers:
+            self._load_tickers()
+
+        if changed_users:
+            self._load_users(list(changed_users))
+        if changed_users or new_tickers:
+            self._compile()
+            logger.debug(f"Valuation engine reloaded {len(changed_users)} user(s)")
+
+    # Valuation
+
+    def price_vector(self):
+        """
+        Get current prices aligned with the matrix columns
+
+        Returns:
+            numpy.ndarray: Current price per ticker (0 when unknown)
+        """
+        prices = np.zeros(len(self.tickers), dtype=np.float64)
+        for ticker, current_price in Stock.objects.values_list('ticker', 'current_price'):
+            col = self.ticker_index.get(ticker)
+            if col is not None and current_price is not None:
+                prices[col] = float(current_price)
+        return prices
+
+    def revalue(self, prices=None):
+        """
+        Value every portfolio against a price vector
+
+        Args:
+            prices (numpy.ndarray): Price per ticker column (defaults to current prices)
+
+        Returns:
+            dict: Arrays indexed by matrix row (user_ids, stocks_value, cost_basis,
+                  total_value, gain_loss, gain_loss_percent, realized_gain_loss, alignment_score,
+                  cosmic_vibe_index, elements_held, aligned_value, element_values,
+                  position_count, match_counts)
+        """
+        if prices is None:
+            prices = self.price_vector()
+
+        stocks_value = self.quantities @ prices
+        cost_basis = self.cost_basis
+        aligned_value = self.aligned_quantities @ prices
+
+        gain_loss = stocks_value - cost_basis
+        gain_loss_percent = np.divide(
+            gain_loss * 100, cost_basis, out=np.zeros_like(gain_loss), where=cost_basis > 0
+        )
+        alignment_score = np.full(len(stocks_value), EMPTY_PORTFOLIO_ALIGNMENT, dtype=np.int64)
+        has_stocks = stocks_value > 0
+        alignment_score[has_stocks] = (aligned_value[has_stocks] / stocks_value[has_stocks]).astype(np.int64)
+
+        # Per-element split: value of every stored entry bucketed by (row, element)
+        n_users = len(stocks_value)
+        buckets = len(ELEMENTS) + 1
+        entry_values = self.quantities.data * prices[self.quantities.indices]
+        element_values = np.bincount(
+            self._entry_rows * buckets + self._entry_elements, weights=entry_values, minlength=n_users * buckets
+        ).reshape(n_users, buckets)[:, :len(ELEMENTS)]
+        elements_held = (element_values > 0).sum(axis=1)
+
+        return {
+            'user_ids': self.user_ids,
+            'cash_balance': self.cash,
+            'stocks_value': stocks_value,
+            'cost_basis': cost_basis,
+            'total_value': self.cash + stocks_value,
+            'gain_loss': gain_loss,
+            'gain_loss_percent': gain_loss_percent,
+            'realized_gain_loss': self.realized,
+            'alignment_score': alignment_score,
+            'cosmic_vibe_index': cosmic_vibe_index(alignment_score, elements_held),
+            'elements_held': elements_held,
+            'aligned_value': aligned_value,
+            'element_values': element_values,
+            'position_count': self.position_counts,
+            'match_counts': self.match_counts,
+        }
+
+    def persist(self, results):
+        """
+        Write only the valuations that changed since the last persist, and append a vibe
+        snapshot for the users whose cosmic vibe index changed
+
+        Rows are locked first (trades lock them too), and users whose data version is newer
+        than the one their positions were loaded at are skipped and reloaded at the next sync:
+        their row already holds the trade's numbers.
+
+        Args:
+            results (dict): Output of revalue()
+
+        Returns:
+            int: Number of PortfolioValuation rows written
+        """
+        current = np.column_stack([
+            np.round(results['total_value'], 2),
+            np.round(results['cost_basis'], 2),
+            results['alignment_score'].astype(np.float64),
+            results['cosmic_vibe_index'].astype(np.float64),
+        ])
+        changed_rows = np.flatnonzero(np.any(current != self._last_written, axis=1))
+        if not len(changed_rows):
+            return 0
+
+        with transaction.atomic():
+            return self._persist_rows(results, current, changed_rows)
+
+    def _persist_rows(self, results, current, changed_rows):
+        """Write the changed rows whose positions are not older than the database's"""
+        user_ids = results['user_ids'][changed_rows].tolist()
+        # Wait for trades holding these rows, then compare versions they have committed
+        list(PortfolioValuation.objects.select_for_update().filter(user_id__in=user_ids).values_list('pk', flat=True))
+        db_versions = dict(UserDataVersion.objects.filter(user_id__in=user_ids).values_list('user_id', 'version'))
+        stale = np.array([
+            db_versions.get(user_id, 0) > self.data_versions.get(user_id, 0) for user_id in user_ids
+        ], dtype=bool)
+        if stale.any():
+            self._stale_users.update(np.asarray(user_ids)[stale].tolist())
+            changed_rows = changed_rows[~stale]
+
+        now = timezone.now()
+        valuations = [
+            PortfolioValuation(
+                user_id=int(results['user_ids'][row]),
+                zodiac_sign=self.user_signs[row],
+                element=self.user_elements[row],
+                cash_balance=_to_money(results['cash_balance'][row]),
+                stocks_value=_to_money(results['stocks_value'][row]),
+                total_value=_to_money(results['total_value'][row]),
+                cost_basis=_to_money(results['cost_basis'][row]),
+                gain_loss=_to_money(results['gain_loss'][row]),
+                gain_loss_percent=_to_money(results['gain_loss_percent'][row]),
+                realized_gain_loss=_to_money(results['realized_gain_loss'][row]),
+                alignment_score=int(results['alignment_score'][row]),
+                cosmic_vibe_index=int(results['cosmic_vibe_index'][row]),
+                fire_value=_to_money(results['element_values'][row, 0]),
+                earth_value=_to_money(results['element_values'][row, 1]),
+                air_value=_to_money(results['element_values'][row, 2]),
+                water_value=_to_money(results['element_values'][row, 3]),
+                alignment_weighted_value=_to_money(results['aligned_value'][row]),
+                position_count=int(results['position_count'][row]),
+                same_sign_count=int(results['match_counts'][row, 0]),
+                positive_count=int(results['match_counts'][row, 1]),
+                neutral_count=int(results['match_counts'][row, 2]),
+                negative_count=int(results['match_counts'][row, 3]),
+                updated_at=now,
+            )
+            for row in changed_rows.tolist()
+        ]
+        # Upsert so users valued for the first time get their row created
+        PortfolioValuation.objects.bulk_create(
+            valuations,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=PERSIST_FIELDS,
+        )
+        self._last_written[changed_rows] = current[changed_rows]
+
+        vibe_rows = changed_rows[current[changed_rows, 3] != self._last_vibe[changed_rows]]
+        CosmicVibeSnapshot.objects.bulk_create([
+            CosmicVibeSnapshot(
+                user_id=int(results['user_ids'][row]),
+                cosmic_vibe_index=int(results['cosmic_vibe_index'][row]),
+                alignment_score=int(results['alignment_score'][row]),
+                elements_held=int(results['elements_held'][row]),
+                recorded_at=now,
+            )
+            for row in vibe_rows.tolist()
+        ], batch_size=1000)
+        self._last_vibe[vibe_rows] = current[vibe_rows, 3]
+        return len(valuations)
+
+
+def apply_position_change(user, ticker, quantity_delta, cost_delta, cash_delta, realized_delta=Decimal('0'),
+                          opened=False, closed=False, stock=None):
+    """
+    Incrementally update a user's PortfolioValuation for a single trade
+    Must be called inside the trade's transaction so the aggregate row and the holdings
+    never disagree. Users without a row yet get one from the next bulk recalculation.
+
+    Args:
+        user (User): Trading user
+        ticker (str): Traded ticker
+        quantity_delta (Decimal): Change in shares held (negative for sells)
+        cost_delta (Decimal): Change in the position's cost basis
+        cash_delta (Decimal): Change in cash balance
+        realized_delta (Decimal): Gain/loss realized by a sell
+        opened (bool): The trade created a new position
+        closed (bool): The trade removed the position
+        stock (dict): The stock's current_price and zodiac_sign, if the caller already loaded them
+
+    Returns:
+        PortfolioValuation: The updated row, or None if the user has no row yet
+    """
+    try:
+        valuation = PortfolioValuation.objects.select_for_update().get(user=user)
+    except PortfolioValuation.DoesNotExist:
+        return None
+
+    valuation.cash_balance += cash_delta
+    valuation.realized_gain_loss += realized_delta
+
+    if stock is None:
+        stock = Stock.objects.filter(ticker=ticker).values('current_price', 'zodiac_sign').first()
+    if stock is not None:
+        # Positions without a Stock row are not valued, same as the bulk recalculation
+        price = stock['current_price'] or Decimal('0')
+        value_delta = (quantity_delta * price).quantize(Decimal('0.01'))
+        matching_table = {
+            (valuation.zodiac_sign, stock['zodiac_sign']): match_type
+            for match_type in ZodiacSignMatching.objects.filter(
+                user_sign=valuation.zodiac_sign, stock_sign=stock['zodiac_sign']
+            ).values_list('match_type', flat=True)
+        }
+        match_type = get_match_type(valuation.zodiac_sign, stock['zodiac_sign'], matching_table)
+        element = get_element_from_zodiac(stock['zodiac_sign'])
+
+        valuation.stocks_value += value_delta
+        valuation.cost_basis += cost_delta
+        valuation.alignment_weighted_value += value_delta * ALIGNMENT_SCORES[match_type]
+        if element in ELEMENTS:
+            field = f'{element.lower()}_value'
+            setattr(valuation, field, getattr(valuation, field) + value_delta)
+
+        count_delta = 1 if opened else -1 if closed else 0
+        if count_delta:
+            valuation.position_count = max(valuation.position_count + count_delta, 0)
+            field = f'{match_type}_count'
+            setattr(valuation, field, max(getattr(valuation, field) + count_delta, 0))
+
+    # Derived headline numbers
+    valuation.total_value = valuation.cash_balance + valuation.stocks_value
+    valuation.gain_loss = valuation.stocks_value - valuation.cost_basis
+    valuation.gain_loss_percent = (
+        (valuation.gain_loss / valuation.cost_basis * 100).quantize(Decimal('0.01'))
+        if valuation.cost_basis > 0 else Decimal('0')
+    )
+    valuation.alignment_score = (
+        int(valuation.alignment_weighted_value / valuation.stocks_value)
+        if valuation.stocks_value > 0 else EMPTY_PORTFOLIO_ALIGNMENT
+    )
+    element_values = [getattr(valuation, f'{element.lower()}_value') for element in ELEMENTS]
+    previous_vibe_index = valuation.cosmic_vibe_index
+    valuation.cosmic_vibe_index = get_cosmic_vibe_index(valuation.alignment_score, element_values)
+    valuation.save()
+
+    if valuation.cosmic_vibe_index != previous_vibe_index:
+        record_cosmic_vibe(
+            user.pk,
+            valuation.cosmic_vibe_index,
+            valuation.alignment_score,
+            sum(1 for value in element_values if value > 0),
+        )
+    return valuation
+
+
+def summarize_valuation(valuation):
+    """
+    Build the portfolio summary headline numbers from a PortfolioValuation row
+
+    Args:
+        valuation (PortfolioValuation): Materialized aggregates for a user
+
+    Returns:
+        dict: Summary fields matching PortfolioSummarySerializer (without holdings)
+    """
+    stocks_value = valuation.stocks_value
+    element_values = {element: getattr(valuation, f'{element.lower()}_value') for element in ELEMENTS}
+
+    if stocks_value > 0:
+        overall_alignment_score = int(valuation.alignment_weighted_value / stocks_value)
+        element_distribution = {
+            element: round((value / stocks_value) * 100, 1) for element, value in element_values.items()
+        }
+    else:
+        overall_alignment_score = EMPTY_PORTFOLIO_ALIGNMENT
+        element_distribution = {element: 0 for element in ELEMENTS}
+
+    return {
+        'cash_balance': valuation.cash_balance,
+        'stocks_value': stocks_value,
+        'total_portfolio_value': valuation.total_value,
+        'total_cost_basis': valuation.cost_basis,
+        'total_gain_loss': valuation.gain_loss,
+        'total_gain_loss_percent': valuation.gain_loss_percent,
+        'realized_gain_loss': valuation.realized_gain_loss,
+        'overall_alignment_score': overall_alignment_score,
+        'cosmic_vibe_index': get_cosmic_vibe_index(overall_alignment_score, element_values.values()),
+        'element_distribution': element_distribution,
+        'alignment_breakdown': {
+            match_type: getattr(valuation, f'{match_type}_count') for match_type in MATCH_TYPES
+        },
+        'position_count': valuation.position_count,
+    }
+
+
+def get_cosmic_vibe_history(user, timestamps):
+    """
+    Get the recorded cosmic vibe index in effect at each of a list of times
+
+    Times before the user's first snapshot get the first recorded index; users without
+    any history get their current index.
+
+    Args:
+        user (User): Portfolio owner
+        timestamps (list): Timezone-aware datetimes, ascending
+
+    Returns:
+        list: Cosmic vibe index per timestamp
+    """
+    if not len(timestamps):
+        return []
+    snapshots = CosmicVibeSnapshot.objects.filter(user=user)
+    # The snapshot in effect at the first timestamp plus every change after it
+    points = list(
+        snapshots.filter(recorded_at__lte=timestamps[0]).order_by('-recorded_at').values_list(
+            'recorded_at', 'cosmic_vibe_index'
+        )[:1]
+    ) + list(
+        snapshots.filter(recorded_at__gt=timestamps[0]).order_by('recorded_at').values_list(
+            'recorded_at', 'cosmic_vibe_index'
+        )
+    )
+    if not points:
+        current = PortfolioValuation.objects.filter(user=user).values_list('cosmic_vibe_index', flat=True).first()
+        if current is None:
+            current = get_cosmic_vibe_index(EMPTY_PORTFOLIO_ALIGNMENT, [])
+        return [current] * len(timestamps)
+
+    times = [recorded_at for recorded_at, _ in points]
+    return [points[max(bisect.bisect_right(times, timestamp) - 1, 0)][1] for timestamp in timestamps]
+
+
+_engine = None
+
+
+def get_valuation_engine():
+    """
+    Get the process-wide valuation engine, loading it on first use
+    """
+    global _engine
+    if _engine is None:
+        _engine = PortfolioValuationEngine()
+    _engine.sync()
+    return _engine
+
+
+def refresh_portfolio_valuations():
+    """
+    Revalue every portfolio against current prices and persist the changed rows
+
+    Returns:
+        int: Number of valuations written
+    """
+    engine = get_valuation_engine()
+    results = engine.revalue()
+    written = engine.persist(results)
+    logger.info(f"Revalued {len(results['user_ids'])} portfolios, {written} valuation(s) changed")
+    return written
@@ -0,0 +1,153 @@
+"""
+Watchlist quotes and bulk edits for ZEN Trading
+- with_quotes joins every watchlist entry to its stock and to the user's zodiac match of the
+  stock's sign in one query, so the watchlist can embed quotes instead of the client fetching
+  /api/stocks/<ticker>/ once per row
+- add_to_watchlist / remove_from_watchlist change many tickers in one transaction
+"""
+from django.db import transaction
+from django.db.models import CharField, OuterRef, Subquery, Value
+from django.utils import timezone
+
+from django_app.models import Stock, UserStockPreference, ZodiacSignMatching, get_element_from_zodiac
+from django_app.utils.response_cache import bump_data_version
+
+# Most tickers one bulk request may add or remove
+MAX_BULK_TICKERS = 100
+
+# Compatibility score of each match type (a stock of the user's own sign scores 4)
+COMPATIBILITY_SCORES = {'positive': 3, 'neutral': 2, 'negative': 1}
+
+
+class WatchlistError(Exception):
+    """
+    Raised for a missing, malformed or too long tickers list
+    """
+
+
+def stock_compatibility(user_sign, stock_sign, match_type):
+    """
+    Zodiac compatibility of a stock for a user, as the stock detail endpoint reports it
+
+    Args:
+        user_sign (str): User's zodiac sign
+        stock_sign (str): Stock's zodiac sign
+        match_type (str): Match type from the matching table, or None if there is no entry
+
+    Returns:
+        dict: is_same_sign, match_type, compatibility_score and element
+    """
+    if stock_sign == user_sign:
+        match_type, score = 'positive', 4
+    else:
+        match_type = match_type or 'neutral'
+        score = COMPATIBILITY_SCORES.get(match_type, COMPATIBILITY_SCORES['negative'])
+    return {
+        'is_same_sign': stock_sign == user_sign,
+        'match_type': match_type,
+        'compatibility_score': score,
+        'element': get_element_from_zodiac(stock_sign),
+    }
+
+
+def with_quotes(queryset, user_sign):
+    """
+    Join preferences to their stocks and the user's match type of each stock's sign
+
+    Entries get .stock loaded and a stock_match_type annotation (None without a match or
+    without a user sign).
+    """
+    queryset = queryset.select_related('stock')
+    if not user_sign:
+        return queryset.annotate(stock_match_type=Value(None, output_field=CharField()))
+    return queryset.annotate(stock_match_type=Subquery(
+        ZodiacSignMatching.objects.filter(
+            user_sign=user_sign, stock_sign=OuterRef('stock__zodiac_sign')
+        ).values('match_type')[:1]
+    ))
+
+
+def parse_bulk_tickers(data):
+    """
+    Get the tickers of a bulk request body ({"tickers": [...]}), upper-cased and deduplicated
+
+    Returns:
+        list: Tickers, or None if the body names a single ticker instead
+
+    Raises:
+        WatchlistError: If tickers is not a non-empty list of strings of at most MAX_BULK_TICKERS
+    """
+    if 'tickers' not in data:
+        return None
+    tickers = data.get('tickers')
+    if not isinstance(tickers, list) or not all(isinstance(ticker, str) for ticker in tickers):
+        raise WatchlistError('tickers must be a list of ticker symbols')
+    tickers = list(dict.fromkeys(ticker.upper().strip() for ticker in tickers if ticker.strip()))
+    if not tickers:
+        raise WatchlistError('At least one ticker is required')
+    if len(tickers) > MAX_BULK_TICKERS:
+        raise WatchlistError(f'At most {MAX_BULK_TICKERS} tickers can be changed at once')
+    return tickers
+
+
+def add_to_watchlist(user, tickers):
+    """
+    Put many stocks on a user's watchlist (disliked ones move over) in one transaction
+
+    Returns:
+        dict: added, updated (moved from the dislike list) and not_found tickers
+    """
+    stocks = {stock.ticker: stock for stock in Stock.objects.filter(ticker__in=tickers)}
+    not_found = [ticker for ticker in tickers if ticker not in stocks]
+
+    with transaction.atomic():
+        existing = set(
+            UserStockPreference.objects.filter(user=user, ticker__in=list(stocks)).values_list('ticker', flat=True)
+        )
+        # A concurrent request may insert the same (user, ticker) rows first: skip those, the
+        # re-read below picks them up
+        UserStockPreference.objects.bulk_create([
+            UserStockPreference(user=user, ticker=ticker, stock=stocks[ticker], preference_type='watchlist')
+            for ticker in stocks if ticker not in existing
+        ], ignore_conflicts=True)
+
+        preferences = UserStockPreference.objects.select_for_update().filter(user=user, ticker__in=list(stocks))
+        moved = [preference for preference in preferences if preference.preference_type != 'watchlist']
+        now = timezone.now()
+        for preference in moved:
+            preference.preference_type = 'watchlist'
+            preference.stock = stocks[preference.ticker]
+            # bulk_update skips auto_now, and delta sync reads updated_at
+            preference.updated_at = now
+        UserStockPreference.objects.bulk_update(moved, ['preference_type', 'stock', 'updated_at'])
+
+        updated = {preference.ticker for preference in moved}
+        added = [ticker for ticker in tickers if ticker in stocks and ticker not in existing and ticker not in updated]
+        if added or moved:
+            bump_data_version(user)
+
+    return {
+        'added': added,
+        'updated': sorted(updated),
+        'not_found': not_found,
+    }
+
+
+def remove_from_watchlist(user, tickers):
+    """
+    Take many stocks off a user's watchlist in one transaction
+
+    Returns:
+        dict: removed and not_found (not on the watchlist) tickers
+    """
+    with transaction.atomic():
+        preferences = UserStockPreference.objects.filter(user=user, ticker__in=tickers, preference_type='watchlist')
+        removed = set(preferences.values_list('ticker', flat=True))
+        if removed:
+            preferences.delete()
+            bump_data_version(user)
+
+    return {
+        'removed': [ticker for ticker in tickers if ticker in removed],
+        'not_found': [ticker for ticker in tickers if ticker not in removed],
+    }
@@ -102,3 +102,87 @@ def get_next_market_open():
     
     return next_open.strftime("%Y-%m-%d %H:%M:%S %Z")
 
+
+
+def get_daily_bars(tickers, start=None, period="5y"):
+    """
+    Download adjusted daily bars for many tickers in one request
+    
+    Args:
+        tickers (list): Stock ticker symbols
+        start (date): First date to fetch (default: use period instead)
+        period (str): Data period when no start is given (default: '5y')
+        
+    Returns:
+        dict: {ticker: pandas.DataFrame with columns [Open, High, Low, Close, Volume]}
+              Tickers without data are left out
+    """
+    data = yf.download(
+        list(tickers),
+        start=start,
+        period=None if start else period,
+        interval="1d",
+        group_by="ticker",
+        auto_adjust=True,
+        progress=False,
+        threads=True,
+    )
+    return _split_download(data, tickers)
+
+
+def get_history(tickers, period="1mo", interval="1d"):
+    """
+    Download price history for many tickers in one request
+    
+    Args:
+        tickers (list): Stock ticker symbols
+        period (str): Data period (e.g., '1d', '1mo', '5y')
+        interval (str): Bar interval (e.g., '5m', '1d', '1wk')
+        
+    Returns:
+        dict: {ticker: pandas.DataFrame with columns [Open, High, Low, Close, Volume]}
+              Tickers without data are left out
+    """
+    data = yf.download(
+        list(tickers),
+        period=period,
+        interval=interval,
+        group_by="ticker",
+        auto_adjust=True,
+        progress=False,
+        threads=True,
+    )
+    return _split_download(data, tickers)
+
+
+def _split_download(data, tickers):
+    # One frame per ticker out of a grouped yf.download result, without the empty bars
+    if data is None or data.empty:
+        return {}
+    
+    bars = {}
+    for ticker in tickers:
+        if data.columns.nlevels > 1:
+            if ticker not in data.columns.get_level_values(0):
+                continue
+            frame = data[ticker]
+        else:
+            frame = data
+        frame = frame.dropna(subset=["Close"])
+        if not frame.empty:
+            bars[ticker] = frame
+    return bars
+
+
+def get_shares_outstanding(ticker):
+    """
+    Get the number of shares outstanding for a ticker
+    
+    Args:
+        ticker (str): Stock ticker symbol (e.g., 'AAPL')
+        
+    Returns:
+        int: Shares outstanding, or None if yfinance doesn't report it
+    """
+    shares = yf.Ticker(ticker).fast_info.shares
+    return int(shares) if shares else None
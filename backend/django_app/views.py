@@ -4,7 +4,10 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.db import transaction
+from django.db.models import Q
 from decimal import Decimal
 from .serializers import (
     StockSerializer,
@@ -16,10 +19,63 @@ from .serializers import (
     UserHoldingsSerializer,
     ZodiacSignMatchingSerializer,
     UserStockPreferenceSerializer,
-    PortfolioSummarySerializer,
-    DailyHoroscopeSerializer
+    WatchlistEntrySerializer,
+    DailyHoroscopeSerializer,
+    LeaderboardEntrySerializer,
+    StockOrderSerializer,
+    PriceAlertSerializer,
+    AlertNotificationSerializer,
+    TaxLotSerializer,
+    PortfolioRiskSerializer,
+    PortfolioProjectionSerializer,
+    RelatedStocksSerializer,
+    BasketIndexSerializer,
+    BasketIndexSeriesSerializer,
+    BacktestRequestSerializer,
+    BacktestJobSerializer,
+    BacktestJobDetailSerializer
 )
-from .models import Stock, UserHoldings, ZodiacSignMatching, UserStockPreference, DailyHoroscope, get_element_from_zodiac
+from .models import Stock, UserHoldings, ZodiacSignMatching, UserStockPreference, DailyHoroscope, PortfolioValuation, StockOrder, PriceAlert, AlertNotification, TaxLot, RelatedStocks, BacktestJob, BasketIndex, ChangeLogEntry, get_element_from_zodiac
+from .utils.trading import execute_trade, TradeError
+from .utils.valuation_engine import (
+    summarize_valuation,
+    get_cosmic_vibe_index,
+    get_cosmic_vibe_history,
+    get_match_type,
+    ALIGNMENT_SCORES,
+    EMPTY_PORTFOLIO_ALIGNMENT,
+)
+from .utils.response_cache import cache_response, bump_data_version
+from .utils.market_aggregates import get_market_snapshot, get_sign_market
+from .utils.compression import choose_encoding
+from .utils.stock_snapshot import get_stock_list_snapshot
+from .utils.delta_sync import get_changes, SyncTokenError
+from .utils.pagination import LIST_PARAMS, ListQueryError, SparseListMixin, paginate_list
+from .utils.fast_serializers import serialize_portfolio_summary
+from .utils.columnar import epoch_seconds, get_layout, LayoutError, ohlcv_columns, ohlcv_rows
+from .renderers import HISTORY_RENDERER_CLASSES
+from .utils.history_stream import HistoryStreamError, parse_tickers, stream_history
+from .utils.dashboard import build_dashboard, DashboardError, load_holdings, parse_sections
+from .utils.watchlist import add_to_watchlist, parse_bulk_tickers, remove_from_watchlist, stock_compatibility, WatchlistError, with_quotes
+from .utils.conditional import (
+    conditional_response,
+    horoscope_validators,
+    is_not_modified,
+    make_etag,
+    matching_rules_validators,
+    not_modified,
+    price_epoch_validators,
+    set_validators,
+    stock_validators,
+    user_data_validators,
+    user_prices_validators,
+)
+from .utils.fixed_point import CENTS, QUANTITY_SCALE, float_to_fixed, position_values, share_of_total, to_decimal, to_fixed, value_portfolio
+from .utils.risk_analytics import get_portfolio_risk, RiskAnalyticsError, RISK_PERIODS, RISK_RETRY_AFTER
+from .utils.backtester import get_holdings_basket, BacktestError
+from .utils.basket_indices import INDEX_PERIODS
+from .utils.projection import get_portfolio_projection, ProjectionError, PROJECTION_HORIZONS, DEFAULT_PATHS, MIN_PATHS, MAX_PATHS
+from django_q.tasks import async_task
 from datetime import date
 
 User = get_user_model()
@@ -28,13 +84,39 @@ User = get_user_model()
 
 # TODO 
 
-class StockListView(generics.ListAPIView):
+class StockListView(SparseListMixin, generics.ListAPIView):
     """
     GET: List all stocks with real-time prices
+    Query parameters:
+        - fields: Comma-separated fields to return (e.g. ticker,current_price)
+        - cursor / page_size: Keyset pagination by ticker (unpaginated without either)
     """
     queryset = Stock.objects.all()
     serializer_class = StockSerializer
     permission_classes = [permissions.AllowAny]  # Public access to stock data
+    keyset_ordering = 'ticker'
+
+    def list(self, request, *args, **kwargs):
+        """
+        Serve the full stock list pre-rendered for the current price epoch, compressed if accepted
+        """
+        if any(param in request.query_params for param in LIST_PARAMS):
+            return super().list(request, *args, **kwargs)
+        
+        epoch, updated_at, bodies = get_stock_list_snapshot()
+        etag = make_etag('stocks', epoch)
+        if is_not_modified(request, etag, updated_at):
+            response = not_modified(request, etag, updated_at)
+            patch_vary_headers(response, ('Accept-Encoding',))
+            return response
+
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), bodies)
+        response = HttpResponse(bodies[encoding], content_type='application/json')
+        if encoding != 'identity':
+            response['Content-Encoding'] = encoding
+        response['Content-Length'] = len(bodies[encoding])
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return set_validators(request, response, etag, updated_at)
 
 
 class StockDetailView(APIView):
@@ -43,6 +125,7 @@ class StockDetailView(APIView):
     """
     permission_classes = [permissions.AllowAny]
     
+    @conditional_response('stock', stock_validators)
     def get(self, request, ticker):
         """
         Get stock details with zodiac matching information if user is authenticated
@@ -59,36 +142,16 @@ class StockDetailView(APIView):
                     if profile.zodiac_sign:
                         user_sign = profile.zodiac_sign
                         
-                        # Check if it's the same sign as user
-                        is_same_sign = stock.zodiac_sign == user_sign
-                        stock_data['is_same_sign'] = is_same_sign
+                        # Match type from the zodiac matching table (same sign needs no lookup)
+                        match_type = None
+                        if stock.zodiac_sign != user_sign:
+                            match_type = ZodiacSignMatching.objects.filter(
+                                user_sign=user_sign,
+                                stock_sign=stock.zodiac_sign
+                            ).values_list('match_type', flat=True).first()
                         
-                        # Get match type from zodiac matching table
-                        if is_same_sign:
-                            stock_data['match_type'] = 'positive'
-                            stock_data['compatibility_score'] = 4
-                        else:
-                            try:
-                                matching = ZodiacSignMatching.objects.get(
-                                    user_sign=user_sign,
-                                    stock_sign=stock.zodiac_sign
-                                )
-                                stock_data['match_type'] = matching.match_type
-                                
-                                # Assign compatibility scores based on match type
-                                if matching.match_type == 'positive':
-                                    stock_data['compatibility_score'] = 3
-                                elif matching.match_type == 'neutral':
-                                    stock_data['compatibility_score'] = 2
-                                else:  # negative
-                                    stock_data['compatibility_score'] = 1
-                            except ZodiacSignMatching.DoesNotExist:
-                                # Default to neutral if no matching data
-                                stock_data['match_type'] = 'neutral'
-                                stock_data['compatibility_score'] = 2
-                        
-                        # Add element
-                        stock_data['element'] = get_element_from_zodiac(stock.zodiac_sign)
+                        # Same sign, match type, compatibility score and element
+                        stock_data.update(stock_compatibility(user_sign, stock.zodiac_sign, match_type))
                 except Exception as e:
                     # If there's an error getting zodiac info, just return basic stock data
                     print(f"Error adding zodiac matching info: {e}")
@@ -118,12 +181,12 @@ class PriceCardView(APIView):
     # return data
 
 
-class UserListCreateView(generics.ListCreateAPIView):
+class UserListCreateView(SparseListMixin, generics.ListCreateAPIView):
     """
-    GET: List all users (admin only)
+    GET: List all users (admin only; fields= and cursor / page_size keyset pagination by id)
     POST: Create a new user (public registration)
     """
-    queryset = User.objects.all()
+    queryset = User.objects.select_related('profile')
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -274,6 +337,26 @@ def market_status(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class MarketMoversView(APIView):
+    """
+    GET: Today's top gainers and losers and the average change of every sign and element
+    Public endpoint - no authentication required
+    """
+    permission_classes = [permissions.AllowAny]
+    
+    def get(self, request):
+        """
+        Get the market snapshot published by the latest price update batch
+        """
+        try:
+            return Response(get_market_snapshot(), status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                'error': 'Failed to fetch market movers',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class OnboardingView(APIView):
     """
     POST: Submit onboarding data (date of birth, zodiac sign, investing style, starting balance)
@@ -344,15 +427,17 @@ class UserHoldingsView(APIView):
     """
     GET: Retrieve user's holdings (balance and stock positions)
     POST: Add or update a stock position (buy/sell stocks)
+    PATCH: Change the default tax-lot method used for sells
     """
     permission_classes = [permissions.IsAuthenticated]
     
+    @cache_response('holdings', prices=False)
     def get(self, request):
         """
         Get the authenticated user's holdings and stock positions
         """
         try:
-            holdings = UserHoldings.objects.get(user=request.user)
+            holdings = load_holdings(request)
             serializer = UserHoldingsSerializer(holdings)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except UserHoldings.DoesNotExist:
@@ -374,18 +459,17 @@ class UserHoldingsView(APIView):
             "ticker": "AAPL",
             "quantity": 10.5,
             "total_value": 1500.00,
-            "action": "buy" or "sell"
+            "action": "buy" or "sell",
+            "lot_method": "fifo", "lifo" or "highest_cost"  (optional, sells only)
         }
         """
         try:
-            # Get or create user holdings
-            holdings, created = UserHoldings.objects.get_or_create(user=request.user)
-            
             # Extract data from request
             ticker = request.data.get('ticker', '').upper().strip()
             quantity = request.data.get('quantity')
             total_value = request.data.get('total_value')
             action = request.data.get('action', 'buy').lower()
+            lot_method = request.data.get('lot_method') or None
             
             # Validate required fields
             if not ticker:
@@ -421,110 +505,14 @@ class UserHoldingsView(APIView):
                     'detail': 'Total value cannot be negative'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Handle buy action
-            if action == 'buy':
-                # Check if user has enough balance
-                if holdings.balance < total_value:
-                    return Response({
-                        'error': 'Insufficient balance',
-                        'detail': f'Your balance (${holdings.balance}) is insufficient to complete this purchase (${total_value})'
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Calculate purchase price per share
-                from django.utils import timezone
-                purchase_price_per_share = total_value / quantity
-                
-                # Update or create stock holding
-                from .models import StockHolding
-                stock_holding, created = StockHolding.objects.get_or_create(
-                    user_holdings=holdings,
-                    ticker=ticker,
-                    defaults={
-                        'quantity': quantity, 
-                        'total_value': total_value,
-                        'purchase_price': purchase_price_per_share,
-                        'purchase_date': timezone.now()
-                    }
-                )
-                
-                if not created:
-                    # Update existing position with weighted average purchase price
-                    old_cost_basis = stock_holding.total_value
-                    new_cost_basis = old_cost_basis + total_value
-                    old_quantity = stock_holding.quantity
-                    new_quantity = old_quantity + quantity
-                    
-                    # Calculate new weighted average purchase price
-                    stock_holding.purchase_price = new_cost_basis / new_quantity
-                    stock_holding.quantity = new_quantity
-                    stock_holding.total_value = new_cost_basis
-                    stock_holding.purchase_date = timezone.now()  # Update to most recent purchase
-                    stock_holding.save()
-                else:
-                    # For new positions, purchase_price is already set in defaults
-                    pass
-                
-                # Deduct from balance
-                holdings.balance -= total_value
-                holdings.save()
-                
-                message = f'Successfully purchased {quantity} shares of {ticker}'
-            
-            # Handle sell action
-            elif action == 'sell':
-                from .models import StockHolding
-                try:
-                    stock_holding = StockHolding.objects.get(
-                        user_holdings=holdings,
-                        ticker=ticker
-                    )
-                except StockHolding.DoesNotExist:
-                    return Response({
-                        'error': 'Position not found',
-                        'detail': f'You do not own any shares of {ticker}'
-                    }, status=status.HTTP_404_NOT_FOUND)
-                
-                # Check if user has enough shares
-                if stock_holding.quantity < quantity:
-                    return Response({
-                        'error': 'Insufficient shares',
-                        'detail': f'You only own {stock_holding.quantity} shares of {ticker}'
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Update position
-                stock_holding.quantity -= quantity
-                stock_holding.total_value -= total_value
-                
-                print(f"After sell: {ticker} quantity = {stock_holding.quantity} (type: {type(stock_holding.quantity)}), checking if <= 0: {stock_holding.quantity <= Decimal('0')}")
-                
-                if stock_holding.quantity <= Decimal('0'):
-                    # Remove position if fully sold
-                    stock_holding.delete()
-                    print(f"Position deleted for {ticker}")
-                    
-                    # Remove from watchlist so it can appear in discovery again
-                    deleted_count, _ = UserStockPreference.objects.filter(
-                        user=request.user,
-                        ticker=ticker,
-                        preference_type='watchlist'
-                    ).delete()
-                    
-                    print(f"Removed {ticker} from watchlist for user {request.user.email}: {deleted_count} entries deleted")
-                else:
-                    stock_holding.save()
-                    print(f"Position updated for {ticker}, remaining quantity: {stock_holding.quantity}")
-                
-                # Add to balance
-                holdings.balance += total_value
-                holdings.save()
-                
-                message = f'Successfully sold {quantity} shares of {ticker}'
-            
-            else:
+            # Execute the trade (balance, position and portfolio aggregates in one transaction)
+            try:
+                holdings, message = execute_trade(request.user, ticker, action, quantity, total_value, lot_method=lot_method)
+            except TradeError as e:
                 return Response({
-                    'error': 'Invalid action',
-                    'detail': 'Action must be either "buy" or "sell"'
-                }, status=status.HTTP_400_BAD_REQUEST)
+                    'error': e.error,
+                    'detail': e.detail
+                }, status=e.status_code)
             
             # Return updated holdings
             serializer = UserHoldingsSerializer(holdings)
@@ -538,6 +526,73 @@ class UserHoldingsView(APIView):
                 'error': 'Failed to process transaction',
                 'detail': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def patch(self, request):
+        """
+        Set the lot method sells use when the request does not specify one
+        Request body:
+        {
+            "lot_method": "fifo", "lifo" or "highest_cost"
+        }
+        """
+        lot_method = request.data.get('lot_method')
+        valid_methods = [method for method, _ in UserHoldings.LOT_METHODS]
+        if lot_method not in valid_methods:
+            return Response({
+                'error': 'Invalid lot method',
+                'detail': f'lot_method must be one of: {", ".join(valid_methods)}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            with transaction.atomic():
+                holdings, _ = UserHoldings.objects.get_or_create(user=request.user)
+                holdings.lot_method = lot_method
+                holdings.save(update_fields=['lot_method', 'updated_at'])
+                bump_data_version(request.user)
+            return Response(UserHoldingsSerializer(holdings).data, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                'error': 'Failed to update lot method',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class TaxLotListView(APIView):
+    """
+    GET: List the user's tax lots with unrealized gain/loss on the open ones
+    Query parameters:
+        - ticker: Only lots of this ticker
+        - open: If 'false', include closed lots as well (default: open lots only)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        """
+        Get the authenticated user's lots in acquisition order
+        """
+        try:
+            lots = TaxLot.objects.filter(user=request.user)
+            
+            ticker = request.GET.get('ticker', '').upper().strip()
+            if ticker:
+                lots = lots.filter(ticker=ticker)
+            if request.GET.get('open', 'true').lower() != 'false':
+                lots = lots.filter(remaining_quantity__gt=0)
+            
+            lots = list(lots)
+            prices = dict(
+                Stock.objects.filter(ticker__in={lot.ticker for lot in lots}).values_list('ticker', 'current_price')
+            )
+            serializer = TaxLotSerializer(lots, many=True, context={'prices': prices})
+            return Response({
+                'lot_method': UserHoldings.objects.filter(user=request.user).values_list('lot_method', flat=True).first() or 'fifo',
+                'lots': serializer.data
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                'error': 'Failed to fetch tax lots',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
 class PortfolioSummaryView(APIView):
@@ -546,14 +601,28 @@ class PortfolioSummaryView(APIView):
     """
     permission_classes = [permissions.IsAuthenticated]
     
+    @conditional_response('portfolio_summary', user_prices_validators, params=('holdings',))
+    @cache_response('portfolio_summary', params=('holdings',))
     def get(self, request):
         """
         Get portfolio summary including financial metrics and alignment scores
+        Query params: holdings (default true). With holdings=false only the headline
+        numbers are returned, read from the user's materialized portfolio aggregates.
         """
         try:
+            include_holdings = request.GET.get('holdings', 'true').lower() not in ('false', '0', 'no')
+            
+            if not include_holdings:
+                # Headline numbers come from a single primary-key read
+                valuation = PortfolioValuation.objects.filter(pk=request.user.pk).first()
+                if valuation is not None and valuation.zodiac_sign:
+                    summary_data = summarize_valuation(valuation)
+                    summary_data['holdings'] = []
+                    return Response(serialize_portfolio_summary(summary_data), status=status.HTTP_200_OK)
+                # Not valued yet: fall through to the full computation
+            
             # Get user's holdings
-            holdings = UserHoldings.objects.get(user=request.user)
-            positions = holdings.positions.all()
+            holdings = load_holdings(request)
             
             # Get user's zodiac sign
             profile = request.user.profile
@@ -565,160 +634,98 @@ class PortfolioSummaryView(APIView):
             
             user_sign = profile.zodiac_sign
             
-            # Initialize metrics
-            cash_balance = holdings.balance
-            total_cost_basis = Decimal('0')
-            stocks_current_value = Decimal('0')
-            portfolio_holdings = []
+            # Load positions joined to their stocks, then the user's sign matches (two queries);
+            # positions whose stock doesn't exist in the database are skipped
+            positions = list(holdings.positions.filter(stock__isnull=False).values(
+                'ticker', 'quantity', 'total_value', 'purchase_price', 'purchase_date',
+                'stock__company_name', 'stock__current_price', 'stock__zodiac_sign',
+            ))
+            matching_table = {
+                (user_sign, stock_sign): match_type
+                for stock_sign, match_type in ZodiacSignMatching.objects.filter(user_sign=user_sign).values_list(
+                    'stock_sign', 'match_type'
+                )
+            }
+            match_types = [
+                get_match_type(user_sign, position['stock__zodiac_sign'], matching_table)
+                for position in positions
+            ]
+            
+            # Value every position in integer cents; Decimals only come back for the response
+            valuation = value_portfolio(
+                to_fixed([position['quantity'] for position in positions], QUANTITY_SCALE),
+                to_fixed([position['stock__current_price'] for position in positions], CENTS),
+                to_fixed([position['total_value'] for position in positions], CENTS),
+                [ALIGNMENT_SCORES[match_type] for match_type in match_types],
+            )
             
             # Element and alignment tracking
             element_values = {'Fire': 0, 'Earth': 0, 'Air': 0, 'Water': 0}
             alignment_counts = {'same_sign': 0, 'positive': 0, 'neutral': 0, 'negative': 0}
-            weighted_alignment_sum = 0
+            portfolio_holdings = []
             
-            # Process each position
-            for position in positions:
-                # Get stock information
-                try:
-                    stock = Stock.objects.get(ticker=position.ticker)
-                except Stock.DoesNotExist:
-                    # Skip positions where stock doesn't exist in database
-                    continue
-                
-                # Calculate financial metrics
-                current_price = Decimal(str(stock.current_price)) if stock.current_price else Decimal('0')
-                quantity = Decimal(str(position.quantity))
-                current_value = current_price * quantity
-                cost_basis = Decimal(str(position.total_value))
-                gain_loss = current_value - cost_basis
-                gain_loss_percent = (gain_loss / cost_basis * 100) if cost_basis > 0 else Decimal('0')
-                
-                # Get alignment information
-                match_type = 'neutral'
-                alignment_score = 65  # Default neutral score
-                
-                # Check if same sign (highest priority)
-                is_same_sign = stock.zodiac_sign == user_sign
-                if is_same_sign:
-                    alignment_score = 100
-                    match_type = 'same_sign'
-                else:
-                    # Lookup zodiac matching
-                    try:
-                        matching = ZodiacSignMatching.objects.get(
-                            user_sign=user_sign,
-                            stock_sign=stock.zodiac_sign
-                        )
-                        match_type = matching.match_type
-                        
-                        # Assign alignment scores based on match type
-                        if match_type == 'positive':
-                            alignment_score = 85
-                        elif match_type == 'neutral':
-                            alignment_score = 65
-                        elif match_type == 'negative':
-                            alignment_score = 40
-                    except ZodiacSignMatching.DoesNotExist:
-                        # Default to neutral if no matching data
-                        match_type = 'neutral'
-                        alignment_score = 65
+            for i, position in enumerate(positions):
+                element = get_element_from_zodiac(position['stock__zodiac_sign'])
                 
-                # Get element
-                element = get_element_from_zodiac(stock.zodiac_sign)
-                
-                # Track element distribution (by current value)
+                # Track element distribution (by current value) and alignment counts
                 if element in element_values:
-                    element_values[element] += current_value
-                
-                # Track alignment counts
-                if is_same_sign:
-                    alignment_counts['same_sign'] += 1
-                elif match_type == 'positive':
-                    alignment_counts['positive'] += 1
-                elif match_type == 'neutral':
-                    alignment_counts['neutral'] += 1
-                elif match_type == 'negative':
-                    alignment_counts['negative'] += 1
-                
-                # Add to totals
-                total_cost_basis += cost_basis
-                stocks_current_value += current_value
+                    element_values[element] += int(valuation['values'][i])
+                alignment_counts[match_types[i]] += 1
                 
-                # Create portfolio holding dict
-                holding_data = {
-                    'ticker': position.ticker,
-                    'company_name': stock.company_name,
-                    'quantity': position.quantity,
-                    'purchase_price': position.purchase_price or 0,
-                    'purchase_date': position.purchase_date,
-                    'current_price': current_price,
-                    'current_value': current_value,
-                    'cost_basis': cost_basis,
-                    'gain_loss': gain_loss,
-                    'gain_loss_percent': gain_loss_percent,
-                    'alignment_score': alignment_score,
-                    'match_type': match_type,
-                    'zodiac_sign': stock.zodiac_sign,
+                portfolio_holdings.append({
+                    'ticker': position['ticker'],
+                    'company_name': position['stock__company_name'],
+                    'quantity': position['quantity'],
+                    'purchase_price': position['purchase_price'] or 0,
+                    'purchase_date': position['purchase_date'],
+                    'current_price': position['stock__current_price'] or Decimal('0'),
+                    'current_value': to_decimal(valuation['values'][i]),
+                    'cost_basis': position['total_value'],
+                    'gain_loss': to_decimal(valuation['gain_loss'][i]),
+                    'gain_loss_percent': to_decimal(valuation['gain_loss_percent'][i]),
+                    'alignment_score': ALIGNMENT_SCORES[match_types[i]],
+                    'match_type': match_types[i],
+                    'zodiac_sign': position['stock__zodiac_sign'],
                     'element': element
-                }
-                
-                portfolio_holdings.append(holding_data)
-                
-                # Accumulate weighted alignment (weight by current value percentage)
-                # We'll normalize this after we know the total
+                })
             
-            # Calculate total portfolio value
-            total_portfolio_value = cash_balance + stocks_current_value
+            stocks_current_value = valuation['stocks_value']
             
-            # Calculate overall alignment score (weighted by position value)
-            overall_alignment_score = 0
-            if stocks_current_value > 0:
-                for holding in portfolio_holdings:
-                    weight = holding['current_value'] / stocks_current_value
-                    weighted_alignment_sum += holding['alignment_score'] * weight
-                overall_alignment_score = int(weighted_alignment_sum)
+            # Overall alignment score (weighted by position value); no stocks is neutral
+            if valuation['alignment_score'] is not None:
+                overall_alignment_score = valuation['alignment_score']
             else:
-                # No stocks, neutral alignment
-                overall_alignment_score = 50
+                overall_alignment_score = EMPTY_PORTFOLIO_ALIGNMENT
             
             # Calculate element distribution percentages
-            element_distribution = {}
             if stocks_current_value > 0:
-                for element, value in element_values.items():
-                    element_distribution[element] = round((value / stocks_current_value) * 100, 1)
+                element_distribution = dict(zip(
+                    element_values.keys(), share_of_total(element_values.values(), stocks_current_value)
+                ))
             else:
                 element_distribution = {'Fire': 0, 'Earth': 0, 'Air': 0, 'Water': 0}
             
-            # Calculate cosmic vibe index (alignment + diversity bonus)
-            # Bonus for having diverse elements (max 15 points)
-            diversity_bonus = 0
-            if stocks_current_value > 0:
-                elements_with_holdings = sum(1 for v in element_values.values() if v > 0)
-                diversity_bonus = min(elements_with_holdings * 3, 15)
-            
-            cosmic_vibe_index = min(overall_alignment_score + diversity_bonus, 100)
-            
-            # Calculate total gain/loss
-            total_gain_loss = stocks_current_value - total_cost_basis
-            total_gain_loss_percent = (total_gain_loss / total_cost_basis * 100) if total_cost_basis > 0 else 0
+            # Calculate cosmic vibe index (alignment + element diversity bonus)
+            cosmic_vibe_index = get_cosmic_vibe_index(overall_alignment_score, element_values.values())
             
             # Build response data
             summary_data = {
-                'cash_balance': cash_balance,
-                'stocks_value': stocks_current_value,
-                'total_portfolio_value': total_portfolio_value,
-                'total_cost_basis': total_cost_basis,
-                'total_gain_loss': total_gain_loss,
-                'total_gain_loss_percent': total_gain_loss_percent,
+                'cash_balance': holdings.balance,
+                'stocks_value': to_decimal(stocks_current_value),
+                'total_portfolio_value': holdings.balance + to_decimal(stocks_current_value),
+                'total_cost_basis': to_decimal(valuation['cost_basis']),
+                'total_gain_loss': to_decimal(valuation['gain_loss_total']),
+                'total_gain_loss_percent': to_decimal(valuation['gain_loss_percent_total']),
+                'realized_gain_loss': holdings.realized_gain_loss,
                 'overall_alignment_score': overall_alignment_score,
                 'cosmic_vibe_index': cosmic_vibe_index,
                 'element_distribution': element_distribution,
                 'alignment_breakdown': alignment_counts,
-                'holdings': portfolio_holdings
+                'position_count': len(portfolio_holdings),
+                'holdings': portfolio_holdings if include_holdings else []
             }
             
-            serializer = PortfolioSummarySerializer(summary_data)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return Response(serialize_portfolio_summary(summary_data), status=status.HTTP_200_OK)
             
         except UserHoldings.DoesNotExist:
             return Response({
@@ -737,8 +744,10 @@ class PortfolioSummaryView(APIView):
 class PortfolioHistoryView(APIView):
     """
     GET: Retrieve portfolio value history over a specified timeframe
+    As rows (default) or parallel columns (?layout=columns); MessagePack with Accept: application/msgpack
     """
     permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = HISTORY_RENDERER_CLASSES
     
     # Timeframe to yfinance period/interval mapping
     TIMEFRAME_MAP = {
@@ -754,9 +763,10 @@ class PortfolioHistoryView(APIView):
     def get(self, request):
         """
         Get historical portfolio values
-        Query params: timeframe (1D, 5D, 1W, 1M, 3M, 1Y, 5Y)
+        Query params: timeframe (1D, 5D, 1W, 1M, 3M, 1Y, 5Y), layout (rows, columns)
         """
         from datetime import datetime
+        import numpy as np
         import yfinance as yf
         
         try:
@@ -768,12 +778,32 @@ class PortfolioHistoryView(APIView):
                     'detail': f'Timeframe must be one of: {", ".join(self.TIMEFRAME_MAP.keys())}'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
+            try:
+                layout = get_layout(request)
+            except LayoutError as e:
+                return Response({
+                    'error': 'Invalid layout',
+                    'detail': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
             # Get user's holdings
-            holdings = UserHoldings.objects.get(user=request.user)
+            holdings = load_holdings(request)
             positions = holdings.positions.all()
             
             if not positions:
                 # No positions, just return cash balance over time
+                if layout == 'columns':
+                    return Response({
+                        'timeframe': timeframe,
+                        'layout': layout,
+                        'data': {
+                            'timestamp': [int(datetime.now().timestamp())],
+                            'portfolio_value': [float(holdings.balance)],
+                            'cash_balance': [float(holdings.balance)],
+                            'stocks_value': [0.0],
+                            'cosmic_vibe_index': [get_cosmic_vibe_index(EMPTY_PORTFOLIO_ALIGNMENT, [])]
+                        }
+                    }, status=status.HTTP_200_OK)
                 return Response({
                     'timeframe': timeframe,
                     'data': [{
@@ -781,7 +811,7 @@ class PortfolioHistoryView(APIView):
                         'portfolio_value': float(holdings.balance),
                         'cash_balance': float(holdings.balance),
                         'stocks_value': 0.0,
-                        'cosmic_vibe_index': 50
+                        'cosmic_vibe_index': get_cosmic_vibe_index(EMPTY_PORTFOLIO_ALIGNMENT, [])
                     }]
                 }, status=status.HTTP_200_OK)
             
@@ -812,35 +842,44 @@ class PortfolioHistoryView(APIView):
             first_ticker = list(historical_data.keys())[0]
             timestamps = historical_data[first_ticker].index
             
+            # Recorded cosmic vibe index in effect at each timestamp
+            vibe_history = get_cosmic_vibe_history(request.user, list(timestamps.to_pydatetime()))
+            
+            # Closes aligned to the reference timestamps in cents (missing bars count as 0),
+            # valued against position quantities in one integer array operation
+            priced = [position for position in positions if position.ticker in historical_data]
+            quantities = to_fixed([position.quantity for position in priced], QUANTITY_SCALE)
+            closes = float_to_fixed(np.column_stack([
+                historical_data[position.ticker]['Close'].reindex(timestamps).to_numpy()
+                for position in priced
+            ]), CENTS)
+            stocks_values = position_values(quantities, closes).sum(axis=1)
+            
             # Calculate portfolio value at each timestamp
+            cash_balance = float(holdings.balance)
+            if layout == 'columns':
+                stocks_column = stocks_values.astype(np.int64) / CENTS
+                return Response({
+                    'timeframe': timeframe,
+                    'layout': layout,
+                    'data': {
+                        'timestamp': epoch_seconds(timestamps),
+                        'portfolio_value': cash_balance + stocks_column,
+                        'cash_balance': np.full(len(timestamps), cash_balance),
+                        'stocks_value': stocks_column,
+                        'cosmic_vibe_index': vibe_history
+                    }
+                }, status=status.HTTP_200_OK)
+            
             portfolio_history = []
-            for timestamp in timestamps:
-                stocks_value = Decimal('0')
-                
-                for position in positions:
-                    if position.ticker in historical_data:
-                        hist = historical_data[position.ticker]
-                        try:
-                            # Get the close price at this timestamp
-                            if timestamp in hist.index:
-                                price = Decimal(str(hist.loc[timestamp]['Close']))
-                                quantity = Decimal(str(position.quantity))
-                                stocks_value += price * quantity
-                        except Exception as e:
-                            print(f"Error calculating value for {position.ticker} at {timestamp}: {e}")
-                            continue
-                
-                portfolio_value = float(holdings.balance) + float(stocks_value)
-                
-                # Simple cosmic vibe calculation (can be enhanced)
-                cosmic_vibe_index = min(50 + (float(stocks_value) / portfolio_value * 50) if portfolio_value > 0 else 50, 100)
-                
+            for timestamp, stocks_value, cosmic_vibe_index in zip(timestamps, stocks_values, vibe_history):
+                stocks_value = int(stocks_value) / CENTS
                 portfolio_history.append({
                     'timestamp': timestamp.isoformat(),
-                    'portfolio_value': portfolio_value,
-                    'cash_balance': float(holdings.balance),
-                    'stocks_value': float(stocks_value),
-                    'cosmic_vibe_index': round(cosmic_vibe_index)
+                    'portfolio_value': cash_balance + stocks_value,
+                    'cash_balance': cash_balance,
+                    'stocks_value': stocks_value,
+                    'cosmic_vibe_index': cosmic_vibe_index
                 })
             
             return Response({
@@ -862,11 +901,102 @@ class PortfolioHistoryView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class PortfolioRiskView(APIView):
+    """
+    GET: Retrieve risk analytics for the user's current holdings
+    Query parameters:
+        - period: Lookback window (1Y, 3Y, 5Y; default: 1Y)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        """
+        Get volatility, beta vs SPY, max drawdown, Sharpe/Sortino ratios and per-position
+        risk contribution, computed from cached daily bars with current position weights
+        Large portfolios are computed in the background: 202 until the result is ready
+        """
+        period = request.GET.get('period', '1Y').upper()
+        if period not in RISK_PERIODS:
+            return Response({
+                'error': 'Invalid period',
+                'detail': f'Period must be one of: {", ".join(RISK_PERIODS.keys())}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            risk = get_portfolio_risk(request.user, period)
+            if risk is None:
+                return Response({
+                    'message': f'Risk analytics are being computed. Retry in {RISK_RETRY_AFTER} seconds.',
+                    'status': 'queued'
+                }, status=status.HTTP_202_ACCEPTED, headers={'Retry-After': str(RISK_RETRY_AFTER)})
+            serializer = PortfolioRiskSerializer(risk)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        except RiskAnalyticsError as e:
+            return Response({
+                'error': 'Risk analytics unavailable',
+                'detail': str(e)
+            }, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return Response({
+                'error': 'Failed to compute risk analytics',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class PortfolioProjectionView(APIView):
+    """
+    GET: Project the user's current holdings forward with a Monte Carlo simulation
+    Query parameters:
+        - horizon: Projection horizon (3M, 6M, 1Y, 2Y; default: 1Y)
+        - paths: Number of simulated paths (1000-50000; default: 10000)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        """
+        Get percentile bands (5th-95th) of future portfolio value, bootstrapped from
+        cached daily returns of the current positions
+        """
+        horizon = request.GET.get('horizon', '1Y').upper()
+        if horizon not in PROJECTION_HORIZONS:
+            return Response({
+                'error': 'Invalid horizon',
+                'detail': f'Horizon must be one of: {", ".join(PROJECTION_HORIZONS.keys())}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            paths = int(request.GET.get('paths', DEFAULT_PATHS))
+        except ValueError:
+            paths = 0
+        if not MIN_PATHS <= paths <= MAX_PATHS:
+            return Response({
+                'error': 'Invalid paths',
+                'detail': f'Paths must be an integer between {MIN_PATHS} and {MAX_PATHS}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            projection = get_portfolio_projection(request.user, horizon, paths)
+            serializer = PortfolioProjectionSerializer(projection)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        except ProjectionError as e:
+            return Response({
+                'error': 'Projection unavailable',
+                'detail': str(e)
+            }, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return Response({
+                'error': 'Failed to compute projection',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class StockHistoryView(APIView):
     """
     GET: Retrieve stock price history over a specified timeframe
+    As rows (default) or parallel columns (?layout=columns); MessagePack with Accept: application/msgpack
     """
     permission_classes = [permissions.AllowAny]  # Public access to stock data
+    renderer_classes = HISTORY_RENDERER_CLASSES
     
     # Timeframe to yfinance period/interval mapping
     TIMEFRAME_MAP = {
@@ -879,10 +1009,11 @@ class StockHistoryView(APIView):
         '5Y': {'period': '5y', 'interval': '1mo'},
     }
     
+    @conditional_response('stock_history', price_epoch_validators, params=('timeframe', 'layout'))
     def get(self, request, ticker):
         """
         Get historical stock prices
-        Query params: timeframe (1D, 5D, 1W, 1M, 3M, 1Y, 5Y)
+        Query params: timeframe (1D, 5D, 1W, 1M, 3M, 1Y, 5Y), layout (rows, columns)
         """
         import yfinance as yf
         
@@ -895,6 +1026,14 @@ class StockHistoryView(APIView):
                     'detail': f'Timeframe must be one of: {", ".join(self.TIMEFRAME_MAP.keys())}'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
+            try:
+                layout = get_layout(request)
+            except LayoutError as e:
+                return Response({
+                    'error': 'Invalid layout',
+                    'detail': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
             period_config = self.TIMEFRAME_MAP[timeframe]
             
             # Fetch historical data
@@ -907,17 +1046,15 @@ class StockHistoryView(APIView):
                     'detail': f'No historical data found for ticker {ticker}'
                 }, status=status.HTTP_404_NOT_FOUND)
             
-            # Format the data
-            history_data = []
-            for timestamp, row in hist.iterrows():
-                history_data.append({
-                    'timestamp': timestamp.isoformat(),
-                    'open': float(row['Open']),
-                    'high': float(row['High']),
-                    'low': float(row['Low']),
-                    'close': float(row['Close']),
-                    'volume': int(row['Volume'])
-                })
+            if layout == 'columns':
+                return Response({
+                    'ticker': ticker.upper(),
+                    'timeframe': timeframe,
+                    'layout': layout,
+                    'data': ohlcv_columns(hist)
+                }, status=status.HTTP_200_OK)
+            
+            history_data = ohlcv_rows(hist)
             
             return Response({
                 'ticker': ticker.upper(),
@@ -934,50 +1071,219 @@ class StockHistoryView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class ZodiacMatchedStocksView(APIView):
+class StockHistoryStreamView(APIView):
     """
-    GET: Retrieve stocks matched to the authenticated user's zodiac sign
-    Query parameters:
-        - match_type: Filter by match type (positive, neutral, negative)
-        - limit: Limit the number of results (default: no limit)
+    GET: Stream several tickers' price histories as newline-delimited JSON, one line per ticker
     """
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.AllowAny]  # Public access to stock data
     
     def get(self, request):
         """
-        Get stocks that are compatible with the user's zodiac sign
-        Excludes disliked stocks and orders by: same sign, positive, neutral, negative
+        Stream historical stock prices, each ticker's line as soon as it is ready
+        Query params: tickers (comma-separated), timeframe (1D, 5D, 1W, 1M, 3M, 1Y, 5Y), layout (rows, columns)
         """
         try:
-            # Get user's zodiac sign from profile
-            profile = request.user.profile
-            if not profile.zodiac_sign:
+            tickers = parse_tickers(request.query_params.get('tickers'))
+        except HistoryStreamError as e:
+            return Response({
+                'error': 'Invalid tickers',
+                'detail': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        timeframe = request.query_params.get('timeframe', '1M').upper()
+        if timeframe not in StockHistoryView.TIMEFRAME_MAP:
+            return Response({
+                'error': 'Invalid timeframe',
+                'detail': f'Timeframe must be one of: {", ".join(StockHistoryView.TIMEFRAME_MAP.keys())}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            layout = get_layout(request)
+        except LayoutError as e:
+            return Response({
+                'error': 'Invalid layout',
+                'detail': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        period_config = StockHistoryView.TIMEFRAME_MAP[timeframe]
+        response = StreamingHttpResponse(
+            stream_history(tickers, timeframe, period_config['period'], period_config['interval'], layout),
+            content_type='application/x-ndjson'
+        )
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+
+class RelatedStocksView(APIView):
+    """
+    GET: Retrieve the stocks whose daily returns are most correlated with a stock
+    Query parameters:
+        - limit: Number of related stocks (default: all stored, up to 10)
+    """
+    permission_classes = [permissions.AllowAny]  # Public access to stock data
+    
+    def get(self, request, ticker):
+        """
+        Get the related stocks stored by the nightly correlation build
+        """
+        try:
+            related = RelatedStocks.objects.filter(ticker=ticker.upper()).first()
+            if related is None:
                 return Response({
-                    'error': 'Zodiac sign not set',
-                    'detail': 'Please complete onboarding to set your zodiac sign'
-                }, status=status.HTTP_400_BAD_REQUEST)
+                    'error': 'No data available',
+                    'detail': f'No related stocks computed for ticker {ticker.upper()}'
+                }, status=status.HTTP_404_NOT_FOUND)
             
-            user_sign = profile.zodiac_sign
+            serializer = RelatedStocksSerializer(related)
+            data = serializer.data
             
-            # Get query parameters
-            match_type_filter = request.GET.get('match_type', None)
             limit = request.GET.get('limit', None)
+            if limit:
+                try:
+                    data['related'] = data['related'][:max(int(limit), 0)]
+                except ValueError:
+                    pass
             
-            # Get user's disliked AND watchlist stocks to exclude them from discovery
-            excluded_tickers = UserStockPreference.objects.filter(
-                user=request.user,
-                preference_type__in=['dislike', 'watchlist']
-            ).values_list('ticker', flat=True)
-            
-            # Query zodiac matching data
-            matching_query = ZodiacSignMatching.objects.filter(user_sign=user_sign)
-            
-            # Filter by match type if specified
-            if match_type_filter and match_type_filter in ['positive', 'neutral', 'negative']:
-                matching_query = matching_query.filter(match_type=match_type_filter)
-            
-            # Get all matching stock signs
-            matches = matching_query.values('stock_sign', 'match_type', 'element')
+            return Response(data, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                'error': 'Failed to retrieve related stocks',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class BasketIndexListView(APIView):
+    """
+    GET: List the zodiac sign and element basket indices with their latest levels
+    Query parameters:
+        - type: Filter by basket type (sign, element)
+        - weighting: Filter by weighting (equal, cap)
+    """
+    permission_classes = [permissions.AllowAny]  # Public access to stock data
+    
+    def get(self, request):
+        """
+        Get the latest level and day/year change of every basket index
+        """
+        basket_type = request.GET.get('type', None)
+        weighting = request.GET.get('weighting', None)
+        if basket_type and basket_type not in dict(BasketIndex.BASKET_TYPES):
+            return Response({
+                'error': 'Invalid type',
+                'detail': 'Type must be one of: sign, element'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if weighting and weighting not in dict(BasketIndex.WEIGHTINGS):
+            return Response({
+                'error': 'Invalid weighting',
+                'detail': 'Weighting must be one of: equal, cap'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            indices = BasketIndex.objects.all()
+            if basket_type:
+                indices = indices.filter(basket_type=basket_type)
+            if weighting:
+                indices = indices.filter(weighting=weighting)
+            
+            serializer = BasketIndexSerializer(indices, many=True)
+            return Response({
+                'baskets': serializer.data
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                'error': 'Failed to retrieve basket indices',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class BasketIndexDetailView(APIView):
+    """
+    GET: Retrieve the index series of a zodiac sign or element basket
+    Query parameters:
+        - weighting: equal or cap (default: equal)
+        - period: Chart period (1M, 3M, 6M, 1Y, 5Y, ALL; default: 1Y)
+    """
+    permission_classes = [permissions.AllowAny]  # Public access to stock data
+    
+    def get(self, request, name):
+        """
+        Get a basket's index levels over a period, as parallel dates/values lists
+        """
+        weighting = request.GET.get('weighting', 'equal')
+        period = request.GET.get('period', '1Y').upper()
+        if weighting not in dict(BasketIndex.WEIGHTINGS):
+            return Response({
+                'error': 'Invalid weighting',
+                'detail': 'Weighting must be one of: equal, cap'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if period not in INDEX_PERIODS:
+            return Response({
+                'error': 'Invalid period',
+                'detail': f'Period must be one of: {", ".join(INDEX_PERIODS.keys())}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            index = BasketIndex.objects.filter(name=name.capitalize(), weighting=weighting).first()
+            if index is None:
+                return Response({
+                    'error': 'No data available',
+                    'detail': f'No {weighting}-weighted index computed for {name.capitalize()}'
+                }, status=status.HTTP_404_NOT_FOUND)
+            
+            serializer = BasketIndexSeriesSerializer(index, context={'period': period})
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                'error': 'Failed to retrieve basket index',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class ZodiacMatchedStocksView(APIView):
+    """
+    GET: Retrieve stocks matched to the authenticated user's zodiac sign
+    Query parameters:
+        - match_type: Filter by match type (positive, neutral, negative)
+        - limit: Limit the number of results (default: no limit)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    @cache_response('matched_stocks', params=('match_type', 'limit'))
+    def get(self, request):
+        """
+        Get stocks that are compatible with the user's zodiac sign
+        Excludes disliked stocks and orders by: same sign, positive, neutral, negative
+        """
+        try:
+            # Get user's zodiac sign from profile
+            profile = request.user.profile
+            if not profile.zodiac_sign:
+                return Response({
+                    'error': 'Zodiac sign not set',
+                    'detail': 'Please complete onboarding to set your zodiac sign'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            user_sign = profile.zodiac_sign
+            
+            # Get query parameters
+            match_type_filter = request.GET.get('match_type', None)
+            limit = request.GET.get('limit', None)
+            
+            # Get user's disliked AND watchlist stocks to exclude them from discovery
+            excluded_tickers = UserStockPreference.objects.filter(
+                user=request.user,
+                preference_type__in=['dislike', 'watchlist']
+            ).values_list('ticker', flat=True)
+            
+            # Query zodiac matching data
+            matching_query = ZodiacSignMatching.objects.filter(user_sign=user_sign)
+            
+            # Filter by match type if specified
+            if match_type_filter and match_type_filter in ['positive', 'neutral', 'negative']:
+                matching_query = matching_query.filter(match_type=match_type_filter)
+            
+            # Get all matching stock signs
+            matches = matching_query.values('stock_sign', 'match_type', 'element')
             
             if not matches:
                 return Response({
@@ -1077,17 +1383,22 @@ class ZodiacMatchedStocksView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class ZodiacSignMatchingListView(generics.ListAPIView):
+class ZodiacSignMatchingListView(SparseListMixin, generics.ListAPIView):
     """
     GET: List all zodiac sign matching rules
     Query parameters:
         - user_sign: Filter by user zodiac sign
         - match_type: Filter by match type (positive, neutral, negative)
+        - fields, cursor / page_size: Sparse fields and keyset pagination by id
     """
     queryset = ZodiacSignMatching.objects.all()
     serializer_class = ZodiacSignMatchingSerializer
     permission_classes = [permissions.AllowAny]
     
+    @conditional_response('matching_rules', matching_rules_validators, params=('user_sign', 'match_type', *LIST_PARAMS))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
     def get_queryset(self):
         queryset = super().get_queryset()
         
@@ -1113,17 +1424,72 @@ class UserWatchlistView(APIView):
     
     def get(self, request):
         """
-        Get all stocks in the user's watchlist
+        Get all stocks in the user's watchlist, newest first
+        Query parameters: include=quotes (embed each stock's quote, zodiac compatibility and element),
+        fields, cursor / page_size (keyset pagination, unpaginated without either)
+        """
+        if 'quotes' in request.query_params.get('include', '').lower().split(','):
+            return self.list_with_quotes(request)
+        return self.list_entries(request)
+    
+    @conditional_response('watchlist', user_data_validators, params=LIST_PARAMS)
+    @cache_response('watchlist', params=LIST_PARAMS, prices=False)
+    def list_entries(self, request):
+        """
+        Watchlist entries only (ticker, preference type and when they were added)
         """
         try:
-            watchlist = UserStockPreference.objects.filter(
-                user=request.user,
-                preference_type='watchlist'
+            watchlist, links = paginate_list(
+                request,
+                UserStockPreference.objects.filter(user=request.user, preference_type='watchlist'),
+                UserStockPreferenceSerializer,
+                '-created_at',
+                self,
+            )
+            return Response({
+                'watchlist': watchlist,
+                **(links or {})
+            }, status=status.HTTP_200_OK)
+        except ListQueryError as e:
+            return Response({
+                'error': 'Invalid list parameters',
+                'detail': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return Response({
+                'error': 'Failed to fetch watchlist',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    @conditional_response('watchlist_quotes', user_prices_validators, params=LIST_PARAMS)
+    @cache_response('watchlist_quotes', params=LIST_PARAMS)
+    def list_with_quotes(self, request):
+        """
+        Watchlist entries with their stocks' quotes and compatibility, in one joined query
+        Depends on prices, so it is cached and validated against the price epoch too.
+        """
+        try:
+            user_sign = request.user.profile.zodiac_sign
+            watchlist, links = paginate_list(
+                request,
+                with_quotes(
+                    UserStockPreference.objects.filter(user=request.user, preference_type='watchlist'),
+                    user_sign
+                ),
+                WatchlistEntrySerializer,
+                '-created_at',
+                self,
+                context={'user_sign': user_sign},
             )
-            serializer = UserStockPreferenceSerializer(watchlist, many=True)
             return Response({
-                'watchlist': serializer.data
+                'watchlist': watchlist,
+                **(links or {})
             }, status=status.HTTP_200_OK)
+        except ListQueryError as e:
+            return Response({
+                'error': 'Invalid list parameters',
+                'detail': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response({
                 'error': 'Failed to fetch watchlist',
@@ -1132,10 +1498,24 @@ class UserWatchlistView(APIView):
     
     def post(self, request):
         """
-        Add a stock to the watchlist
-        Request body: { "ticker": "AAPL" }
+        Add stocks to the watchlist
+        Request body: { "ticker": "AAPL" } or, for many at once, { "tickers": ["AAPL", "MSFT"] }
         """
         try:
+            try:
+                tickers = parse_bulk_tickers(request.data)
+            except WatchlistError as e:
+                return Response({
+                    'error': 'Invalid data',
+                    'detail': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+            if tickers is not None:
+                result = add_to_watchlist(request.user, tickers)
+                return Response({
+                    'message': f'Added {len(result["added"])} and moved {len(result["updated"])} to watchlist',
+                    **result
+                }, status=status.HTTP_200_OK)
+            
             ticker = request.data.get('ticker', '').upper().strip()
             if not ticker:
                 return Response({
@@ -1145,7 +1525,7 @@ class UserWatchlistView(APIView):
             
             # Check if stock exists in database
             try:
-                Stock.objects.get(ticker=ticker)
+                stock = Stock.objects.get(ticker=ticker)
             except Stock.DoesNotExist:
                 return Response({
                     'error': 'Stock not found',
@@ -1153,11 +1533,13 @@ class UserWatchlistView(APIView):
                 }, status=status.HTTP_404_NOT_FOUND)
             
             # Create or update preference
-            preference, created = UserStockPreference.objects.update_or_create(
-                user=request.user,
-                ticker=ticker,
-                defaults={'preference_type': 'watchlist'}
-            )
+            with transaction.atomic():
+                preference, created = UserStockPreference.objects.update_or_create(
+                    user=request.user,
+                    ticker=ticker,
+                    defaults={'preference_type': 'watchlist', 'stock': stock}
+                )
+                bump_data_version(request.user)
             
             serializer = UserStockPreferenceSerializer(preference)
             message = 'Added to watchlist' if created else 'Updated to watchlist'
@@ -1175,10 +1557,24 @@ class UserWatchlistView(APIView):
     
     def delete(self, request):
         """
-        Remove a stock from the watchlist
-        Request body: { "ticker": "AAPL" }
+        Remove stocks from the watchlist
+        Request body: { "ticker": "AAPL" } or, for many at once, { "tickers": ["AAPL", "MSFT"] }
         """
         try:
+            try:
+                tickers = parse_bulk_tickers(request.data)
+            except WatchlistError as e:
+                return Response({
+                    'error': 'Invalid data',
+                    'detail': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+            if tickers is not None:
+                result = remove_from_watchlist(request.user, tickers)
+                return Response({
+                    'message': f'Removed {len(result["removed"])} from watchlist',
+                    **result
+                }, status=status.HTTP_200_OK)
+            
             ticker = request.data.get('ticker', '').upper().strip()
             if not ticker:
                 return Response({
@@ -1186,11 +1582,14 @@ class UserWatchlistView(APIView):
                     'detail': 'Ticker is required'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            deleted_count, _ = UserStockPreference.objects.filter(
-                user=request.user,
-                ticker=ticker,
-                preference_type='watchlist'
-            ).delete()
+            with transaction.atomic():
+                deleted_count, _ = UserStockPreference.objects.filter(
+                    user=request.user,
+                    ticker=ticker,
+                    preference_type='watchlist'
+                ).delete()
+                if deleted_count:
+                    bump_data_version(request.user)
             
             if deleted_count == 0:
                 return Response({
@@ -1217,19 +1616,29 @@ class UserDislikeListView(APIView):
     """
     permission_classes = [permissions.IsAuthenticated]
     
+    @cache_response('dislike_list', params=LIST_PARAMS, prices=False)
     def get(self, request):
         """
-        Get all stocks in the user's dislike list
+        Get all stocks in the user's dislike list, newest first
+        Query parameters: fields, cursor / page_size (keyset pagination, unpaginated without either)
         """
         try:
-            dislike_list = UserStockPreference.objects.filter(
-                user=request.user,
-                preference_type='dislike'
+            dislike_list, links = paginate_list(
+                request,
+                UserStockPreference.objects.filter(user=request.user, preference_type='dislike'),
+                UserStockPreferenceSerializer,
+                '-created_at',
+                self,
             )
-            serializer = UserStockPreferenceSerializer(dislike_list, many=True)
             return Response({
-                'dislike_list': serializer.data
+                'dislike_list': dislike_list,
+                **(links or {})
             }, status=status.HTTP_200_OK)
+        except ListQueryError as e:
+            return Response({
+                'error': 'Invalid list parameters',
+                'detail': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response({
                 'error': 'Failed to fetch dislike list',
@@ -1251,7 +1660,7 @@ class UserDislikeListView(APIView):
             
             # Check if stock exists in database
             try:
-                Stock.objects.get(ticker=ticker)
+                stock = Stock.objects.get(ticker=ticker)
             except Stock.DoesNotExist:
                 return Response({
                     'error': 'Stock not found',
@@ -1259,11 +1668,13 @@ class UserDislikeListView(APIView):
                 }, status=status.HTTP_404_NOT_FOUND)
             
             # Create or update preference
-            preference, created = UserStockPreference.objects.update_or_create(
-                user=request.user,
-                ticker=ticker,
-                defaults={'preference_type': 'dislike'}
-            )
+            with transaction.atomic():
+                preference, created = UserStockPreference.objects.update_or_create(
+                    user=request.user,
+                    ticker=ticker,
+                    defaults={'preference_type': 'dislike', 'stock': stock}
+                )
+                bump_data_version(request.user)
             
             serializer = UserStockPreferenceSerializer(preference)
             message = 'Added to dislike list' if created else 'Updated to dislike list'
@@ -1292,11 +1703,14 @@ class UserDislikeListView(APIView):
                     'detail': 'Ticker is required'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            deleted_count, _ = UserStockPreference.objects.filter(
-                user=request.user,
-                ticker=ticker,
-                preference_type='dislike'
-            ).delete()
+            with transaction.atomic():
+                deleted_count, _ = UserStockPreference.objects.filter(
+                    user=request.user,
+                    ticker=ticker,
+                    preference_type='dislike'
+                ).delete()
+                if deleted_count:
+                    bump_data_version(request.user)
             
             if deleted_count == 0:
                 return Response({
@@ -1315,12 +1729,39 @@ class UserDislikeListView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class SyncView(APIView):
+    """
+    GET: Changes to stock quotes and the user's holdings, preferences and horoscope since a sync token
+    Query parameters:
+        - token: Token returned by the previous sync (omit for a full sync)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        """
+        Get the changed rows, the tickers deleted since the token and the token for the next sync
+        """
+        try:
+            return Response(get_changes(request.user, request.GET.get('token')), status=status.HTTP_200_OK)
+        except SyncTokenError as e:
+            return Response({
+                'error': 'Invalid sync token',
+                'detail': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return Response({
+                'error': 'Failed to sync',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class DailyHoroscopeView(APIView):
     """
-    GET: Retrieve today's horoscope for the authenticated user
+    GET: Retrieve today's horoscope for the authenticated user, with how their sign and element trade today
     """
     permission_classes = [permissions.IsAuthenticated]
     
+    @conditional_response('horoscope', horoscope_validators)
     def get(self, request):
         """
         Get today's horoscope based on user's zodiac sign and investing style
@@ -1354,7 +1795,10 @@ class DailyHoroscopeView(APIView):
                 )
                 
                 serializer = DailyHoroscopeSerializer(horoscope)
-                return Response(serializer.data, status=status.HTTP_200_OK)
+                return Response({
+                    **serializer.data,
+                    'market': get_sign_market(profile.zodiac_sign)
+                }, status=status.HTTP_200_OK)
                 
             except DailyHoroscope.DoesNotExist:
                 # Generate horoscope on-demand if it doesn't exist yet
@@ -1367,7 +1811,10 @@ class DailyHoroscopeView(APIView):
                     )
                     
                     serializer = DailyHoroscopeSerializer(horoscope)
-                    return Response(serializer.data, status=status.HTTP_200_OK)
+                    return Response({
+                        **serializer.data,
+                        'market': get_sign_market(profile.zodiac_sign)
+                    }, status=status.HTTP_200_OK)
                     
                 except Exception as gen_error:
                     return Response({
@@ -1380,3 +1827,470 @@ class DailyHoroscopeView(APIView):
                 'error': 'Failed to fetch horoscope',
                 'detail': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class LeaderboardView(APIView):
+    """
+    GET: Ranked leaderboard of portfolio valuations
+    Query parameters:
+        - scope: global, sign or element (default: global)
+        - group: Zodiac sign or element to rank within (default: the user's own)
+        - metric: total_value, gain_loss_percent or alignment_score (default: total_value)
+        - limit: Number of entries (default: 25, max: 100)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    SCOPES = ['global', 'sign', 'element']
+    METRICS = ['total_value', 'gain_loss_percent', 'alignment_score']
+    
+    def get(self, request):
+        """
+        Get the top portfolios and the authenticated user's own rank
+        Valuations are refreshed for all users after every price update batch
+        """
+        try:
+            scope = request.GET.get('scope', 'global').lower()
+            metric = request.GET.get('metric', 'total_value')
+            
+            if scope not in self.SCOPES:
+                return Response({
+                    'error': 'Invalid scope',
+                    'detail': f'Scope must be one of: {", ".join(self.SCOPES)}'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            if metric not in self.METRICS:
+                return Response({
+                    'error': 'Invalid metric',
+                    'detail': f'Metric must be one of: {", ".join(self.METRICS)}'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            try:
+                limit = min(max(int(request.GET.get('limit', 25)), 1), 100)
+            except (ValueError, TypeError):
+                limit = 25
+            
+            # Rank within a sign or element, defaulting to the user's own
+            valuations = PortfolioValuation.objects.all()
+            group = None
+            if scope != 'global':
+                profile = request.user.profile
+                if scope == 'sign':
+                    group = request.GET.get('group') or profile.zodiac_sign
+                    valuations = valuations.filter(zodiac_sign=group)
+                else:
+                    group = request.GET.get('group') or get_element_from_zodiac(profile.zodiac_sign)
+                    valuations = valuations.filter(element=group)
+            
+            # The metric indexes do the ranking; ties are broken by user id
+            top = valuations.select_related('user').order_by(f'-{metric}', 'user_id')[:limit]
+            entries = []
+            for rank, valuation in enumerate(top, start=1):
+                valuation.rank = rank
+                entries.append(valuation)
+            
+            # The user's own rank is the number of portfolios ahead of them in the same
+            # (metric descending, user id) order as the list
+            my_entry = None
+            try:
+                mine = PortfolioValuation.objects.get(user=request.user)
+                if group is None or getattr(mine, 'zodiac_sign' if scope == 'sign' else 'element') == group:
+                    value = getattr(mine, metric)
+                    mine.rank = valuations.filter(
+                        Q(**{f'{metric}__gt': value}) | Q(**{metric: value, 'user_id__lt': mine.user_id})
+                    ).count() + 1
+                    my_entry = LeaderboardEntrySerializer(mine).data
+            except PortfolioValuation.DoesNotExist:
+                pass
+            
+            return Response({
+                'scope': scope,
+                'group': group,
+                'metric': metric,
+                'total_ranked': valuations.count(),
+                'entries': LeaderboardEntrySerializer(entries, many=True).data,
+                'me': my_entry
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            return Response({
+                'error': 'Failed to fetch leaderboard',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class StockOrderListView(APIView):
+    """
+    GET: List the user's limit and stop orders
+    POST: Place a resting limit or stop order
+    Query parameters:
+        - status: Filter by status (open, filled, cancelled, rejected)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        """
+        Get the authenticated user's orders, newest first
+        """
+        try:
+            orders = StockOrder.objects.filter(user=request.user)
+            
+            status_filter = request.GET.get('status', None)
+            if status_filter and status_filter in dict(StockOrder.STATUSES):
+                orders = orders.filter(status=status_filter)
+            
+            serializer = StockOrderSerializer(orders, many=True)
+            return Response({
+                'orders': serializer.data
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                'error': 'Failed to fetch orders',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def post(self, request):
+        """
+        Place a resting order, filled at market once the price crosses trigger_price
+        Request body:
+        {
+            "ticker": "AAPL",
+            "side": "buy" or "sell",
+            "order_type": "limit" or "stop",
+            "trigger_price": 170.00,
+            "quantity": 10
+        }
+        """
+        serializer = StockOrderSerializer(data=request.data)
+        if serializer.is_valid():
+            try:
+                order = serializer.save(user=request.user)
+                return Response({
+                    'message': f'{order.order_type.capitalize()} {order.side} order placed for {order.quantity} shares of {order.ticker}',
+                    'order': StockOrderSerializer(order).data
+                }, status=status.HTTP_201_CREATED)
+            except Exception as e:
+                return Response({
+                    'error': 'Failed to place order',
+                    'detail': str(e)
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class StockOrderDetailView(APIView):
+    """
+    GET: Retrieve one of the user's orders
+    DELETE: Cancel an open order
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request, pk):
+        """
+        Get a single order
+        """
+        order = get_object_or_404(StockOrder, pk=pk, user=request.user)
+        return Response(StockOrderSerializer(order).data, status=status.HTTP_200_OK)
+    
+    def delete(self, request, pk):
+        """
+        Cancel an open order
+        The order engine reads the cancellation from the change log and forgets the order
+        """
+        try:
+            with transaction.atomic():
+                cancelled = StockOrder.objects.filter(pk=pk, user=request.user, status='open').update(status='cancelled')
+                if cancelled:
+                    ChangeLogEntry.objects.create(kind='order', object_id=pk)
+            
+            if cancelled == 0:
+                return Response({
+                    'error': 'Not found',
+                    'detail': f'No open order with id {pk}'
+                }, status=status.HTTP_404_NOT_FOUND)
+            
+            return Response({
+                'message': f'Cancelled order {pk}'
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            return Response({
+                'error': 'Failed to cancel order',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class PriceAlertListView(APIView):
+    """
+    GET: List the user's price alerts
+    POST: Create a price alert
+    Query parameters:
+        - active: If 'true', only return alerts that have not fired yet
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        """
+        Get the authenticated user's alerts, newest first
+        """
+        try:
+            alerts = PriceAlert.objects.filter(user=request.user)
+            
+            if request.GET.get('active', '').lower() == 'true':
+                alerts = alerts.filter(is_active=True)
+            
+            serializer = PriceAlertSerializer(alerts, many=True)
+            return Response({
+                'alerts': serializer.data
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                'error': 'Failed to fetch alerts',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def post(self, request):
+        """
+        Create a one-shot alert, fired on the first price update that crosses the threshold
+        Request body:
+        {
+            "ticker": "AAPL",
+            "alert_type": "above", "below" or "percent_change",
+            "threshold": 200.00  (a price, or a percent move from previous close)
+        }
+        """
+        serializer = PriceAlertSerializer(data=request.data)
+        if serializer.is_valid():
+            try:
+                alert = serializer.save(user=request.user)
+                return Response({
+                    'message': f'Alert created for {alert.ticker}',
+                    'alert': PriceAlertSerializer(alert).data
+                }, status=status.HTTP_201_CREATED)
+            except Exception as e:
+                return Response({
+                    'error': 'Failed to create alert',
+                    'detail': str(e)
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class PriceAlertDetailView(APIView):
+    """
+    DELETE: Delete one of the user's price alerts
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def delete(self, request, pk):
+        """
+        Delete an alert
+        The alert engine reads the deletion from the change log (the post_delete signal
+        writes the entry) and forgets the alert
+        """
+        try:
+            deleted, _ = PriceAlert.objects.filter(pk=pk, user=request.user).delete()
+            
+            if deleted == 0:
+                return Response({
+                    'error': 'Not found',
+                    'detail': f'No alert with id {pk}'
+                }, status=status.HTTP_404_NOT_FOUND)
+            
+            return Response({
+                'message': f'Deleted alert {pk}'
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            return Response({
+                'error': 'Failed to delete alert',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AlertNotificationListView(APIView):
+    """
+    GET: List the user's alert notifications
+    POST: Mark notifications as read
+    Query parameters:
+        - unread: If 'true', only return unread notifications
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        """
+        Get the authenticated user's notifications, newest first
+        """
+        try:
+            notifications = AlertNotification.objects.filter(user=request.user).select_related('alert')
+            
+            if request.GET.get('unread', '').lower() == 'true':
+                notifications = notifications.filter(is_read=False)
+            
+            serializer = AlertNotificationSerializer(notifications[:100], many=True)
+            return Response({
+                'notifications': serializer.data,
+                'unread_count': AlertNotification.objects.filter(user=request.user, is_read=False).count()
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                'error': 'Failed to fetch notifications',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def post(self, request):
+        """
+        Mark notifications as read
+        Request body:
+        {
+            "ids": [1, 2, 3]  (optional, defaults to all unread notifications)
+        }
+        """
+        try:
+            notifications = AlertNotification.objects.filter(user=request.user, is_read=False)
+            
+            ids = request.data.get('ids')
+            if ids is not None:
+                if not isinstance(ids, list):
+                    return Response({
+                        'error': 'Invalid ids',
+                        'detail': 'ids must be a list of notification ids'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                notifications = notifications.filter(id__in=ids)
+            
+            updated = notifications.update(is_read=True)
+            return Response({
+                'message': f'Marked {updated} notification(s) as read'
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                'error': 'Failed to update notifications',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class BacktestListView(APIView):
+    """
+    GET: List the user's backtest jobs (without results)
+    POST: Queue a backtest of a basket or of the user's current holdings
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        """
+        Get the authenticated user's 50 most recent backtest jobs
+        """
+        try:
+            jobs = BacktestJob.objects.filter(user=request.user).defer('result')[:50]
+            serializer = BacktestJobSerializer(jobs, many=True)
+            return Response({
+                'backtests': serializer.data
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                'error': 'Failed to fetch backtests',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def post(self, request):
+        """
+        Queue a backtest; poll GET /backtests/<id>/ for the result
+        Request body:
+        {
+            "tickers": ["AAPL", "MSFT"],  (or "use_holdings": true)
+            "weights": [0.6, 0.4],  (optional, equal weights by default)
+            "rebalance": "none", "monthly", "quarterly" or "yearly",
+            "horizon": "1Y", "3Y", "5Y" or "10Y",
+            "initial_value": 10000.00
+        }
+        """
+        serializer = BacktestRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        params = serializer.validated_data
+        try:
+            if params['use_holdings']:
+                tickers, weights = get_holdings_basket(request.user)
+            else:
+                tickers, weights = params['tickers'], params['weights']
+            
+            job = BacktestJob.objects.create(user=request.user, params={
+                'tickers': tickers,
+                'weights': weights,
+                'rebalance': params['rebalance'],
+                'horizon': params['horizon'],
+                'initial_value': str(params['initial_value']),
+            })
+            async_task('django_app.tasks.run_backtest_job', job.id)
+            
+            return Response({
+                'message': f'Backtest {job.id} queued',
+                'backtest': BacktestJobSerializer(job).data
+            }, status=status.HTTP_202_ACCEPTED)
+        except BacktestError as e:
+            return Response({
+                'error': 'Invalid backtest',
+                'detail': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return Response({
+                'error': 'Failed to queue backtest',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class BacktestDetailView(APIView):
+    """
+    GET: Retrieve a backtest job and, once completed, its result
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request, pk):
+        """
+        Get a single backtest job
+        """
+        job = get_object_or_404(BacktestJob, pk=pk, user=request.user)
+        return Response(BacktestJobDetailSerializer(job).data, status=status.HTTP_200_OK)
+
+
+class DashboardView(APIView):
+    """
+    GET: Several page-load endpoints in one response (portfolio, history, holdings, horoscope, watchlist, market)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    # Section name -> endpoint whose GET handler produces it
+    SECTIONS = {
+        'portfolio': PortfolioSummaryView,
+        'history': PortfolioHistoryView,
+        'holdings': UserHoldingsView,
+        'horoscope': DailyHoroscopeView,
+        'watchlist': UserWatchlistView,
+        'market': market_status.cls,
+    }
+    # Sections that wait on yfinance run concurrently with the rest
+    THREADED_SECTIONS = ('history', 'market')
+    
+    def get(self, request):
+        """
+        Run the requested sections; each one's errors are reported without failing the others
+        Query params: sections (comma-separated, default all), plus the sections' own
+        parameters (e.g. timeframe for history, holdings for portfolio)
+        """
+        try:
+            sections = parse_sections(request.query_params.get('sections'), self.SECTIONS)
+        except DashboardError as e:
+            return Response({
+                'error': 'Invalid sections',
+                'detail': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            document = build_dashboard(request, sections, self.SECTIONS, self.THREADED_SECTIONS)
+            return Response(document, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                'error': 'Failed to build dashboard',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
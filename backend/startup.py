@@ -134,6 +134,12 @@ def setup_horoscope_schedule():
     run_command(['setup_horoscope_schedule'], 'Setup horoscope schedule')
 
 
+def setup_market_data_schedule():
+    """Set up Django-Q2 scheduled task for the nightly daily bar sync"""
+    log("Setting up market data schedule", BLUE)
+    run_command(['setup_market_data_schedule'], 'Setup market data schedule')
+
+
 def check_horoscope_status():
     """Check horoscope status without blocking (informational only)"""
     try:
@@ -298,6 +304,9 @@ def main():
         # Step 6: Set up horoscope generation schedule (runs every 15 seconds)
         setup_horoscope_schedule()
         
+        # Step 6b: Set up nightly daily bar sync for portfolio analytics
+        setup_market_data_schedule()
+        
         # Step 7: Start qcluster worker (non-blocking - handles horoscope generation)
         qcluster_process = start_qcluster()
         
@@ -0,0 +1,124 @@
+const API_BASE = 'http://localhost:42069/api';
+
+const TEST_EMAIL = 'alertstest' + Date.now() + '@example.com';
+const TEST_PASSWORD = 'testPassword123!';
+
+let authToken = null;
+
+async function request(method, path, data = null, auth = true) {
+  const url = `${API_BASE}${path}`;
+  const headers = { 'Content-Type': 'application/json' };
+
+  if (auth && authToken) {
+    headers['Authorization'] = `Bearer ${authToken}`;
+  }
+
+  const options = { method, headers };
+  if (data) options.body = JSON.stringify(data);
+
+  const response = await fetch(url, options);
+  const text = await response.text();
+
+  let responseData;
+  try {
+    responseData = text ? JSON.parse(text) : null;
+  } catch (e) {
+    responseData = text;
+  }
+
+  if (!response.ok) {
+    const error = new Error(`HTTP ${response.status}`);
+    error.response = { status: response.status, data: responseData };
+    throw error;
+  }
+
+  return responseData;
+}
+
+async function runTest() {
+  console.log('\n=== Price Alerts Test ===\n');
+
+  // Register and login
+  await request('POST', '/register/', {
+    email: TEST_EMAIL,
+    username: TEST_EMAIL.split('@')[0],
+    password: TEST_PASSWORD,
+    password_confirm: TEST_PASSWORD,
+    first_name: 'Test',
+    last_name: 'User'
+  }, false);
+
+  const loginResponse = await request('POST', '/auth/token/', {
+    email: TEST_EMAIL,
+    password: TEST_PASSWORD
+  }, false);
+
+  authToken = loginResponse.access;
+  console.log('✓ Logged in');
+
+  await request('POST', '/onboarding/', {
+    date_of_birth: '1990-01-01',
+    zodiac_sign: 'Capricorn',
+    zodiac_symbol: '♑',
+    zodiac_element: 'Earth',
+    investing_style: 'balanced',
+    starting_balance: 50000.00
+  });
+  console.log('✓ Onboarding complete');
+
+  // Create an alert far above the market so it stays active
+  const created = await request('POST', '/alerts/', {
+    ticker: 'AAPL',
+    alert_type: 'above',
+    threshold: 1000000.00
+  });
+  if (!created.alert.is_active) {
+    throw new Error('Expected a new alert to be active');
+  }
+  console.log(`✓ Created alert #${created.alert.id}`);
+
+  // It shows up in the active alerts list
+  const alerts = await request('GET', '/alerts/?active=true');
+  if (!alerts.alerts.some(a => a.id === created.alert.id)) {
+    throw new Error('Created alert missing from active alerts');
+  }
+  console.log('✓ Alert listed as active');
+
+  // Unknown tickers are rejected
+  try {
+    await request('POST', '/alerts/', { ticker: 'NOTATICKER', alert_type: 'below', threshold: 10 });
+    throw new Error('Unknown ticker was accepted');
+  } catch (error) {
+    if (!error.response || error.response.status !== 400) throw error;
+  }
+  console.log('✓ Unknown ticker rejected');
+
+  // Notifications endpoint responds and can mark everything read
+  const notifications = await request('GET', '/alerts/notifications/?unread=true');
+  if (typeof notifications.unread_count !== 'number') {
+    throw new Error('Missing unread_count');
+  }
+  await request('POST', '/alerts/notifications/', {});
+  console.log('✓ Notifications listed and marked read');
+
+  // Delete the alert, then deleting again is a 404
+  await request('DELETE', `/alerts/${created.alert.id}/`);
+  try {
+    await request('DELETE', `/alerts/${created.alert.id}/`);
+    throw new Error('Deleted alert was deleted again');
+  } catch (error) {
+    if (!error.response || error.response.status !== 404) throw error;
+  }
+  console.log('✓ Alert deleted');
+
+  console.log('\n✅ PASSED: Price alerts endpoints');
+  process.exit(0);
+}
+
+runTest().catch(error => {
+  console.error('\n❌ Test crashed:', error.message);
+  if (error.response) {
+    console.error('Response:', error.response.data);
+  }
+  process.exit(1);
+});
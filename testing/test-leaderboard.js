@@ -0,0 +1,113 @@
+const API_BASE = 'http://localhost:42069/api';
+
+const TEST_EMAIL = 'leaderboardtest' + Date.now() + '@example.com';
+const TEST_PASSWORD = 'testPassword123!';
+
+let authToken = null;
+
+async function request(method, path, data = null, auth = true) {
+  const url = `${API_BASE}${path}`;
+  const headers = { 'Content-Type': 'application/json' };
+
+  if (auth && authToken) {
+    headers['Authorization'] = `Bearer ${authToken}`;
+  }
+
+  const options = { method, headers };
+  if (data) options.body = JSON.stringify(data);
+
+  const response = await fetch(url, options);
+  const text = await response.text();
+
+  let responseData;
+  try {
+    responseData = text ? JSON.parse(text) : null;
+  } catch (e) {
+    responseData = text;
+  }
+
+  if (!response.ok) {
+    const error = new Error(`HTTP ${response.status}`);
+    error.response = { status: response.status, data: responseData };
+    throw error;
+  }
+
+  return responseData;
+}
+
+async function runTest() {
+  console.log('\n=== Leaderboard Test ===\n');
+
+  // Register and login
+  await request('POST', '/register/', {
+    email: TEST_EMAIL,
+    username: TEST_EMAIL.split('@')[0],
+    password: TEST_PASSWORD,
+    password_confirm: TEST_PASSWORD,
+    first_name: 'Test',
+    last_name: 'User'
+  }, false);
+
+  const loginResponse = await request('POST', '/auth/token/', {
+    email: TEST_EMAIL,
+    password: TEST_PASSWORD
+  }, false);
+
+  authToken = loginResponse.access;
+  console.log('✓ Logged in');
+
+  // Complete onboarding
+  await request('POST', '/onboarding/', {
+    date_of_birth: '1990-08-01',
+    zodiac_sign: 'Leo',
+    zodiac_symbol: '♌',
+    zodiac_element: 'Fire',
+    investing_style: 'balanced',
+    starting_balance: 50000.00
+  });
+  console.log('✓ Onboarding complete');
+
+  // Each scope should return a ranked list
+  for (const scope of ['global', 'sign', 'element']) {
+    const board = await request('GET', `/leaderboard/?scope=${scope}&limit=10`);
+    if (board.scope !== scope || !Array.isArray(board.entries)) {
+      throw new Error(`Invalid ${scope} leaderboard response`);
+    }
+    const ranks = board.entries.map(e => e.rank);
+    if (ranks.some((rank, i) => rank !== i + 1)) {
+      throw new Error(`${scope} leaderboard ranks are not sequential: ${ranks}`);
+    }
+    const values = board.entries.map(e => parseFloat(e.total_value));
+    if (values.some((value, i) => i > 0 && value > values[i - 1])) {
+      throw new Error(`${scope} leaderboard is not sorted by total_value`);
+    }
+    console.log(`✓ ${scope} leaderboard: ${board.entries.length} of ${board.total_ranked} entries`);
+  }
+
+  // Sign scope defaults to the user's own sign
+  const signBoard = await request('GET', '/leaderboard/?scope=sign');
+  if (signBoard.group !== 'Leo') {
+    throw new Error(`Expected sign group Leo, got ${signBoard.group}`);
+  }
+  console.log('✓ Sign leaderboard defaults to the user\'s sign');
+
+  // Invalid metric is rejected
+  try {
+    await request('GET', '/leaderboard/?metric=bogus');
+    throw new Error('Invalid metric was accepted');
+  } catch (error) {
+    if (!error.response || error.response.status !== 400) throw error;
+  }
+  console.log('✓ Invalid metric rejected');
+
+  console.log('\n✅ PASSED: Leaderboard endpoint');
+  process.exit(0);
+}
+
+runTest().catch(error => {
+  console.error('\n❌ Test crashed:', error.message);
+  if (error.response) {
+    console.error('Response:', error.response.data);
+  }
+  process.exit(1);
+});
@@ -0,0 +1,125 @@
+const API_BASE = 'http://localhost:42069/api';
+
+const TEST_EMAIL = 'orderstest' + Date.now() + '@example.com';
+const TEST_PASSWORD = 'testPassword123!';
+
+let authToken = null;
+
+async function request(method, path, data = null, auth = true) {
+  const url = `${API_BASE}${path}`;
+  const headers = { 'Content-Type': 'application/json' };
+
+  if (auth && authToken) {
+    headers['Authorization'] = `Bearer ${authToken}`;
+  }
+
+  const options = { method, headers };
+  if (data) options.body = JSON.stringify(data);
+
+  const response = await fetch(url, options);
+  const text = await response.text();
+
+  let responseData;
+  try {
+    responseData = text ? JSON.parse(text) : null;
+  } catch (e) {
+    responseData = text;
+  }
+
+  if (!response.ok) {
+    const error = new Error(`HTTP ${response.status}`);
+    error.response = { status: response.status, data: responseData };
+    throw error;
+  }
+
+  return responseData;
+}
+
+async function runTest() {
+  console.log('\n=== Limit/Stop Orders Test ===\n');
+
+  // Register and login
+  await request('POST', '/register/', {
+    email: TEST_EMAIL,
+    username: TEST_EMAIL.split('@')[0],
+    password: TEST_PASSWORD,
+    password_confirm: TEST_PASSWORD,
+    first_name: 'Test',
+    last_name: 'User'
+  }, false);
+
+  const loginResponse = await request('POST', '/auth/token/', {
+    email: TEST_EMAIL,
+    password: TEST_PASSWORD
+  }, false);
+
+  authToken = loginResponse.access;
+  console.log('✓ Logged in');
+
+  await request('POST', '/onboarding/', {
+    date_of_birth: '1990-01-01',
+    zodiac_sign: 'Capricorn',
+    zodiac_symbol: '♑',
+    zodiac_element: 'Earth',
+    investing_style: 'balanced',
+    starting_balance: 50000.00
+  });
+  console.log('✓ Onboarding complete');
+
+  // Place a buy limit far below the market so it stays open
+  const placed = await request('POST', '/orders/', {
+    ticker: 'AAPL',
+    side: 'buy',
+    order_type: 'limit',
+    trigger_price: 1.00,
+    quantity: 2
+  });
+  if (placed.order.status !== 'open') {
+    throw new Error(`Expected open order, got ${placed.order.status}`);
+  }
+  console.log(`✓ Placed buy limit order #${placed.order.id}`);
+
+  // It shows up in the open orders list
+  let orders = await request('GET', '/orders/?status=open');
+  if (!orders.orders.some(o => o.id === placed.order.id)) {
+    throw new Error('Placed order missing from open orders');
+  }
+  console.log('✓ Order listed as open');
+
+  // Invalid orders are rejected
+  try {
+    await request('POST', '/orders/', { ticker: 'AAPL', side: 'buy', order_type: 'limit', trigger_price: -5, quantity: 1 });
+    throw new Error('Negative trigger price was accepted');
+  } catch (error) {
+    if (!error.response || error.response.status !== 400) throw error;
+  }
+  console.log('✓ Negative trigger price rejected');
+
+  // Cancel it
+  await request('DELETE', `/orders/${placed.order.id}/`);
+  const cancelled = await request('GET', `/orders/${placed.order.id}/`);
+  if (cancelled.status !== 'cancelled') {
+    throw new Error(`Expected cancelled order, got ${cancelled.status}`);
+  }
+  console.log('✓ Order cancelled');
+
+  // Cancelling twice is a 404
+  try {
+    await request('DELETE', `/orders/${placed.order.id}/`);
+    throw new Error('Cancelled order was cancelled again');
+  } catch (error) {
+    if (!error.response || error.response.status !== 404) throw error;
+  }
+  console.log('✓ Second cancel rejected');
+
+  console.log('\n✅ PASSED: Limit/stop orders endpoint');
+  process.exit(0);
+}
+
+runTest().catch(error => {
+  console.error('\n❌ Test crashed:', error.message);
+  if (error.response) {
+    console.error('Response:', error.response.data);
+  }
+  process.exit(1);
+});